@@ -21,11 +21,16 @@ except ImportError:
 from conecta_senai.auth import auth_bp, auth_reset_bp
 from conecta_senai.cli import register_cli
 from conecta_senai.config import DevConfig, ProdConfig, TestConfig
+from conecta_senai.config.database import montar_engine_options
+from conecta_senai.config.esquema import verificar_esquema_na_inicializacao
 from conecta_senai.config.redis import init_redis
 from conecta_senai.extensions import db, jwt, limiter, migrate
 from conecta_senai.logging_conf import setup_logging
 from conecta_senai.middlewares.request_id import request_id_bp
 from conecta_senai.repositories.user_repository import UserRepository
+from conecta_senai.routes.diagnostico import diagnostico_bp
+from conecta_senai.routes.exportacoes import exportacoes_bp
+from conecta_senai.routes.scheduler import scheduler_bp
 from conecta_senai.routes.inscricoes_treinamento import bp as inscricoes_treinamento_bp
 from conecta_senai.routes.laboratorios import agendamento_bp, laboratorio_bp
 from conecta_senai.routes.noticias import api_noticias_bp
@@ -52,6 +57,7 @@ from conecta_senai.routes.treinamentos.basedados import (
 )
 from conecta_senai.routes.user import user_bp
 from conecta_senai.tasks import start_scheduler
+from conecta_senai.services.email_template_service import precompilar_templates_email
 from conecta_senai.telemetry import instrument
 from conecta_senai.utils.paths import ensure_path_is_safe
 
@@ -100,6 +106,17 @@ def _setup_observability() -> None:
     OBSERVABILITY_CONFIGURED = True
 
 
+def _load_config(app: Flask) -> None:
+    env = os.getenv("FLASK_ENV", "development").lower()
+    config_map = {
+        "production": ProdConfig,
+        "testing": TestConfig,
+    }
+    config_class = config_map.get(env, DevConfig)
+    app.config.from_object(config_class)
+    logging.getLogger().setLevel(app.config.get("LOG_LEVEL", logging.INFO))
+
+
 def _configure_database(app: Flask) -> None:
     migrations_dir = str(PROJECT_ROOT / "migrations")
     db.init_app(app)
@@ -151,6 +168,9 @@ def _configure_flask(app: Flask) -> None:
     app.register_blueprint(instrutor_bp, url_prefix="/api")
     app.register_blueprint(ocupacao_bp, url_prefix="/api")
     app.register_blueprint(rateio_bp, url_prefix="/api")
+    app.register_blueprint(exportacoes_bp, url_prefix="/api")
+    app.register_blueprint(scheduler_bp, url_prefix="/api")
+    app.register_blueprint(diagnostico_bp, url_prefix="/api")
     app.register_blueprint(manutencao_unidade_paginas_publicas_bp)
     app.register_blueprint(manutencao_unidade_visitante_bp)
     app.register_blueprint(manutencao_public_bp)
@@ -174,6 +194,7 @@ def _configure_flask(app: Flask) -> None:
     app.register_blueprint(auth_bp)
 
     register_cli(app)
+    precompilar_templates_email(app)
 
 
 def _configure_swagger(app: Flask) -> None:
@@ -239,6 +260,12 @@ def _configure_database_url(app: Flask) -> None:
     if db_uri.startswith("postgres://"):
         db_uri = db_uri.replace("postgres://", "postgresql://", 1)
     app.config["SQLALCHEMY_DATABASE_URI"] = db_uri
+
+    replica_uri = os.getenv("DATABASE_REPLICA_URL", "").strip()
+    if replica_uri.startswith("postgres://"):
+        replica_uri = replica_uri.replace("postgres://", "postgresql://", 1)
+    app.config["SQLALCHEMY_REPLICA_URI"] = replica_uri or None
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = montar_engine_options(db_uri, app.config)
     app.config["REDIS_URL"] = os.getenv("REDIS_URL", "redis://localhost:6379/0")
 
 
@@ -376,15 +403,7 @@ def create_app() -> Flask:
         template_folder=str(TEMPLATES_DIR),
     )
 
-    env = os.getenv("FLASK_ENV", "development").lower()
-    config_map = {
-        "production": ProdConfig,
-        "testing": TestConfig,
-    }
-    config_class = config_map.get(env, DevConfig)
-    app.config.from_object(config_class)
-    logging.getLogger().setLevel(app.config.get("LOG_LEVEL", logging.INFO))
-
+    _load_config(app)
     _configure_database_url(app)
     _configure_database(app)
 
@@ -395,6 +414,7 @@ def create_app() -> Flask:
     _configure_swagger(app)
     _configure_recaptcha(app)
     _register_default_routes(app)
+    verificar_esquema_na_inicializacao(app)
 
     scheduler_env = os.getenv("SCHEDULER_ENABLED")
     scheduler_enabled = False
@@ -0,0 +1,311 @@
+"""Cache, por processo, da identidade dos usuários autenticados.
+
+``verificar_autenticacao`` consulta aqui a identidade (id, nome, e-mail, tipo)
+por ``(user_id, jti)`` em vez de ir ao banco a cada requisição. Tokens revogados
+são registrados num filtro de Bloom local: só quando o filtro acusa uma possível
+revogação o Redis é consultado. Alterações de usuários e revogações são
+propagadas aos demais processos pelo pub/sub do Redis.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+
+from flask import current_app
+
+from conecta_senai.config import redis as redis_config
+from conecta_senai.models import db
+from conecta_senai.models.user import User
+
+log = logging.getLogger(__name__)
+
+CANAL_AUTH = "conecta_senai:auth"
+CHAVE_REVOGADOS = "auth:jtis_revogados"
+TTL_PADRAO_SEGUNDOS = 30
+TAMANHO_PADRAO = 10_000
+CAPACIDADE_BLOOM_PADRAO = 100_000
+RESSINCRONIZAR_BLOOM_SEGUNDOS = 60
+# Validade do token de acesso (``gerar_token_acesso``). Revogações gravadas
+# antes do conjunto ``auth:jtis_revogados`` existirem só como chave simples
+# ``<jti>``; durante esta janela após a subida do processo o Redis é
+# consultado para todo token, e não só quando o filtro acusa.
+JANELA_REVOGACAO_LEGADA_SEGUNDOS = 15 * 60
+
+
+class IdentidadeUsuario(NamedTuple):
+    id: int
+    nome: str
+    email: str
+    tipo: str
+    username: str | None
+
+
+class UsuarioAutenticado:
+    """Usuário da requisição montado a partir da identidade em cache.
+
+    Os demais atributos e métodos de ``User`` carregam o registro do banco sob
+    demanda, uma única vez por requisição. As rotas só leem atributos e
+    relacionamentos do usuário autenticado; para passá-lo a ``db.session`` use
+    o ``User`` de ``db.session.get``.
+    """
+
+    __slots__ = ("_identidade", "_usuario")
+
+    def __init__(self, identidade: IdentidadeUsuario) -> None:
+        object.__setattr__(self, "_identidade", identidade)
+        object.__setattr__(self, "_usuario", None)
+
+    def _carregar(self) -> User:
+        usuario = object.__getattribute__(self, "_usuario")
+        if usuario is None:
+            usuario = db.session.get(User, self._identidade.id)
+            if usuario is None:
+                raise LookupError("Usuário autenticado não existe mais")
+            object.__setattr__(self, "_usuario", usuario)
+        return usuario
+
+    def __getattr__(self, nome):
+        identidade = object.__getattribute__(self, "_identidade")
+        if nome in IdentidadeUsuario._fields and self._usuario is None:
+            return getattr(identidade, nome)
+        return getattr(self._carregar(), nome)
+
+    def __setattr__(self, nome, valor) -> None:
+        setattr(self._carregar(), nome, valor)
+
+    def __repr__(self) -> str:
+        return f"<UsuarioAutenticado {self._identidade.id} {self._identidade.tipo}>"
+
+
+class FiltroBloom:
+    def __init__(
+        self, capacidade: int = CAPACIDADE_BLOOM_PADRAO, erro: float = 0.01
+    ) -> None:
+        self.bits = max(8, int(-capacidade * math.log(erro) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.bits / capacidade * math.log(2)))
+        self._dados = bytearray((self.bits + 7) // 8)
+
+    def _posicoes(self, valor: str):
+        digest = hashlib.blake2b(valor.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.bits for i in range(self.hashes))
+
+    def adicionar(self, valor: str) -> None:
+        for posicao in self._posicoes(valor):
+            self._dados[posicao >> 3] |= 1 << (posicao & 7)
+
+    def __contains__(self, valor: str) -> bool:
+        return all(
+            self._dados[posicao >> 3] & (1 << (posicao & 7))
+            for posicao in self._posicoes(valor)
+        )
+
+
+def _redis_real():
+    cliente = redis_config.redis_conn
+    if isinstance(cliente, redis_config.DummyRedis):
+        return None
+    return cliente
+
+
+class CacheUsuarios:
+    def __init__(
+        self,
+        ttl: float = TTL_PADRAO_SEGUNDOS,
+        tamanho: int = TAMANHO_PADRAO,
+        capacidade_bloom: int = CAPACIDADE_BLOOM_PADRAO,
+        janela_revogacao_legada: float = JANELA_REVOGACAO_LEGADA_SEGUNDOS,
+    ) -> None:
+        self.ttl = ttl
+        self.tamanho = tamanho
+        self.capacidade_bloom = capacidade_bloom
+        self._itens: OrderedDict[tuple, tuple[float, IdentidadeUsuario]] = OrderedDict()
+        self._revogados_locais: dict[str, float] = {}
+        self._bloom = FiltroBloom(capacidade_bloom)
+        self._bloom_sincronizado_em = 0.0
+        self._legado_ate = time.monotonic() + janela_revogacao_legada
+        self._lock = threading.Lock()
+        self._assinante: threading.Thread | None = None
+
+    # Identidades -----------------------------------------------------------
+
+    def obter(self, user_id: int, jti: str | None) -> IdentidadeUsuario | None:
+        chave = (user_id, jti)
+        agora = time.monotonic()
+        with self._lock:
+            item = self._itens.get(chave)
+            if item and item[0] > agora:
+                self._itens.move_to_end(chave)
+                return item[1]
+
+        usuario = db.session.get(User, user_id)
+        if usuario is None:
+            return None
+        identidade = IdentidadeUsuario(
+            usuario.id, usuario.nome, usuario.email, usuario.tipo, usuario.username
+        )
+        if self.ttl > 0:
+            with self._lock:
+                self._itens[chave] = (agora + self.ttl, identidade)
+                self._itens.move_to_end(chave)
+                while len(self._itens) > self.tamanho:
+                    self._itens.popitem(last=False)
+        return identidade
+
+    def _remover_usuario(self, user_id: int) -> None:
+        with self._lock:
+            for chave in [c for c in self._itens if c[0] == user_id]:
+                del self._itens[chave]
+
+    # Revogação -------------------------------------------------------------
+
+    def _registrar_revogacao(self, jti: str, expira_em: float) -> None:
+        with self._lock:
+            self._bloom.adicionar(jti)
+            self._revogados_locais[jti] = expira_em
+
+    def _ressincronizar_bloom(self, cliente) -> None:
+        agora = time.time()
+        try:
+            cliente.zremrangebyscore(CHAVE_REVOGADOS, "-inf", agora)
+            revogados = cliente.zrangebyscore(
+                CHAVE_REVOGADOS, agora, "+inf", withscores=True
+            )
+        except Exception as exc:
+            log.warning("Falha ao sincronizar tokens revogados: %s", exc)
+            # Sem isso cada requisição tentaria o Redis de novo durante a queda.
+            self._bloom_sincronizado_em = time.monotonic()
+            return
+        bloom = FiltroBloom(self.capacidade_bloom)
+        with self._lock:
+            locais = {
+                jti: exp for jti, exp in self._revogados_locais.items() if exp > agora
+            }
+            for jti, exp in revogados:
+                jti = jti.decode() if isinstance(jti, bytes) else jti
+                locais[jti] = exp
+            for jti in locais:
+                bloom.adicionar(jti)
+            self._bloom = bloom
+            self._revogados_locais = locais
+            self._bloom_sincronizado_em = time.monotonic()
+
+    def token_revogado(self, jti: str) -> bool:
+        cliente = _redis_real()
+        if cliente is not None:
+            self._garantir_assinante(cliente)
+            if (
+                time.monotonic() - self._bloom_sincronizado_em
+                > RESSINCRONIZAR_BLOOM_SEGUNDOS
+            ):
+                self._ressincronizar_bloom(cliente)
+
+        with self._lock:
+            if jti not in self._bloom and time.monotonic() >= self._legado_ate:
+                return False
+            expira_em = self._revogados_locais.get(jti)
+        if expira_em is not None and expira_em > time.time():
+            return True
+        if cliente is None:
+            return False
+        try:
+            return bool(cliente.get(jti))
+        except Exception:
+            log.warning("Falha ao consultar revogação do token no Redis")
+            return False
+
+    # Propagação entre processos ----------------------------------------------
+
+    def _garantir_assinante(self, cliente) -> None:
+        if self._assinante is not None and self._assinante.is_alive():
+            return
+        with self._lock:
+            if self._assinante is not None and self._assinante.is_alive():
+                return
+            self._assinante = threading.Thread(
+                target=self._escutar,
+                args=(cliente,),
+                name="auth-cache-invalidacao",
+                daemon=True,
+            )
+            self._assinante.start()
+
+    def _escutar(self, cliente) -> None:
+        try:
+            pubsub = cliente.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(CANAL_AUTH)
+            while True:
+                # ``get_message`` com timeout, e não ``listen``, para não
+                # esbarrar no ``socket_timeout`` do pool.
+                mensagem = pubsub.get_message(timeout=1.0)
+                if mensagem and mensagem.get("type") == "message":
+                    self.aplicar(json.loads(mensagem["data"]))
+        except Exception as exc:
+            # A próxima verificação de token recria o assinante.
+            log.warning("Assinatura de invalidações de autenticação caiu: %s", exc)
+
+    def aplicar(self, evento: dict) -> None:
+        if evento.get("tipo") == "usuario":
+            self._remover_usuario(int(evento["id"]))
+        elif evento.get("tipo") == "revogado":
+            self._registrar_revogacao(evento["jti"], float(evento["expira_em"]))
+
+
+def obter_cache_usuarios() -> CacheUsuarios:
+    cache = current_app.extensions.get("cache_usuarios")
+    if cache is None:
+        cache = current_app.extensions.setdefault(
+            "cache_usuarios",
+            CacheUsuarios(
+                ttl=float(
+                    current_app.config.get(
+                        "AUTH_CACHE_TTL_SEGUNDOS", TTL_PADRAO_SEGUNDOS
+                    )
+                ),
+                capacidade_bloom=int(
+                    current_app.config.get(
+                        "AUTH_BLOOM_CAPACIDADE", CAPACIDADE_BLOOM_PADRAO
+                    )
+                ),
+            ),
+        )
+    return cache
+
+
+def _publicar(evento: dict) -> None:
+    obter_cache_usuarios().aplicar(evento)
+    cliente = _redis_real()
+    if cliente is None:
+        return
+    try:
+        cliente.publish(CANAL_AUTH, json.dumps(evento))
+    except Exception as exc:
+        log.warning("Falha ao propagar invalidação de autenticação: %s", exc)
+
+
+def invalidar_usuario(user_id: int) -> None:
+    """Descarta a identidade em cache do usuário em todos os processos."""
+    _publicar({"tipo": "usuario", "id": user_id})
+
+
+def revogar_token(jti: str, expira_em: float) -> None:
+    """Revoga o token ``jti`` até ``expira_em`` (timestamp UNIX)."""
+    ttl = int(expira_em - time.time())
+    if ttl <= 0:
+        return
+    cliente = _redis_real()
+    if cliente is not None:
+        try:
+            cliente.setex(jti, ttl, "revoked")
+            cliente.zadd(CHAVE_REVOGADOS, {jti: expira_em})
+        except Exception as exc:
+            log.warning("Falha ao registrar revogação no Redis: %s", exc)
+    _publicar({"tipo": "revogado", "jti": jti, "expira_em": expira_em})
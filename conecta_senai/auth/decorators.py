@@ -3,8 +3,7 @@ from functools import wraps
 import jwt
 from flask import current_app, g, jsonify, request
 
-from conecta_senai.config.redis import redis_conn
-from conecta_senai.models import db
+from conecta_senai.auth.cache_usuarios import UsuarioAutenticado, obter_cache_usuarios
 from conecta_senai.models.user import User
 
 
@@ -24,14 +23,15 @@ def verificar_autenticacao(req):
             current_app.config["SECRET_KEY"],
             algorithms=["HS256"],
         )
+        cache = obter_cache_usuarios()
         jti = dados.get("jti")
-        if jti and redis_conn.get(jti):
+        if jti and cache.token_revogado(jti):
             g.token_message = "Token has been revoked"
             return False, None
-        user = db.session.get(User, dados.get("user_id"))
-        if user:
+        identidade = cache.obter(dados.get("user_id"), jti)
+        if identidade:
             g.token_message = None
-            return True, user
+            return True, UsuarioAutenticado(identidade)
         g.token_message = None
         return False, None
     except jwt.ExpiredSignatureError:
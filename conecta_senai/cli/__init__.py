@@ -1 +1,13 @@
-from .noticias import register_cli
+from .auditoria import register_auditoria_cli
+from .esquema import register_esquema_cli
+from .noticias import register_cli as register_noticias_cli
+from .ocupacao import register_ocupacao_cli
+from .worker import register_worker_cli
+
+
+def register_cli(app):
+    register_auditoria_cli(app)
+    register_esquema_cli(app)
+    register_noticias_cli(app)
+    register_ocupacao_cli(app)
+    register_worker_cli(app)
@@ -0,0 +1,53 @@
+import click
+from flask import current_app
+
+from conecta_senai.services.auditoria_retencao_service import (
+    MESES_A_FRENTE_PADRAO,
+    RETENCAO_MESES_PADRAO,
+    arquivar_logs,
+    garantir_particoes,
+)
+
+
+def register_auditoria_cli(app):
+    @app.cli.command("arquivar_logs_auditoria")
+    @click.option(
+        "--meses-retencao",
+        type=int,
+        default=None,
+        help="Meses mantidos no banco. Padrão: AUDITORIA_RETENCAO_MESES.",
+    )
+    @click.option(
+        "--destino",
+        type=click.Path(file_okay=False),
+        default=None,
+        help="Diretório dos arquivos JSONL. Padrão: AUDITORIA_ARQUIVO_DIR.",
+    )
+    def arquivar_logs_auditoria(meses_retencao, destino):
+        """Move os logs de auditoria antigos para JSONL comprimido."""
+        if meses_retencao is None:
+            meses_retencao = int(
+                current_app.config.get(
+                    "AUDITORIA_RETENCAO_MESES", RETENCAO_MESES_PADRAO
+                )
+            )
+        arquivados = arquivar_logs(meses_retencao, destino)
+        for item in arquivados:
+            click.echo(
+                f"{item['tabela']} {item['mes']}: {item['linhas']} linha(s) -> "
+                f"{item['arquivo']}"
+            )
+        click.echo(f"{len(arquivados)} mês(es) arquivado(s).")
+
+    @app.cli.command("criar_particoes_auditoria")
+    @click.option(
+        "--meses",
+        type=int,
+        default=MESES_A_FRENTE_PADRAO,
+        show_default=True,
+        help="Quantos meses à frente devem ter partição.",
+    )
+    def criar_particoes_auditoria(meses):
+        """Cria as partições mensais das tabelas de auditoria (PostgreSQL)."""
+        criadas = garantir_particoes(meses)
+        click.echo(f"{len(criadas)} partição(ões) criada(s).")
@@ -0,0 +1,14 @@
+import click
+
+from conecta_senai.config.esquema import OK, verificar_esquema
+
+
+def register_esquema_cli(app):
+    @app.cli.command("verificar_esquema")
+    def verificar_esquema_cmd():
+        """Executa novamente todas as verificações e ajustes de esquema registrados."""
+        resultados = verificar_esquema(forcar=True)
+        for nome, resultado in resultados.items():
+            click.echo(f"{nome}: {resultado}")
+        if any(resultado != OK for resultado in resultados.values()):
+            raise SystemExit(1)
@@ -0,0 +1,26 @@
+import click
+
+from conecta_senai.services.ocupacao_resumo_service import reconstruir_resumo
+
+
+def register_ocupacao_cli(app):
+    @app.cli.command("reconstruir_resumo_ocupacoes")
+    @click.option(
+        "--data-inicio",
+        type=click.DateTime(formats=["%Y-%m-%d"]),
+        default=None,
+        help="Primeiro dia a recalcular (YYYY-MM-DD). Padrão: todo o histórico.",
+    )
+    @click.option(
+        "--data-fim",
+        type=click.DateTime(formats=["%Y-%m-%d"]),
+        default=None,
+        help="Último dia a recalcular (YYYY-MM-DD).",
+    )
+    def reconstruir_resumo_ocupacoes(data_inicio, data_fim):
+        """Recalcula o resumo diário de ocupações a partir da tabela ocupacoes."""
+        linhas = reconstruir_resumo(
+            data_inicio.date() if data_inicio else None,
+            data_fim.date() if data_fim else None,
+        )
+        click.echo(f"Resumo de ocupações reconstruído: {linhas} linha(s).")
@@ -0,0 +1,23 @@
+import click
+
+
+def register_worker_cli(app):
+    @app.cli.command("worker", with_appcontext=False)
+    @click.option(
+        "--threads",
+        type=int,
+        default=None,
+        help="Quantidade de jobs executados em paralelo (WORKER_THREADS).",
+    )
+    def worker(threads):
+        """Executa os jobs agendados e as filas até receber SIGTERM/SIGINT."""
+        from conecta_senai.tasks import stop_scheduler
+        from conecta_senai.tasks.scheduler import scheduler
+        from conecta_senai.worker import create_worker_app, run_worker
+
+        # A aplicação web carregada pela CLI (FLASK_APP) pode já ter iniciado o
+        # scheduler com o executor padrão; o worker sobe sobre a própria
+        # aplicação, com WORKER_PROCESS definido antes do engine.
+        stop_scheduler(wait=True)
+        scheduler.remove_all_jobs()
+        run_worker(create_worker_app(), threads=threads)
@@ -28,13 +28,86 @@ class BaseConfig:
     RESEND_API_KEY = os.getenv("RESEND_API_KEY", "")
     RESEND_FROM = os.getenv("RESEND_FROM", "no-reply@example.com")
     RESEND_REPLY_TO = os.getenv("RESEND_REPLY_TO")
+    EMAIL_TRANSPORT = os.getenv("EMAIL_TRANSPORT", "resend")
+    EMAIL_TEMPLATE_CACHE_SIZE = int(os.getenv("EMAIL_TEMPLATE_CACHE_SIZE", "256"))
 
     SECURITY_PASSWORD_SALT = os.environ.get("SECURITY_PASSWORD_SALT", "change-me")
     FRONTEND_BASE_URL = os.getenv("FRONTEND_BASE_URL", "http://localhost:5000")
     APP_BASE_URL = os.getenv("APP_BASE_URL", "https://conecta-senai.up.railway.app")
 
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING = env_bool("DB_POOL_PRE_PING", True)
+    DB_POOL_ESPERA_LOG_MS = float(os.getenv("DB_POOL_ESPERA_LOG_MS", "100"))
+    DB_CONNECT_TIMEOUT = int(os.getenv("DB_CONNECT_TIMEOUT", "5"))
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+    DB_WORKER_STATEMENT_TIMEOUT_MS = int(
+        os.getenv("DB_WORKER_STATEMENT_TIMEOUT_MS", "0")
+    )
+    DB_APPLICATION_NAME = os.getenv("DB_APPLICATION_NAME", "conecta-senai")
+    DB_REPLICA_PAUSA_SEGUNDOS = float(os.getenv("DB_REPLICA_PAUSA_SEGUNDOS", "30"))
+
     REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
     REDIS_PORT = int(os.getenv("REDIS_PORT", "6379"))
     RATELIMIT_STORAGE_URI = os.getenv(
         "RATELIMIT_STORAGE_URI", f"redis://{REDIS_HOST}:{REDIS_PORT}"
     )
+    REDIS_POOL_MAX_CONEXOES = int(os.getenv("REDIS_POOL_MAX_CONEXOES", "50"))
+    REDIS_POOL_TIMEOUT_SEGUNDOS = float(os.getenv("REDIS_POOL_TIMEOUT_SEGUNDOS", "2"))
+    REDIS_SOCKET_TIMEOUT_SEGUNDOS = float(
+        os.getenv("REDIS_SOCKET_TIMEOUT_SEGUNDOS", "2")
+    )
+    REDIS_CONNECT_TIMEOUT_SEGUNDOS = float(
+        os.getenv("REDIS_CONNECT_TIMEOUT_SEGUNDOS", "2")
+    )
+    REDIS_HEALTH_CHECK_SEGUNDOS = int(os.getenv("REDIS_HEALTH_CHECK_SEGUNDOS", "30"))
+    REDIS_DISJUNTOR_FALHAS = int(os.getenv("REDIS_DISJUNTOR_FALHAS", "3"))
+    REDIS_RECONEXAO_SEGUNDOS = float(os.getenv("REDIS_RECONEXAO_SEGUNDOS", "5"))
+
+    SSE_HABILITADO = env_bool("SSE_HABILITADO", False)
+    SSE_HEARTBEAT_SEGUNDOS = int(os.getenv("SSE_HEARTBEAT_SEGUNDOS", "15"))
+    SSE_DURACAO_MAXIMA_SEGUNDOS = int(os.getenv("SSE_DURACAO_MAXIMA_SEGUNDOS", "300"))
+    EVENTOS_CANAL = os.getenv("EVENTOS_CANAL", "conecta_senai:eventos")
+    AUTH_CACHE_TTL_SEGUNDOS = int(os.getenv("AUTH_CACHE_TTL_SEGUNDOS", "30"))
+    AUTH_BLOOM_CAPACIDADE = int(os.getenv("AUTH_BLOOM_CAPACIDADE", "100000"))
+    INDICADORES_CACHE_TTL_SEGUNDOS = int(
+        os.getenv("INDICADORES_CACHE_TTL_SEGUNDOS", "60")
+    )
+    CACHE_HTTP_MAX_ENTRADAS = int(os.getenv("CACHE_HTTP_MAX_ENTRADAS", "256"))
+    ESQUEMA_VERIFICAR_NA_INICIALIZACAO = env_bool(
+        "ESQUEMA_VERIFICAR_NA_INICIALIZACAO", True
+    )
+    AUDITORIA_EM_LOTE = env_bool("AUDITORIA_EM_LOTE", True)
+    AUDITORIA_RETENCAO_MESES = int(os.getenv("AUDITORIA_RETENCAO_MESES", "12"))
+    AUDITORIA_ARQUIVO_DIR = os.getenv("AUDITORIA_ARQUIVO_DIR")
+
+    WORKER_THREADS = int(os.getenv("WORKER_THREADS", "4"))
+    CONVOCACAO_LOTE = int(os.getenv("CONVOCACAO_LOTE", "200"))
+    SCHEDULER_LOCK_TTL_SEGUNDOS = int(os.getenv("SCHEDULER_LOCK_TTL_SEGUNDOS", "60"))
+    SCHEDULER_HISTORICO_DIAS = int(os.getenv("SCHEDULER_HISTORICO_DIAS", "14"))
+    SCHEDULER_EXECUCAO_EXPIRADA_MINUTOS = int(
+        os.getenv("SCHEDULER_EXECUCAO_EXPIRADA_MINUTOS", "60")
+    )
+
+    EXPORT_JOBS_DIR = os.getenv("EXPORT_JOBS_DIR")
+    EXPORT_JOBS_WORKERS = int(os.getenv("EXPORT_JOBS_WORKERS", "2"))
+    EXPORT_JOBS_TTL_HORAS = int(os.getenv("EXPORT_JOBS_TTL_HORAS", "24"))
+    EXPORT_JOBS_VIA_WORKER = env_bool("EXPORT_JOBS_VIA_WORKER", False)
+    EXPORT_JOBS_INTERVALO_SEGUNDOS = int(
+        os.getenv("EXPORT_JOBS_INTERVALO_SEGUNDOS", "5")
+    )
+    EXPORT_JOBS_LEASE_SEGUNDOS = int(os.getenv("EXPORT_JOBS_LEASE_SEGUNDOS", "120"))
+    EXPORT_JOBS_MAX_TENTATIVAS = int(os.getenv("EXPORT_JOBS_MAX_TENTATIVAS", "3"))
+
+    EMAIL_RATE_LIMIT_POR_SEGUNDO = float(os.getenv("EMAIL_RATE_LIMIT_POR_SEGUNDO", "2"))
+    EMAIL_OUTBOX_WORKERS = int(os.getenv("EMAIL_OUTBOX_WORKERS", "2"))
+    EMAIL_OUTBOX_LOTE = int(os.getenv("EMAIL_OUTBOX_LOTE", "50"))
+    EMAIL_OUTBOX_INTERVALO_SEGUNDOS = int(
+        os.getenv("EMAIL_OUTBOX_INTERVALO_SEGUNDOS", "15")
+    )
+    EMAIL_OUTBOX_MAX_TENTATIVAS = int(os.getenv("EMAIL_OUTBOX_MAX_TENTATIVAS", "5"))
+    EMAIL_OUTBOX_BACKOFF_SEGUNDOS = int(
+        os.getenv("EMAIL_OUTBOX_BACKOFF_SEGUNDOS", "30")
+    )
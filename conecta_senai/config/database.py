@@ -0,0 +1,187 @@
+"""Engines do SQLAlchemy: opções do pool e roteamento para a réplica de leitura.
+
+Os valores vêm das chaves ``DB_*`` da configuração; opções declaradas
+explicitamente em ``SQLALCHEMY_ENGINE_OPTIONS`` têm precedência. Com
+``SQLALCHEMY_REPLICA_URI`` definido (``DATABASE_REPLICA_URL``), as views
+marcadas com ``usar_replica`` leem da réplica.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from functools import wraps
+from typing import Any, Mapping
+
+from flask import current_app, g, has_app_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.sql.dml import UpdateBase
+
+log = logging.getLogger(__name__)
+
+CHAVE_ENGINE_REPLICA = "engine_replica"
+CHAVE_PAUSA_REPLICA = "replica_pausada_ate"
+
+_lock_replica = threading.Lock()
+
+
+class QueuePoolMedido(QueuePool):
+    """``QueuePool`` que registra a espera para obter uma conexão."""
+
+    def __init__(self, creator, limiar_espera_ms: float = 100.0, **kw: Any) -> None:
+        super().__init__(creator, **kw)
+        self.limiar_espera_ms = limiar_espera_ms
+        self.esperas_lentas = 0
+        self.espera_maxima_ms = 0.0
+
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            espera_ms = (time.perf_counter() - inicio) * 1000
+            if espera_ms > self.espera_maxima_ms:
+                self.espera_maxima_ms = espera_ms
+            if espera_ms >= self.limiar_espera_ms:
+                self.esperas_lentas += 1
+                log.warning(
+                    "Espera de %.0f ms por conexão do pool (%s)",
+                    espera_ms,
+                    self.status(),
+                )
+
+    def recreate(self):
+        # ``recreate`` (chamado após ``dispose``) não repassa argumentos extras.
+        novo = super().recreate()
+        novo.limiar_espera_ms = self.limiar_espera_ms
+        return novo
+
+
+def montar_engine_options(uri: str, config: Mapping[str, Any]) -> dict[str, Any]:
+    backend = make_url(uri).get_backend_name()
+    opcoes: dict[str, Any] = {
+        "pool_pre_ping": bool(config.get("DB_POOL_PRE_PING", True)),
+    }
+
+    if backend != "sqlite":
+        opcoes.update(
+            poolclass=QueuePoolMedido,
+            pool_size=int(config.get("DB_POOL_SIZE", 5)),
+            max_overflow=int(config.get("DB_MAX_OVERFLOW", 10)),
+            pool_timeout=float(config.get("DB_POOL_TIMEOUT", 10)),
+            pool_recycle=int(config.get("DB_POOL_RECYCLE", 1800)),
+            pool_use_lifo=True,
+            limiar_espera_ms=float(config.get("DB_POOL_ESPERA_LOG_MS", 100)),
+        )
+
+    if backend == "postgresql":
+        worker = bool(config.get("WORKER_PROCESS"))
+        nome = config.get("DB_APPLICATION_NAME") or "conecta-senai"
+        timeout = int(
+            config.get("DB_WORKER_STATEMENT_TIMEOUT_MS", 0)
+            if worker
+            else config.get("DB_STATEMENT_TIMEOUT_MS", 0)
+        )
+        connect_args: dict[str, Any] = {
+            "application_name": f"{nome}-worker" if worker else nome,
+            "connect_timeout": int(config.get("DB_CONNECT_TIMEOUT", 5)),
+        }
+        if timeout > 0:
+            connect_args["options"] = f"-c statement_timeout={timeout}"
+        opcoes["connect_args"] = connect_args
+
+    opcoes.update(config.get("SQLALCHEMY_ENGINE_OPTIONS") or {})
+    return opcoes
+
+
+def metricas_pool(engine) -> dict[str, Any]:
+    pool = engine.pool
+    metricas: dict[str, Any] = {"classe": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        metricas.update(
+            tamanho=pool.size(),
+            em_uso=pool.checkedout(),
+            livres=pool.checkedin(),
+            overflow=pool.overflow(),
+        )
+    if isinstance(pool, QueuePoolMedido):
+        metricas.update(
+            esperas_lentas=pool.esperas_lentas,
+            espera_maxima_ms=round(pool.espera_maxima_ms, 1),
+        )
+    return metricas
+
+
+class SessaoRoteada(Session):
+    """Sessão que envia leituras à réplica enquanto ``usar_replica`` estiver ativo.
+
+    Escritas (``flush`` e comandos DML) continuam indo para o banco principal.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (
+            bind is None
+            and has_app_context()
+            and g.get("_usar_replica")
+            and not self._flushing
+            and not isinstance(clause, UpdateBase)
+        ):
+            replica = engine_replica()
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def engine_replica():
+    uri = current_app.config.get("SQLALCHEMY_REPLICA_URI")
+    if not uri:
+        return None
+    engine = current_app.extensions.get(CHAVE_ENGINE_REPLICA)
+    if engine is None:
+        with _lock_replica:
+            engine = current_app.extensions.get(CHAVE_ENGINE_REPLICA)
+            if engine is None:
+                engine = create_engine(
+                    uri, **montar_engine_options(uri, current_app.config)
+                )
+                current_app.extensions[CHAVE_ENGINE_REPLICA] = engine
+    return engine
+
+
+def replica_disponivel() -> bool:
+    if not current_app.config.get("SQLALCHEMY_REPLICA_URI"):
+        return False
+    return time.monotonic() >= current_app.extensions.get(CHAVE_PAUSA_REPLICA, 0.0)
+
+
+def usar_replica(view):
+    """Executa uma view somente leitura na réplica, se configurada.
+
+    Se a réplica falhar, a view é repetida no banco principal e a réplica
+    fica em pausa por ``DB_REPLICA_PAUSA_SEGUNDOS``.
+    """
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not replica_disponivel():
+            return view(*args, **kwargs)
+
+        g._usar_replica = True
+        try:
+            return view(*args, **kwargs)
+        except OperationalError as exc:
+            log.warning("Réplica indisponível, usando o banco principal: %s", exc)
+            pausa = float(current_app.config.get("DB_REPLICA_PAUSA_SEGUNDOS", 30))
+            current_app.extensions[CHAVE_PAUSA_REPLICA] = time.monotonic() + pausa
+            current_app.extensions["sqlalchemy"].session.rollback()
+            g._usar_replica = False
+            return view(*args, **kwargs)
+        finally:
+            g._usar_replica = False
+
+    return wrapper
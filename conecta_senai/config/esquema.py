@@ -0,0 +1,140 @@
+"""Registro das verificações de esquema executadas na inicialização.
+
+Módulos que criam tabelas ou colunas sob demanda registram aqui o que
+precisam com ``registrar_verificacao``. ``verificar_esquema`` roda as
+verificações pendentes uma vez por processo (em ``create_app`` ou com
+``flask verificar_esquema``) e guarda o resultado; ``garantir_esquema``,
+chamado pelas rotas, só consulta esse resultado em memória.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Callable, Iterable, NamedTuple
+
+import click
+from flask import current_app
+from sqlalchemy import inspect
+from sqlalchemy.exc import SQLAlchemyError
+
+from conecta_senai.models import db
+
+log = logging.getLogger(__name__)
+
+OK = "ok"
+INTERVALO_NOVA_TENTATIVA_SEGUNDOS = 30.0
+
+
+class Verificacao(NamedTuple):
+    nome: str
+    modelos: tuple
+    ajuste: Callable[[], object] | None
+
+
+class EstadoEsquema:
+    def __init__(self) -> None:
+        self.resultados: dict[str, str] = {}
+        self.tabelas: set[str] = set()
+        self.nova_tentativa = 0.0
+        self.lock = threading.RLock()
+
+    def pendente(self) -> bool:
+        if len(self.resultados) < len(_registro):
+            return True
+        return (
+            any(resultado != OK for resultado in self.resultados.values())
+            and time.monotonic() >= self.nova_tentativa
+        )
+
+
+_registro: dict[str, Verificacao] = {}
+
+
+def registrar_verificacao(nome: str, *modelos, ajuste=None) -> None:
+    """Registra as tabelas de ``modelos`` e um ajuste opcional (colunas, etc.).
+
+    O ajuste é chamado sem argumentos depois que as tabelas existem; se
+    retornar ``False`` a verificação fica marcada como indisponível.
+    """
+    _registro[nome] = Verificacao(nome, tuple(modelos), ajuste)
+
+
+def _estado() -> EstadoEsquema:
+    estado = current_app.extensions.get("esquema")
+    if estado is None:
+        estado = current_app.extensions.setdefault("esquema", EstadoEsquema())
+    return estado
+
+
+def _criar_tabelas(modelos: Iterable, estado: EstadoEsquema) -> None:
+    faltantes = [m for m in modelos if m.__tablename__ not in estado.tabelas]
+    if not faltantes:
+        return
+    inspector = inspect(db.engine)
+    for modelo in faltantes:
+        if not inspector.has_table(modelo.__tablename__):
+            log.info("Criando tabela ausente: %s", modelo.__tablename__)
+            modelo.__table__.create(db.engine, checkfirst=True)
+        estado.tabelas.add(modelo.__tablename__)
+
+
+def verificar_esquema(forcar: bool = False) -> dict[str, str]:
+    """Executa as verificações pendentes (ou todas, com ``forcar``)."""
+    estado = _estado()
+    with estado.lock:
+        for nome, verificacao in list(_registro.items()):
+            if not forcar and estado.resultados.get(nome) == OK:
+                continue
+            if forcar:
+                estado.tabelas.difference_update(
+                    modelo.__tablename__ for modelo in verificacao.modelos
+                )
+            try:
+                _criar_tabelas(verificacao.modelos, estado)
+                disponivel = verificacao.ajuste() if verificacao.ajuste else True
+            except SQLAlchemyError as exc:
+                log.warning("Verificação de esquema '%s' falhou: %s", nome, exc)
+                estado.resultados[nome] = f"erro: {exc.__class__.__name__}"
+                continue
+            estado.resultados[nome] = OK if disponivel is not False else "indisponível"
+        estado.nova_tentativa = time.monotonic() + INTERVALO_NOVA_TENTATIVA_SEGUNDOS
+        return dict(estado.resultados)
+
+
+def garantir_esquema(modelos: Iterable = ()) -> None:
+    """Garante o esquema verificado; após a primeira execução é só consulta em memória."""
+    estado = _estado()
+    if estado.pendente():
+        verificar_esquema()
+    modelos = tuple(modelos)
+    if modelos and not estado.tabelas.issuperset(m.__tablename__ for m in modelos):
+        with estado.lock:
+            _criar_tabelas(modelos, estado)
+
+
+def esquema_disponivel(nome: str) -> bool:
+    return _estado().resultados.get(nome) == OK
+
+
+def verificar_esquema_na_inicializacao(app) -> None:
+    """Roda as verificações no boot do servidor.
+
+    Sob a CLI do Flask (ex.: ``flask db upgrade``) nada é feito, para não criar
+    tabelas antes das migrações; nesses processos a verificação fica para o
+    primeiro uso ou para ``flask verificar_esquema``.
+    """
+    if not app.config.get("ESQUEMA_VERIFICAR_NA_INICIALIZACAO", True):
+        return
+    if click.get_current_context(silent=True) is not None:
+        return
+    with app.app_context():
+        try:
+            resultados = verificar_esquema()
+        except Exception:
+            log.exception("Falha ao verificar o esquema do banco na inicialização")
+            return
+    falhas = {nome: r for nome, r in resultados.items() if r != OK}
+    if falhas:
+        log.warning("Verificações de esquema pendentes: %s", falhas)
@@ -1,7 +1,17 @@
 import logging
+import os
 
 from .base import BaseConfig
 
 
 class ProdConfig(BaseConfig):
     LOG_LEVEL = logging.INFO
+
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "5"))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "900"))
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
+    DB_WORKER_STATEMENT_TIMEOUT_MS = int(
+        os.getenv("DB_WORKER_STATEMENT_TIMEOUT_MS", "600000")
+    )
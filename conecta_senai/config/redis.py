@@ -1,5 +1,26 @@
+"""Cliente Redis compartilhado pela aplicação.
+
+Todas as conexões saem de um único pool (``GerenciadorRedis``), usado também
+pelo Flask-Limiter. Um disjuntor acompanha as falhas de conexão: após
+``REDIS_DISJUNTOR_FALHAS`` erros seguidos ``redis_conn`` passa a ser o
+``DummyRedis`` e uma thread tenta reconectar em segundo plano, restaurando o
+cliente real assim que o Redis volta a responder. ``app.redis_conn`` aponta
+para ``ClienteRedisAtual``, que sempre delega ao ``redis_conn`` vigente.
+"""
+
+import logging
 import os
-from redis import Redis
+import threading
+import time
+from urllib.parse import urlparse
+
+from redis import BlockingConnectionPool, ConnectionPool, Redis
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
+
+log = logging.getLogger(__name__)
+
+ERROS_CONEXAO = (RedisConnectionError, RedisTimeoutError)
 
 
 class DummyRedis:
@@ -13,29 +34,214 @@ class DummyRedis:
         return None
 
 
+class ClienteRedisAtual:
+    """Encaminha cada acesso ao ``redis_conn`` do momento.
+
+    O disjuntor troca o global do módulo; quem guardou esta referência (ex.:
+    ``app.redis_conn``) acompanha a troca sem precisar reler o módulo.
+    """
+
+    def __getattr__(self, nome):
+        return getattr(redis_conn, nome)
+
+
+class RedisMonitorado(Redis):
+    """``Redis`` que informa ao disjuntor o resultado de cada comando."""
+
+    gerenciador = None
+
+    def execute_command(self, *args, **options):
+        try:
+            resultado = super().execute_command(*args, **options)
+        except ERROS_CONEXAO as exc:
+            if self.gerenciador is not None:
+                self.gerenciador.registrar_falha(exc)
+            raise
+        if self.gerenciador is not None and self.gerenciador.falhas:
+            self.gerenciador.falhas = 0
+        return resultado
+
+
+def _config(app, chave, padrao):
+    if app is not None and chave in app.config:
+        return app.config[chave]
+    return os.getenv(chave, padrao)
+
+
+class GerenciadorRedis:
+    def __init__(
+        self,
+        url,
+        max_conexoes=50,
+        timeout_pool=2.0,
+        socket_timeout=2.0,
+        connect_timeout=2.0,
+        health_check=30,
+        limite_falhas=3,
+        intervalo_reconexao=5.0,
+    ):
+        self.url = url
+        self.pool = BlockingConnectionPool.from_url(
+            url,
+            max_connections=max_conexoes,
+            timeout=timeout_pool,
+            socket_timeout=socket_timeout,
+            socket_connect_timeout=connect_timeout,
+            health_check_interval=health_check,
+            retry_on_timeout=True,
+        )
+        self.cliente = RedisMonitorado(connection_pool=self.pool)
+        self.cliente.gerenciador = self
+        self.limite_falhas = limite_falhas
+        self.intervalo_reconexao = intervalo_reconexao
+        self.falhas = 0
+        self.aberto_desde = None
+        self.aberturas = 0
+        self._lock = threading.Lock()
+        self._parar = threading.Event()
+        self._reconexao = None
+
+    @classmethod
+    def from_app(cls, app=None):
+        url = _config(app, "REDIS_URL", None) or os.getenv(
+            "REDIS_URL", "redis://localhost:6379/0"
+        )
+        return cls(
+            url,
+            max_conexoes=int(_config(app, "REDIS_POOL_MAX_CONEXOES", 50)),
+            timeout_pool=float(_config(app, "REDIS_POOL_TIMEOUT_SEGUNDOS", 2)),
+            socket_timeout=float(_config(app, "REDIS_SOCKET_TIMEOUT_SEGUNDOS", 2)),
+            connect_timeout=float(_config(app, "REDIS_CONNECT_TIMEOUT_SEGUNDOS", 2)),
+            health_check=int(_config(app, "REDIS_HEALTH_CHECK_SEGUNDOS", 30)),
+            limite_falhas=int(_config(app, "REDIS_DISJUNTOR_FALHAS", 3)),
+            intervalo_reconexao=float(_config(app, "REDIS_RECONEXAO_SEGUNDOS", 5)),
+        )
+
+    @property
+    def aberto(self):
+        return self.aberto_desde is not None
+
+    def conectar(self):
+        try:
+            self.cliente.ping()
+        except Exception as exc:
+            log.warning("Redis indisponível: %s", exc)
+            self._abrir()
+            return DummyRedis()
+        return self.cliente
+
+    def registrar_falha(self, exc):
+        if self.aberto:
+            return
+        self.falhas += 1
+        if self.falhas >= self.limite_falhas:
+            log.warning(
+                "Redis falhou %d vezes seguidas (%s); usando fallback local.",
+                self.falhas,
+                exc,
+            )
+            self._abrir()
+
+    def _abrir(self):
+        global redis_conn
+        with self._lock:
+            if self.aberto:
+                return
+            self.aberto_desde = time.time()
+            self.aberturas += 1
+            if redis_conn is self.cliente:
+                redis_conn = DummyRedis()
+            self._reconexao = threading.Thread(
+                target=self._reconectar, name="redis-reconexao", daemon=True
+            )
+            self._reconexao.start()
+
+    def _fechar(self):
+        global redis_conn
+        with self._lock:
+            self.falhas = 0
+            self.aberto_desde = None
+            if gerenciador is self:
+                redis_conn = self.cliente
+        log.info("Conexão com o Redis restabelecida.")
+
+    def _reconectar(self):
+        while not self._parar.wait(self.intervalo_reconexao):
+            try:
+                self.cliente.ping()
+            except Exception:
+                continue
+            self._fechar()
+            return
+
+    def metricas(self):
+        pool = self.pool
+        livres = pool.pool.qsize()
+        return {
+            "estado": "aberto" if self.aberto else "fechado",
+            "aberto_desde": self.aberto_desde,
+            "aberturas": self.aberturas,
+            "falhas_consecutivas": self.falhas,
+            "pool": {
+                "max_conexoes": pool.max_connections,
+                "criadas": len(pool._connections),
+                "em_uso": pool.max_connections - livres,
+                "livres": livres,
+            },
+        }
+
+    def encerrar(self):
+        self._parar.set()
+        self.pool.disconnect()
+
+
+def _destino_redis(url):
+    pool = ConnectionPool.from_url(url)
+    parametros = dict(pool.connection_kwargs)
+    parametros.setdefault("port", 6379)
+    parametros.setdefault("db", 0)
+    return pool.connection_class, parametros
+
+
+def _compartilhar_pool_com_limiter(app, gerenciador):
+    storage_uri = app.config.get("RATELIMIT_STORAGE_URI") or ""
+    if urlparse(storage_uri).scheme not in ("redis", "rediss"):
+        return
+    if _destino_redis(storage_uri) != _destino_redis(gerenciador.url):
+        return
+    opcoes = dict(app.config.get("RATELIMIT_STORAGE_OPTIONS") or {})
+    opcoes.setdefault("connection_pool", gerenciador.pool)
+    app.config["RATELIMIT_STORAGE_OPTIONS"] = opcoes
+
+
 def init_redis(app=None):
-    url = (
-        app.config.get("REDIS_URL")
-        if app is not None
-        else os.getenv("REDIS_URL", "redis://localhost:6379/0")
-    )
+    global gerenciador, redis_conn
+
+    if gerenciador is not None:
+        gerenciador.encerrar()
+        gerenciador = None
 
     if os.getenv("DISABLE_REDIS") == "1":
         client = DummyRedis()
     else:
-        try:
-            client = Redis.from_url(url)
-            client.ping()
-        except Exception as e:
-            if app is not None:
-                app.logger.warning("Redis indisponível: %s", str(e))
-            client = DummyRedis()
+        gerenciador = GerenciadorRedis.from_app(app)
+        client = gerenciador.conectar()
+        if app is not None:
+            _compartilhar_pool_com_limiter(app, gerenciador)
 
     if app is not None:
-        app.redis_conn = client
-    global redis_conn
+        app.redis_conn = cliente_atual
+        app.extensions["redis"] = gerenciador
     redis_conn = client
     return client
 
 
+def metricas_redis():
+    if gerenciador is None:
+        return {"estado": "desabilitado"}
+    return gerenciador.metricas()
+
+
+gerenciador = None
 redis_conn = DummyRedis()
+cliente_atual = ClienteRedisAtual()
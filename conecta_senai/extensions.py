@@ -5,8 +5,9 @@ from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 import os
 
+from conecta_senai.config.database import SessaoRoteada
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={"class_": SessaoRoteada})
 migrate = Migrate()
 jwt = JWTManager()
 
@@ -10,6 +10,10 @@ from .sala import Sala
 from .agendamento import Agendamento, Notificacao
 from .instrutor import Instrutor
 from .ocupacao import Ocupacao
+from .ocupacao_resumo import OcupacaoResumoDiario
+from .export_job import ExportJob
+from .email_outbox import EmailOutbox
+from .job_execucao import JobExecucao
 from .treinamento import (
     LocalRealizacao,
     Treinamento,
@@ -45,6 +49,10 @@ __all__ = [
     "Notificacao",
     "Instrutor",
     "Ocupacao",
+    "OcupacaoResumoDiario",
+    "ExportJob",
+    "EmailOutbox",
+    "JobExecucao",
     "LocalRealizacao",
     "Treinamento",
     "TurmaTreinamento",
@@ -1,4 +1,7 @@
 from datetime import datetime
+
+from sqlalchemy import text
+
 from conecta_senai.models import db
 
 
@@ -48,6 +51,21 @@ class Agendamento(db.Model):
 
 class Notificacao(db.Model):
     __tablename__ = "notificacoes"
+    __table_args__ = (
+        db.Index(
+            "uq_notificacoes_lembrete_pendente",
+            "agendamento_id",
+            unique=True,
+            postgresql_where=text("lida = false AND agendamento_id IS NOT NULL"),
+            sqlite_where=text("lida = false AND agendamento_id IS NOT NULL"),
+        ),
+        db.Index(
+            "ix_notificacoes_usuario_lida_data_criacao",
+            "usuario_id",
+            "lida",
+            "data_criacao",
+        ),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     usuario_id = db.Column(db.Integer, db.ForeignKey("usuarios.id"), nullable=False)
@@ -4,6 +4,11 @@ from conecta_senai.models import db
 
 class AuditLog(db.Model):
     __tablename__ = "audit_logs"
+    __table_args__ = (
+        db.Index("ix_audit_logs_timestamp_id", "timestamp", "id"),
+        db.Index("ix_audit_logs_entity_timestamp", "entity", "timestamp"),
+        db.Index("ix_audit_logs_user_id_timestamp", "user_id", "timestamp"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("usuarios.id"))
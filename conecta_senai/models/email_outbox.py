@@ -0,0 +1,77 @@
+from datetime import datetime
+
+from conecta_senai.models import db
+
+
+class EmailOutbox(db.Model):
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        db.Index(
+            "ix_email_outbox_status_proxima_tentativa",
+            "status",
+            "proxima_tentativa_em",
+        ),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    destinatarios = db.Column(db.JSON, nullable=False)
+    cc = db.Column(db.JSON)
+    bcc = db.Column(db.JSON)
+    assunto = db.Column(db.String(255), nullable=False)
+    html = db.Column(db.Text, nullable=False)
+    texto = db.Column(db.Text)
+    remetente = db.Column(db.String(255))
+    reply_to = db.Column(db.String(255))
+    headers = db.Column(db.JSON)
+    tags = db.Column(db.JSON)
+    anexos = db.Column(db.JSON)
+    referencia = db.Column(db.String(100), index=True)
+    status = db.Column(db.String(20), nullable=False, default="pendente")
+    tentativas = db.Column(db.Integer, nullable=False, default=0)
+    max_tentativas = db.Column(db.Integer, nullable=False, default=5)
+    proxima_tentativa_em = db.Column(
+        db.DateTime, nullable=False, default=datetime.utcnow
+    )
+    reservado_em = db.Column(db.DateTime)
+    provider_id = db.Column(db.String(100))
+    ultimo_erro = db.Column(db.Text)
+    criado_em = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    enviado_em = db.Column(db.DateTime)
+
+    def parametros_envio(self):
+        return {
+            "to": self.destinatarios,
+            "subject": self.assunto,
+            "html": self.html,
+            "text": self.texto,
+            "cc": self.cc,
+            "bcc": self.bcc,
+            "reply_to": self.reply_to,
+            "headers": self.headers,
+            "tags": self.tags,
+            "attachments": self.anexos,
+            "from_": self.remetente,
+        }
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "destinatarios": self.destinatarios,
+            "assunto": self.assunto,
+            "referencia": self.referencia,
+            "status": self.status,
+            "tentativas": self.tentativas,
+            "max_tentativas": self.max_tentativas,
+            "proxima_tentativa_em": (
+                self.proxima_tentativa_em.isoformat()
+                if self.proxima_tentativa_em
+                else None
+            ),
+            "provider_id": self.provider_id,
+            "ultimo_erro": self.ultimo_erro,
+            "criado_em": self.criado_em.isoformat() if self.criado_em else None,
+            "enviado_em": self.enviado_em.isoformat() if self.enviado_em else None,
+        }
+
+    def __repr__(self):
+        return f"<EmailOutbox {self.id} {self.status}>"
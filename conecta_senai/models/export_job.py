@@ -0,0 +1,50 @@
+from datetime import datetime
+
+from conecta_senai.models import db
+
+
+class ExportJob(db.Model):
+    __tablename__ = "export_jobs"
+    __table_args__ = (
+        db.Index("ix_export_jobs_status_criado_em", "status", "criado_em"),
+        db.Index("ix_export_jobs_expira_em", "expira_em"),
+    )
+
+    id = db.Column(db.String(32), primary_key=True)
+    tipo = db.Column(db.String(50), nullable=False)
+    formato = db.Column(db.String(10), nullable=False)
+    parametros = db.Column(db.JSON, nullable=False, default=dict)
+    status = db.Column(db.String(20), nullable=False, default="pendente")
+    usuario_id = db.Column(db.Integer, db.ForeignKey("usuarios.id"), nullable=True)
+    nome_arquivo = db.Column(db.String(255))
+    mimetype = db.Column(db.String(120))
+    caminho_arquivo = db.Column(db.String(500))
+    tamanho_bytes = db.Column(db.Integer)
+    erro = db.Column(db.Text)
+    tentativas = db.Column(db.Integer, nullable=False, default=0)
+    criado_em = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    iniciado_em = db.Column(db.DateTime)
+    heartbeat_em = db.Column(db.DateTime)
+    concluido_em = db.Column(db.DateTime)
+    expira_em = db.Column(db.DateTime)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "tipo": self.tipo,
+            "formato": self.formato,
+            "parametros": self.parametros or {},
+            "status": self.status,
+            "nome_arquivo": self.nome_arquivo,
+            "tamanho_bytes": self.tamanho_bytes,
+            "erro": self.erro,
+            "criado_em": self.criado_em.isoformat() if self.criado_em else None,
+            "iniciado_em": self.iniciado_em.isoformat() if self.iniciado_em else None,
+            "concluido_em": (
+                self.concluido_em.isoformat() if self.concluido_em else None
+            ),
+            "expira_em": self.expira_em.isoformat() if self.expira_em else None,
+        }
+
+    def __repr__(self):
+        return f"<ExportJob {self.id} {self.tipo}/{self.formato} {self.status}>"
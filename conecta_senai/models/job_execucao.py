@@ -0,0 +1,42 @@
+from datetime import datetime
+
+from conecta_senai.models import db
+
+
+class JobExecucao(db.Model):
+    __tablename__ = "job_execucoes"
+    __table_args__ = (
+        db.Index("ix_job_execucoes_job_iniciado_em", "job_id", "iniciado_em"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.String(100), nullable=False)
+    instancia = db.Column(db.String(120), nullable=False)
+    backend_lock = db.Column(db.String(20))
+    status = db.Column(db.String(20), nullable=False, default="executando")
+    iniciado_em = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    finalizado_em = db.Column(db.DateTime)
+    duracao_ms = db.Column(db.Integer)
+    linhas_afetadas = db.Column(db.Integer)
+    resultado = db.Column(db.JSON)
+    erro = db.Column(db.Text)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "job_id": self.job_id,
+            "instancia": self.instancia,
+            "backend_lock": self.backend_lock,
+            "status": self.status,
+            "iniciado_em": self.iniciado_em.isoformat() if self.iniciado_em else None,
+            "finalizado_em": (
+                self.finalizado_em.isoformat() if self.finalizado_em else None
+            ),
+            "duracao_ms": self.duracao_ms,
+            "linhas_afetadas": self.linhas_afetadas,
+            "resultado": self.resultado,
+            "erro": self.erro,
+        }
+
+    def __repr__(self):
+        return f"<JobExecucao {self.job_id} {self.status}>"
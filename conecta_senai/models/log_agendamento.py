@@ -4,6 +4,10 @@ from conecta_senai.models import db
 
 class LogAgendamento(db.Model):
     __tablename__ = "logs_agendamentos"
+    __table_args__ = (
+        db.Index("ix_logs_agendamentos_timestamp_id", "timestamp", "id"),
+        db.Index("ix_logs_agendamentos_tipo_acao_timestamp", "tipo_acao", "timestamp"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     usuario = db.Column(db.String(100))
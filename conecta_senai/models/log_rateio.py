@@ -4,6 +4,12 @@ from conecta_senai.models import db
 
 class LogLancamentoRateio(db.Model):
     __tablename__ = "log_lancamentos_rateio_instrutor"
+    __table_args__ = (
+        db.Index("ix_log_lancamentos_rateio_instrutor_timestamp_id", "timestamp", "id"),
+        db.Index(
+            "ix_log_lancamentos_rateio_instrutor_acao_timestamp", "acao", "timestamp"
+        ),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
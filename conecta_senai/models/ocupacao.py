@@ -10,9 +10,31 @@ TURNOS_PADRAO = {
     "Noite": (time.fromisoformat("18:30"), time.fromisoformat("22:30")),
 }
 
+STATUS_ATIVOS = ("confirmado", "pendente")
+_FILTRO_STATUS_ATIVOS = "status IN ('confirmado', 'pendente')"
+
 
 class Ocupacao(SerializerMixin, db.Model):
     __tablename__ = "ocupacoes"
+    __table_args__ = (
+        db.Index(
+            "ix_ocupacoes_sala_data_horario_ativas",
+            "sala_id",
+            "data",
+            "horario_inicio",
+            "horario_fim",
+            postgresql_where=db.text(_FILTRO_STATUS_ATIVOS),
+            sqlite_where=db.text(_FILTRO_STATUS_ATIVOS),
+        ),
+        db.Index(
+            "ix_ocupacoes_instrutor_data_ativas",
+            "instrutor_id",
+            "data",
+            postgresql_where=db.text(_FILTRO_STATUS_ATIVOS),
+            sqlite_where=db.text(_FILTRO_STATUS_ATIVOS),
+        ),
+        db.Index("ix_ocupacoes_data_status", "data", "status"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     sala_id = db.Column(db.Integer, db.ForeignKey("salas.id"), nullable=False)
@@ -105,12 +127,8 @@ class Ocupacao(SerializerMixin, db.Model):
             return False
 
         return (
-            (self.horario_inicio <= outra_ocupacao.horario_inicio < self.horario_fim)
-            or (self.horario_inicio < outra_ocupacao.horario_fim <= self.horario_fim)
-            or (
-                outra_ocupacao.horario_inicio <= self.horario_inicio
-                and outra_ocupacao.horario_fim >= self.horario_fim
-            )
+            self.horario_inicio < outra_ocupacao.horario_fim
+            and self.horario_fim > outra_ocupacao.horario_inicio
         )
 
     def pode_ser_editada_por(self, usuario):
@@ -164,6 +182,14 @@ class Ocupacao(SerializerMixin, db.Model):
 
         return result
 
+    @staticmethod
+    def filtro_sobreposicao(horario_inicio, horario_fim):
+        """Predicado de sobreposição de intervalos no formato indexável."""
+        return db.and_(
+            Ocupacao.horario_inicio < horario_fim,
+            Ocupacao.horario_fim > horario_inicio,
+        )
+
     @staticmethod
     def buscar_conflitos(
         sala_id,
@@ -177,21 +203,8 @@ class Ocupacao(SerializerMixin, db.Model):
         query = Ocupacao.query.filter(
             Ocupacao.sala_id == sala_id,
             Ocupacao.data == data,
-            Ocupacao.status.in_(["confirmado", "pendente"]),
-            db.or_(
-                db.and_(
-                    Ocupacao.horario_inicio <= horario_inicio,
-                    Ocupacao.horario_fim > horario_inicio,
-                ),
-                db.and_(
-                    Ocupacao.horario_inicio < horario_fim,
-                    Ocupacao.horario_fim >= horario_fim,
-                ),
-                db.and_(
-                    Ocupacao.horario_inicio >= horario_inicio,
-                    Ocupacao.horario_fim <= horario_fim,
-                ),
-            ),
+            Ocupacao.status.in_(STATUS_ATIVOS),
+            Ocupacao.filtro_sobreposicao(horario_inicio, horario_fim),
         )
 
         if ocupacao_id:
@@ -207,7 +220,7 @@ class Ocupacao(SerializerMixin, db.Model):
         query = Ocupacao.query.filter(
             Ocupacao.data >= data_inicio,
             Ocupacao.data <= data_fim,
-            Ocupacao.status.in_(["confirmado", "pendente"]),
+            Ocupacao.status.in_(STATUS_ATIVOS),
         )
 
         if sala_id:
@@ -0,0 +1,37 @@
+from conecta_senai.models import db
+
+TURNO_OUTRO = "Outro"
+
+
+class OcupacaoResumoDiario(db.Model):
+    """Quantidade de ocupações por sala, dia, turno, status e tipo.
+
+    Mantida pelas rotas de ocupação e reconstruída com
+    ``flask reconstruir_resumo_ocupacoes``.
+    """
+
+    __tablename__ = "ocupacoes_resumo_diario"
+    __table_args__ = (
+        db.UniqueConstraint(
+            "data",
+            "sala_id",
+            "turno",
+            "status",
+            "tipo_ocupacao",
+            name="uq_ocupacoes_resumo_diario_chave",
+        ),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    data = db.Column(db.Date, nullable=False)
+    sala_id = db.Column(db.Integer, nullable=False, index=True)
+    turno = db.Column(db.String(10), nullable=False)
+    status = db.Column(db.String(20), nullable=False)
+    tipo_ocupacao = db.Column(db.String(50), nullable=False, default="")
+    quantidade = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return (
+            f"<OcupacaoResumoDiario {self.data} sala={self.sala_id} "
+            f"{self.turno} {self.status}: {self.quantidade}>"
+        )
@@ -81,26 +81,13 @@ class Sala(db.Model):
         if self.status != "ativa":
             return False
 
-        from conecta_senai.models.ocupacao import Ocupacao
+        from conecta_senai.models.ocupacao import STATUS_ATIVOS, Ocupacao
 
         query = Ocupacao.query.filter(
             Ocupacao.sala_id == self.id,
             Ocupacao.data == data,
-            Ocupacao.status.in_(["confirmado", "pendente"]),
-            db.or_(
-                db.and_(
-                    Ocupacao.horario_inicio <= horario_inicio,
-                    Ocupacao.horario_fim > horario_inicio,
-                ),
-                db.and_(
-                    Ocupacao.horario_inicio < horario_fim,
-                    Ocupacao.horario_fim >= horario_fim,
-                ),
-                db.and_(
-                    Ocupacao.horario_inicio >= horario_inicio,
-                    Ocupacao.horario_fim <= horario_fim,
-                ),
-            ),
+            Ocupacao.status.in_(STATUS_ATIVOS),
+            Ocupacao.filtro_sobreposicao(horario_inicio, horario_fim),
         )
 
         if ocupacao_id:
@@ -109,8 +96,7 @@ class Sala(db.Model):
         if grupo_ocupacao_id:
             query = query.filter(Ocupacao.grupo_ocupacao_id != grupo_ocupacao_id)
 
-        conflitos = query.all()
-        return len(conflitos) == 0
+        return query.first() is None
 
     def to_dict(self):
         return {
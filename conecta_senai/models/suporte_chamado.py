@@ -10,6 +10,15 @@ def _get_brasilia_time():
 
 class SuporteChamado(db.Model):
     __tablename__ = "suporte_chamados"
+    __table_args__ = (
+        db.Index("ix_suporte_chamados_status_created_at", "status", "created_at"),
+        db.Index("ix_suporte_chamados_area_created_at", "area", "created_at"),
+        db.Index(
+            "ix_suporte_chamados_tipo_equipamento_id_created_at",
+            "tipo_equipamento_id",
+            "created_at",
+        ),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("usuarios.id"), nullable=True)
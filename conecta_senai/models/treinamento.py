@@ -78,6 +78,9 @@ class TurmaTreinamento(db.Model):
     teoria_online = db.Column(
         db.Boolean, nullable=False, server_default=text("FALSE"), default=False
     )
+    data_atualizacao = db.Column(
+        db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
 
     treinamento = db.relationship("Treinamento", back_populates="turmas")
     instrutor = db.relationship("Instrutor")
@@ -104,6 +107,14 @@ class TurmaTreinamento(db.Model):
 
 class InscricaoTreinamento(db.Model):
     __tablename__ = "inscricoes_treinamento"
+    __table_args__ = (
+        db.Index(
+            "ix_inscricoes_treinamento_pendentes_convocacao",
+            "id",
+            postgresql_where=text("convocado_em IS NULL"),
+            sqlite_where=text("convocado_em IS NULL"),
+        ),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     usuario_id = db.Column(db.Integer, db.ForeignKey("usuarios.id"), nullable=True)
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 from sqlalchemy import func, bindparam
 
 from conecta_senai.models import db
@@ -31,11 +31,14 @@ class LogRateioRepository:
         if tipo:
             query = query.filter(LogLancamentoRateio.acao == tipo)
         if data_acao:
-            dia = datetime.strptime(data_acao, "%Y-%m-%d").date()
-            query = query.filter(func.date(LogLancamentoRateio.timestamp) == dia)
-        return query.order_by(LogLancamentoRateio.timestamp.desc()).paginate(
-            page=page, per_page=min(per_page, 100), error_out=False
-        )
+            dia = datetime.strptime(data_acao, "%Y-%m-%d")
+            query = query.filter(
+                LogLancamentoRateio.timestamp >= dia,
+                LogLancamentoRateio.timestamp < dia + timedelta(days=1),
+            )
+        return query.order_by(
+            LogLancamentoRateio.timestamp.desc(), LogLancamentoRateio.id.desc()
+        ).paginate(page=page, per_page=min(per_page, 100), error_out=False)
 
     @staticmethod
     def all_ordered():
@@ -6,10 +6,10 @@ from typing import Optional
 from sqlalchemy import inspect, text
 from sqlalchemy.exc import SQLAlchemyError
 
+from conecta_senai.config.esquema import garantir_esquema, registrar_verificacao
 from conecta_senai.models import db
 from conecta_senai.models.noticia import Noticia
 
-
 log = logging.getLogger(__name__)
 
 
@@ -18,8 +18,10 @@ class NoticiaRepository:
 
     @classmethod
     def ensure_table_exists(cls, force_refresh: bool = False) -> bool:
-        if cls._table_checked and not force_refresh:
-            return True
+        if not force_refresh:
+            garantir_esquema()
+            if cls._table_checked:
+                return True
 
         engine = db.engine
         inspector = inspect(engine)
@@ -141,3 +143,9 @@ class NoticiaRepository:
         except SQLAlchemyError:
             db.session.rollback()
             raise
+
+
+registrar_verificacao(
+    "noticias",
+    ajuste=lambda: NoticiaRepository.ensure_table_exists(force_refresh=True),
+)
@@ -0,0 +1,20 @@
+from flask import Blueprint, jsonify
+
+from conecta_senai.auth import admin_required
+from conecta_senai.config.database import metricas_pool
+from conecta_senai.config.redis import metricas_redis
+from conecta_senai.models import db
+
+diagnostico_bp = Blueprint("diagnostico", __name__)
+
+
+@diagnostico_bp.route("/diagnostico/redis", methods=["GET"])
+@admin_required
+def diagnostico_redis():
+    return jsonify(metricas_redis())
+
+
+@diagnostico_bp.route("/diagnostico/banco", methods=["GET"])
+@admin_required
+def diagnostico_banco():
+    return jsonify(metricas_pool(db.engine))
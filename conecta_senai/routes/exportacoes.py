@@ -0,0 +1,88 @@
+from datetime import datetime
+from pathlib import Path
+
+from flask import Blueprint, g, jsonify, request, send_file
+from sqlalchemy.exc import SQLAlchemyError
+
+from conecta_senai.auth import login_required, verificar_admin
+from conecta_senai.models import db
+from conecta_senai.models.export_job import ExportJob
+from conecta_senai.services.export_job_service import (
+    EXPORTADORES,
+    enfileirar_exportacao,
+)
+from conecta_senai.utils.error_handler import handle_internal_error
+
+exportacoes_bp = Blueprint("exportacoes", __name__)
+
+
+def _obter_job_autorizado(job_id):
+    job = db.session.get(ExportJob, job_id)
+    if not job:
+        return None, (jsonify({"erro": "Exportação não encontrada"}), 404)
+    user = g.current_user
+    if job.usuario_id != user.id and not verificar_admin(user):
+        return None, (jsonify({"erro": "Permissão negada"}), 403)
+    return job, None
+
+
+@exportacoes_bp.route("/exportacoes", methods=["POST"])
+@login_required
+def criar_exportacao():
+    dados = request.get_json(silent=True) or {}
+    tipo = dados.get("tipo")
+    parametros = dados.get("parametros") or {}
+
+    exportador = EXPORTADORES.get(tipo)
+    if not exportador:
+        return jsonify({"erro": "Tipo de exportação inválido"}), 400
+    if exportador.somente_admin and not verificar_admin(g.current_user):
+        return jsonify({"erro": "Permissão negada"}), 403
+    if not isinstance(parametros, dict):
+        return jsonify({"erro": "Parâmetros devem ser um objeto"}), 400
+
+    formato = dados.get("formato") or sorted(exportador.formatos)[0]
+    try:
+        job = enfileirar_exportacao(tipo, formato, parametros, g.current_user.id)
+    except ValueError as e:
+        return jsonify({"erro": str(e)}), 400
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        return handle_internal_error(e)
+
+    db.session.refresh(job)
+    resposta = jsonify(job.to_dict())
+    resposta.status_code = 202
+    resposta.headers["Location"] = f"{request.path}/{job.id}"
+    return resposta
+
+
+@exportacoes_bp.route("/exportacoes/<string:job_id>", methods=["GET"])
+@login_required
+def obter_exportacao(job_id):
+    job, erro = _obter_job_autorizado(job_id)
+    if erro:
+        return erro
+    return jsonify(job.to_dict())
+
+
+@exportacoes_bp.route("/exportacoes/<string:job_id>/download", methods=["GET"])
+@login_required
+def baixar_exportacao(job_id):
+    job, erro = _obter_job_autorizado(job_id)
+    if erro:
+        return erro
+
+    if job.status != "concluido":
+        return jsonify({"erro": "Exportação ainda não concluída", **job.to_dict()}), 409
+
+    caminho = Path(job.caminho_arquivo or "")
+    if (job.expira_em and job.expira_em < datetime.utcnow()) or not caminho.is_file():
+        return jsonify({"erro": "Arquivo de exportação expirado"}), 410
+
+    return send_file(
+        caminho,
+        mimetype=job.mimetype,
+        as_attachment=True,
+        download_name=job.nome_arquivo,
+    )
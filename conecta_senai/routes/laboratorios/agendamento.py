@@ -17,6 +17,7 @@ from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy import func, extract
 from conecta_senai.utils.error_handler import handle_internal_error
 from conecta_senai.utils.audit import log_action
+from conecta_senai.utils.paginacao import limitar_por_pagina, paginar_por_chave
 from conecta_senai.models.log_agendamento import LogAgendamento
 from conecta_senai.services.agendamento_service import (
     listar_agendamentos as listar_agendamentos_service,
@@ -30,6 +31,8 @@ from conecta_senai.services.agendamento_service import (
 
 agendamento_bp = Blueprint("agendamento", __name__)
 
+LOGS_POR_PAGINA_PADRAO = 50
+
 
 @agendamento_bp.route("/agendamentos", methods=["GET"])
 def listar_agendamentos():
@@ -491,12 +494,27 @@ def listar_logs_agenda():
         query = query.filter(LogAgendamento.tipo_acao == tipo)
     if data_acao:
         try:
-            dia = datetime.strptime(data_acao, "%Y-%m-%d").date()
-            query = query.filter(func.date(LogAgendamento.timestamp) == dia)
+            dia = datetime.strptime(data_acao, "%Y-%m-%d")
         except ValueError:
             return jsonify({"erro": "Formato de data inválido"}), 400
+        query = query.filter(
+            LogAgendamento.timestamp >= dia,
+            LogAgendamento.timestamp < dia + timedelta(days=1),
+        )
 
-    logs = query.order_by(LogAgendamento.timestamp.desc()).all()
+    per_page = limitar_por_pagina(
+        request.args.get("per_page", type=int), LOGS_POR_PAGINA_PADRAO, 200
+    )
+    try:
+        logs, proximo = paginar_por_chave(
+            query,
+            LogAgendamento.timestamp,
+            LogAgendamento.id,
+            request.args.get("cursor"),
+            per_page,
+        )
+    except ValueError as exc:
+        return jsonify({"erro": str(exc)}), 400
 
     def intervalo(horarios):
         try:
@@ -514,26 +532,30 @@ def listar_logs_agenda():
             return None
 
     return jsonify(
-        [
-            {
-                "id": l.id,
-                "usuario": l.usuario,
-                "tipo_acao": l.tipo_acao,
-                "laboratorio": l.laboratorio,
-                "turno": l.turno,
-                "data_agendamento": (
-                    l.data_agendamento.isoformat() if l.data_agendamento else None
-                ),
-                "dados_antes": l.dados_antes,
-                "dados_depois": l.dados_depois,
-                "intervalo_horarios": intervalo(
-                    (l.dados_depois or {}).get("horarios")
-                    or (l.dados_antes or {}).get("horarios")
-                ),
-                "timestamp": l.timestamp.isoformat(),
-            }
-            for l in logs
-        ]
+        {
+            "items": [
+                {
+                    "id": l.id,
+                    "usuario": l.usuario,
+                    "tipo_acao": l.tipo_acao,
+                    "laboratorio": l.laboratorio,
+                    "turno": l.turno,
+                    "data_agendamento": (
+                        l.data_agendamento.isoformat() if l.data_agendamento else None
+                    ),
+                    "dados_antes": l.dados_antes,
+                    "dados_depois": l.dados_depois,
+                    "intervalo_horarios": intervalo(
+                        (l.dados_depois or {}).get("horarios")
+                        or (l.dados_antes or {}).get("horarios")
+                    ),
+                    "timestamp": l.timestamp.isoformat(),
+                }
+                for l in logs
+            ],
+            "per_page": per_page,
+            "next_cursor": proximo,
+        }
     )
 
 
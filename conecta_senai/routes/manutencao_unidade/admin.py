@@ -9,8 +9,10 @@ from typing import Iterable
 from flask import Blueprint, jsonify, request, g, current_app, make_response
 from sqlalchemy import func
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import selectinload
 
 from conecta_senai.auth import admin_required
+from conecta_senai.config.database import usar_replica
 from conecta_senai.models import db
 from conecta_senai.models.manutencao_basedados import (
     ManutencaoArea,
@@ -18,6 +20,19 @@ from conecta_senai.models.manutencao_basedados import (
 )
 from conecta_senai.models.manutencao_chamado import ManutencaoChamado
 from conecta_senai.routes.manutencao_unidade.utils import ensure_tables_exist
+from conecta_senai.services.chamados_exportacao_service import (
+    escrever_planilha_chamados_manutencao,
+)
+from conecta_senai.services.eventos_service import publicar_evento
+from conecta_senai.services.indicadores_service import (
+    obter_indicadores as obter_indicadores_chamados,
+)
+from conecta_senai.utils.cache_http import cache_http
+from conecta_senai.utils.paginacao import (
+    contar_total,
+    limitar_por_pagina,
+    paginar_por_chave,
+)
 
 manutencao_unidade_admin_bp = Blueprint(
     "manutencao_unidade_admin",
@@ -26,6 +41,10 @@ manutencao_unidade_admin_bp = Blueprint(
 )
 
 
+CHAMADOS_POR_PAGINA_PADRAO = 50
+CHAMADOS_POR_PAGINA_MAXIMO = 200
+
+
 CANONICAL_STATUS = {"Aberto", "Em Atendimento", "Finalizado", "Cancelado"}
 
 
@@ -162,9 +181,36 @@ def listar_todos_chamados():
     if fim is not None:
         consulta = consulta.filter(ManutencaoChamado.created_at <= fim)
 
-    consulta = consulta.order_by(ManutencaoChamado.created_at.desc())
-    chamados = consulta.all()
-    return jsonify([_serialize_chamado(chamado) for chamado in chamados])
+    per_page = limitar_por_pagina(
+        request.args.get("per_page", type=int),
+        CHAMADOS_POR_PAGINA_PADRAO,
+        CHAMADOS_POR_PAGINA_MAXIMO,
+    )
+    consulta_pagina = consulta.options(
+        selectinload(ManutencaoChamado.user),
+        selectinload(ManutencaoChamado.tipo_servico),
+        selectinload(ManutencaoChamado.anexos),
+    )
+    try:
+        chamados, proximo = paginar_por_chave(
+            consulta_pagina,
+            ManutencaoChamado.created_at,
+            ManutencaoChamado.id,
+            request.args.get("cursor"),
+            per_page,
+        )
+    except ValueError as exc:
+        return jsonify({"erro": str(exc)}), 400
+
+    resposta = {
+        "items": [_serialize_chamado(chamado) for chamado in chamados],
+        "per_page": per_page,
+        "next_cursor": proximo,
+    }
+    incluir_total = request.args.get("incluir_total", "").strip().lower()
+    if incluir_total in {"1", "true", "t", "sim"}:
+        resposta["total"] = contar_total(consulta)
+    return jsonify(resposta)
 
 
 @manutencao_unidade_admin_bp.route("/chamados/exportar_excel", methods=["GET"])
@@ -176,78 +222,15 @@ def exportar_chamados_excel():
     ensure_tables_exist([ManutencaoChamado])
 
     try:
-        from openpyxl import Workbook
-        from openpyxl.styles import Font, PatternFill, Alignment
+        import openpyxl  # noqa: F401
 
         current_app.logger.info("XLSX EXPORT: openpyxl importado com sucesso")
     except ImportError:
         current_app.logger.error("XLSX EXPORT: openpyxl não está instalado")
         return jsonify({"erro": "Biblioteca openpyxl não está instalada"}), 500
 
-    chamados = ManutencaoChamado.query.order_by(
-        ManutencaoChamado.created_at.asc()
-    ).all()
-
-    def _fmt(dt):
-        return dt.strftime("%Y-%m-%d %H:%M:%S") if dt else ""
-
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Chamados Suporte TI"
-
-    header_font = Font(bold=True, color="FFFFFF")
-    header_fill = PatternFill(
-        start_color="0066CC", end_color="0066CC", fill_type="solid"
-    )
-    header_alignment = Alignment(horizontal="center", vertical="center")
-
-    headers = [
-        "ID",
-        "Nome solicitante",
-        "Email",
-        "Área",
-        "Tipo de equipamento",
-        "Nível urgência",
-        "Status",
-        "Abertura",
-        "Início atendimento",
-        "Encerramento",
-        "Última atualização",
-        "Observações",
-    ]
-
-    for col_num, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col_num, value=header)
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = header_alignment
-
-    for row_num, c in enumerate(chamados, 2):
-        ws.cell(row=row_num, column=1, value=c.id)
-        ws.cell(
-            row=row_num,
-            column=2,
-            value=c.nome_solicitante or (c.user.nome if c.user else ""),
-        )
-        ws.cell(row=row_num, column=3, value=c.email)
-        ws.cell(row=row_num, column=4, value=c.area or "")
-        ws.cell(
-            row=row_num, column=5, value=c.tipo_servico.nome if c.tipo_servico else ""
-        )
-        ws.cell(row=row_num, column=6, value=c.nivel_urgencia or "")
-        ws.cell(row=row_num, column=7, value=c.status or "")
-        ws.cell(row=row_num, column=8, value=_fmt(c.created_at))
-        ws.cell(row=row_num, column=9, value=_fmt(c.inicio_atendimento_at))
-        ws.cell(row=row_num, column=10, value=_fmt(c.encerrado_at))
-        ws.cell(row=row_num, column=11, value=_fmt(c.updated_at))
-        ws.cell(row=row_num, column=12, value=(c.observacoes or ""))
-
-    column_widths = [8, 25, 30, 20, 20, 15, 15, 20, 20, 20, 20, 40]
-    for col_num, width in enumerate(column_widths, 1):
-        ws.column_dimensions[ws.cell(row=1, column=col_num).column_letter].width = width
-
     output = io.BytesIO()
-    wb.save(output)
+    escrever_planilha_chamados_manutencao(output)
     output.seek(0)
 
     current_app.logger.info(
@@ -334,6 +317,17 @@ def atualizar_status_chamado(chamado_id: int):
         db.session.rollback()
         return jsonify({"erro": "Não foi possível atualizar o status do chamado."}), 500
 
+    publicar_evento(
+        "chamado",
+        {
+            "modulo": "manutencao_unidade",
+            "id": chamado.id,
+            "status": chamado.status,
+            "status_anterior": status_anterior,
+        },
+        usuario_ids=[chamado.user_id] if chamado.user_id else [],
+    )
+
     return (
         jsonify(
             {
@@ -488,225 +482,17 @@ def excluir_chamado(chamado_id: int):
 
 @manutencao_unidade_admin_bp.route("/indicadores", methods=["GET"])
 @admin_required
+@usar_replica
 def obter_indicadores():
     ensure_tables_exist([ManutencaoChamado])
-
-    query = db.session.query(ManutencaoChamado)
-
-    data_inicio_str = request.args.get("data_inicio")
-    data_fim_str = request.args.get("data_fim")
-    area = request.args.get("area")
-    tipo_equipamento_id = request.args.get("tipo_equipamento_id")
-    nivel_urgencia = request.args.get("nivel_urgencia")
-    status = request.args.get("status")
-
-    if data_inicio_str:
-        try:
-
-            tz_brasilia = timezone(timedelta(hours=-3))
-            data_inicio = (
-                datetime.fromisoformat(data_inicio_str)
-                .replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=tz_brasilia)
-                .replace(tzinfo=None)
-            )
-            query = query.filter(ManutencaoChamado.created_at >= data_inicio)
-        except (ValueError, TypeError):
-            pass
-
-    if data_fim_str:
-        try:
-            tz_brasilia = timezone(timedelta(hours=-3))
-            data_fim = (
-                datetime.fromisoformat(data_fim_str)
-                .replace(
-                    hour=23,
-                    minute=59,
-                    second=59,
-                    microsecond=999999,
-                    tzinfo=tz_brasilia,
-                )
-                .replace(tzinfo=None)
-            )
-            query = query.filter(ManutencaoChamado.created_at <= data_fim)
-        except (ValueError, TypeError):
-            pass
-
-    if area:
-        query = query.filter(ManutencaoChamado.area == area)
-
-    if tipo_equipamento_id:
-        try:
-            tipo_id = int(tipo_equipamento_id)
-            query = query.filter(ManutencaoChamado.tipo_servico_id == tipo_id)
-        except (ValueError, TypeError):
-            pass
-
-    if nivel_urgencia:
-        query = query.filter(ManutencaoChamado.nivel_urgencia == nivel_urgencia)
-
-    if status:
-        query = query.filter(ManutencaoChamado.status == status)
-
-    total = query.count()
-
-    por_status = (
-        db.session.query(ManutencaoChamado.status, func.count(ManutencaoChamado.id))
-        .filter(
-            ManutencaoChamado.id.in_(
-                query.with_entities(ManutencaoChamado.id).subquery()
-            )
-        )
-        .group_by(ManutencaoChamado.status)
-        .all()
-    )
-
-    por_tipo = (
-        db.session.query(ManutencaoTipoServico.nome, func.count(ManutencaoChamado.id))
-        .join(
+    return jsonify(
+        obter_indicadores_chamados(
+            "manutencao_unidade",
+            ManutencaoChamado,
             ManutencaoTipoServico,
-            ManutencaoTipoServico.id == ManutencaoChamado.tipo_servico_id,
-            isouter=True,
-        )
-        .filter(
-            ManutencaoChamado.id.in_(
-                query.with_entities(ManutencaoChamado.id).subquery()
-            )
-        )
-        .group_by(ManutencaoTipoServico.nome)
-        .all()
-    )
-
-    por_urgencia = (
-        db.session.query(
-            ManutencaoChamado.nivel_urgencia, func.count(ManutencaoChamado.id)
-        )
-        .filter(
-            ManutencaoChamado.id.in_(
-                query.with_entities(ManutencaoChamado.id).subquery()
-            )
-        )
-        .group_by(ManutencaoChamado.nivel_urgencia)
-        .all()
-    )
-
-    tempo_medio_atendimento = (
-        db.session.query(
-            func.avg(
-                func.extract("epoch", ManutencaoChamado.inicio_atendimento_at)
-                - func.extract("epoch", ManutencaoChamado.created_at)
-            )
-        )
-        .filter(ManutencaoChamado.inicio_atendimento_at.isnot(None))
-        .filter(
-            ManutencaoChamado.id.in_(
-                query.with_entities(ManutencaoChamado.id).subquery()
-            )
+            ManutencaoChamado.tipo_servico_id,
+            request.args,
         )
-        .scalar()
-    )
-
-    tempo_medio_encerramento = (
-        db.session.query(
-            func.avg(
-                func.extract("epoch", ManutencaoChamado.encerrado_at)
-                - func.extract("epoch", ManutencaoChamado.created_at)
-            )
-        )
-        .filter(ManutencaoChamado.encerrado_at.isnot(None))
-        .filter(
-            ManutencaoChamado.id.in_(
-                query.with_entities(ManutencaoChamado.id).subquery()
-            )
-        )
-        .scalar()
-    )
-
-    total_com_atendimento = query.filter(
-        ManutencaoChamado.inicio_atendimento_at.isnot(None)
-    ).count()
-
-    if total_com_atendimento > 0:
-        atendidos_em_24h = (
-            query.filter(ManutencaoChamado.inicio_atendimento_at.isnot(None))
-            .filter(
-                func.extract("epoch", ManutencaoChamado.inicio_atendimento_at)
-                - func.extract("epoch", ManutencaoChamado.created_at)
-                < 86400
-            )
-            .count()
-        )
-        percentual_24h = (atendidos_em_24h / total_com_atendimento) * 100
-    else:
-        percentual_24h = 0
-
-    tempo_por_urgencia = []
-    for nivel in ["Baixo", "Médio", "Alto"]:
-        query_nivel = query.filter(ManutencaoChamado.nivel_urgencia == nivel)
-
-        tempo_atend = (
-            db.session.query(
-                func.avg(
-                    func.extract("epoch", ManutencaoChamado.inicio_atendimento_at)
-                    - func.extract("epoch", ManutencaoChamado.created_at)
-                )
-            )
-            .filter(ManutencaoChamado.inicio_atendimento_at.isnot(None))
-            .filter(
-                ManutencaoChamado.id.in_(
-                    query_nivel.with_entities(ManutencaoChamado.id).subquery()
-                )
-            )
-            .scalar()
-        )
-
-        tempo_encer = (
-            db.session.query(
-                func.avg(
-                    func.extract("epoch", ManutencaoChamado.encerrado_at)
-                    - func.extract("epoch", ManutencaoChamado.created_at)
-                )
-            )
-            .filter(ManutencaoChamado.encerrado_at.isnot(None))
-            .filter(
-                ManutencaoChamado.id.in_(
-                    query_nivel.with_entities(ManutencaoChamado.id).subquery()
-                )
-            )
-            .scalar()
-        )
-
-        tempo_por_urgencia.append(
-            {
-                "nivel": nivel,
-                "tempo_atendimento": float(tempo_atend) if tempo_atend else 0,
-                "tempo_encerramento": float(tempo_encer) if tempo_encer else 0,
-            }
-        )
-
-    return jsonify(
-        {
-            "total_chamados": total,
-            "por_status": [
-                {"status": status or "Não informado", "quantidade": quantidade}
-                for status, quantidade in por_status
-            ],
-            "por_tipo_equipamento": [
-                {"tipo": tipo or "Não informado", "quantidade": quantidade}
-                for tipo, quantidade in por_tipo
-            ],
-            "por_nivel_urgencia": [
-                {"nivel": nivel or "Não informado", "quantidade": quantidade}
-                for nivel, quantidade in por_urgencia
-            ],
-            "tempo_medio_abertura_para_atendimento_segundos": (
-                float(tempo_medio_atendimento) if tempo_medio_atendimento else 0
-            ),
-            "tempo_medio_abertura_para_encerramento_segundos": (
-                float(tempo_medio_encerramento) if tempo_medio_encerramento else 0
-            ),
-            "percentual_atendidos_em_24h": round(percentual_24h, 2),
-            "tempo_medio_por_urgencia": tempo_por_urgencia,
-        }
     )
 
 
@@ -763,6 +549,7 @@ def _excluir_registro_basico(model, registro_id: int):
 
 @manutencao_unidade_admin_bp.route("/tipos_equipamento", methods=["GET"])
 @admin_required
+@cache_http(ManutencaoTipoServico)
 def listar_tipos_equipamento():
     ensure_tables_exist([ManutencaoTipoServico])
     tipos = ManutencaoTipoServico.query.order_by(ManutencaoTipoServico.nome.asc()).all()
@@ -815,6 +602,7 @@ def excluir_tipo_equipamento(registro_id: int):
 
 @manutencao_unidade_admin_bp.route("/areas", methods=["GET"])
 @admin_required
+@cache_http(ManutencaoArea)
 def listar_areas():
     ensure_tables_exist([ManutencaoArea])
     areas = ManutencaoArea.query.order_by(ManutencaoArea.nome.asc()).all()
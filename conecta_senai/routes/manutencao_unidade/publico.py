@@ -17,6 +17,7 @@ from conecta_senai.models.manutencao_basedados import (
 )
 from conecta_senai.models.manutencao_chamado import ManutencaoChamado
 from conecta_senai.routes.manutencao_unidade.utils import ensure_tables_exist
+from conecta_senai.utils.cache_http import cache_http
 
 manutencao_public_bp = Blueprint(
     "manutencao_unidade_publico",
@@ -197,6 +198,7 @@ def listar_meus_chamados():
 
 @manutencao_public_bp.route("/basedados_formulario", methods=["GET"])
 @login_required
+@cache_http(ManutencaoTipoServico, ManutencaoArea)
 def obter_base_dados_formulario():
     ensure_tables_exist([ManutencaoTipoServico, ManutencaoArea])
 
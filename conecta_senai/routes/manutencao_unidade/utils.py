@@ -3,18 +3,26 @@ from __future__ import annotations
 import logging
 from typing import Iterable
 
-from sqlalchemy import inspect
-
+from conecta_senai.config.esquema import garantir_esquema, registrar_verificacao
 from conecta_senai.models import db
+from conecta_senai.models.manutencao_anexo import ManutencaoAnexo
+from conecta_senai.models.manutencao_basedados import (
+    ManutencaoArea,
+    ManutencaoTipoServico,
+)
+from conecta_senai.models.manutencao_chamado import ManutencaoChamado
 
 LOGGER = logging.getLogger(__name__)
 
 
 def ensure_tables_exist(models: Iterable[type[db.Model]]) -> None:
-    inspector = inspect(db.engine)
-    for model in models:
-        table_name = model.__tablename__
-        if not inspector.has_table(table_name):
-            LOGGER.info("Criando tabela ausente: %s", table_name)
-            model.__table__.create(db.engine)
-            inspector = inspect(db.engine)
+    garantir_esquema(models)
+
+
+registrar_verificacao(
+    "manutencao_unidade",
+    ManutencaoTipoServico,
+    ManutencaoArea,
+    ManutencaoChamado,
+    ManutencaoAnexo,
+)
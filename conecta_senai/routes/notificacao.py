@@ -1,21 +1,49 @@
-from flask import Blueprint, request, jsonify
-from conecta_senai.routes.user import verificar_autenticacao
+import time
+
+from flask import Blueprint, Response, current_app, request, jsonify
+from conecta_senai.routes.user import verificar_admin, verificar_autenticacao
+from conecta_senai.services.eventos_service import (
+    Assinatura,
+    evento_visivel,
+    formatar_sse,
+)
 from conecta_senai.services.notificacao_service import (
+    contar_nao_lidas,
     listar_notificacoes as listar_notificacoes_service,
     marcar_notificacao_lida as marcar_notificacao_lida_service,
+    marcar_todas_lidas as marcar_todas_lidas_service,
 )
 
-
 notificacao_bp = Blueprint("notificacao", __name__)
 
 
+def _parse_lida(valor):
+    if valor is None:
+        return None
+    return valor.strip().lower() in {"1", "true", "t", "sim"}
+
+
 @notificacao_bp.route("/notificacoes", methods=["GET"])
 def listar_notificacoes():
     autenticado, user = verificar_autenticacao(request)
     if not autenticado:
         return jsonify({"erro": "Não autenticado"}), 401
 
-    return listar_notificacoes_service(user)
+    return listar_notificacoes_service(
+        user,
+        cursor=request.args.get("cursor"),
+        per_page=request.args.get("per_page", type=int),
+        lida=_parse_lida(request.args.get("lida")),
+    )
+
+
+@notificacao_bp.route("/notificacoes/nao-lidas", methods=["GET"])
+def contar_notificacoes_nao_lidas():
+    autenticado, user = verificar_autenticacao(request)
+    if not autenticado:
+        return jsonify({"erro": "Não autenticado"}), 401
+
+    return jsonify({"nao_lidas": contar_nao_lidas(user)})
 
 
 @notificacao_bp.route("/notificacoes/<int:id>/marcar-lida", methods=["PUT"])
@@ -25,3 +53,49 @@ def marcar_notificacao_lida(id):
         return jsonify({"erro": "Não autenticado"}), 401
 
     return marcar_notificacao_lida_service(id, user)
+
+
+@notificacao_bp.route("/notificacoes/marcar-todas-lidas", methods=["PUT"])
+def marcar_todas_lidas():
+    autenticado, user = verificar_autenticacao(request)
+    if not autenticado:
+        return jsonify({"erro": "Não autenticado"}), 401
+
+    return marcar_todas_lidas_service(user)
+
+
+@notificacao_bp.route("/notificacoes/stream", methods=["GET"])
+def stream_eventos():
+    """Canal SSE com novas notificações e mudanças em chamados e ocupações."""
+    if not current_app.config.get("SSE_HABILITADO"):
+        return jsonify({"erro": "Canal de eventos desabilitado"}), 404
+    autenticado, user = verificar_autenticacao(request)
+    if not autenticado:
+        return jsonify({"erro": "Não autenticado"}), 401
+
+    usuario_id = user.id
+    admin = verificar_admin(user)
+    heartbeat = float(current_app.config.get("SSE_HEARTBEAT_SEGUNDOS", 15))
+    duracao = float(current_app.config.get("SSE_DURACAO_MAXIMA_SEGUNDOS", 300))
+    assinatura = Assinatura(timeout=heartbeat)
+
+    def gerar():
+        # O navegador reconecta sozinho ao fim de cada conexão.
+        yield "retry: 3000\n\n"
+        limite = time.monotonic() + duracao
+        try:
+            for evento in assinatura:
+                if evento is None:
+                    yield ": ping\n\n"
+                elif evento_visivel(evento, usuario_id, admin):
+                    yield formatar_sse(evento)
+                if time.monotonic() >= limite:
+                    break
+        finally:
+            assinatura.close()
+
+    resposta = Response(gerar(), mimetype="text/event-stream")
+    resposta.headers["Cache-Control"] = "no-cache"
+    resposta.headers["X-Accel-Buffering"] = "no"
+    resposta.call_on_close(assinatura.close)
+    return resposta
@@ -3,6 +3,8 @@ from conecta_senai.models import db
 from conecta_senai.models.instrutor import Instrutor
 from conecta_senai.models.ocupacao import Ocupacao
 from conecta_senai.routes.user import verificar_autenticacao, verificar_admin
+from conecta_senai.auth import login_required
+from conecta_senai.utils.cache_http import cache_http
 from sqlalchemy.exc import SQLAlchemyError
 from conecta_senai.utils.error_handler import handle_internal_error
 from datetime import datetime, date
@@ -13,11 +15,9 @@ instrutor_bp = Blueprint("instrutor", __name__)
 
 
 @instrutor_bp.route("/instrutores", methods=["GET"])
+@login_required
+@cache_http(Instrutor)
 def listar_instrutores():
-    autenticado, user = verificar_autenticacao(request)
-    if not autenticado:
-        return jsonify({"erro": "Não autenticado"}), 401
-
     status = request.args.get("status")
     area_atuacao = request.args.get("area_atuacao")
 
@@ -1,29 +1,42 @@
-from flask import Blueprint, request, jsonify, make_response, send_file
+from flask import Blueprint, Response, request, jsonify, send_file, stream_with_context
 from conecta_senai.models import db
 from conecta_senai.models.ocupacao import Ocupacao
 from conecta_senai.models.sala import Sala
 from conecta_senai.models.instrutor import Instrutor
 from conecta_senai.routes.user import verificar_autenticacao, verificar_admin
-from conecta_senai.auth import admin_required
+from conecta_senai.auth import admin_required, login_required
+from conecta_senai.config.database import usar_replica
 from sqlalchemy.exc import SQLAlchemyError
 from conecta_senai.utils.error_handler import handle_internal_error
 from conecta_senai.utils.audit import log_action
+from conecta_senai.utils.cache_http import cache_http
+from conecta_senai.services.eventos_service import publicar_evento
 from datetime import datetime, date, time, timedelta
 from pydantic import ValidationError
 from conecta_senai.schemas import OcupacaoCreateSchema, OcupacaoUpdateSchema
-import csv
-from io import StringIO, BytesIO
-from openpyxl import Workbook
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
-from sqlalchemy import and_, or_, func, extract, desc, cast, String
+from conecta_senai.services.ocupacao_service import (
+    consultar_ocupacoes_exportacao,
+    escrever_pdf_ocupacoes,
+    escrever_xlsx_ocupacoes,
+    gerar_csv_ocupacoes,
+    verificar_disponibilidade_periodo,
+)
+from conecta_senai.services.ocupacao_resumo_service import (
+    descontar_ocupacoes,
+    montar_relatorio,
+    montar_resumo_periodo,
+    montar_tendencia,
+    registrar_ocupacoes,
+)
+import tempfile
+from sqlalchemy import and_, or_, func, desc, cast, String
 
 ocupacao_bp = Blueprint("ocupacao", __name__)
 
 
 @ocupacao_bp.after_request
 def add_no_cache_headers(response):
-    response.headers["Cache-Control"] = "no-store"
+    response.headers.setdefault("Cache-Control", "no-store")
     return response
 
 
@@ -72,6 +85,24 @@ def obter_ocupacoes_por_identificador(identificador):
     return ocupacoes, grupo_id, ocupacao_base
 
 
+def _publicar_alteracao(acao, ocupacoes, removidas=()):
+    publicar_evento(
+        "ocupacao",
+        {
+            "acao": acao,
+            "ids": [oc.id for oc in ocupacoes],
+            "removidas": list(removidas),
+            "datas": sorted({oc.data.isoformat() for oc in ocupacoes if oc.data}),
+        },
+    )
+
+
+def _parse_data_opcional(valor):
+    if not valor:
+        return None
+    return datetime.strptime(valor, "%Y-%m-%d").date()
+
+
 def obter_turno_por_horarios(horario_inicio, horario_fim):
     if not horario_inicio or not horario_fim:
         return None
@@ -223,66 +254,42 @@ def exportar_ocupacoes():
         return jsonify({"erro": "Não autenticado"}), 401
 
     formato = request.args.get("formato", "csv").lower()
+    sala_id = request.args.get("sala_id", type=int)
+
+    try:
+        data_inicio = _parse_data_opcional(request.args.get("data_inicio"))
+        data_fim = _parse_data_opcional(request.args.get("data_fim"))
+    except ValueError:
+        return jsonify({"erro": "Formato de data inválido (YYYY-MM-DD)"}), 400
 
-    ocupacoes = Ocupacao.query.all()
+    linhas = consultar_ocupacoes_exportacao(data_inicio, data_fim, sala_id)
 
     if formato == "pdf":
-        buffer = BytesIO()
-        c = canvas.Canvas(buffer, pagesize=letter)
-        c.drawString(50, 750, "Relatório de Ocupações")
-        y = 730
-        c.drawString(50, y, "ID  Sala  Data  Início  Fim  Status")
-        y -= 20
-        for oc in ocupacoes:
-            sala = oc.sala.nome if oc.sala else oc.sala_id
-            c.drawString(
-                50,
-                y,
-                f"{oc.id}  {sala}  {oc.data}  {oc.horario_inicio}  {oc.horario_fim}  {oc.status}",
-            )
-            y -= 20
-            if y < 50:
-                c.showPage()
-                y = 750
-        c.save()
-        buffer.seek(0)
+        arquivo = tempfile.TemporaryFile()
+        escrever_pdf_ocupacoes(linhas, arquivo)
+        arquivo.seek(0)
         return send_file(
-            buffer,
+            arquivo,
             mimetype="application/pdf",
             as_attachment=True,
             download_name="ocupacoes.pdf",
         )
 
     if formato == "xlsx":
-        wb = Workbook()
-        ws = wb.active
-        ws.append(["ID", "Sala", "Data", "Início", "Fim", "Status"])
-        for oc in ocupacoes:
-            sala = oc.sala.nome if oc.sala else oc.sala_id
-            ws.append(
-                [oc.id, sala, oc.data, oc.horario_inicio, oc.horario_fim, oc.status]
-            )
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
+        arquivo = tempfile.TemporaryFile()
+        escrever_xlsx_ocupacoes(linhas, arquivo)
+        arquivo.seek(0)
         return send_file(
-            output,
+            arquivo,
             mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
             as_attachment=True,
             download_name="ocupacoes.xlsx",
         )
 
-    si = StringIO()
-    writer = csv.writer(si)
-    writer.writerow(["ID", "Sala", "Data", "Início", "Fim", "Status"])
-    for oc in ocupacoes:
-        sala = oc.sala.nome if oc.sala else oc.sala_id
-        writer.writerow(
-            [oc.id, sala, oc.data, oc.horario_inicio, oc.horario_fim, oc.status]
-        )
-    output = make_response(si.getvalue())
+    output = Response(
+        stream_with_context(gerar_csv_ocupacoes(linhas)), mimetype="text/csv"
+    )
     output.headers["Content-Disposition"] = "attachment; filename=ocupacoes.csv"
-    output.headers["Content-Type"] = "text/csv"
     return output
 
 
@@ -367,15 +374,9 @@ def criar_ocupacao():
 
         horario_inicio, horario_fim = TURNOS_PADRAO[payload.turno]
 
-        conflitos_totais = []
-        dia = data_inicio
-        while dia <= data_fim:
-            if not sala.is_disponivel(dia, horario_inicio, horario_fim):
-                conflitos = Ocupacao.buscar_conflitos(
-                    payload.sala_id, dia, horario_inicio, horario_fim
-                )
-                conflitos_totais.extend(conflitos)
-            dia += timedelta(days=1)
+        _, conflitos_totais = verificar_disponibilidade_periodo(
+            sala, data_inicio, data_fim, horario_inicio, horario_fim
+        )
 
         if conflitos_totais:
             return (
@@ -448,9 +449,11 @@ def criar_ocupacao():
             ocupacoes_criadas.append(nova_ocupacao)
             dia += timedelta(days=1)
 
+        registrar_ocupacoes(ocupacoes_criadas)
         db.session.commit()
         for oc in ocupacoes_criadas:
             log_action(user.id, "create", "Ocupacao", oc.id, oc.to_dict())
+        _publicar_alteracao("criada", ocupacoes_criadas)
 
         return jsonify([o.to_dict() for o in ocupacoes_criadas]), 201
 
@@ -556,26 +559,15 @@ def atualizar_ocupacao(identificador):
 
         ignorar_ocupacao_id = None if grupo_id_existente else ocupacao_original.id
 
-        conflitos_totais = []
-        dia_atual = data_inicio
-        while dia_atual <= data_fim:
-            if not sala.is_disponivel(
-                dia_atual,
-                horario_inicio,
-                horario_fim,
-                ignorar_ocupacao_id,
-                grupo_id_existente,
-            ):
-                conflitos = Ocupacao.buscar_conflitos(
-                    sala_id,
-                    dia_atual,
-                    horario_inicio,
-                    horario_fim,
-                    ignorar_ocupacao_id,
-                    grupo_id_existente,
-                )
-                conflitos_totais.extend(conflitos)
-            dia_atual += timedelta(days=1)
+        _, conflitos_totais = verificar_disponibilidade_periodo(
+            sala,
+            data_inicio,
+            data_fim,
+            horario_inicio,
+            horario_fim,
+            ignorar_ocupacao_id,
+            grupo_id_existente,
+        )
 
         if conflitos_totais:
             raise ValueError(
@@ -586,6 +578,7 @@ def atualizar_ocupacao(identificador):
             ocupacoes_grupo if grupo_id_existente else [ocupacao_original]
         )
         dados_anteriores = [oc.to_dict() for oc in ocupacoes_anteriores]
+        descontar_ocupacoes(ocupacoes_anteriores)
         for oc in ocupacoes_anteriores:
             db.session.delete(oc)
 
@@ -613,6 +606,7 @@ def atualizar_ocupacao(identificador):
             ocupacoes_criadas.append(nova_ocupacao)
             dia_atual += timedelta(days=1)
 
+        registrar_ocupacoes(ocupacoes_criadas)
         db.session.commit()
 
         for antigo in dados_anteriores:
@@ -620,6 +614,11 @@ def atualizar_ocupacao(identificador):
 
         for oc in ocupacoes_criadas:
             log_action(user.id, "update", "Ocupacao", oc.id, oc.to_dict())
+        _publicar_alteracao(
+            "atualizada",
+            ocupacoes_criadas,
+            removidas=[antigo["id"] for antigo in dados_anteriores],
+        )
 
         return (
             jsonify(
@@ -671,12 +670,14 @@ def remover_ocupacao(identificador):
 
         quantidade = len(ocupacoes)
         dados = [oc.to_dict() for oc in ocupacoes]
+        descontar_ocupacoes(ocupacoes)
         for oc in ocupacoes:
             db.session.delete(oc)
 
         db.session.commit()
         for info in dados:
             log_action(user.id, "delete", "Ocupacao", info["id"], info)
+        _publicar_alteracao("removida", [], removidas=[info["id"] for info in dados])
         return jsonify(
             {"mensagem": "Ocupação removida com sucesso", "removidas": quantidade}
         )
@@ -723,6 +724,7 @@ def atualizar_instrutor_ocupacao(identificador):
             ocupacao.instrutor_id = instrutor_id
 
         db.session.commit()
+        _publicar_alteracao("atualizada", ocupacoes_grupo)
 
         for oc in ocupacoes_grupo:
             log_action(
@@ -807,28 +809,22 @@ def verificar_disponibilidade():
 
         horario_inicio, horario_fim = TURNOS_PADRAO[turno]
 
-        disponivel = True
-        conflitos = []
-        dia = data_inicio
-        while dia <= data_fim:
-            if not sala.is_disponivel(
-                dia, horario_inicio, horario_fim, ocupacao_id, grupo_ocupacao_id
-            ):
-                disponivel = False
-                conflitos.extend(
-                    Ocupacao.buscar_conflitos(
-                        sala_id,
-                        dia,
-                        horario_inicio,
-                        horario_fim,
-                        ocupacao_id,
-                        grupo_ocupacao_id,
-                    )
-                )
-            dia += timedelta(days=1)
+        disponivel, conflitos = verificar_disponibilidade_periodo(
+            sala,
+            data_inicio,
+            data_fim,
+            horario_inicio,
+            horario_fim,
+            ocupacao_id,
+            grupo_ocupacao_id,
+        )
 
         return jsonify(
-            {"disponivel": disponivel, "sala": sala.to_dict(), "conflitos": conflitos}
+            {
+                "disponivel": disponivel,
+                "sala": sala.to_dict(),
+                "conflitos": [c.to_dict(include_relations=False) for c in conflitos],
+            }
         )
 
     except ValueError:
@@ -939,78 +935,23 @@ def obter_resumo_periodo():
         except ValueError:
             return jsonify({"erro": "Formato de data inválido (YYYY-MM-DD)"}), 400
 
-    salas_ativas = Sala.query.filter_by(status="ativa").all()
-    total_salas = len(salas_ativas)
-    salas_dict = {s.id: s.nome for s in salas_ativas}
+    if turno_filtro and turno_filtro not in TURNOS_PADRAO:
+        return jsonify({"erro": "Turno inválido"}), 400
 
-    query = Ocupacao.query.filter(
-        Ocupacao.data >= data_inicio,
-        Ocupacao.data <= data_fim,
-        Ocupacao.status.in_(["confirmado", "pendente"]),
+    resumo = montar_resumo_periodo(
+        data_inicio,
+        data_fim,
+        sala_id=sala_id,
+        turno=turno_filtro,
+        instrutor_id=instrutor_id,
     )
-
-    if sala_id:
-        query = query.filter(Ocupacao.sala_id == sala_id)
-
-    if instrutor_id:
-        query = query.filter(Ocupacao.instrutor_id == instrutor_id)
-
-    if turno_filtro:
-        if turno_filtro not in TURNOS_PADRAO:
-            return jsonify({"erro": "Turno inválido"}), 400
-        inicio, fim = TURNOS_PADRAO[turno_filtro]
-        query = query.filter(
-            Ocupacao.horario_inicio == inicio, Ocupacao.horario_fim == fim
-        )
-
-    ocupacoes = query.all()
-
-    resumo = {}
-    dia = data_inicio
-    while dia <= data_fim:
-        resumo[dia.isoformat()] = {
-            turno: {
-                "ocupadas": 0,
-                "salas_ocupadas": [],
-                "salas_livres": [],
-                "total_salas": total_salas,
-            }
-            for turno in TURNOS_PADRAO
-        }
-        dia += timedelta(days=1)
-
-    for oc in ocupacoes:
-        turno = oc.get_turno()
-        if not turno:
-            continue
-        info = resumo[oc.data.isoformat()][turno]
-        info["ocupadas"] += 1
-        info["salas_ocupadas"].append(
-            {
-                "sala_id": oc.sala_id,
-                "sala_nome": salas_dict.get(oc.sala_id, str(oc.sala_id)),
-                "curso_evento": oc.curso_evento,
-                "instrutor_nome": oc.instrutor.nome if oc.instrutor else None,
-            }
-        )
-
-    for dia_key, turnos in resumo.items():
-        for turno, info in turnos.items():
-            ocupadas_ids = [s["sala_id"] for s in info["salas_ocupadas"]]
-            info["salas_livres"] = [
-                nome for sid, nome in salas_dict.items() if sid not in ocupadas_ids
-            ]
-            info["livres"] = info["total_salas"] - info["ocupadas"]
-
     return jsonify(resumo)
 
 
 @ocupacao_bp.route("/ocupacoes/tipos", methods=["GET"])
+@login_required
+@cache_http()
 def listar_tipos_ocupacao():
-    autenticado, user = verificar_autenticacao(request)
-    if not autenticado:
-        return jsonify({"erro": "Não autenticado"}), 401
-
     tipos = [
         {"valor": "aula_regular", "nome": "Aula Regular", "cor": "#006837"},
         {"valor": "evento_especial", "nome": "Evento Especial", "cor": "#FFB612"},
@@ -1023,6 +964,7 @@ def listar_tipos_ocupacao():
 
 
 @ocupacao_bp.route("/ocupacoes/relatorio", methods=["GET"])
+@usar_replica
 def gerar_relatorio_ocupacoes():
     autenticado, user = verificar_autenticacao(request)
     if not autenticado:
@@ -1051,80 +993,12 @@ def gerar_relatorio_ocupacoes():
         except ValueError:
             return jsonify({"erro": "Formato de data inválido (YYYY-MM-DD)"}), 400
 
-    total_ocupacoes = Ocupacao.query.filter(
-        Ocupacao.data >= data_inicio, Ocupacao.data <= data_fim
-    ).count()
-
-    ocupacoes_confirmadas = Ocupacao.query.filter(
-        Ocupacao.data >= data_inicio,
-        Ocupacao.data <= data_fim,
-        Ocupacao.status == "confirmado",
-    ).count()
-
-    ocupacoes_pendentes = Ocupacao.query.filter(
-        Ocupacao.data >= data_inicio,
-        Ocupacao.data <= data_fim,
-        Ocupacao.status == "pendente",
-    ).count()
-
-    ocupacoes_canceladas = Ocupacao.query.filter(
-        Ocupacao.data >= data_inicio,
-        Ocupacao.data <= data_fim,
-        Ocupacao.status == "cancelado",
-    ).count()
-
-    salas_mais_utilizadas = (
-        db.session.query(Sala.nome, db.func.count(Ocupacao.id).label("total_ocupacoes"))
-        .join(Ocupacao)
-        .filter(
-            Ocupacao.data >= data_inicio,
-            Ocupacao.data <= data_fim,
-            Ocupacao.status.in_(["confirmado", "pendente"]),
-        )
-        .group_by(Sala.id, Sala.nome)
-        .order_by(db.desc("total_ocupacoes"))
-        .limit(10)
-        .all()
-    )
-
-    ocupacoes_por_tipo = (
-        db.session.query(
-            Ocupacao.tipo_ocupacao, db.func.count(Ocupacao.id).label("total")
-        )
-        .filter(
-            Ocupacao.data >= data_inicio,
-            Ocupacao.data <= data_fim,
-            Ocupacao.status.in_(["confirmado", "pendente"]),
-        )
-        .group_by(Ocupacao.tipo_ocupacao)
-        .all()
-    )
-
-    relatorio = {
-        "periodo": {
-            "data_inicio": data_inicio.isoformat(),
-            "data_fim": data_fim.isoformat(),
-        },
-        "estatisticas_gerais": {
-            "total_ocupacoes": total_ocupacoes,
-            "ocupacoes_confirmadas": ocupacoes_confirmadas,
-            "ocupacoes_pendentes": ocupacoes_pendentes,
-            "ocupacoes_canceladas": ocupacoes_canceladas,
-        },
-        "salas_mais_utilizadas": [
-            {"sala": sala, "total_ocupacoes": total}
-            for sala, total in salas_mais_utilizadas
-        ],
-        "ocupacoes_por_tipo": [
-            {"tipo": tipo or "Não especificado", "total": total}
-            for tipo, total in ocupacoes_por_tipo
-        ],
-    }
-
+    relatorio = montar_relatorio(data_inicio, data_fim)
     return jsonify(relatorio)
 
 
 @ocupacao_bp.route("/ocupacoes/tendencia", methods=["GET"])
+@usar_replica
 def obter_tendencia_ocupacoes():
     autenticado, user = verificar_autenticacao(request)
     if not autenticado:
@@ -1135,27 +1009,11 @@ def obter_tendencia_ocupacoes():
 
     ano = request.args.get("ano", type=int, default=date.today().year)
 
-    resultados = (
-        db.session.query(
-            extract("month", Ocupacao.data).label("mes"),
-            func.count(Ocupacao.id).label("total"),
-        )
-        .filter(extract("year", Ocupacao.data) == ano)
-        .group_by(extract("month", Ocupacao.data))
-        .order_by(extract("month", Ocupacao.data))
-        .all()
-    )
-
-    dados_meses = {str(r.mes).zfill(2): r.total for r in resultados}
-    dados_formatados = []
-    for i in range(1, 13):
-        mes_str = str(i).zfill(2)
-        dados_formatados.append({"mes": mes_str, "total": dados_meses.get(mes_str, 0)})
-
-    return jsonify(dados_formatados)
+    return jsonify(montar_tendencia(ano))
 
 
 @ocupacao_bp.route("/dashboard/salas/utilizacao", methods=["GET"])
+@usar_replica
 def salas_utilizacao_mes():
     autenticado, user = verificar_autenticacao(request)
     if not autenticado:
@@ -6,19 +6,21 @@ from conecta_senai.models.sala import Sala
 from conecta_senai.models.recurso import Recurso
 from conecta_senai.models.ocupacao import Ocupacao
 from conecta_senai.routes.user import verificar_autenticacao, verificar_admin
+from conecta_senai.auth import login_required
+from conecta_senai.utils.cache_http import cache_http
 from datetime import datetime, date
 from pydantic import ValidationError
 from conecta_senai.schemas import SalaCreateSchema, SalaUpdateSchema
+from conecta_senai.services.ocupacao_service import verificar_disponibilidade_periodo
+from conecta_senai.services.ocupacao_resumo_service import descontar_ocupacoes_onde
 
 sala_bp = Blueprint("sala", __name__)
 
 
 @sala_bp.route("/salas", methods=["GET"])
+@login_required
+@cache_http(Sala, Recurso)
 def listar_salas():
-    autenticado, user = verificar_autenticacao(request)
-    if not autenticado:
-        return jsonify({"erro": "Não autenticado"}), 401
-
     status = request.args.get("status")
     tipo = request.args.get("tipo")
     capacidade_min = request.args.get("capacidade_min", type=int)
@@ -197,6 +199,8 @@ def remover_sala(id):
         )
 
     try:
+        # A remoção da sala apaga em cascata as ocupações passadas.
+        descontar_ocupacoes_onde(Ocupacao.sala_id == id)
         db.session.delete(sala)
         db.session.commit()
         return jsonify({"mensagem": "Sala removida com sucesso"})
@@ -229,19 +233,18 @@ def verificar_disponibilidade_sala(id):
         horario_inicio = datetime.strptime(horario_inicio_str, "%H:%M").time()
         horario_fim = datetime.strptime(horario_fim_str, "%H:%M").time()
 
-        disponivel = sala.is_disponivel(
-            data_verificacao, horario_inicio, horario_fim, ocupacao_id
+        disponivel, ocupacoes_conflitantes = verificar_disponibilidade_periodo(
+            sala,
+            data_verificacao,
+            data_verificacao,
+            horario_inicio,
+            horario_fim,
+            ocupacao_id,
         )
-
-        conflitos = []
-        if not disponivel:
-            ocupacoes_conflitantes = Ocupacao.buscar_conflitos(
-                id, data_verificacao, horario_inicio, horario_fim, ocupacao_id
-            )
-            conflitos = [
-                ocupacao.to_dict(include_relations=False)
-                for ocupacao in ocupacoes_conflitantes
-            ]
+        conflitos = [
+            ocupacao.to_dict(include_relations=False)
+            for ocupacao in ocupacoes_conflitantes
+        ]
 
         return jsonify(
             {"disponivel": disponivel, "sala": sala.to_dict(), "conflitos": conflitos}
@@ -300,11 +303,9 @@ def listar_ocupacoes_sala(id):
 
 
 @sala_bp.route("/salas/tipos", methods=["GET"])
+@login_required
+@cache_http()
 def listar_tipos_sala():
-    autenticado, user = verificar_autenticacao(request)
-    if not autenticado:
-        return jsonify({"erro": "Não autenticado"}), 401
-
     tipos = [
         {"valor": "aula_teorica", "nome": "Aula Teórica"},
         {"valor": "laboratorio", "nome": "Laboratório"},
@@ -319,11 +320,9 @@ def listar_tipos_sala():
 
 
 @sala_bp.route("/salas/recursos", methods=["GET"])
+@login_required
+@cache_http(Recurso)
 def listar_recursos_disponiveis():
-    autenticado, user = verificar_autenticacao(request)
-    if not autenticado:
-        return jsonify({"erro": "Não autenticado"}), 401
-
     recursos = Recurso.query.order_by(Recurso.nome).all()
     return jsonify(
         [{"valor": r.nome, "nome": r.nome.replace("_", " ").title()} for r in recursos]
@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta
+
+from flask import Blueprint, jsonify, request
+from sqlalchemy import case, func
+
+from conecta_senai.auth import admin_required
+from conecta_senai.models import db
+from conecta_senai.models.job_execucao import JobExecucao
+
+scheduler_bp = Blueprint("scheduler", __name__)
+
+LIMITE_PADRAO = 50
+LIMITE_MAXIMO = 500
+
+
+@scheduler_bp.route("/scheduler/execucoes", methods=["GET"])
+@admin_required
+def listar_execucoes():
+    query = JobExecucao.query
+    if job_id := request.args.get("job_id"):
+        query = query.filter(JobExecucao.job_id == job_id)
+    if status := request.args.get("status"):
+        query = query.filter(JobExecucao.status == status)
+
+    limite = min(
+        request.args.get("limite", LIMITE_PADRAO, type=int) or LIMITE_PADRAO,
+        LIMITE_MAXIMO,
+    )
+    execucoes = (
+        query.order_by(JobExecucao.iniciado_em.desc(), JobExecucao.id.desc())
+        .limit(limite)
+        .all()
+    )
+    return jsonify([execucao.to_dict() for execucao in execucoes])
+
+
+@scheduler_bp.route("/scheduler/execucoes/resumo", methods=["GET"])
+@admin_required
+def resumo_execucoes():
+    dias = request.args.get("dias", 7, type=int) or 7
+    desde = datetime.utcnow() - timedelta(days=dias)
+    linhas = (
+        db.session.query(
+            JobExecucao.job_id,
+            func.count(JobExecucao.id),
+            func.sum(case((JobExecucao.status == "erro", 1), else_=0)),
+            func.avg(JobExecucao.duracao_ms),
+            func.max(JobExecucao.duracao_ms),
+            func.sum(JobExecucao.linhas_afetadas),
+            func.max(JobExecucao.iniciado_em),
+        )
+        .filter(JobExecucao.iniciado_em >= desde)
+        .group_by(JobExecucao.job_id)
+        .order_by(JobExecucao.job_id)
+        .all()
+    )
+    return jsonify(
+        [
+            {
+                "job_id": job_id,
+                "execucoes": total,
+                "erros": int(erros or 0),
+                "duracao_media_ms": round(float(media), 1) if media else None,
+                "duracao_maxima_ms": maxima,
+                "linhas_afetadas": int(linhas_afetadas or 0),
+                "ultima_execucao": ultima.isoformat() if ultima else None,
+            }
+            for job_id, total, erros, media, maxima, linhas_afetadas, ultima in linhas
+        ]
+    )
@@ -14,6 +14,7 @@ from conecta_senai.models.suporte_anexo import SuporteAnexo
 from conecta_senai.models.suporte_basedados import SuporteArea, SuporteTipoEquipamento
 from conecta_senai.models.suporte_chamado import SuporteChamado
 from conecta_senai.routes.suporte_ti.utils import ensure_tables_exist
+from conecta_senai.utils.cache_http import cache_http
 
 suporte_ti_public_bp = Blueprint(
     "suporte_ti_publico",
@@ -197,6 +198,7 @@ def listar_meus_chamados():
 
 @suporte_ti_public_bp.route("/basedados_formulario", methods=["GET"])
 @login_required
+@cache_http(SuporteTipoEquipamento, SuporteArea)
 def obter_base_dados_formulario():
     ensure_tables_exist([SuporteTipoEquipamento, SuporteArea])
 
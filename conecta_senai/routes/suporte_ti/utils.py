@@ -7,23 +7,21 @@ from flask import current_app
 from sqlalchemy import inspect, text
 from sqlalchemy.exc import ProgrammingError
 
+from conecta_senai.config.esquema import garantir_esquema, registrar_verificacao
 from conecta_senai.models import db
+from conecta_senai.models.suporte_anexo import SuporteAnexo
+from conecta_senai.models.suporte_basedados import SuporteArea, SuporteTipoEquipamento
 from conecta_senai.models.suporte_chamado import SuporteChamado
 
-
 LOGGER = logging.getLogger(__name__)
 
 
 def ensure_tables_exist(models: Iterable[type[db.Model]]) -> None:
-    inspector = inspect(db.engine)
-    for model in models:
-        table_name = model.__tablename__
-        if not inspector.has_table(table_name):
-            model.__table__.create(db.engine)
-            inspector = inspect(db.engine)
+    garantir_esquema(models)
+
 
-        if table_name == SuporteChamado.__tablename__:
-            inspector = _ensure_suporte_chamados_columns(inspector)
+def _ajustar_suporte_chamados() -> None:
+    _ensure_suporte_chamados_columns(inspect(db.engine))
 
 
 def _ensure_suporte_chamados_columns(inspector):
@@ -150,3 +148,13 @@ def _recreate_table_with_nullable_user() -> None:
     _get_logger().info(
         "Recriada tabela suporte_chamados no SQLite para permitir user_id nulo."
     )
+
+
+registrar_verificacao(
+    "suporte_ti",
+    SuporteTipoEquipamento,
+    SuporteArea,
+    SuporteChamado,
+    SuporteAnexo,
+    ajuste=_ajustar_suporte_chamados,
+)
@@ -1,9 +1,9 @@
 from flask import Blueprint, jsonify, request
 from pydantic import ValidationError
-from sqlalchemy import inspect
 from sqlalchemy.exc import SQLAlchemyError
 
 from conecta_senai.auth import admin_required
+from conecta_senai.config.esquema import garantir_esquema, registrar_verificacao
 from conecta_senai.models import db
 from conecta_senai.models.secretaria_treinamentos import SecretariaTreinamentos
 from conecta_senai.models.treinamento import LocalRealizacao
@@ -43,9 +43,12 @@ def _validar_local_payload(data: dict):
 
 
 def ensure_table_exists(model) -> None:
-    inspector = inspect(db.engine)
-    if not inspector.has_table(model.__tablename__):
-        model.__table__.create(db.engine)
+    garantir_esquema([model])
+
+
+registrar_verificacao(
+    "treinamentos_basedados", SecretariaTreinamentos, LocalRealizacao, Horario
+)
 
 
 @secretaria_bp.route("", methods=["GET"])
@@ -1,10 +1,10 @@
 from flask import Blueprint, request, jsonify, g, current_app
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import contains_eager
 import math
 from datetime import date, datetime, timedelta
 import logging
 from types import SimpleNamespace
-from pathlib import Path
 
 from conecta_senai.models import (
     db,
@@ -14,7 +14,6 @@ from conecta_senai.models import (
     AuditLog,
     user,
 )
-from conecta_senai.models.user import User
 from conecta_senai.models.instrutor import Instrutor
 from conecta_senai.utils.error_handler import handle_internal_error
 from conecta_senai.schemas.treinamento import (
@@ -26,26 +25,20 @@ from conecta_senai.schemas.treinamento import (
 )
 from conecta_senai.auth import login_required, admin_required
 from conecta_senai.utils.audit import log_action
+from conecta_senai.utils.cache_http import cache_http
+from conecta_senai.utils.paginacao import limitar_por_pagina, paginar_por_chave
 from pydantic import ValidationError
-from io import StringIO, BytesIO
-import csv
-from flask import send_file, make_response
-from openpyxl import Workbook
-from openpyxl.styles import PatternFill, Font, Border, Side, Alignment
-from openpyxl.drawing.image import Image as OpenpyxlImage
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.units import inch
-from reportlab.platypus import (
-    SimpleDocTemplate,
-    Table,
-    TableStyle,
-    Paragraph,
-    Spacer,
-    Image as ReportlabImage,
-    KeepTogether,
+from io import BytesIO
+from flask import send_file
+from conecta_senai.services.inscricoes_exportacao_service import (
+    FORMATOS_EXPORTACAO_INSCRICOES,
+    escrever_exportacao_inscricoes,
+    nome_arquivo_inscricoes,
+)
+from conecta_senai.services.turma_listagem_service import (
+    consultar_turmas,
+    serializar_turma,
 )
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib import colors
 from conecta_senai.services.email_service import (
     enviar_convocacao,
     send_email,
@@ -61,12 +54,8 @@ log = logging.getLogger(__name__)
 
 treinamento_bp = Blueprint("treinamento", __name__)
 
-
-def _get_logo_path() -> Path:
-    static_folder = current_app.static_folder
-    if not static_folder:
-        static_folder = str(Path(current_app.root_path) / "static")
-    return Path(static_folder) / "img" / "senai-logo.png"
+LOGS_POR_PAGINA_PADRAO = 50
+TURMAS_POR_PAGINA_PADRAO = 20
 
 
 def coletar_dados_turma(turma: TurmaTreinamento) -> dict:
@@ -88,127 +77,68 @@ def coletar_dados_turma(turma: TurmaTreinamento) -> dict:
     }
 
 
+def _listar_turmas(filtros=(), ordem=(), instrutor_resumido=False):
+    """Resposta comum das listagens de turmas.
+
+    Aceita ``atualizado_desde`` (ou ``since``) em ISO 8601 e, com ``per_page``,
+    pagina por ``page`` devolvendo ``{items, page, per_page, has_next}``; sem
+    ``per_page`` a resposta continua sendo a lista completa.
+    """
+    desde_param = request.args.get("atualizado_desde") or request.args.get("since")
+    desde = None
+    if desde_param:
+        try:
+            desde = datetime.fromisoformat(desde_param)
+        except ValueError:
+            return jsonify({"erro": "Parâmetro atualizado_desde inválido"}), 400
+
+    per_page = request.args.get("per_page", type=int)
+    page = max(request.args.get("page", 1, type=int), 1)
+    if per_page is not None:
+        per_page = limitar_por_pagina(per_page, TURMAS_POR_PAGINA_PADRAO, 200)
+
+    linhas, has_next = consultar_turmas(filtros, ordem, desde, page, per_page)
+    itens = [serializar_turma(linha, instrutor_resumido) for linha in linhas]
+    if per_page is None:
+        return jsonify(itens)
+    return jsonify(
+        {"items": itens, "page": page, "per_page": per_page, "has_next": has_next}
+    )
+
+
 @treinamento_bp.route("/treinamentos/agendadas", methods=["GET"])
 @login_required
 def listar_turmas_agendadas():
-    hoje = date.today()
-    turmas = (
-        TurmaTreinamento.query.filter(TurmaTreinamento.data_inicio > hoje)
-        .join(Treinamento)
-        .order_by(TurmaTreinamento.data_inicio)
-        .all()
+    return _listar_turmas(
+        [TurmaTreinamento.data_inicio > date.today()],
+        [TurmaTreinamento.data_inicio],
+        instrutor_resumido=True,
     )
 
-    dados = []
-    for turma in turmas:
-        dados.append(
-            {
-                "turma_id": turma.id,
-                "treinamento": turma.treinamento.to_dict(),
-                "data_inicio": (
-                    turma.data_inicio.isoformat() if turma.data_inicio else None
-                ),
-                "data_fim": turma.data_fim.isoformat() if turma.data_fim else None,
-                "local_realizacao": turma.local_realizacao,
-                "horario": turma.horario,
-                "instrutor_nome": (
-                    turma.instrutor.nome if turma.instrutor else "A definir"
-                ),
-                "teoria_online": turma.teoria_online,
-                "has_pratica": bool(getattr(turma.treinamento, "tem_pratica", False)),
-            }
-        )
-    return jsonify(dados)
-
 
 @treinamento_bp.route("/treinamentos/turmas-ativas", methods=["GET"])
 @login_required
 def listar_turmas_ativas():
     hoje = date.today()
-    turmas = (
-        TurmaTreinamento.query.filter(
-            db.and_(
-                TurmaTreinamento.data_inicio <= hoje, TurmaTreinamento.data_fim >= hoje
-            )
-        )
-        .join(Treinamento)
-        .order_by(TurmaTreinamento.data_inicio.desc())
-        .all()
+    return _listar_turmas(
+        [TurmaTreinamento.data_inicio <= hoje, TurmaTreinamento.data_fim >= hoje],
+        [TurmaTreinamento.data_inicio.desc()],
     )
 
-    dados = []
-    for turma in turmas:
-        dados.append(
-            {
-                "turma_id": turma.id,
-                "treinamento": turma.treinamento.to_dict(),
-                "data_inicio": (
-                    turma.data_inicio.isoformat() if turma.data_inicio else None
-                ),
-                "data_fim": turma.data_fim.isoformat() if turma.data_fim else None,
-                "local_realizacao": turma.local_realizacao,
-                "horario": turma.horario,
-                "instrutor": turma.instrutor.to_dict() if turma.instrutor else None,
-                "teoria_online": turma.teoria_online,
-                "has_pratica": bool(getattr(turma.treinamento, "tem_pratica", False)),
-            }
-        )
-    return jsonify(dados)
-
 
 @treinamento_bp.route("/treinamentos/historico", methods=["GET"])
 @login_required
 def listar_historico_turmas():
-    hoje = date.today()
-    turmas = (
-        TurmaTreinamento.query.filter(TurmaTreinamento.data_fim < hoje)
-        .join(Treinamento)
-        .order_by(TurmaTreinamento.data_inicio.desc())
-        .all()
+    return _listar_turmas(
+        [TurmaTreinamento.data_fim < date.today()],
+        [TurmaTreinamento.data_inicio.desc()],
     )
 
-    dados = []
-    for turma in turmas:
-        dados.append(
-            {
-                "turma_id": turma.id,
-                "treinamento": turma.treinamento.to_dict(),
-                "data_inicio": (
-                    turma.data_inicio.isoformat() if turma.data_inicio else None
-                ),
-                "data_fim": turma.data_fim.isoformat() if turma.data_fim else None,
-                "local_realizacao": turma.local_realizacao,
-                "horario": turma.horario,
-                "instrutor": turma.instrutor.to_dict() if turma.instrutor else None,
-                "teoria_online": turma.teoria_online,
-                "has_pratica": bool(getattr(turma.treinamento, "tem_pratica", False)),
-            }
-        )
-    return jsonify(dados)
-
 
 @treinamento_bp.route("/treinamentos/todas", methods=["GET"])
 @login_required
 def listar_todas_as_turmas():
-    turmas = TurmaTreinamento.query.join(Treinamento).order_by(Treinamento.nome).all()
-    dados = []
-    for turma in turmas:
-        dados.append(
-            {
-                "turma_id": turma.id,
-                "treinamento": turma.treinamento.to_dict(),
-                "data_inicio": (
-                    turma.data_inicio.isoformat() if turma.data_inicio else None
-                ),
-                "data_fim": turma.data_fim.isoformat() if turma.data_fim else None,
-                "local_realizacao": turma.local_realizacao,
-                "horario": turma.horario,
-                "instrutor": turma.instrutor.to_dict() if turma.instrutor else None,
-                "teoria_online": turma.teoria_online,
-                "has_pratica": bool(getattr(turma.treinamento, "tem_pratica", False)),
-            }
-        )
-    return jsonify(dados)
+    return _listar_turmas(ordem=[Treinamento.nome])
 
 
 @treinamento_bp.route("/treinamentos/<int:turma_id>/inscricoes", methods=["POST"])
@@ -299,6 +229,7 @@ def listar_meus_cursos():
 
 @treinamento_bp.route("/treinamentos/catalogo", methods=["GET"])
 @login_required
+@cache_http(Treinamento)
 def listar_catalogo_treinamentos():
     treins = Treinamento.query.order_by(Treinamento.nome).all()
     return jsonify([t.to_dict() for t in treins])
@@ -784,566 +715,18 @@ def exportar_inscricoes(turma_id):
         return jsonify({"erro": "Turma não encontrada"}), 404
 
     formato = request.args.get("formato", "xlsx").lower()
-    inscricoes = (
-        InscricaoTreinamento.query.filter_by(turma_id=turma_id)
-        .order_by(InscricaoTreinamento.nome)
-        .all()
+    if formato not in FORMATOS_EXPORTACAO_INSCRICOES:
+        return jsonify({"erro": "Formato inválido"}), 400
+
+    buffer = BytesIO()
+    escrever_exportacao_inscricoes(turma, formato, buffer)
+    buffer.seek(0)
+    return send_file(
+        buffer,
+        mimetype=FORMATOS_EXPORTACAO_INSCRICOES[formato],
+        as_attachment=True,
+        download_name=f"{nome_arquivo_inscricoes(turma)}.{formato}",
     )
-    treinamento = turma.treinamento
-
-    nome_arquivo_base = treinamento.nome.replace(" ", "_").lower()
-    data_hoje = datetime.now().strftime("%Y-%m-%d")
-    nome_arquivo_final = f"{nome_arquivo_base}_{data_hoje}"
-
-    def format_date(dt):
-        return dt.strftime("%d/%m/%Y") if dt else ""
-
-    if formato == "csv":
-        si = StringIO()
-        writer = csv.writer(si)
-        headers = [
-            "Nome",
-            "E-mail",
-            "CPF",
-            "Empresa",
-            "Presença Teoria",
-            "Presença Prática",
-            "Nota Teoria",
-            "Nota Prática",
-            "Status",
-        ]
-        writer.writerow(headers)
-        for i in inscricoes:
-            row = [
-                i.nome,
-                i.email,
-                i.cpf,
-                i.empresa,
-                "Sim" if i.presenca_teoria else "Não",
-                "Sim" if i.presenca_pratica else "Não",
-                i.nota_teoria,
-                i.nota_pratica,
-                i.status_aprovacao,
-            ]
-            writer.writerow(row)
-        output = make_response(si.getvalue())
-        output.headers["Content-Disposition"] = (
-            f"attachment; filename={nome_arquivo_final}.csv"
-        )
-        output.headers["Content-Type"] = "text/csv"
-        return output
-
-    if formato == "xlsx":
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Lista de Presença"
-
-        cor_azul_senai_hex = "00539F"
-        fill_azul = PatternFill(
-            start_color=cor_azul_senai_hex,
-            end_color=cor_azul_senai_hex,
-            fill_type="solid",
-        )
-        font_white_bold = Font(color="FFFFFF", bold=True)
-        font_bold = Font(bold=True)
-        thin_border_side = Side(style="thin")
-        thin_border = Border(
-            left=thin_border_side,
-            right=thin_border_side,
-            top=thin_border_side,
-            bottom=thin_border_side,
-        )
-
-        ws.merge_cells("A1:B2")
-        ws.merge_cells("C1:K2")
-
-        logo_path = _get_logo_path()
-        try:
-            if logo_path.exists():
-                img = OpenpyxlImage(str(logo_path))
-                img.anchor = "A1"
-                img.height = 40
-                ws.add_image(img)
-            else:
-                raise FileNotFoundError(str(logo_path))
-        except FileNotFoundError:
-            log.warning("Logo do SENAI não encontrado em %s", logo_path)
-            logo_cell = ws["A1"]
-            logo_cell.value = "SENAI"
-            logo_cell.font = font_white_bold
-            logo_cell.alignment = Alignment(horizontal="center", vertical="center")
-
-        title_cell = ws["C1"]
-        title_cell.value = "Lista de Presença"
-        title_cell.font = Font(color="FFFFFF", bold=True, size=20)
-        title_cell.fill = fill_azul
-        title_cell.alignment = Alignment(horizontal="center", vertical="center")
-
-        for row in ws["A1:B2"]:
-            for cell in row:
-                cell.fill = fill_azul
-
-        row_idx = 4
-        dados_treinamento = {
-            "Unidade:": "SENAI - Conceição do Mato Dentro",
-            "Nome Treinamento:": treinamento.nome,
-            "Instituição:": "SENAI",
-            "Local de Realização:": turma.local_realizacao or "N/D",
-            "Instrutor(es):": turma.instrutor.nome if turma.instrutor else "N/D",
-            "CONTEÚDO PROGRAMÁTICO:": (treinamento.conteudo_programatico or "").replace(
-                "\n", "\n"
-            ),
-        }
-
-        dados_treinamento_lado_direito = {
-            "Período:": f"{format_date(turma.data_inicio)} a {format_date(turma.data_fim)}",
-            "Duração:": f"{treinamento.carga_horaria or 'N/D'} horas",
-            "Horário:": turma.horario or "N/D",
-        }
-
-        for col in "ABCDEFGHIJ":
-            for row in range(row_idx, row_idx + 6):
-                ws[f"{col}{row}"].border = thin_border
-
-        for i, (label, value) in enumerate(dados_treinamento.items()):
-            current_row = row_idx + i
-            label_cell = ws[f"A{current_row}"]
-            label_cell.value = label
-            label_cell.fill = fill_azul
-            label_cell.font = font_white_bold
-            label_cell.alignment = Alignment(vertical="top")
-
-            value_cell = ws[f"B{current_row}"]
-            value_cell.value = value
-            value_cell.alignment = Alignment(vertical="top", wrap_text=True)
-
-            if label in ["Instituição:", "Local de Realização:", "Instrutor(es):"]:
-                ws.merge_cells(f"B{current_row}:F{current_row}")
-            else:
-                ws.merge_cells(f"B{current_row}:I{current_row}")
-
-        ws["G6"].value = "Período:"
-        ws["H6"].value = dados_treinamento_lado_direito["Período:"]
-        ws["G7"].value = "Duração:"
-        ws["H7"].value = dados_treinamento_lado_direito["Duração:"]
-        ws["G8"].value = "Horário:"
-        ws["H8"].value = dados_treinamento_lado_direito["Horário:"]
-
-        ws.merge_cells("B6:F6")
-        ws.merge_cells("B7:F7")
-        ws.merge_cells("B8:F8")
-        ws.merge_cells("H6:I6")
-        ws.merge_cells("H7:I7")
-        ws.merge_cells("H8:I8")
-
-        for cell_label, cell_value in [("G6", "H6"), ("G7", "H7"), ("G8", "H8")]:
-            ws[cell_label].fill = fill_azul
-            ws[cell_label].font = font_white_bold
-            ws[cell_label].alignment = Alignment(vertical="top")
-            ws[cell_value].alignment = Alignment(vertical="top")
-
-        row_idx += 7
-
-        ws.merge_cells(f"A{row_idx}:F{row_idx}")
-        info_cell = ws[f"A{row_idx}"]
-        info_cell.value = "Informações dos participantes"
-        info_cell.fill = fill_azul
-        info_cell.font = font_white_bold
-        info_cell.alignment = Alignment(horizontal="center", vertical="center")
-
-        ws.merge_cells(f"G{row_idx}:K{row_idx}")
-        rubrica_cell = ws[f"G{row_idx}"]
-        rubrica_cell.value = "Rubrica do participante conforme data de participação"
-        rubrica_cell.fill = fill_azul
-        rubrica_cell.font = font_white_bold
-        rubrica_cell.alignment = Alignment(horizontal="center", vertical="center")
-
-        row_idx += 1
-        headers = [
-            "Nº",
-            "CPF",
-            "Data de Nascimento",
-            "Nome do Participante",
-            "E-mail",
-            "Empresa",
-            "TEORIA",
-            "NOTA DA\nTEORIA",
-            "PRÁTICA",
-            "NOTA DA\nPRÁTICA",
-            "APROVADO /\nREPROVADO",
-        ]
-        for col_idx, header in enumerate(headers, 1):
-            cell = ws.cell(row=row_idx, column=col_idx, value=header)
-            cell.fill = fill_azul
-            cell.font = font_white_bold
-            cell.alignment = Alignment(
-                horizontal="center", vertical="center", wrap_text=True
-            )
-
-        row_idx += 1
-        for i, inscricao in enumerate(inscricoes, 1):
-            ws.cell(row=row_idx, column=1, value=i)
-            ws.cell(row=row_idx, column=2, value=inscricao.cpf)
-            ws.cell(
-                row=row_idx,
-                column=3,
-                value=(
-                    inscricao.data_nascimento.strftime("%d/%m/%Y")
-                    if inscricao.data_nascimento
-                    else ""
-                ),
-            )
-            ws.cell(row=row_idx, column=4, value=inscricao.nome)
-            ws.cell(row=row_idx, column=5, value=inscricao.email)
-            ws.cell(row=row_idx, column=6, value=inscricao.empresa)
-            row_idx += 1
-
-        for col in "ABCDEFGHIJK":
-            for row in range(row_idx - len(inscricoes) - 2, row_idx):
-                ws[f"{col}{row}"].border = thin_border
-                ws[f"{col}{row}"].alignment = Alignment(
-                    horizontal="center", vertical="center"
-                )
-
-        row_idx += 1
-        ws.merge_cells(f"A{row_idx}:K{row_idx+2}")
-        obs_cell = ws[f"A{row_idx}"]
-        obs_cell.value = "Observações:"
-        obs_cell.font = font_bold
-        obs_cell.alignment = Alignment(horizontal="left", vertical="top")
-        obs_cell.border = thin_border
-
-        row_idx += 4
-        ws.merge_cells(f"A{row_idx}:K{row_idx+1}")
-        ass_cell = ws[f"A{row_idx}"]
-        ass_cell.value = "Assinatura do(s) instrutor(es) / Responsável (eis):"
-        ass_cell.font = font_bold
-        ass_cell.alignment = Alignment(horizontal="left", vertical="top")
-        ass_cell.border = Border(bottom=thin_border_side)
-
-        ws.column_dimensions["A"].width = 5
-        ws.column_dimensions["B"].width = 18
-        ws.column_dimensions["C"].width = 15
-        ws.column_dimensions["D"].width = 35
-        ws.column_dimensions["E"].width = 30
-        ws.column_dimensions["F"].width = 20
-        ws.column_dimensions["G"].width = 10
-        ws.column_dimensions["H"].width = 10
-        ws.column_dimensions["I"].width = 10
-        ws.column_dimensions["J"].width = 10
-        ws.column_dimensions["K"].width = 15
-        ws.row_dimensions[9].height = 40
-
-        buf = BytesIO()
-        wb.save(buf)
-        buf.seek(0)
-        return send_file(
-            buf,
-            mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            as_attachment=True,
-            download_name=f"{nome_arquivo_final}.xlsx",
-        )
-
-    if formato == "pdf":
-        buffer = BytesIO()
-
-        doc = SimpleDocTemplate(
-            buffer,
-            pagesize=letter,
-            rightMargin=18,
-            leftMargin=18,
-            topMargin=18,
-            bottomMargin=18,
-        )
-        elements = []
-        styles = getSampleStyleSheet()
-
-        cor_azul_senai_rgb = colors.Color(
-            red=(0 / 255), green=(83 / 255), blue=(159 / 255)
-        )
-
-        style_normal = ParagraphStyle(name="Normal", fontSize=6.5, leading=7.5)
-        style_bold_white = ParagraphStyle(
-            name="BoldWhite",
-            parent=style_normal,
-            fontName="Helvetica-Bold",
-            textColor=colors.white,
-        )
-        style_h1_centralizado = ParagraphStyle(
-            name="h1_centralizado",
-            parent=styles["h1"],
-            alignment=1,
-            textColor=colors.white,
-            fontSize=14,
-        )
-
-        try:
-            logo_path = _get_logo_path()
-            if logo_path.exists():
-                logo = ReportlabImage(
-                    str(logo_path), width=1.2 * inch, height=0.4 * inch
-                )
-                logo.hAlign = "CENTER"
-            else:
-                raise FileNotFoundError(str(logo_path))
-        except Exception as exc:
-            log.warning("Falha ao carregar o logo do SENAI: %s", exc)
-            logo = Paragraph("<b>SENAI</b>", style_normal)
-
-        titulo = Paragraph("<b>Lista de Presença</b>", style_h1_centralizado)
-
-        header_logo_width = 1.45 * inch
-        header_table = Table(
-            [[logo, titulo]],
-            colWidths=[header_logo_width, doc.width - header_logo_width],
-        )
-        header_table.setStyle(
-            TableStyle(
-                [
-                    ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-                    ("BACKGROUND", (0, 0), (-1, -1), cor_azul_senai_rgb),
-                ]
-            )
-        )
-        elements.append(header_table)
-        elements.append(Spacer(1, 0.05 * inch))
-
-        dados_treinamento = [
-            [
-                Paragraph("<b>Unidade:</b>", style_bold_white),
-                Paragraph("SENAI - Conceição do Mato Dentro", style_normal),
-                None,
-                None,
-            ],
-            [
-                Paragraph("<b>Nome Treinamento:</b>", style_bold_white),
-                Paragraph(treinamento.nome, style_normal),
-                None,
-                None,
-            ],
-            [
-                Paragraph("<b>Instituição:</b>", style_bold_white),
-                Paragraph("SENAI", style_normal),
-                Paragraph("<b>Período:</b>", style_bold_white),
-                Paragraph(
-                    f"{format_date(turma.data_inicio)} a {format_date(turma.data_fim)}",
-                    style_normal,
-                ),
-            ],
-            [
-                Paragraph("<b>Local de Realização:</b>", style_bold_white),
-                Paragraph(turma.local_realizacao or "N/D", style_normal),
-                Paragraph("<b>Duração:</b>", style_bold_white),
-                Paragraph(f"{treinamento.carga_horaria or 'N/D'} horas", style_normal),
-            ],
-            [
-                Paragraph("<b>Instrutor(es):</b>", style_bold_white),
-                Paragraph(
-                    turma.instrutor.nome if turma.instrutor else "N/D", style_normal
-                ),
-                Paragraph("<b>Horário:</b>", style_bold_white),
-                Paragraph(turma.horario or "N/D", style_normal),
-            ],
-            [
-                Paragraph("<b>CONTEÚDO PROGRAMÁTICO:</b>", style_bold_white),
-                Paragraph(
-                    (treinamento.conteudo_programatico or "").replace("\n", "<br/>"),
-                    style_normal,
-                ),
-                None,
-                None,
-            ],
-        ]
-
-        col1 = 1.25 * inch
-        col3 = 1.0 * inch
-        col4 = 1.45 * inch
-        col2 = doc.width - (col1 + col3 + col4)
-        if col2 < 2.0 * inch:
-            col2 = 2.0 * inch
-            col4 = doc.width - (col1 + col2 + col3)
-        if col4 < 1.2 * inch:
-            col4 = 1.2 * inch
-            col2 = doc.width - (col1 + col3 + col4)
-        tabela_dados = Table(
-            dados_treinamento,
-            colWidths=[col1, col2, col3, col4],
-        )
-        tabela_dados.setStyle(
-            TableStyle(
-                [
-                    ("VALIGN", (0, 0), (-1, -1), "TOP"),
-                    ("BOX", (0, 0), (-1, -1), 1, colors.black),
-                    ("INNERGRID", (0, 0), (-1, -1), 0.25, colors.black),
-                    ("SPAN", (1, 0), (-1, 0)),
-                    ("SPAN", (1, 1), (-1, 1)),
-                    ("SPAN", (1, 5), (-1, 5)),
-                    ("BACKGROUND", (0, 0), (0, -1), cor_azul_senai_rgb),
-                    ("BACKGROUND", (2, 2), (2, 4), cor_azul_senai_rgb),
-                    ("TEXTCOLOR", (0, 0), (0, -1), colors.white),
-                    ("TEXTCOLOR", (2, 2), (2, 4), colors.white),
-                ]
-            )
-        )
-        elements.append(tabela_dados)
-        elements.append(Spacer(1, 0.1 * inch))
-
-        style_header_participantes = ParagraphStyle(
-            name="HeaderParticipantes",
-            fontSize=5.8,
-            leading=6.6,
-            alignment=1,
-            fontName="Helvetica-Bold",
-            textColor=colors.white,
-        )
-
-        tabela_header = [
-            "Nº",
-            "Nome do Participante",
-            "Empresa",
-            "TEORIA",
-            Paragraph("NOTA DA<br/>TEORIA", style_header_participantes),
-            "PRÁTICA",
-            Paragraph("NOTA DA<br/>PRÁTICA", style_header_participantes),
-            Paragraph("APROVADO /<br/>REPROVADO", style_header_participantes),
-        ]
-
-        cabecalhos_agrupados = [
-            [
-                Paragraph("<b>Informações dos participantes</b>", style_bold_white),
-                None,
-                None,
-                Paragraph(
-                    "<b>Rubrica do participante conforme data de participação</b>",
-                    style_bold_white,
-                ),
-                None,
-                None,
-                None,
-                None,
-            ],
-            [
-                (
-                    Paragraph(f"<b>{h}</b>", style_header_participantes)
-                    if isinstance(h, str)
-                    else h
-                )
-                for h in tabela_header
-            ],
-        ]
-
-        dados_alunos = []
-        for idx, i in enumerate(inscricoes, 1):
-            dados_alunos.append(
-                [
-                    str(idx),
-                    Paragraph(i.nome, style_normal),
-                    i.empresa or "",
-                    "",
-                    "",
-                    "",
-                    "",
-                    "",
-                ]
-            )
-
-        col_widths = [
-            0.05 * doc.width,
-            0.34 * doc.width,
-            0.2 * doc.width,
-            0.08 * doc.width,
-            0.08 * doc.width,
-            0.08 * doc.width,
-            0.08 * doc.width,
-            0.09 * doc.width,
-        ]
-
-        num_participantes = len(dados_alunos)
-        alturas_linhas = [
-            0.28 * inch,
-            0.26 * inch,
-        ] + [0.18 * inch] * num_participantes
-
-        tabela_alunos = Table(
-            cabecalhos_agrupados + dados_alunos,
-            colWidths=col_widths,
-            rowHeights=alturas_linhas,
-        )
-
-        tabela_alunos.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, 1), cor_azul_senai_rgb),
-                    ("TEXTCOLOR", (0, 0), (-1, 1), colors.white),
-                    ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                    ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-                    ("BOX", (0, 0), (-1, -1), 1, colors.black),
-                    ("INNERGRID", (0, 0), (-1, -1), 0.25, colors.black),
-                    ("SPAN", (0, 0), (2, 0)),
-                    ("SPAN", (3, 0), (-1, 0)),
-                ]
-            )
-        )
-
-        obs_table = Table(
-            [[Paragraph("<b>Observações:</b>", style_normal)], [""]],
-            colWidths=[doc.width],
-            rowHeights=[0.14 * inch, 0.35 * inch],
-        )
-        obs_table.setStyle(
-            TableStyle(
-                [
-                    ("BOX", (0, 0), (-1, -1), 1, colors.black),
-                    ("VALIGN", (0, 0), (-1, -1), "TOP"),
-                ]
-            )
-        )
-
-        ass_table = Table(
-            [
-                [
-                    Paragraph(
-                        "<b>Assinatura do(s) instrutor(es) / Responsável (eis):</b>",
-                        style_normal,
-                    )
-                ],
-                [""],
-            ],
-            colWidths=[doc.width],
-            rowHeights=[0.14 * inch, 0.22 * inch],
-        )
-        ass_table.setStyle(
-            TableStyle(
-                [
-                    ("BOX", (0, 0), (-1, -1), 1, colors.black),
-                    ("VALIGN", (0, 0), (-1, -1), "TOP"),
-                    ("LINEBELOW", (0, 1), (0, 1), 1, colors.black),
-                ]
-            )
-        )
-
-        conteudo_final = KeepTogether(
-            [
-                tabela_alunos,
-                Spacer(1, 0.1 * inch),
-                obs_table,
-                Spacer(1, 0.1 * inch),
-                ass_table,
-            ]
-        )
-        elements.append(conteudo_final)
-
-        doc.build(elements)
-
-        buffer.seek(0)
-        return send_file(
-            buffer,
-            mimetype="application/pdf",
-            as_attachment=True,
-            download_name=f"{nome_arquivo_final}.pdf",
-        )
-
-    return jsonify({"erro": "Formato inválido"}), 400
 
 
 @treinamento_bp.route("/treinamentos/turmas/<int:turma_id>", methods=["GET"])
@@ -1488,10 +871,13 @@ def create_inscricao_treinamento_externo(turma_id):
 @treinamento_bp.route("/treinamentos/logs", methods=["GET"])
 @admin_required
 def listar_logs_treinamentos():
+    per_page = limitar_por_pagina(
+        request.args.get("per_page", type=int), LOGS_POR_PAGINA_PADRAO, 200
+    )
     try:
-        logs = (
-            db.session.query(AuditLog, User.nome)
-            .join(User, User.id == AuditLog.user_id)
+        consulta = (
+            AuditLog.query.join(AuditLog.user)
+            .options(contains_eager(AuditLog.user))
             .filter(
                 AuditLog.entity.in_(
                     [
@@ -1501,12 +887,20 @@ def listar_logs_treinamentos():
                     ]
                 )
             )
-            .order_by(AuditLog.timestamp.desc())
-            .all()
         )
+        try:
+            logs, proximo = paginar_por_chave(
+                consulta,
+                AuditLog.timestamp,
+                AuditLog.id,
+                request.args.get("cursor"),
+                per_page,
+            )
+        except ValueError as exc:
+            return jsonify({"erro": str(exc)}), 400
 
         resultado = []
-        for log, nome_usuario in logs:
+        for log in logs:
             detalhes = log.details or {}
             info = ""
 
@@ -1540,13 +934,15 @@ def listar_logs_treinamentos():
                 {
                     "id": log.id,
                     "timestamp": log.timestamp.isoformat(),
-                    "usuario": nome_usuario,
+                    "usuario": log.user.nome,
                     "acao": log.action,
                     "info": info,
                 }
             )
 
-        return jsonify(resultado)
+        return jsonify(
+            {"items": resultado, "per_page": per_page, "next_cursor": proximo}
+        )
     except SQLAlchemyError as e:
         db.session.rollback()
         return handle_internal_error(e)
@@ -10,9 +10,9 @@ from conecta_senai.services.email_service import (
     notificar_atualizacao_turma,
     EmailService,
 )
+from conecta_senai.services.email_outbox_service import enfileirar_email
 from conecta_senai.auth import admin_required
 from datetime import datetime
-import time
 
 turma_bp = Blueprint("turma", __name__)
 
@@ -207,9 +207,7 @@ def convocar_todos_da_turma(turma_id: int):
     convocados_sucesso = 0
     for inscricao in inscricoes_para_convocar:
         try:
-
-            time.sleep(0.6)
-            enviar_convocacao(inscricao, turma)
+            enviar_convocacao(inscricao, turma, send_email_fn=enfileirar_email)
             inscricao.convocado_em = datetime.utcnow()
             convocados_sucesso += 1
         except Exception as e:
@@ -242,6 +240,7 @@ def convocar_todos_da_turma(turma_id: int):
             "message": (
                 f"{convocados_sucesso} de {total_inscricoes} participantes "
                 "convocados com sucesso."
-            )
+            ),
+            "emails_enfileirados": convocados_sucesso,
         }
     )
@@ -10,14 +10,15 @@ from conecta_senai.models import db
 from conecta_senai.models.user import User
 from conecta_senai.models.agendamento import Agendamento, Notificacao
 from conecta_senai.models.ocupacao import Ocupacao
+from conecta_senai.services.ocupacao_resumo_service import descontar_ocupacoes_onde
 from conecta_senai.repositories.user_repository import UserRepository
 from conecta_senai.models.refresh_token import RefreshToken
 import hashlib
-from conecta_senai.config.redis import redis_conn
 from sqlalchemy.exc import SQLAlchemyError
 import requests
 from werkzeug.security import check_password_hash
 from conecta_senai.utils.error_handler import handle_internal_error
+from conecta_senai.auth.cache_usuarios import invalidar_usuario, revogar_token
 from conecta_senai.auth import (
     verificar_autenticacao,
     verificar_admin,
@@ -29,7 +30,6 @@ from conecta_senai.services import user_service
 from pydantic import ValidationError
 from conecta_senai.schemas.user import UserCreateSchema, UserUpdateSchema
 
-
 PASSWORD_REGEX = user_service.PASSWORD_REGEX
 
 user_bp = Blueprint("user", __name__)
@@ -319,6 +319,7 @@ def atualizar_usuario(id):
 
     try:
         UserRepository.commit()
+        invalidar_usuario(usuario.id)
         return jsonify(usuario.to_dict())
     except SQLAlchemyError as e:
         UserRepository.rollback()
@@ -367,6 +368,7 @@ def remover_usuario(id):
                 ).delete(synchronize_session=False)
 
             Agendamento.query.filter_by(usuario_id=id).delete(synchronize_session=False)
+            descontar_ocupacoes_onde(Ocupacao.usuario_id == id)
             Ocupacao.query.filter_by(usuario_id=id).delete(synchronize_session=False)
         else:
 
@@ -396,6 +398,7 @@ def remover_usuario(id):
                 )
 
         UserRepository.delete(usuario)
+        invalidar_usuario(id)
         return jsonify({"mensagem": "Usuário removido com sucesso"})
     except SQLAlchemyError as e:
         UserRepository.rollback()
@@ -571,10 +574,8 @@ def logout():
                 options={"verify_exp": False},
             )
             jti = dados.get("jti")
-            exp = datetime.utcfromtimestamp(dados["exp"])
-            ttl = exp - datetime.utcnow()
-            if ttl.total_seconds() > 0 and jti:
-                redis_conn.setex(jti, ttl, "revoked")
+            if jti:
+                revogar_token(jti, float(dados["exp"]))
         except jwt.InvalidTokenError:
             return jsonify({"erro": "Token inválido"}), 401
 
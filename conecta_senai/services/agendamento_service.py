@@ -1,5 +1,5 @@
 from flask import jsonify, make_response, send_file
-from datetime import datetime
+from datetime import date, datetime
 import json
 from io import StringIO, BytesIO
 from sqlalchemy.exc import SQLAlchemyError
@@ -9,27 +9,32 @@ from conecta_senai.models.agendamento import Agendamento
 from conecta_senai.models.laboratorio_turma import Laboratorio
 from conecta_senai.models.user import User
 from conecta_senai.utils.error_handler import handle_internal_error
-from conecta_senai.utils.audit import log_action
+from conecta_senai.utils.audit import log_action, registrar_evento
 from conecta_senai.models.log_agendamento import LogAgendamento
 from conecta_senai.routes.user import verificar_admin
 
 
 def registrar_log_agenda(user, acao, antes, depois):
-    try:
-        ref = depois or antes or {}
-        log = LogAgendamento(
-            usuario=user.nome if user else "Sistema",
-            tipo_acao=acao,
-            laboratorio=ref.get("laboratorio"),
-            turno=ref.get("turno"),
-            data_agendamento=ref.get("data"),
-            dados_antes=antes,
-            dados_depois=depois,
-        )
-        db.session.add(log)
-        db.session.commit()
-    except Exception:
-        db.session.rollback()
+    ref = depois or antes or {}
+    data_agendamento = ref.get("data")
+    if isinstance(data_agendamento, str):
+        try:
+            data_agendamento = date.fromisoformat(data_agendamento)
+        except ValueError:
+            data_agendamento = None
+    registrar_evento(
+        LogAgendamento.__table__,
+        {
+            "usuario": user.nome if user else "Sistema",
+            "tipo_acao": acao,
+            "laboratorio": ref.get("laboratorio"),
+            "turno": ref.get("turno"),
+            "data_agendamento": data_agendamento,
+            "dados_antes": antes,
+            "dados_depois": depois,
+            "timestamp": datetime.utcnow(),
+        },
+    )
 
 
 def listar_agendamentos(user):
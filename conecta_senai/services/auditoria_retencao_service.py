@@ -0,0 +1,207 @@
+"""Partições mensais e retenção das tabelas de log de auditoria.
+
+No PostgreSQL as tabelas de log são particionadas por intervalo de
+``timestamp`` (uma partição por mês, ``<tabela>_pAAAAMM``, mais uma partição
+padrão). ``garantir_particoes`` cria as partições dos próximos meses e roda no
+boot e diariamente no scheduler. ``arquivar_logs`` grava os meses além da
+retenção em JSONL comprimido e então descarta a partição (ou apaga o intervalo,
+em bancos sem particionamento, como o SQLite).
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import os
+from datetime import date, datetime
+from pathlib import Path
+
+from flask import current_app
+from sqlalchemy import delete, func, select, text
+
+from conecta_senai.config.esquema import registrar_verificacao
+from conecta_senai.models import db
+from conecta_senai.models.audit_log import AuditLog
+from conecta_senai.models.log_agendamento import LogAgendamento
+from conecta_senai.models.log_rateio import LogLancamentoRateio
+
+log = logging.getLogger(__name__)
+
+TABELAS_AUDITORIA = (
+    AuditLog.__table__,
+    LogAgendamento.__table__,
+    LogLancamentoRateio.__table__,
+)
+MESES_A_FRENTE_PADRAO = 2
+RETENCAO_MESES_PADRAO = 12
+LOTE_EXPORTACAO = 5000
+
+
+def inicio_do_mes(dia: date, deslocamento: int = 0) -> date:
+    indice = dia.year * 12 + dia.month - 1 + deslocamento
+    return date(indice // 12, indice % 12 + 1, 1)
+
+
+def nome_particao(tabela: str, mes: date) -> str:
+    return f"{tabela}_p{mes:%Y%m}"
+
+
+def _postgres() -> bool:
+    return db.engine.dialect.name == "postgresql"
+
+
+def _particionada(conn, tabela: str) -> bool:
+    return bool(
+        conn.execute(
+            text(
+                "SELECT 1 FROM pg_partitioned_table pt "
+                "JOIN pg_class c ON c.oid = pt.partrelid WHERE c.relname = :tabela"
+            ),
+            {"tabela": tabela},
+        ).scalar()
+    )
+
+
+def _particao_existe(conn, nome: str) -> bool:
+    return conn.execute(text("SELECT to_regclass(:nome)"), {"nome": nome}).scalar()
+
+
+def garantir_particoes(
+    meses_a_frente: int = MESES_A_FRENTE_PADRAO, referencia: date | None = None
+) -> list[str]:
+    """Cria as partições do mês de ``referencia`` até ``meses_a_frente`` meses depois."""
+    if not _postgres():
+        return []
+    mes_atual = inicio_do_mes(referencia or date.today())
+    criadas = []
+    with db.engine.begin() as conn:
+        for tabela in TABELAS_AUDITORIA:
+            if not _particionada(conn, tabela.name):
+                continue
+            for deslocamento in range(meses_a_frente + 1):
+                mes = inicio_do_mes(mes_atual, deslocamento)
+                nome = nome_particao(tabela.name, mes)
+                if _particao_existe(conn, nome):
+                    continue
+                conn.execute(
+                    text(
+                        f'CREATE TABLE "{nome}" PARTITION OF "{tabela.name}" '
+                        f"FOR VALUES FROM ('{mes}') TO "
+                        f"('{inicio_do_mes(mes, 1)}')"
+                    )
+                )
+                criadas.append(nome)
+    if criadas:
+        log.info("Partições de auditoria criadas: %s", ", ".join(criadas))
+    return criadas
+
+
+def diretorio_arquivo() -> Path:
+    return Path(
+        current_app.config.get("AUDITORIA_ARQUIVO_DIR")
+        or os.path.join(current_app.instance_path, "auditoria")
+    )
+
+
+def _serializar(valor):
+    if isinstance(valor, (datetime, date)):
+        return valor.isoformat()
+    return str(valor)
+
+
+def _arquivo_livre(pasta: Path, mes: date) -> Path:
+    """Primeiro ``<AAAA-MM>[.N].jsonl.gz`` ainda inexistente em ``pasta``."""
+    arquivo = pasta / f"{mes:%Y-%m}.jsonl.gz"
+    sufixo = 0
+    while arquivo.exists():
+        sufixo += 1
+        arquivo = pasta / f"{mes:%Y-%m}.{sufixo}.jsonl.gz"
+    return arquivo
+
+
+def _exportar_mes(
+    tabela, mes: date, inicio: datetime, fim: datetime, pasta: Path
+) -> tuple[int, Path | None]:
+    """Grava as linhas do mês num arquivo novo; nunca sobrescreve um arquivo."""
+    pasta.mkdir(parents=True, exist_ok=True)
+    temporario = pasta / f"{mes:%Y-%m}.jsonl.gz.tmp"
+    consulta = (
+        select(tabela)
+        .where(tabela.c.timestamp >= inicio, tabela.c.timestamp < fim)
+        .order_by(tabela.c.timestamp, tabela.c.id)
+        .execution_options(yield_per=LOTE_EXPORTACAO)
+    )
+    linhas = 0
+    with gzip.open(temporario, "wt", encoding="utf-8") as destino:
+        for linha in db.session.execute(consulta).mappings():
+            destino.write(json.dumps(dict(linha), default=_serializar))
+            destino.write("\n")
+            linhas += 1
+    if not linhas:
+        temporario.unlink()
+        return 0, None
+    arquivo = _arquivo_livre(pasta, mes)
+    temporario.rename(arquivo)
+    return linhas, arquivo
+
+
+def _descartar_mes(tabela, mes: date, inicio: datetime, fim: datetime) -> None:
+    nome = nome_particao(tabela.name, mes)
+    with db.engine.begin() as conn:
+        if _postgres() and _particao_existe(conn, nome):
+            conn.execute(text(f'ALTER TABLE "{tabela.name}" DETACH PARTITION "{nome}"'))
+            conn.execute(text(f'DROP TABLE "{nome}"'))
+        # Linhas do intervalo que tenham caído na partição padrão (ou numa
+        # tabela sem particionamento) são apagadas diretamente.
+        conn.execute(
+            delete(tabela).where(tabela.c.timestamp >= inicio, tabela.c.timestamp < fim)
+        )
+
+
+def arquivar_logs(
+    meses_retencao: int = RETENCAO_MESES_PADRAO,
+    destino: Path | None = None,
+    referencia: date | None = None,
+) -> list[dict]:
+    """Arquiva e remove os meses anteriores à janela de retenção.
+
+    Cada mês vira ``<destino>/<tabela>/<AAAA-MM>.jsonl.gz``; o arquivo é
+    gravado por completo antes de os registros serem apagados, então uma
+    execução interrompida pode ser repetida com segurança. Um arquivo já
+    existente para o mês nunca é substituído: as linhas restantes vão para
+    ``<AAAA-MM>.1.jsonl.gz``, ``<AAAA-MM>.2.jsonl.gz`` e assim por diante.
+    """
+    destino = Path(destino) if destino else diretorio_arquivo()
+    corte = inicio_do_mes(referencia or date.today(), -meses_retencao)
+    arquivados = []
+    for tabela in TABELAS_AUDITORIA:
+        mais_antigo = db.session.execute(
+            select(func.min(tabela.c.timestamp)).where(tabela.c.timestamp < corte)
+        ).scalar()
+        if mais_antigo is None:
+            continue
+        mes = inicio_do_mes(mais_antigo)
+        while mes < corte:
+            proximo = inicio_do_mes(mes, 1)
+            inicio = datetime.combine(mes, datetime.min.time())
+            fim = datetime.combine(proximo, datetime.min.time())
+            linhas, arquivo = _exportar_mes(
+                tabela, mes, inicio, fim, destino / tabela.name
+            )
+            db.session.commit()
+            _descartar_mes(tabela, mes, inicio, fim)
+            if linhas:
+                arquivados.append(
+                    {
+                        "tabela": tabela.name,
+                        "mes": f"{mes:%Y-%m}",
+                        "linhas": linhas,
+                        "arquivo": str(arquivo),
+                    }
+                )
+            mes = proximo
+    return arquivados
+
+
+registrar_verificacao("particoes_auditoria", ajuste=garantir_particoes)
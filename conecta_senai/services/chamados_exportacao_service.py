@@ -0,0 +1,95 @@
+"""Planilhas XLSX com todos os chamados de suporte de TI e de manutenção.
+
+Usadas pelas rotas ``/chamados/exportar_excel`` e pela fila de exportações.
+"""
+
+from __future__ import annotations
+
+from typing import Callable
+
+from openpyxl import Workbook
+from openpyxl.styles import Alignment, Font, PatternFill
+
+from conecta_senai.models.manutencao_chamado import ManutencaoChamado
+from conecta_senai.models.suporte_chamado import SuporteChamado
+
+CABECALHOS = [
+    "ID",
+    "Nome solicitante",
+    "Email",
+    "Área",
+    "Tipo de equipamento",
+    "Nível urgência",
+    "Status",
+    "Abertura",
+    "Início atendimento",
+    "Encerramento",
+    "Última atualização",
+    "Observações",
+]
+LARGURAS_COLUNAS = [8, 25, 30, 20, 20, 15, 15, 20, 20, 20, 20, 40]
+
+
+def _fmt(dt):
+    return dt.strftime("%Y-%m-%d %H:%M:%S") if dt else ""
+
+
+def _escrever_planilha(chamados, nome_tipo: Callable[[object], str], destino) -> None:
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Chamados Suporte TI"
+
+    header_font = Font(bold=True, color="FFFFFF")
+    header_fill = PatternFill(
+        start_color="0066CC", end_color="0066CC", fill_type="solid"
+    )
+    header_alignment = Alignment(horizontal="center", vertical="center")
+
+    for col_num, header in enumerate(CABECALHOS, 1):
+        cell = ws.cell(row=1, column=col_num, value=header)
+        cell.font = header_font
+        cell.fill = header_fill
+        cell.alignment = header_alignment
+
+    for row_num, c in enumerate(chamados, 2):
+        ws.cell(row=row_num, column=1, value=c.id)
+        ws.cell(
+            row=row_num,
+            column=2,
+            value=c.nome_solicitante or (c.user.nome if c.user else ""),
+        )
+        ws.cell(row=row_num, column=3, value=c.email)
+        ws.cell(row=row_num, column=4, value=c.area or "")
+        ws.cell(row=row_num, column=5, value=nome_tipo(c))
+        ws.cell(row=row_num, column=6, value=c.nivel_urgencia or "")
+        ws.cell(row=row_num, column=7, value=c.status or "")
+        ws.cell(row=row_num, column=8, value=_fmt(c.created_at))
+        ws.cell(row=row_num, column=9, value=_fmt(c.inicio_atendimento_at))
+        ws.cell(row=row_num, column=10, value=_fmt(c.encerrado_at))
+        ws.cell(row=row_num, column=11, value=_fmt(c.updated_at))
+        ws.cell(row=row_num, column=12, value=(c.observacoes or ""))
+
+    for col_num, width in enumerate(LARGURAS_COLUNAS, 1):
+        ws.column_dimensions[ws.cell(row=1, column=col_num).column_letter].width = width
+
+    wb.save(destino)
+
+
+def escrever_planilha_chamados_suporte_ti(destino) -> None:
+    chamados = SuporteChamado.query.order_by(SuporteChamado.created_at.asc()).all()
+    _escrever_planilha(
+        chamados,
+        lambda c: c.tipo_equipamento.nome if c.tipo_equipamento else "",
+        destino,
+    )
+
+
+def escrever_planilha_chamados_manutencao(destino) -> None:
+    chamados = ManutencaoChamado.query.order_by(
+        ManutencaoChamado.created_at.asc()
+    ).all()
+    _escrever_planilha(
+        chamados,
+        lambda c: c.tipo_servico.nome if c.tipo_servico else "",
+        destino,
+    )
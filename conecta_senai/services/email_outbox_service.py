@@ -0,0 +1,398 @@
+"""Caixa de saída de e-mails enviada em segundo plano.
+
+As rotas apenas gravam a mensagem na tabela ``email_outbox`` (na mesma
+transação da alteração que a originou). O despachante drena a fila respeitando
+um token bucket compartilhado via Redis, com retentativas em backoff
+exponencial e *dead-letter* (status ``falhou``) após ``max_tentativas``.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time as time_module
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+from flask import current_app
+from resend.exceptions import ResendError
+
+from conecta_senai.config import redis as redis_config
+from conecta_senai.models import db
+from conecta_senai.models.email_outbox import EmailOutbox
+from conecta_senai.services import email_service
+from conecta_senai.services.email_service import Address, _normalize
+
+log = logging.getLogger(__name__)
+
+CHAVE_BUCKET_PADRAO = "email_outbox:token_bucket"
+
+_SCRIPT_TOKEN_BUCKET = """
+local capacidade = tonumber(ARGV[1])
+local taxa = tonumber(ARGV[2])
+local pedido = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local agora = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local estado = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(estado[1]) or capacidade
+local ts = tonumber(estado[2]) or agora
+tokens = math.min(capacidade, tokens + math.max(0, agora - ts) * taxa)
+local espera = 0
+if tokens >= pedido then
+  tokens = tokens - pedido
+else
+  espera = (pedido - tokens) / taxa
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', agora)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacidade / taxa) + 1)
+return tostring(espera)
+"""
+
+
+class TokenBucket:
+    """Token bucket compartilhado entre processos através do Redis.
+
+    Sem Redis disponível (ex.: ``DISABLE_REDIS=1``) o controle passa a ser
+    feito em memória, valendo apenas para o processo atual.
+    """
+
+    def __init__(
+        self,
+        taxa: float,
+        capacidade: Optional[float] = None,
+        chave: str = CHAVE_BUCKET_PADRAO,
+        redis_client: Any = None,
+    ) -> None:
+        self.taxa = float(taxa)
+        self.capacidade = float(capacidade or taxa)
+        self.chave = chave
+        self.redis_client = redis_client
+        self.lock = threading.Lock()
+        self._tokens = self.capacidade
+        self._ts = time_module.monotonic()
+
+    def _cliente(self) -> Any:
+        return self.redis_client or redis_config.redis_conn
+
+    def _consumir_local(self, tokens: float) -> float:
+        with self.lock:
+            agora = time_module.monotonic()
+            self._tokens = min(
+                self.capacidade, self._tokens + (agora - self._ts) * self.taxa
+            )
+            self._ts = agora
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.taxa
+
+    def tentar_consumir(self, tokens: float = 1) -> float:
+        """Consome ``tokens`` e retorna 0, ou o tempo (s) até haver saldo."""
+        cliente = self._cliente()
+        if hasattr(cliente, "eval"):
+            try:
+                espera = cliente.eval(
+                    _SCRIPT_TOKEN_BUCKET,
+                    1,
+                    self.chave,
+                    self.capacidade,
+                    self.taxa,
+                    tokens,
+                )
+                return float(espera)
+            except Exception as exc:
+                log.warning("Token bucket no Redis indisponível: %s", exc)
+        return self._consumir_local(tokens)
+
+    def aguardar(self, tokens: float = 1, timeout: Optional[float] = None) -> bool:
+        limite = None if timeout is None else time_module.monotonic() + timeout
+        while True:
+            espera = self.tentar_consumir(tokens)
+            if espera <= 0:
+                return True
+            if limite is not None and time_module.monotonic() + espera > limite:
+                return False
+            time_module.sleep(espera)
+
+
+_bucket: TokenBucket | None = None
+_bucket_lock = threading.Lock()
+
+
+def obter_token_bucket() -> TokenBucket:
+    global _bucket
+    taxa = float(current_app.config.get("EMAIL_RATE_LIMIT_POR_SEGUNDO", 2))
+    with _bucket_lock:
+        if _bucket is None or _bucket.taxa != taxa:
+            _bucket = TokenBucket(taxa)
+        return _bucket
+
+
+def enfileirar_email(
+    to: Address,
+    subject: str,
+    html: str,
+    text: Optional[str] = None,
+    cc: Address | None = None,
+    bcc: Address | None = None,
+    reply_to: Optional[str] = None,
+    headers: Optional[Dict[str, str]] = None,
+    tags: Optional[List[Dict[str, str]]] = None,
+    attachments: Optional[List[Dict[str, Any]]] = None,
+    from_: Optional[str] = None,
+    *,
+    referencia: Optional[str] = None,
+) -> EmailOutbox:
+    """Grava o e-mail na caixa de saída; o commit fica a cargo de quem chama.
+
+    Aceita os mesmos argumentos de :func:`email_service.send_email`, podendo
+    ser usado como ``send_email_fn``.
+    """
+    mensagem = EmailOutbox(
+        destinatarios=_normalize(to),
+        assunto=subject,
+        html=html,
+        texto=text,
+        cc=_normalize(cc),
+        bcc=_normalize(bcc),
+        reply_to=reply_to,
+        headers=headers,
+        tags=tags,
+        anexos=list(attachments) if attachments else None,
+        remetente=from_,
+        referencia=referencia,
+        status="pendente",
+        tentativas=0,
+        max_tentativas=int(current_app.config.get("EMAIL_OUTBOX_MAX_TENTATIVAS", 5)),
+        proxima_tentativa_em=datetime.utcnow(),
+    )
+    db.session.add(mensagem)
+    return mensagem
+
+
+def _calcular_backoff(tentativas: int) -> timedelta:
+    base = int(current_app.config.get("EMAIL_OUTBOX_BACKOFF_SEGUNDOS", 30))
+    maximo = int(current_app.config.get("EMAIL_OUTBOX_BACKOFF_MAXIMO_SEGUNDOS", 3600))
+    return timedelta(seconds=min(maximo, base * 2 ** max(0, tentativas - 1)))
+
+
+def _erro_definitivo(exc: Exception) -> bool:
+    codigo = getattr(exc, "code", None)
+    try:
+        codigo = int(codigo)
+    except (TypeError, ValueError):
+        return isinstance(exc, ValueError)
+    return 400 <= codigo < 500 and codigo != 429
+
+
+def liberar_reservas_expiradas(minutos: int = 10) -> int:
+    """Devolve à fila mensagens presas em ``enviando`` (ex.: worker morto)."""
+    limite = datetime.utcnow() - timedelta(minutes=minutos)
+    liberadas = EmailOutbox.query.filter(
+        EmailOutbox.status == "enviando", EmailOutbox.reservado_em < limite
+    ).update({"status": "pendente", "reservado_em": None}, synchronize_session=False)
+    db.session.commit()
+    return liberadas
+
+
+def reservar_lote(limite: int) -> List[int]:
+    agora = datetime.utcnow()
+    candidatos = [
+        mensagem_id
+        for (mensagem_id,) in db.session.query(EmailOutbox.id)
+        .filter(
+            EmailOutbox.status == "pendente",
+            EmailOutbox.proxima_tentativa_em <= agora,
+        )
+        .order_by(EmailOutbox.proxima_tentativa_em, EmailOutbox.id)
+        .limit(limite)
+        .all()
+    ]
+    reservados = []
+    for mensagem_id in candidatos:
+        atualizados = EmailOutbox.query.filter_by(
+            id=mensagem_id, status="pendente"
+        ).update(
+            {"status": "enviando", "reservado_em": agora}, synchronize_session=False
+        )
+        if atualizados:
+            reservados.append(mensagem_id)
+    db.session.commit()
+    return reservados
+
+
+def _registrar_falha(mensagem: EmailOutbox, exc: Exception) -> str:
+    mensagem.tentativas += 1
+    mensagem.ultimo_erro = str(exc) or exc.__class__.__name__
+    mensagem.reservado_em = None
+    if _erro_definitivo(exc) or mensagem.tentativas >= mensagem.max_tentativas:
+        mensagem.status = "falhou"
+        log.error(
+            "EMAIL_OUTBOX_DEAD_LETTER",
+            extra={"email_outbox_id": mensagem.id, "error": mensagem.ultimo_erro},
+        )
+    else:
+        mensagem.status = "pendente"
+        mensagem.proxima_tentativa_em = datetime.utcnow() + _calcular_backoff(
+            mensagem.tentativas
+        )
+        log.warning(
+            "EMAIL_OUTBOX_RETRY",
+            extra={
+                "email_outbox_id": mensagem.id,
+                "attempt": mensagem.tentativas,
+                "error": mensagem.ultimo_erro,
+                "rate_limited": isinstance(exc, ResendError)
+                and getattr(exc, "code", None) == 429,
+            },
+        )
+    return mensagem.status
+
+
+def _registrar_envio(mensagem: EmailOutbox, resultado: Dict[str, Any] | None) -> str:
+    mensagem.tentativas += 1
+    mensagem.status = "enviado"
+    mensagem.enviado_em = datetime.utcnow()
+    mensagem.reservado_em = None
+    mensagem.ultimo_erro = None
+    mensagem.provider_id = (resultado or {}).get("id")
+    return mensagem.status
+
+
+def _adiar(mensagens: List[EmailOutbox]) -> List[str]:
+    for mensagem in mensagens:
+        mensagem.status = "pendente"
+        mensagem.reservado_em = None
+    db.session.commit()
+    return ["adiado"] * len(mensagens)
+
+
+def _aguardar_token(bucket: TokenBucket) -> bool:
+    espera_maxima = float(current_app.config.get("EMAIL_OUTBOX_ESPERA_MAXIMA", 30))
+    return bucket.aguardar(timeout=espera_maxima)
+
+
+def enviar_mensagem(mensagem_id: int, bucket: TokenBucket | None = None) -> str:
+    mensagem = db.session.get(EmailOutbox, mensagem_id)
+    if mensagem is None or mensagem.status != "enviando":
+        return "ignorado"
+
+    if not _aguardar_token(bucket or obter_token_bucket()):
+        return _adiar([mensagem])[0]
+
+    try:
+        resultado = email_service.send_email(
+            **mensagem.parametros_envio(), controlar_taxa=False
+        )
+    except Exception as exc:
+        status = _registrar_falha(mensagem, exc)
+    else:
+        status = _registrar_envio(mensagem, resultado)
+    db.session.commit()
+    return status
+
+
+def enviar_lote(ids: List[int], bucket: TokenBucket | None = None) -> List[str]:
+    """Envia mensagens sem anexo numa única chamada ao endpoint de lote."""
+    mensagens = (
+        EmailOutbox.query.filter(
+            EmailOutbox.id.in_(ids), EmailOutbox.status == "enviando"
+        )
+        .order_by(EmailOutbox.id)
+        .all()
+    )
+    if not mensagens:
+        return []
+
+    if not _aguardar_token(bucket or obter_token_bucket()):
+        return _adiar(mensagens)
+
+    try:
+        resultados = email_service.send_batch(
+            [mensagem.parametros_envio() for mensagem in mensagens],
+            controlar_taxa=False,
+        )
+    except Exception as exc:
+        status = [_registrar_falha(mensagem, exc) for mensagem in mensagens]
+    else:
+        status = [
+            _registrar_envio(mensagem, resultado)
+            for mensagem, resultado in zip(mensagens, resultados)
+        ]
+    db.session.commit()
+    return status
+
+
+def processar_outbox(limite: Optional[int] = None) -> Dict[str, int]:
+    """Reserva um lote de mensagens vencidas e as envia.
+
+    Mensagens sem anexo seguem agrupadas pelo endpoint de lote do Resend; as
+    demais são enviadas individualmente no pool de workers. A taxa é
+    controlada só pelo token bucket e as falhas só pelo backoff da fila, sem o
+    limitador e a retentativa de ``send_email``.
+    """
+    app = current_app._get_current_object()
+    limite = limite or int(app.config.get("EMAIL_OUTBOX_LOTE", 50))
+    workers = int(app.config.get("EMAIL_OUTBOX_WORKERS", 1))
+
+    liberar_reservas_expiradas()
+    ids = reservar_lote(limite)
+    if not ids:
+        return {}
+
+    com_anexo = {
+        mensagem_id
+        for mensagem_id, anexos in db.session.query(
+            EmailOutbox.id, EmailOutbox.anexos
+        ).filter(EmailOutbox.id.in_(ids))
+        if anexos
+    }
+    agrupaveis = [mensagem_id for mensagem_id in ids if mensagem_id not in com_anexo]
+    individuais = [mensagem_id for mensagem_id in ids if mensagem_id in com_anexo]
+
+    bucket = obter_token_bucket()
+    resultados: List[str] = []
+    for inicio in range(0, len(agrupaveis), email_service.MAX_BATCH_SIZE):
+        resultados.extend(
+            enviar_lote(
+                agrupaveis[inicio : inicio + email_service.MAX_BATCH_SIZE], bucket
+            )
+        )
+
+    if workers > 1 and len(individuais) > 1:
+
+        def _executar(mensagem_id: int) -> str:
+            with app.app_context():
+                return enviar_mensagem(mensagem_id, bucket)
+
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="email-outbox"
+        ) as pool:
+            resultados.extend(pool.map(_executar, individuais))
+    else:
+        resultados.extend(
+            enviar_mensagem(mensagem_id, bucket) for mensagem_id in individuais
+        )
+
+    contagem = dict(Counter(resultados))
+    log.info("EMAIL_OUTBOX_BATCH", extra={"resultado": contagem})
+    return contagem
+
+
+def reenfileirar_falhas(ids: Iterable[int] | None = None) -> int:
+    """Recoloca mensagens em dead-letter na fila, zerando as tentativas."""
+    query = EmailOutbox.query.filter(EmailOutbox.status == "falhou")
+    if ids is not None:
+        query = query.filter(EmailOutbox.id.in_(list(ids)))
+    total = query.update(
+        {
+            "status": "pendente",
+            "tentativas": 0,
+            "proxima_tentativa_em": datetime.utcnow(),
+        },
+        synchronize_session=False,
+    )
+    db.session.commit()
+    return total
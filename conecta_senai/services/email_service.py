@@ -16,6 +16,7 @@ import re
 import time as time_module
 import threading
 from collections import deque
+from urllib.parse import quote
 
 import resend
 from flask import current_app, render_template
@@ -23,6 +24,11 @@ from types import SimpleNamespace
 from datetime import time, date
 from resend.exceptions import ResendError
 
+from conecta_senai.services.email_template_service import (
+    carregar_anexo_base64,
+    renderizar_para_turma,
+)
+
 log = logging.getLogger(__name__)
 
 if TYPE_CHECKING:
@@ -43,6 +49,9 @@ Address = Union[str, Iterable[str]]
 
 RATE_LIMIT_DELAY = 0.5
 MAX_EMAIL_RETRIES = 2
+MAX_BATCH_SIZE = 100
+LOGO_FILENAME = "Logo-assinatura do e-mail.png"
+LOGO_CID = "cid:logo_assinatura"
 
 
 class RateLimiter:
@@ -122,8 +131,72 @@ def build_user_context(nome: str) -> SimpleNamespace:
     return SimpleNamespace(name=nome)
 
 
-@RateLimiter(max_calls=2, period=1)
-def send_email(
+class ResendTransport:
+    def send(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return resend.Emails.send(params)
+
+    def send_batch(self, params_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        response = resend.Batch.send(params_list)
+        return list(response.get("data") or [])
+
+
+class FakeTransport:
+    """Transporte em memória, usado em testes e no desenvolvimento local."""
+
+    def __init__(self) -> None:
+        self.sent: List[Dict[str, Any]] = []
+        self.batches: List[List[Dict[str, Any]]] = []
+        self._seq = 0
+
+    def _next_id(self) -> Dict[str, Any]:
+        self._seq += 1
+        return {"id": f"fake-{self._seq}"}
+
+    def send(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        self.sent.append(params)
+        return self._next_id()
+
+    def send_batch(self, params_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        self.batches.append(list(params_list))
+        return [self._next_id() for _ in params_list]
+
+    @property
+    def messages(self) -> List[Dict[str, Any]]:
+        return self.sent + [params for batch in self.batches for params in batch]
+
+    @property
+    def recipients(self) -> List[str]:
+        return [addr for params in self.messages for addr in params["to"]]
+
+
+EMAIL_TRANSPORTS = {"resend": ResendTransport, "fake": FakeTransport}
+
+
+def get_transport() -> Any:
+    try:
+        app = current_app._get_current_object()
+    except RuntimeError:
+        return ResendTransport()
+    transport = app.extensions.get("email_transport")
+    if transport is None:
+        name = app.config.get("EMAIL_TRANSPORT", "resend")
+        transport = EMAIL_TRANSPORTS.get(name, ResendTransport)()
+        app.extensions["email_transport"] = transport
+    return transport
+
+
+def dedupe_recipients(addresses: Iterable[str | None]) -> List[str]:
+    vistos: set[str] = set()
+    unicos: List[str] = []
+    for addr in addresses:
+        addr = (addr or "").strip()
+        if addr and addr.lower() not in vistos:
+            vistos.add(addr.lower())
+            unicos.append(addr)
+    return unicos
+
+
+def _build_params(
     to: Address,
     subject: str,
     html: str,
@@ -133,10 +206,8 @@ def send_email(
     reply_to: Optional[str] = None,
     headers: Optional[Dict[str, str]] = None,
     tags: Optional[List[Dict[str, str]]] = None,
-    attachments: Optional[List[Dict[str, Any]]] = None,
     from_: Optional[str] = None,
 ) -> Dict[str, Any]:
-
     params = {
         "from": from_ or DEFAULT_FROM,
         "to": _normalize(to),
@@ -155,12 +226,83 @@ def send_email(
         params["headers"] = headers
     if tags:
         params["tags"] = tags
+    return params
+
+
+def _logo_url() -> str:
+    try:
+        base = current_app.config.get("APP_BASE_URL")
+    except RuntimeError:
+        base = None
+    base = (base or os.getenv("APP_BASE_URL", "")).rstrip("/")
+    return f"{base}/static/img/{quote(LOGO_FILENAME)}"
+
+
+def _send_with_retry(
+    send: Callable[[], Any], subject: str, event: str = "EMAIL_SEND"
+) -> Any:
+    for attempt in range(1, MAX_EMAIL_RETRIES + 1):
+        try:
+            return send()
+        except ResendError as exc:
+            if getattr(exc, "code", None) == 429 and attempt < MAX_EMAIL_RETRIES:
+                log.warning(
+                    "EMAIL_RATE_LIMIT_HIT",
+                    extra={"subject": subject, "attempt": attempt},
+                )
+                time_module.sleep(RATE_LIMIT_DELAY)
+                continue
+            log.error(
+                f"{event}_FAILURE",
+                extra={"subject": subject, "error": str(exc)},
+            )
+            raise
+
+
+_resend_limiter = RateLimiter(max_calls=2, period=1)
+
+
+def _chamar_transporte(
+    chamada: Callable[[], Any],
+    subject: str,
+    event: str = "EMAIL_SEND",
+    controlar_taxa: bool = True,
+) -> Any:
+    # A caixa de saída já limita a taxa com o token bucket e reagenda falhas
+    # com backoff; para ela a chamada ao transporte é feita uma única vez.
+    if not controlar_taxa:
+        return chamada()
+    return _resend_limiter(lambda: _send_with_retry(chamada, subject, event))()
+
+
+def send_email(
+    to: Address,
+    subject: str,
+    html: str,
+    text: Optional[str] = None,
+    cc: Address | None = None,
+    bcc: Address | None = None,
+    reply_to: Optional[str] = None,
+    headers: Optional[Dict[str, str]] = None,
+    tags: Optional[List[Dict[str, str]]] = None,
+    attachments: Optional[List[Dict[str, Any]]] = None,
+    from_: Optional[str] = None,
+    *,
+    referencia: Optional[str] = None,
+    controlar_taxa: bool = True,
+) -> Dict[str, Any]:
+    """Envia um e-mail imediatamente.
+
+    Tem a mesma assinatura de ``enfileirar_email``, e as duas podem ser usadas
+    como ``send_email_fn``. ``referencia`` aqui só aparece no log.
+    """
+    params = _build_params(
+        to, subject, html, text, cc, bcc, reply_to, headers, tags, from_
+    )
     attachments = list(attachments) if attachments else []
     logo_path = None
     try:
-        logo_path = os.path.join(
-            current_app.static_folder, "img", "Logo-assinatura do e-mail.png"
-        )
+        logo_path = os.path.join(current_app.static_folder, "img", LOGO_FILENAME)
     except RuntimeError:
         logo_path = None
 
@@ -186,27 +328,90 @@ def send_email(
         params["attachments"] = attachments
 
     log.debug("EMAIL_SEND_START", extra={"to": params["to"], "subject": subject})
-    for attempt in range(1, MAX_EMAIL_RETRIES + 1):
-        try:
-            result = resend.Emails.send(params)
-            log.info(
-                "EMAIL_SEND_SUCCESS",
-                extra={"email_id": result.get("id"), "subject": subject},
-            )
-            return result
-        except ResendError as exc:
-            if getattr(exc, "code", None) == 429 and attempt < MAX_EMAIL_RETRIES:
-                log.warning(
-                    "EMAIL_RATE_LIMIT_HIT",
-                    extra={"subject": subject, "attempt": attempt},
-                )
-                time_module.sleep(RATE_LIMIT_DELAY)
-                continue
-            log.error(
-                "EMAIL_SEND_FAILURE",
-                extra={"subject": subject, "error": str(exc)},
-            )
-            raise
+    transport = get_transport()
+    result = _chamar_transporte(
+        lambda: transport.send(params), subject, controlar_taxa=controlar_taxa
+    )
+    log.info(
+        "EMAIL_SEND_SUCCESS",
+        extra={
+            "email_id": result.get("id"),
+            "subject": subject,
+            "referencia": referencia,
+        },
+    )
+    return result
+
+
+def _send_batch_chunk(
+    params_list: List[Dict[str, Any]], controlar_taxa: bool = True
+) -> List[Dict[str, Any]]:
+    transport = get_transport()
+    subject = params_list[0]["subject"]
+    results = _chamar_transporte(
+        lambda: transport.send_batch(params_list),
+        subject,
+        "EMAIL_BATCH",
+        controlar_taxa,
+    )
+    log.info(
+        "EMAIL_BATCH_SUCCESS",
+        extra={"count": len(params_list), "subject": subject},
+    )
+    return results
+
+
+def send_batch(
+    messages: Iterable[Dict[str, Any]], controlar_taxa: bool = True
+) -> List[Dict[str, Any]]:
+    """Envia várias mensagens com o endpoint de lote do Resend.
+
+    Cada item aceita os mesmos argumentos de :func:`send_email`. O endpoint de
+    lote não aceita anexos, então mensagens com anexo seguem individualmente e
+    o logo da assinatura é referenciado por URL pública em vez de ``cid:``.
+    O retorno preserva a ordem de ``messages``.
+    """
+    messages = list(messages)
+    results: List[Dict[str, Any]] = [{} for _ in messages]
+    pendentes: List[tuple[int, Dict[str, Any]]] = []
+    logo_url = _logo_url()
+
+    for indice, message in enumerate(messages):
+        message = dict(message)
+        if message.get("attachments"):
+            results[indice] = send_email(**message, controlar_taxa=controlar_taxa)
+            continue
+        message.pop("attachments", None)
+        params = _build_params(**message)
+        params["html"] = params["html"].replace(LOGO_CID, logo_url)
+        pendentes.append((indice, params))
+
+    for inicio in range(0, len(pendentes), MAX_BATCH_SIZE):
+        chunk = pendentes[inicio : inicio + MAX_BATCH_SIZE]
+        chunk_results = _send_batch_chunk(
+            [params for _, params in chunk], controlar_taxa
+        )
+        for (indice, _), result in zip(chunk, chunk_results):
+            results[indice] = result
+    return results
+
+
+def _enfileirar_mensagens(mensagens: Iterable[Dict[str, Any]]) -> None:
+    """Grava as mensagens na caixa de saída e confirma a transação.
+
+    O envio sai da requisição: o despachante usa o endpoint de lote com o
+    token bucket da fila e registra falhas por lote, sem descartar os demais.
+    """
+    from conecta_senai.models import db
+    from conecta_senai.services.email_outbox_service import enfileirar_email
+
+    try:
+        for mensagem in mensagens:
+            enfileirar_email(**mensagem)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
 
 
 def render_email_template(name: str, **ctx: Any) -> str:
@@ -334,6 +539,23 @@ def _aplicar_diff_em_dados_antigos(
     return dados_antigos
 
 
+def _montar_contexto_convocacao(turma: Any, treinamento: Any) -> Dict[str, Any]:
+    local_realizacao = getattr(turma, "local_realizacao", "")
+    return {
+        "nome_do_treinamento": getattr(treinamento, "nome", ""),
+        "periodo": _formatar_periodo(
+            getattr(turma, "data_inicio", None), getattr(turma, "data_fim", None)
+        ),
+        "horario": getattr(turma, "horario", ""),
+        "carga_horaria": getattr(treinamento, "carga_horaria", ""),
+        "instrutor": getattr(getattr(turma, "instrutor", None), "nome", "A definir"),
+        "local_de_realizacao": local_realizacao,
+        "local_da_pratica": local_realizacao,
+        "teoria_online": bool(getattr(turma, "teoria_online", False)),
+        "tem_pratica": bool(getattr(treinamento, "tem_pratica", False)),
+    }
+
+
 def enviar_convocacao(
     inscricao: Any, turma: Any, send_email_fn: Callable[..., Any] = send_email
 ) -> None:
@@ -350,28 +572,15 @@ def enviar_convocacao(
     log.info(f"Tentando enviar e-mail de convocação para {destinatario}")
 
     is_teoria_online = bool(getattr(turma, "teoria_online", False))
-    has_tem_pratica = bool(getattr(treinamento, "tem_pratica", False))
-
     data_inicio = getattr(turma, "data_inicio", None)
-    data_fim = getattr(turma, "data_fim", None)
-    periodo = _formatar_periodo(data_inicio, data_fim)
-
-    instrutor = getattr(getattr(turma, "instrutor", None), "nome", "A definir")
-    local_realizacao = getattr(turma, "local_realizacao", "")
 
-    html = render_template(
+    html = renderizar_para_turma(
         "email/convocacao.html.j2",
+        turma,
+        lambda: _montar_contexto_convocacao(turma, treinamento),
+        ("nome", "email_fornecido_na_inscricao"),
         nome=participante_nome,
-        nome_do_treinamento=getattr(treinamento, "nome", ""),
-        periodo=periodo,
-        horario=getattr(turma, "horario", ""),
-        carga_horaria=getattr(treinamento, "carga_horaria", ""),
-        instrutor=instrutor,
-        local_de_realizacao=local_realizacao,
         email_fornecido_na_inscricao=destinatario,
-        local_da_pratica=local_realizacao,
-        teoria_online=is_teoria_online,
-        tem_pratica=has_tem_pratica,
     )
 
     attachments: List[Dict[str, Any]] = []
@@ -383,24 +592,21 @@ def enviar_convocacao(
                 "Tutorial de Acesso e Navegação - Aluno Anglo.pdf",
             )
             file_name = "Tutorial de Acesso e Navegação - Aluno Anglo.pdf"
-            with open(file_path, "rb") as f:
-                encoded = base64.b64encode(f.read()).decode()
+            encoded = carregar_anexo_base64(file_path)
             attachments.append({"filename": file_name, "content": encoded})
         except FileNotFoundError:
             current_app.logger.error("Arquivo de tutorial não encontrado.")
 
     data_inicio_str = data_inicio.strftime("%d/%m/%Y") if data_inicio else ""
     subject = f"Convocação: {getattr(treinamento, 'nome', '')} — {data_inicio_str}"
-    if send_email_fn is send_email:
-        send_email_fn(
-            to=destinatario,
-            subject=subject,
-            html=html,
-            attachments=attachments,
-        )
-    else:
-        send_email_fn(to=destinatario, subject=subject, html=html)
-    log.info(f"E-mail de convocação enviado com sucesso para {destinatario}")
+    send_email_fn(
+        to=destinatario,
+        subject=subject,
+        html=html,
+        attachments=attachments,
+        referencia=f"convocacao:{getattr(inscricao, 'id', '')}",
+    )
+    log.info(f"E-mail de convocação processado para {destinatario}")
 
 
 def listar_emails_secretaria() -> List[str]:
@@ -434,9 +640,26 @@ def send_turma_alterada_secretaria(
     send_email(list(emails), subject, html)
 
 
+def _montar_email_turma_alterada(
+    recipients: Iterable[str], dados_antigos: dict, dados_novos: dict
+) -> Dict[str, Any]:
+    dados_antigos_completos = dict(dados_novos)
+    dados_antigos_completos.update(dados_antigos or {})
+
+    html_body = render_template(
+        "email/turma_alterada_secretaria.html.j2",
+        dados_antigos=dados_antigos_completos,
+        dados_novos=dados_novos,
+    )
+    subject = (
+        "Alteração de Agendamento de Turma: " f"{dados_novos.get('treinamento_nome')}"
+    )
+    return {"to": list(recipients), "subject": subject, "html": html_body}
+
+
 def send_turma_alterada_email(dados_antigos: dict, dados_novos: dict):
     try:
-        recipients = listar_emails_secretaria()
+        recipients = dedupe_recipients(listar_emails_secretaria())
         if not recipients:
             current_app.logger.warning(
                 "Nenhum e-mail de secretaria encontrado para "
@@ -444,20 +667,9 @@ def send_turma_alterada_email(dados_antigos: dict, dados_novos: dict):
             )
             return
 
-        dados_antigos_completos = dict(dados_novos)
-        dados_antigos_completos.update(dados_antigos or {})
-
-        html_body = render_template(
-            "email/turma_alterada_secretaria.html.j2",
-            dados_antigos=dados_antigos_completos,
-            dados_novos=dados_novos,
-        )
-
-        subject = (
-            "Alteração de Agendamento de Turma: "
-            f"{dados_novos.get('treinamento_nome')}"
+        send_email(
+            **_montar_email_turma_alterada(recipients, dados_antigos, dados_novos)
         )
-        send_email(recipients, subject, html_body)
         current_app.logger.info(
             (
                 "E-mail de alteração da turma "
@@ -475,7 +687,7 @@ def send_treinamento_desmarcado_email(
     recipients: Iterable[str], turma: "TurmaTreinamento"
 ) -> None:
 
-    recipients_list = list(recipients)
+    recipients_list = dedupe_recipients(recipients)
     if not recipients_list:
         return
 
@@ -506,16 +718,19 @@ def send_treinamento_desmarcado_email(
 
     subject = f"Treinamento desmarcado - {turma_ctx.treinamento.nome}"
     html = render_email_template("treinamento_desmarcado.html.j2", turma=turma_ctx)
-    send_email(recipients_list, subject, html)
+    _enfileirar_mensagens(
+        {"to": recipient, "subject": subject, "html": html}
+        for recipient in recipients_list
+    )
 
 
-def send_nova_turma_instrutor_email(
+def _montar_email_nova_turma_instrutor(
     turma: "TurmaTreinamento",
     instrutor: "Instrutor",
-) -> None:
+) -> Dict[str, Any] | None:
 
     if not instrutor or not getattr(instrutor, "email", None):
-        return
+        return None
 
     treinamento = getattr(turma, "treinamento", None)
     carga_horaria = getattr(treinamento, "carga_horaria", None)
@@ -559,7 +774,17 @@ def send_nova_turma_instrutor_email(
         local_pratica=getattr(turma, "local_pratica", "-") or "-",
     )
     subject = f"Nova turma designada - {getattr(treinamento, 'nome', '')}"
-    send_email(instrutor.email, subject, html)
+    return {"to": instrutor.email, "subject": subject, "html": html}
+
+
+def send_nova_turma_instrutor_email(
+    turma: "TurmaTreinamento",
+    instrutor: "Instrutor",
+) -> None:
+
+    mensagem = _montar_email_nova_turma_instrutor(turma, instrutor)
+    if mensagem:
+        send_email(**mensagem)
 
 
 def notificar_nova_turma(turma: "TurmaTreinamento") -> None:
@@ -616,10 +841,12 @@ def notificar_atualizacao_turma(
     dados_novos = _montar_dados_turma_email(turma)
     dados_antigos = _aplicar_diff_em_dados_antigos(dados_novos, diff)
 
-    emails_secretaria = listar_emails_secretaria()
+    mensagens: List[Dict[str, Any]] = []
+    emails_secretaria = dedupe_recipients(listar_emails_secretaria())
     if notificar_secretaria and emails_secretaria:
-        send_turma_alterada_email(dados_antigos, dados_novos)
-        time_module.sleep(RATE_LIMIT_DELAY)
+        mensagens.append(
+            _montar_email_turma_alterada(emails_secretaria, dados_antigos, dados_novos)
+        )
 
     instrutor_atual = getattr(turma, "instrutor", None)
 
@@ -659,24 +886,25 @@ def notificar_atualizacao_turma(
                 turma=turma_ctx,
             )
             subject_rem = f"Remanejamento de Turma - {nome_treinamento}"
-            send_email(instrutor_antigo_obj.email, subject_rem, html_rem)
-            time_module.sleep(RATE_LIMIT_DELAY)
+            mensagens.append(
+                {
+                    "to": instrutor_antigo_obj.email,
+                    "subject": subject_rem,
+                    "html": html_rem,
+                }
+            )
 
     if atual_id and antigo_id != atual_id and getattr(instrutor_atual, "email", None):
-        send_nova_turma_instrutor_email(turma, instrutor_atual)
-        time_module.sleep(RATE_LIMIT_DELAY)
+        mensagens.append(_montar_email_nova_turma_instrutor(turma, instrutor_atual))
     elif atual_id and antigo_id == atual_id and getattr(instrutor_atual, "email", None):
-        subject = (
-            "Alteração de Agendamento de Turma: "
-            f"{dados_novos.get('treinamento_nome')}"
-        )
-        html_body = render_template(
-            "email/turma_alterada_secretaria.html.j2",
-            dados_antigos=dados_antigos,
-            dados_novos=dados_novos,
+        mensagens.append(
+            _montar_email_turma_alterada(
+                [instrutor_atual.email], dados_antigos, dados_novos
+            )
         )
-        send_email(instrutor_atual.email, subject, html_body)
-        time_module.sleep(RATE_LIMIT_DELAY)
+
+    if mensagens:
+        _enfileirar_mensagens(mensagens)
 
 
 class EmailService:
@@ -0,0 +1,158 @@
+"""Renderização de templates de e-mail com cache por turma.
+
+Os templates ``email/*.html.j2`` são compilados uma única vez na subida da
+aplicação. Para envios em massa, a parte do e-mail que não depende do
+destinatário é renderizada uma vez por versão da turma e guardada num LRU; a
+cada destinatário apenas os campos individuais (nome, e-mail) são preenchidos.
+"""
+
+from __future__ import annotations
+
+import base64
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Callable, Dict, Hashable, Iterable, NamedTuple
+
+from flask import current_app, render_template
+from markupsafe import escape
+
+PREFIXO_TEMPLATES_EMAIL = "email/"
+TAMANHO_CACHE_PADRAO = 256
+
+
+def _marcador(campo: str) -> str:
+    # Caracteres de uso privado do Unicode não aparecem nos templates.
+    return f"\ue000{campo}\ue001"
+
+
+class TemplatePreRenderizado(NamedTuple):
+    html: str
+    campos: tuple[str, ...]
+    autoescape: bool
+
+    def preencher(self, **valores: Any) -> str:
+        html = self.html
+        for campo in self.campos:
+            valor = valores.get(campo)
+            valor = "" if valor is None else valor
+            html = html.replace(
+                _marcador(campo), str(escape(valor) if self.autoescape else valor)
+            )
+        return html
+
+
+class CacheLRU:
+    def __init__(self, tamanho: int = TAMANHO_CACHE_PADRAO) -> None:
+        self.tamanho = tamanho
+        self._itens: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+
+    def obter(self, chave: Hashable, criar: Callable[[], Any]) -> Any:
+        with self._lock:
+            if chave in self._itens:
+                self._itens.move_to_end(chave)
+                self.acertos += 1
+                return self._itens[chave]
+        valor = criar()
+        with self._lock:
+            self.falhas += 1
+            self._itens[chave] = valor
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.tamanho:
+                self._itens.popitem(last=False)
+        return valor
+
+    def limpar(self) -> None:
+        with self._lock:
+            self._itens.clear()
+
+
+def obter_cache() -> CacheLRU:
+    cache = current_app.extensions.get("email_template_cache")
+    if cache is None:
+        tamanho = int(
+            current_app.config.get("EMAIL_TEMPLATE_CACHE_SIZE", TAMANHO_CACHE_PADRAO)
+        )
+        cache = current_app.extensions.setdefault(
+            "email_template_cache", CacheLRU(tamanho)
+        )
+    return cache
+
+
+def precompilar_templates_email(app) -> int:
+    """Compila todos os templates de e-mail para o cache do ambiente Jinja."""
+    env = app.jinja_env
+    nomes = env.list_templates(
+        filter_func=lambda nome: nome.startswith(PREFIXO_TEMPLATES_EMAIL)
+        and nome.endswith(".j2")
+    )
+    for nome in nomes:
+        env.get_template(nome)
+    return len(nomes)
+
+
+def versao_turma(turma: Any) -> tuple | None:
+    turma_id = getattr(turma, "id", None)
+    if turma_id is None:
+        return None
+    treinamento = getattr(turma, "treinamento", None)
+    return (
+        turma_id,
+        getattr(turma, "data_atualizacao", None),
+        getattr(treinamento, "id", None),
+        getattr(treinamento, "data_atualizacao", None),
+        getattr(turma, "instrutor_id", None),
+    )
+
+
+def _pre_renderizar(
+    template: str, contexto: Dict[str, Any], campos: tuple[str, ...]
+) -> TemplatePreRenderizado:
+    contexto = dict(contexto)
+    contexto.update({campo: _marcador(campo) for campo in campos})
+    autoescape = current_app.jinja_env.autoescape
+    if callable(autoescape):
+        autoescape = autoescape(template)
+    return TemplatePreRenderizado(
+        render_template(template, **contexto), campos, bool(autoescape)
+    )
+
+
+def renderizar_para_turma(
+    template: str,
+    turma: Any,
+    contexto_turma: Callable[[], Dict[str, Any]],
+    campos_destinatario: Iterable[str],
+    **valores_destinatario: Any,
+) -> str:
+    """Renderiza ``template`` reaproveitando a parte comum a toda a turma.
+
+    ``contexto_turma`` só é chamado quando a versão da turma não está em cache.
+    Os campos em ``campos_destinatario`` devem ser apenas exibidos pelo
+    template (sem condicionais ou filtros sobre eles).
+    """
+    campos = tuple(campos_destinatario)
+    versao = versao_turma(turma)
+    if versao is None:
+        return render_template(template, **contexto_turma(), **valores_destinatario)
+
+    pre_renderizado = obter_cache().obter(
+        (template, campos, versao),
+        lambda: _pre_renderizar(template, contexto_turma(), campos),
+    )
+    return pre_renderizado.preencher(**valores_destinatario)
+
+
+@lru_cache(maxsize=16)
+def _ler_anexo_base64(caminho: str, mtime: float) -> str:
+    with open(caminho, "rb") as arquivo:
+        return base64.b64encode(arquivo.read()).decode()
+
+
+def carregar_anexo_base64(caminho: str) -> str:
+    """Lê e codifica um anexo estático, reaproveitando o resultado em memória."""
+    return _ler_anexo_base64(caminho, os.path.getmtime(caminho))
@@ -0,0 +1,154 @@
+"""Eventos em tempo real entregues ao frontend via Server-Sent Events.
+
+Os eventos são publicados num canal Redis (pub/sub) para alcançar todos os
+processos web. Sem Redis, um barramento em memória entrega os eventos apenas
+aos clientes conectados ao próprio processo.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import queue
+import threading
+from typing import Any, Iterable
+
+from flask import current_app
+
+from conecta_senai.config import redis as redis_config
+
+log = logging.getLogger(__name__)
+
+CANAL_PADRAO = "conecta_senai:eventos"
+TAMANHO_FILA_LOCAL = 100
+
+
+class BarramentoLocal:
+    def __init__(self) -> None:
+        self._filas: set[queue.Queue] = set()
+        self._lock = threading.Lock()
+
+    def publicar(self, mensagem: str) -> None:
+        with self._lock:
+            filas = list(self._filas)
+        for fila in filas:
+            try:
+                fila.put_nowait(mensagem)
+            except queue.Full:
+                # Cliente lento: descarta em vez de bloquear quem publica.
+                log.debug("Fila de eventos cheia; evento descartado.")
+
+    def assinar(self) -> queue.Queue:
+        fila: queue.Queue = queue.Queue(maxsize=TAMANHO_FILA_LOCAL)
+        with self._lock:
+            self._filas.add(fila)
+        return fila
+
+    def cancelar(self, fila: queue.Queue) -> None:
+        with self._lock:
+            self._filas.discard(fila)
+
+
+barramento_local = BarramentoLocal()
+
+
+def _cliente_pubsub():
+    cliente = redis_config.redis_conn
+    if hasattr(cliente, "publish") and hasattr(cliente, "pubsub"):
+        return cliente
+    return None
+
+
+def _canal() -> str:
+    return current_app.config.get("EVENTOS_CANAL", CANAL_PADRAO)
+
+
+def publicar_evento(
+    tipo: str,
+    dados: dict[str, Any] | None = None,
+    usuario_ids: Iterable[int] | None = None,
+) -> None:
+    """Publica um evento para os clientes SSE.
+
+    ``usuario_ids`` restringe a entrega a esses usuários (e aos administradores);
+    ``None`` entrega a todos os usuários autenticados.
+    """
+    mensagem = json.dumps(
+        {
+            "tipo": tipo,
+            "dados": dados or {},
+            "usuario_ids": None if usuario_ids is None else sorted(set(usuario_ids)),
+        },
+        default=str,
+    )
+    cliente = _cliente_pubsub()
+    if cliente is not None:
+        try:
+            cliente.publish(_canal(), mensagem)
+            return
+        except Exception as exc:
+            log.warning("Falha ao publicar evento no Redis: %s", exc)
+    barramento_local.publicar(mensagem)
+
+
+def evento_visivel(evento: dict, usuario_id: int, admin: bool) -> bool:
+    destinatarios = evento.get("usuario_ids")
+    return admin or destinatarios is None or usuario_id in destinatarios
+
+
+def formatar_sse(evento: dict) -> str:
+    dados = json.dumps(evento.get("dados") or {}, ensure_ascii=False, default=str)
+    return f"event: {evento['tipo']}\ndata: {dados}\n\n"
+
+
+class Assinatura:
+    """Itera os eventos publicados; rende ``None`` após ``timeout`` sem eventos.
+
+    A inscrição é feita na criação, antes de a resposta começar a ser enviada.
+    """
+
+    def __init__(self, timeout: float) -> None:
+        self.timeout = timeout
+        self._pubsub = None
+        self._fila = None
+        cliente = _cliente_pubsub()
+        if cliente is not None:
+            try:
+                self._pubsub = cliente.pubsub(ignore_subscribe_messages=True)
+                self._pubsub.subscribe(_canal())
+            except Exception as exc:
+                log.warning("Pub/sub do Redis indisponível: %s", exc)
+                self._pubsub = None
+        if self._pubsub is None:
+            self._fila = barramento_local.assinar()
+
+    def __iter__(self) -> "Assinatura":
+        return self
+
+    def __next__(self) -> dict | None:
+        if self._pubsub is not None:
+            mensagem = self._pubsub.get_message(timeout=self.timeout)
+            if mensagem is None or mensagem.get("type") != "message":
+                return None
+            bruto = mensagem["data"]
+        elif self._fila is not None:
+            try:
+                bruto = self._fila.get(timeout=self.timeout)
+            except queue.Empty:
+                return None
+        else:
+            raise StopIteration
+        if isinstance(bruto, bytes):
+            bruto = bruto.decode()
+        return json.loads(bruto)
+
+    def close(self) -> None:
+        if self._pubsub is not None:
+            try:
+                self._pubsub.close()
+            except Exception:
+                log.debug("Falha ao encerrar assinatura pub/sub", exc_info=True)
+            self._pubsub = None
+        if self._fila is not None:
+            barramento_local.cancelar(self._fila)
+            self._fila = None
@@ -0,0 +1,408 @@
+"""Fila de exportações pesadas processadas fora da thread da requisição.
+
+Os jobs ficam na tabela ``export_jobs`` (que funciona como fila persistente) e
+são renderizados por um pool de threads em disco. O cliente consulta o status
+e baixa o arquivo até ``expira_em``; a limpeza remove arquivos e jobs vencidos,
+inclusive os que terminaram em erro.
+
+Enquanto gera o arquivo, a execução renova ``heartbeat_em``; só jobs cujo
+heartbeat passou de ``EXPORT_JOBS_LEASE_SEGUNDOS`` (dono morto) voltam à fila,
+até ``EXPORT_JOBS_MAX_TENTATIVAS`` vezes. Cada tentativa grava arquivos
+próprios e só conclui o job se ainda for a tentativa vigente.
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+import os
+import tempfile
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from threading import Event, Lock, Thread
+from typing import Callable, NamedTuple
+
+from flask import current_app
+from sqlalchemy import func, update
+from sqlalchemy.exc import SQLAlchemyError
+
+from conecta_senai.models import db
+from conecta_senai.models.export_job import ExportJob
+
+log = logging.getLogger(__name__)
+
+MIMETYPES = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "pdf": "application/pdf",
+}
+
+DIRETORIO_PADRAO = os.path.join(tempfile.gettempdir(), "conecta_senai_exports")
+
+
+class Exportador(NamedTuple):
+    funcao: Callable[[dict, str, io.BufferedIOBase], str]
+    formatos: frozenset
+    somente_admin: bool = True
+
+
+def _parse_data(valor) -> date | None:
+    if not valor:
+        return None
+    return datetime.strptime(valor, "%Y-%m-%d").date()
+
+
+def _exportar_ocupacoes(parametros: dict, formato: str, destino) -> str:
+    from conecta_senai.services.ocupacao_service import (
+        consultar_ocupacoes_exportacao,
+        escrever_pdf_ocupacoes,
+        escrever_xlsx_ocupacoes,
+        gerar_csv_ocupacoes,
+    )
+
+    linhas = consultar_ocupacoes_exportacao(
+        _parse_data(parametros.get("data_inicio")),
+        _parse_data(parametros.get("data_fim")),
+        int(parametros["sala_id"]) if parametros.get("sala_id") else None,
+    )
+    if formato == "pdf":
+        escrever_pdf_ocupacoes(linhas, destino)
+    elif formato == "xlsx":
+        escrever_xlsx_ocupacoes(linhas, destino)
+    else:
+        for bloco in gerar_csv_ocupacoes(linhas):
+            destino.write(bloco.encode("utf-8"))
+    return f"ocupacoes.{formato}"
+
+
+def _exportar_inscricoes(parametros: dict, formato: str, destino) -> str:
+    from conecta_senai.models.treinamento import TurmaTreinamento
+    from conecta_senai.services.inscricoes_exportacao_service import (
+        escrever_exportacao_inscricoes,
+        nome_arquivo_inscricoes,
+    )
+
+    turma_id = parametros.get("turma_id")
+    turma = db.session.get(TurmaTreinamento, turma_id) if turma_id else None
+    if not turma:
+        raise ValueError("Turma não encontrada")
+    escrever_exportacao_inscricoes(turma, formato, destino)
+    return f"{nome_arquivo_inscricoes(turma)}.{formato}"
+
+
+def _exportar_chamados_suporte_ti(parametros: dict, formato: str, destino) -> str:
+    from conecta_senai.services.chamados_exportacao_service import (
+        escrever_planilha_chamados_suporte_ti,
+    )
+
+    escrever_planilha_chamados_suporte_ti(destino)
+    return "chamados_suporte_ti.xlsx"
+
+
+def _exportar_chamados_manutencao(parametros: dict, formato: str, destino) -> str:
+    from conecta_senai.services.chamados_exportacao_service import (
+        escrever_planilha_chamados_manutencao,
+    )
+
+    escrever_planilha_chamados_manutencao(destino)
+    return "chamados_manutencao_unidade.xlsx"
+
+
+def _exportar_logs_rateio(parametros: dict, formato: str, destino) -> str:
+    from conecta_senai.services.rateio_service import escrever_csv_logs_rateio
+
+    texto = io.TextIOWrapper(destino, encoding="utf-8", newline="")
+    try:
+        escrever_csv_logs_rateio(texto)
+        texto.flush()
+    finally:
+        texto.detach()
+    return "logs_rateio.csv"
+
+
+EXPORTADORES: dict[str, Exportador] = {
+    "ocupacoes": Exportador(
+        _exportar_ocupacoes, frozenset({"csv", "xlsx", "pdf"}), somente_admin=False
+    ),
+    "inscricoes_turma": Exportador(
+        _exportar_inscricoes, frozenset({"csv", "xlsx", "pdf"})
+    ),
+    "chamados_suporte_ti": Exportador(
+        _exportar_chamados_suporte_ti, frozenset({"xlsx"})
+    ),
+    "chamados_manutencao": Exportador(
+        _exportar_chamados_manutencao, frozenset({"xlsx"})
+    ),
+    "logs_rateio": Exportador(_exportar_logs_rateio, frozenset({"csv"})),
+}
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = Lock()
+
+
+def _obter_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=int(current_app.config.get("EXPORT_JOBS_WORKERS", 2)),
+                thread_name_prefix="export-job",
+            )
+        return _executor
+
+
+def encerrar_executor(wait: bool = True) -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait)
+            _executor = None
+
+
+def diretorio_exportacoes() -> Path:
+    diretorio = Path(current_app.config.get("EXPORT_JOBS_DIR") or DIRETORIO_PADRAO)
+    diretorio.mkdir(parents=True, exist_ok=True)
+    return diretorio
+
+
+def enfileirar_exportacao(
+    tipo: str, formato: str, parametros: dict | None, usuario_id: int | None
+) -> ExportJob:
+    exportador = EXPORTADORES.get(tipo)
+    if not exportador:
+        raise ValueError(f"Tipo de exportação inválido: {tipo}")
+    formato = (formato or "").lower()
+    if formato not in exportador.formatos:
+        raise ValueError(
+            f"Formato deve ser um dos seguintes: {', '.join(sorted(exportador.formatos))}"
+        )
+
+    job = ExportJob(
+        id=uuid.uuid4().hex,
+        tipo=tipo,
+        formato=formato,
+        parametros=parametros or {},
+        usuario_id=usuario_id,
+        status="pendente",
+    )
+    db.session.add(job)
+    db.session.commit()
+    despachar_exportacao(job.id)
+    return job
+
+
+def despachar_exportacao(job_id: str) -> None:
+    app = current_app._get_current_object()
+    if app.config.get("EXPORT_JOBS_SINCRONO", app.testing):
+        processar_exportacao(job_id)
+        return
+    if app.config.get("EXPORT_JOBS_VIA_WORKER") and not app.config.get(
+        "WORKER_PROCESS"
+    ):
+        # O processo worker consome os jobs pendentes em ``consumir_exportacoes``.
+        return
+
+    def _executar():
+        with app.app_context():
+            processar_exportacao(job_id)
+
+    _obter_executor().submit(_executar)
+
+
+def _lease_segundos() -> int:
+    return int(current_app.config.get("EXPORT_JOBS_LEASE_SEGUNDOS", 120))
+
+
+def _da_tentativa(job_id: str, tentativa: int):
+    """UPDATE restrito à tentativa que ainda é dona do job."""
+    return update(ExportJob).where(
+        ExportJob.id == job_id,
+        ExportJob.status == "processando",
+        ExportJob.tentativas == tentativa,
+    )
+
+
+def _manter_heartbeat(engine, job_id: str, tentativa: int, intervalo, parar):
+    while not parar.wait(intervalo):
+        try:
+            with engine.begin() as conn:
+                renovado = conn.execute(
+                    _da_tentativa(job_id, tentativa).values(
+                        heartbeat_em=datetime.utcnow()
+                    )
+                ).rowcount
+        except SQLAlchemyError:
+            log.warning("Falha ao renovar heartbeat da exportação %s", job_id)
+            continue
+        if not renovado:
+            return
+
+
+def _validade() -> timedelta:
+    return timedelta(hours=int(current_app.config.get("EXPORT_JOBS_TTL_HORAS", 24)))
+
+
+def _mensagem_erro(exc: Exception) -> str:
+    # ``ValueError`` dos exportadores descreve parâmetros inválidos para o
+    # usuário; qualquer outra falha fica só no log.
+    if isinstance(exc, ValueError) and str(exc):
+        return str(exc)
+    return "Falha ao gerar a exportação"
+
+
+def _finalizar(job_id: str, tentativa: int, valores: dict) -> bool:
+    finalizado = db.session.execute(
+        _da_tentativa(job_id, tentativa).values(**valores)
+    ).rowcount
+    db.session.commit()
+    if not finalizado:
+        log.warning(
+            "Exportação %s: tentativa %d perdeu a reserva; resultado descartado",
+            job_id,
+            tentativa,
+        )
+    return bool(finalizado)
+
+
+def processar_exportacao(job_id: str) -> bool:
+    agora = datetime.utcnow()
+    reservado = ExportJob.query.filter_by(id=job_id, status="pendente").update(
+        {
+            "status": "processando",
+            "iniciado_em": agora,
+            "heartbeat_em": agora,
+            "tentativas": ExportJob.tentativas + 1,
+        },
+        synchronize_session=False,
+    )
+    db.session.commit()
+    if not reservado:
+        return False
+
+    job = db.session.get(ExportJob, job_id)
+    tentativa = job.tentativas
+    exportador = EXPORTADORES[job.tipo]
+    destino = diretorio_exportacoes() / f"{job.id}.{tentativa}.{job.formato}"
+    temporario = destino.with_suffix(destino.suffix + ".part")
+
+    parar = Event()
+    Thread(
+        target=_manter_heartbeat,
+        args=(db.engine, job_id, tentativa, _lease_segundos() / 4, parar),
+        name=f"export-heartbeat-{job_id}",
+        daemon=True,
+    ).start()
+    try:
+        with open(temporario, "wb") as arquivo:
+            nome_arquivo = exportador.funcao(
+                dict(job.parametros or {}), job.formato, arquivo
+            )
+        os.replace(temporario, destino)
+    except Exception as exc:
+        parar.set()
+        db.session.rollback()
+        temporario.unlink(missing_ok=True)
+        log.exception("Falha ao gerar exportação %s (%s)", job_id, job.tipo)
+        concluido_em = datetime.utcnow()
+        _finalizar(
+            job_id,
+            tentativa,
+            {
+                "status": "erro",
+                "erro": _mensagem_erro(exc),
+                "concluido_em": concluido_em,
+                "expira_em": concluido_em + _validade(),
+            },
+        )
+        return False
+    parar.set()
+
+    concluido_em = datetime.utcnow()
+    concluido = _finalizar(
+        job_id,
+        tentativa,
+        {
+            "status": "concluido",
+            "nome_arquivo": nome_arquivo,
+            "mimetype": MIMETYPES[job.formato],
+            "caminho_arquivo": str(destino),
+            "tamanho_bytes": destino.stat().st_size,
+            "concluido_em": concluido_em,
+            "expira_em": concluido_em + _validade(),
+        },
+    )
+    if not concluido:
+        destino.unlink(missing_ok=True)
+    return concluido
+
+
+def despachar_exportacoes_pendentes(limite: int = 20) -> int:
+    pendentes = [
+        job_id
+        for (job_id,) in db.session.query(ExportJob.id)
+        .filter(ExportJob.status == "pendente")
+        .order_by(ExportJob.criado_em)
+        .limit(limite)
+        .all()
+    ]
+    for job_id in pendentes:
+        despachar_exportacao(job_id)
+    return len(pendentes)
+
+
+def retomar_exportacoes_pendentes(lease_segundos: int | None = None) -> int:
+    """Redespacha jobs cujo dono morreu (heartbeat vencido) e pendentes antigos."""
+    limite = datetime.utcnow() - timedelta(seconds=lease_segundos or _lease_segundos())
+    max_tentativas = int(current_app.config.get("EXPORT_JOBS_MAX_TENTATIVAS", 3))
+    sem_heartbeat = (
+        ExportJob.status == "processando",
+        func.coalesce(ExportJob.heartbeat_em, ExportJob.iniciado_em) < limite,
+    )
+    agora = datetime.utcnow()
+    esgotados = ExportJob.query.filter(
+        *sem_heartbeat, ExportJob.tentativas >= max_tentativas
+    ).update(
+        {
+            "status": "erro",
+            "erro": "Exportação interrompida repetidas vezes",
+            "concluido_em": agora,
+            "expira_em": agora + _validade(),
+        },
+        synchronize_session=False,
+    )
+    ExportJob.query.filter(*sem_heartbeat).update(
+        {"status": "pendente"}, synchronize_session=False
+    )
+    db.session.commit()
+    if esgotados:
+        log.warning(
+            "%d exportações abandonadas após %d tentativas", esgotados, max_tentativas
+        )
+
+    pendentes = [
+        job_id
+        for (job_id,) in db.session.query(ExportJob.id)
+        .filter(ExportJob.status == "pendente", ExportJob.criado_em < limite)
+        .all()
+    ]
+    for job_id in pendentes:
+        despachar_exportacao(job_id)
+    return len(pendentes)
+
+
+def limpar_exportacoes_expiradas() -> int:
+    agora = datetime.utcnow()
+    expirados = ExportJob.query.filter(ExportJob.expira_em < agora).all()
+    for job in expirados:
+        if job.caminho_arquivo:
+            Path(job.caminho_arquivo).unlink(missing_ok=True)
+        db.session.delete(job)
+    try:
+        db.session.commit()
+    except SQLAlchemyError:
+        db.session.rollback()
+        log.exception("Falha ao remover exportações expiradas")
+        return 0
+    return len(expirados)
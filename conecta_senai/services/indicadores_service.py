@@ -0,0 +1,183 @@
+"""Indicadores dos painéis de chamados (suporte de TI e manutenção).
+
+Os números saem de uma única consulta agregada sobre o conjunto filtrado,
+agrupada por status, tipo e nível de urgência; totais, médias e percentuais
+são derivados desses grupos. O resultado fica em cache no Redis por
+combinação de filtros durante ``INDICADORES_CACHE_TTL_SEGUNDOS``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Mapping
+
+from flask import current_app
+from sqlalchemy import case, func
+
+from conecta_senai.config import redis as redis_config
+from conecta_senai.models import db
+
+log = logging.getLogger(__name__)
+
+CHAVE_CACHE = "indicadores:{}:{}"
+TTL_PADRAO_SEGUNDOS = 60
+NIVEIS_URGENCIA = ("Baixo", "Médio", "Alto")
+FILTROS = (
+    "data_inicio",
+    "data_fim",
+    "area",
+    "tipo_equipamento_id",
+    "nivel_urgencia",
+    "status",
+)
+SEGUNDOS_24H = 86400
+TZ_BRASILIA = timezone(timedelta(hours=-3))
+
+
+def _data(valor: str | None, fim: bool = False) -> datetime | None:
+    if not valor:
+        return None
+    try:
+        data = datetime.fromisoformat(valor)
+    except (ValueError, TypeError):
+        return None
+    if fim:
+        data = data.replace(hour=23, minute=59, second=59, microsecond=999999)
+    else:
+        data = data.replace(hour=0, minute=0, second=0, microsecond=0)
+    return data.replace(tzinfo=TZ_BRASILIA).replace(tzinfo=None)
+
+
+def _aplicar_filtros(query, modelo, coluna_tipo, filtros: Mapping[str, str]):
+    if data_inicio := _data(filtros.get("data_inicio")):
+        query = query.filter(modelo.created_at >= data_inicio)
+    if data_fim := _data(filtros.get("data_fim"), fim=True):
+        query = query.filter(modelo.created_at <= data_fim)
+    if area := filtros.get("area"):
+        query = query.filter(modelo.area == area)
+    if tipo_id := filtros.get("tipo_equipamento_id"):
+        try:
+            query = query.filter(coluna_tipo == int(tipo_id))
+        except (ValueError, TypeError):
+            pass
+    if nivel := filtros.get("nivel_urgencia"):
+        query = query.filter(modelo.nivel_urgencia == nivel)
+    if status := filtros.get("status"):
+        query = query.filter(modelo.status == status)
+    return query
+
+
+def _segundos_desde_abertura(modelo, coluna):
+    return func.extract("epoch", coluna) - func.extract("epoch", modelo.created_at)
+
+
+def _media(soma, quantidade) -> float:
+    return float(soma) / quantidade if quantidade else 0
+
+
+def calcular_indicadores(
+    modelo, modelo_tipo, coluna_tipo, filtros: Mapping[str, str]
+) -> dict[str, Any]:
+    atendimento = _segundos_desde_abertura(modelo, modelo.inicio_atendimento_at)
+    encerramento = _segundos_desde_abertura(modelo, modelo.encerrado_at)
+    atendido = modelo.inicio_atendimento_at.isnot(None)
+    encerrado = modelo.encerrado_at.isnot(None)
+
+    query = (
+        db.session.query(
+            modelo.status,
+            modelo_tipo.nome,
+            modelo.nivel_urgencia,
+            func.count(modelo.id),
+            func.count(modelo.inicio_atendimento_at),
+            func.sum(case((atendido, atendimento), else_=0)),
+            func.sum(case((atendido & (atendimento < SEGUNDOS_24H), 1), else_=0)),
+            func.count(modelo.encerrado_at),
+            func.sum(case((encerrado, encerramento), else_=0)),
+        )
+        .select_from(modelo)
+        .outerjoin(modelo_tipo, modelo_tipo.id == coluna_tipo)
+        .group_by(modelo.status, modelo_tipo.nome, modelo.nivel_urgencia)
+    )
+    grupos = _aplicar_filtros(query, modelo, coluna_tipo, filtros).all()
+
+    total = 0
+    por_status: dict = defaultdict(int)
+    por_tipo: dict = defaultdict(int)
+    por_urgencia: dict = defaultdict(int)
+    # [atendidos, soma atendimento, atendidos em 24h, encerrados, soma encerramento]
+    geral = [0, 0.0, 0, 0, 0.0]
+    tempos: dict = defaultdict(lambda: [0, 0.0, 0, 0, 0.0])
+    for status, tipo, nivel, quantidade, *parciais in grupos:
+        total += quantidade
+        por_status[status] += quantidade
+        por_tipo[tipo] += quantidade
+        por_urgencia[nivel] += quantidade
+        for acumulado in (geral, tempos[nivel]):
+            for posicao, valor in enumerate(parciais):
+                acumulado[posicao] += float(valor or 0)
+
+    def _contagens(valores: dict, chave: str) -> list[dict]:
+        return [
+            {chave: valor or "Não informado", "quantidade": quantidade}
+            for valor, quantidade in sorted(
+                valores.items(), key=lambda item: (-item[1], str(item[0]))
+            )
+        ]
+
+    return {
+        "total_chamados": total,
+        "por_status": _contagens(por_status, "status"),
+        "por_tipo_equipamento": _contagens(por_tipo, "tipo"),
+        "por_nivel_urgencia": _contagens(por_urgencia, "nivel"),
+        "tempo_medio_abertura_para_atendimento_segundos": _media(geral[1], geral[0]),
+        "tempo_medio_abertura_para_encerramento_segundos": _media(geral[4], geral[3]),
+        "percentual_atendidos_em_24h": (
+            round(geral[2] / geral[0] * 100, 2) if geral[0] else 0
+        ),
+        "tempo_medio_por_urgencia": [
+            {
+                "nivel": nivel,
+                "tempo_atendimento": _media(tempos[nivel][1], tempos[nivel][0]),
+                "tempo_encerramento": _media(tempos[nivel][4], tempos[nivel][3]),
+            }
+            for nivel in NIVEIS_URGENCIA
+        ],
+    }
+
+
+def _chave_cache(modulo: str, filtros: Mapping[str, str]) -> str:
+    normalizados = {nome: filtros.get(nome) or "" for nome in FILTROS}
+    assinatura = hashlib.sha1(
+        json.dumps(normalizados, sort_keys=True).encode()
+    ).hexdigest()
+    return CHAVE_CACHE.format(modulo, assinatura)
+
+
+def obter_indicadores(
+    modulo: str, modelo, modelo_tipo, coluna_tipo, filtros: Mapping[str, str]
+) -> dict[str, Any]:
+    """Indicadores de ``modelo`` para os filtros da requisição, com cache."""
+    chave = _chave_cache(modulo, filtros)
+    cliente = redis_config.redis_conn
+    try:
+        em_cache = cliente.get(chave)
+    except Exception:
+        em_cache = None
+    if em_cache is not None:
+        return json.loads(em_cache)
+
+    indicadores = calcular_indicadores(modelo, modelo_tipo, coluna_tipo, filtros)
+    ttl = int(
+        current_app.config.get("INDICADORES_CACHE_TTL_SEGUNDOS", TTL_PADRAO_SEGUNDOS)
+    )
+    if ttl > 0:
+        try:
+            cliente.setex(chave, ttl, json.dumps(indicadores))
+        except Exception:
+            log.warning("Não foi possível armazenar os indicadores em cache")
+    return indicadores
@@ -12,6 +12,7 @@ from sqlalchemy.exc import ProgrammingError, SQLAlchemyError
 from werkzeug.datastructures import FileStorage
 from werkzeug.utils import secure_filename
 
+from conecta_senai.config.esquema import garantir_esquema, registrar_verificacao
 from conecta_senai.models import db
 from conecta_senai.models.imagem_noticia import ImagemNoticia
 from conecta_senai.models.noticia import Noticia
@@ -83,8 +84,10 @@ def _registrar_tabela_imagens_indisponivel(exc: Exception | None = None) -> None
 
 def _tabela_imagens_disponivel(force_refresh: bool = False) -> bool:
     global _TABELA_IMAGENS_DISPONIVEL
-    if _TABELA_IMAGENS_DISPONIVEL is not None and not force_refresh:
-        return _TABELA_IMAGENS_DISPONIVEL
+    if not force_refresh:
+        garantir_esquema()
+        if _TABELA_IMAGENS_DISPONIVEL is not None:
+            return _TABELA_IMAGENS_DISPONIVEL
 
     try:
         bind = db.session.get_bind()
@@ -119,6 +122,11 @@ def _tabela_imagens_disponivel(force_refresh: bool = False) -> bool:
     return resultado
 
 
+registrar_verificacao(
+    "imagens_noticias", ajuste=lambda: _tabela_imagens_disponivel(force_refresh=True)
+)
+
+
 def _extrair_caminho_relativo_de_url(url: str | None) -> str | None:
     if not url:
         return None
@@ -1,23 +1,98 @@
-from flask import jsonify
+import logging
 from datetime import datetime, timedelta
+
+from flask import jsonify
+from sqlalchemy import (
+    String,
+    cast,
+    func,
+    insert,
+    literal,
+    select,
+    text,
+    update,
+)
 from sqlalchemy.exc import SQLAlchemyError
 
+from conecta_senai.config import redis as redis_config
 from conecta_senai.models import db
 from conecta_senai.models.agendamento import Notificacao, Agendamento
 from conecta_senai.routes.user import verificar_admin
+from conecta_senai.services.eventos_service import publicar_evento
 from conecta_senai.utils.error_handler import handle_internal_error
+from conecta_senai.utils.paginacao import limitar_por_pagina, paginar_por_chave
+
+log = logging.getLogger(__name__)
+
+
+POR_PAGINA_PADRAO = 20
+POR_PAGINA_MAXIMO = 100
+TTL_CONTADOR_SEGUNDOS = 300
+CHAVE_CONTADOR = "notificacoes:nao_lidas:{}"
 
 
-def listar_notificacoes(user):
+def _escopo(user):
+    # Administradores enxergam todas as notificações.
     if verificar_admin(user):
-        notificacoes = Notificacao.query.order_by(Notificacao.data_criacao.desc()).all()
-    else:
-        notificacoes = (
-            Notificacao.query.filter_by(usuario_id=user.id)
-            .order_by(Notificacao.data_criacao.desc())
-            .all()
+        return Notificacao.query, "todas"
+    return Notificacao.query.filter_by(usuario_id=user.id), str(user.id)
+
+
+def listar_notificacoes(user, cursor=None, per_page=POR_PAGINA_PADRAO, lida=None):
+    """Página de notificações em ordem decrescente, paginada por chave.
+
+    O cursor codifica ``(data_criacao, id)`` da última notificação retornada.
+    """
+    per_page = limitar_por_pagina(per_page, POR_PAGINA_PADRAO, POR_PAGINA_MAXIMO)
+    query, _ = _escopo(user)
+    if lida is not None:
+        query = query.filter(Notificacao.lida.is_(lida))
+    try:
+        notificacoes, proximo = paginar_por_chave(
+            query, Notificacao.data_criacao, Notificacao.id, cursor, per_page
         )
-    return jsonify([n.to_dict() for n in notificacoes])
+    except ValueError as exc:
+        return jsonify({"erro": str(exc)}), 400
+    return jsonify(
+        {
+            "items": [n.to_dict() for n in notificacoes],
+            "per_page": per_page,
+            "next_cursor": proximo,
+        }
+    )
+
+
+def contar_nao_lidas(user) -> int:
+    query, escopo = _escopo(user)
+    chave = CHAVE_CONTADOR.format(escopo)
+    cliente = redis_config.redis_conn
+    try:
+        em_cache = cliente.get(chave)
+    except Exception:
+        em_cache = None
+    if em_cache is not None:
+        return int(em_cache)
+
+    total = query.filter(Notificacao.lida.is_(False)).count()
+    try:
+        cliente.setex(chave, TTL_CONTADOR_SEGUNDOS, total)
+    except Exception:
+        log.warning("Não foi possível armazenar o contador de notificações")
+    return total
+
+
+def invalidar_contadores(usuario_ids) -> None:
+    chaves = [CHAVE_CONTADOR.format(u) for u in set(usuario_ids)]
+    if not chaves:
+        return
+    chaves.append(CHAVE_CONTADOR.format("todas"))
+    remover = getattr(redis_config.redis_conn, "delete", None)
+    if remover is None:
+        return
+    try:
+        remover(*chaves)
+    except Exception:
+        log.warning("Não foi possível invalidar contadores de notificações")
 
 
 def marcar_notificacao_lida(id, user):
@@ -31,42 +106,136 @@ def marcar_notificacao_lida(id, user):
     try:
         notificacao.marcar_como_lida()
         db.session.commit()
+        invalidar_contadores([notificacao.usuario_id])
         return jsonify(notificacao.to_dict())
     except SQLAlchemyError as e:
         db.session.rollback()
         return handle_internal_error(e)
 
 
-def criar_notificacoes_agendamentos_proximos():
+def marcar_todas_lidas(user):
+    """Marca como lidas, num único UPDATE, as notificações visíveis ao usuário.
+
+    Para administradores os usuários afetados são lidos com ``DISTINCT`` antes
+    do UPDATE, em vez de devolver um id por notificação alterada.
+    """
+    admin = verificar_admin(user)
+    filtros = [Notificacao.lida.is_(False)]
+    if not admin:
+        filtros.append(Notificacao.usuario_id == user.id)
+    try:
+        if admin:
+            usuario_ids = (
+                db.session.execute(
+                    select(Notificacao.usuario_id).where(*filtros).distinct()
+                )
+                .scalars()
+                .all()
+            )
+        else:
+            usuario_ids = [user.id]
+        atualizadas = db.session.execute(
+            update(Notificacao).where(*filtros).values(lida=True)
+        ).rowcount
+        db.session.commit()
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        return handle_internal_error(e)
+    if atualizadas:
+        invalidar_contadores(usuario_ids)
+    return jsonify({"atualizadas": atualizadas, "nao_lidas": 0})
+
+
+# Predicado do índice único parcial ``uq_notificacoes_lembrete_pendente``: no
+# máximo um lembrete não lido por agendamento.
+LEMBRETE_PENDENTE = text("lida = false AND agendamento_id IS NOT NULL")
+
+
+def _data_formatada(coluna, dialeto: str):
+    if dialeto == "postgresql":
+        return func.to_char(coluna, "DD/MM/YYYY")
+    if dialeto == "sqlite":
+        return func.strftime("%d/%m/%Y", coluna)
+    return cast(coluna, String)
+
+
+def _insert_ignorando_duplicados(dialeto: str):
+    if dialeto == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as insert_dialeto
+    elif dialeto == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as insert_dialeto
+    else:
+        return insert(Notificacao.__table__), False
+    return insert_dialeto(Notificacao.__table__), True
+
+
+def criar_notificacoes_agendamentos_proximos() -> int:
+    """Cria, num único ``INSERT ... SELECT``, os lembretes que ainda faltam.
+
+    Em PostgreSQL e SQLite o insert ignora conflitos com o índice parcial e
+    devolve os usuários afetados via ``RETURNING``. Nos demais bancos os
+    usuários são lidos antes do insert, na mesma transação.
+
+    Retorna a quantidade de lembretes criados.
+    """
     agora = datetime.utcnow()
     limite = agora + timedelta(hours=24)
+    dialeto = db.engine.dialect.name
 
-    agendamentos_proximos = Agendamento.query.filter(
+    pendente = (
+        select(Notificacao.id)
+        .where(
+            Notificacao.agendamento_id == Agendamento.id,
+            Notificacao.lida.is_(False),
+        )
+        .exists()
+    )
+    filtros = (
         Agendamento.data >= agora.date(),
         Agendamento.data <= limite.date(),
-    ).all()
-
-    for agendamento in agendamentos_proximos:
-        notificacao_existente = Notificacao.query.filter_by(
-            agendamento_id=agendamento.id,
-            lida=False,
-        ).first()
-        if not notificacao_existente:
-            mensagem = (
-                f"Lembrete: Você tem um agendamento para {agendamento.laboratorio} em "
-                f"{agendamento.data.strftime('%d/%m/%Y')}"
-            )
-            nova_notificacao = Notificacao(
-                usuario_id=agendamento.usuario_id,
-                agendamento_id=agendamento.id,
-                mensagem=mensagem,
-            )
-            db.session.add(nova_notificacao)
+        ~pendente,
+    )
+    mensagem = (
+        literal("Lembrete: Você tem um agendamento para ")
+        + Agendamento.laboratorio
+        + literal(" em ")
+        + _data_formatada(Agendamento.data, dialeto)
+    )
+    faltantes = select(
+        Agendamento.usuario_id,
+        Agendamento.id,
+        mensagem,
+        literal(False),
+        literal(agora),
+    ).where(*filtros)
+
+    stmt, suporta_conflito = _insert_ignorando_duplicados(dialeto)
+    stmt = stmt.from_select(
+        ["usuario_id", "agendamento_id", "mensagem", "lida", "data_criacao"],
+        faltantes,
+    )
 
     try:
+        if suporta_conflito:
+            stmt = stmt.on_conflict_do_nothing(
+                index_elements=["agendamento_id"], index_where=LEMBRETE_PENDENTE
+            ).returning(Notificacao.usuario_id)
+            usuario_ids = db.session.execute(stmt).scalars().all()
+        else:
+            usuario_ids = (
+                db.session.execute(select(Agendamento.usuario_id).where(*filtros))
+                .scalars()
+                .all()
+            )
+            db.session.execute(stmt)
         db.session.commit()
-        return True
     except SQLAlchemyError as e:
         db.session.rollback()
         handle_internal_error(e)
-        return False
+        return 0
+    invalidar_contadores(usuario_ids)
+    if usuario_ids:
+        publicar_evento(
+            "notificacao", {"novas": len(usuario_ids)}, usuario_ids=usuario_ids
+        )
+    return len(usuario_ids)
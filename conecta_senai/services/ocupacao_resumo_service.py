@@ -0,0 +1,367 @@
+"""Resumo diário de ocupações (sala × dia × turno × status × tipo).
+
+As rotas de criação, edição e remoção somam ou descontam as ocupações
+afetadas na mesma transação; ``reconstruir_resumo`` refaz a tabela a partir
+de ``ocupacoes``. Resumo do período, relatório e tendência leem apenas o
+resumo, então o custo depende de dias × salas e não do número de ocupações.
+"""
+
+from __future__ import annotations
+
+from collections import Counter, defaultdict
+from datetime import date, time, timedelta
+from typing import Any, Iterable
+
+from sqlalchemy import and_, delete, extract, func, insert, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from conecta_senai.models import db
+from conecta_senai.models.ocupacao import STATUS_ATIVOS, TURNOS_PADRAO, Ocupacao
+from conecta_senai.models.ocupacao_resumo import TURNO_OUTRO, OcupacaoResumoDiario
+from conecta_senai.models.sala import Sala
+
+COLUNAS_CHAVE = ("data", "sala_id", "turno", "status", "tipo_ocupacao")
+TAMANHO_LOTE = 500
+
+_UPSERT = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def turno_por_horarios(inicio: time | None, fim: time | None) -> str:
+    for nome, (turno_inicio, turno_fim) in TURNOS_PADRAO.items():
+        if inicio == turno_inicio and fim == turno_fim:
+            return nome
+    return TURNO_OUTRO
+
+
+def _chave(ocupacao: Ocupacao) -> tuple:
+    return (
+        ocupacao.data,
+        ocupacao.sala_id,
+        turno_por_horarios(ocupacao.horario_inicio, ocupacao.horario_fim),
+        ocupacao.status or "",
+        ocupacao.tipo_ocupacao or "",
+    )
+
+
+def _lotes(itens: list, tamanho: int = TAMANHO_LOTE):
+    for inicio in range(0, len(itens), tamanho):
+        yield itens[inicio : inicio + tamanho]
+
+
+def _filtro_chaves(tabela, chaves: list[tuple]):
+    return or_(
+        *(
+            and_(
+                *(
+                    tabela.c[coluna] == valor
+                    for coluna, valor in zip(COLUNAS_CHAVE, chave)
+                )
+            )
+            for chave in chaves
+        )
+    )
+
+
+def _somar(deltas: dict[tuple, int]) -> None:
+    tabela = OcupacaoResumoDiario.__table__
+    linhas = [
+        {**dict(zip(COLUNAS_CHAVE, chave)), "quantidade": delta}
+        for chave, delta in deltas.items()
+        if delta
+    ]
+    upsert = _UPSERT.get(db.session.get_bind().dialect.name)
+
+    for lote in _lotes(linhas):
+        if upsert is not None:
+            stmt = upsert(tabela).values(lote)
+            db.session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=list(COLUNAS_CHAVE),
+                    set_={"quantidade": tabela.c.quantidade + stmt.excluded.quantidade},
+                )
+            )
+            continue
+        for linha in lote:
+            chave = tuple(linha[coluna] for coluna in COLUNAS_CHAVE)
+            atualizadas = db.session.execute(
+                update(tabela)
+                .where(_filtro_chaves(tabela, [chave]))
+                .values(quantidade=tabela.c.quantidade + linha["quantidade"])
+            ).rowcount
+            if not atualizadas:
+                db.session.execute(insert(tabela).values(linha))
+
+    removidas = [chave for chave, delta in deltas.items() if delta < 0]
+    for lote in _lotes(removidas, 100):
+        db.session.execute(
+            delete(tabela).where(_filtro_chaves(tabela, lote), tabela.c.quantidade <= 0)
+        )
+
+
+def registrar_ocupacoes(ocupacoes: Iterable[Ocupacao]) -> None:
+    """Soma ``ocupacoes`` ao resumo; o commit fica a cargo de quem chama."""
+    _somar(Counter(_chave(oc) for oc in ocupacoes))
+
+
+def descontar_ocupacoes(ocupacoes: Iterable[Ocupacao]) -> None:
+    """Desconta ``ocupacoes`` do resumo antes de removê-las ou alterá-las."""
+    deltas: Counter = Counter()
+    for oc in ocupacoes:
+        deltas[_chave(oc)] -= 1
+    _somar(deltas)
+
+
+def _contar_por_chave(filtros) -> Counter:
+    grupos = db.session.execute(
+        select(
+            Ocupacao.data,
+            Ocupacao.sala_id,
+            Ocupacao.horario_inicio,
+            Ocupacao.horario_fim,
+            Ocupacao.status,
+            Ocupacao.tipo_ocupacao,
+            func.count(Ocupacao.id),
+        )
+        .where(*filtros)
+        .group_by(
+            Ocupacao.data,
+            Ocupacao.sala_id,
+            Ocupacao.horario_inicio,
+            Ocupacao.horario_fim,
+            Ocupacao.status,
+            Ocupacao.tipo_ocupacao,
+        )
+    )
+    contagens: Counter = Counter()
+    for data, sala_id, inicio, fim, status, tipo, quantidade in grupos:
+        chave = (
+            data,
+            sala_id,
+            turno_por_horarios(inicio, fim),
+            status or "",
+            tipo or "",
+        )
+        contagens[chave] += quantidade
+    return contagens
+
+
+def descontar_ocupacoes_onde(*filtros) -> None:
+    """Desconta as ocupações que casam com ``filtros`` antes de uma remoção em massa.
+
+    Agrupa no banco em vez de carregar as linhas; o commit fica a cargo de
+    quem chama.
+    """
+    _somar(
+        {chave: -quantidade for chave, quantidade in _contar_por_chave(filtros).items()}
+    )
+
+
+def reconstruir_resumo(
+    data_inicio: date | None = None, data_fim: date | None = None
+) -> int:
+    """Recalcula o resumo do intervalo (ou inteiro) e retorna as linhas gravadas."""
+    tabela = OcupacaoResumoDiario.__table__
+    filtros_resumo = []
+    filtros_ocupacao = []
+    if data_inicio:
+        filtros_resumo.append(tabela.c.data >= data_inicio)
+        filtros_ocupacao.append(Ocupacao.data >= data_inicio)
+    if data_fim:
+        filtros_resumo.append(tabela.c.data <= data_fim)
+        filtros_ocupacao.append(Ocupacao.data <= data_fim)
+
+    contagens = _contar_por_chave(filtros_ocupacao)
+    db.session.execute(delete(tabela).where(*filtros_resumo))
+    linhas = [
+        {**dict(zip(COLUNAS_CHAVE, chave)), "quantidade": quantidade}
+        for chave, quantidade in contagens.items()
+    ]
+    for lote in _lotes(linhas):
+        db.session.execute(insert(tabela), lote)
+    db.session.commit()
+    return len(linhas)
+
+
+def _dias(data_inicio: date, data_fim: date):
+    dia = data_inicio
+    while dia <= data_fim:
+        yield dia
+        dia += timedelta(days=1)
+
+
+def _ocupadas_por_turno(
+    data_inicio: date,
+    data_fim: date,
+    sala_id: int | None,
+    turno: str | None,
+    instrutor_id: int | None,
+):
+    if instrutor_id:
+        # O resumo não guarda o instrutor; esse filtro agrega direto em ocupacoes.
+        consulta = (
+            db.session.query(
+                Ocupacao.data,
+                Ocupacao.sala_id,
+                Ocupacao.horario_inicio,
+                Ocupacao.horario_fim,
+                func.count(Ocupacao.id),
+            )
+            .filter(
+                Ocupacao.data >= data_inicio,
+                Ocupacao.data <= data_fim,
+                Ocupacao.status.in_(STATUS_ATIVOS),
+                Ocupacao.instrutor_id == instrutor_id,
+            )
+            .group_by(
+                Ocupacao.data,
+                Ocupacao.sala_id,
+                Ocupacao.horario_inicio,
+                Ocupacao.horario_fim,
+            )
+        )
+        if sala_id:
+            consulta = consulta.filter(Ocupacao.sala_id == sala_id)
+        for data, sala, inicio, fim, quantidade in consulta:
+            turno_ocupacao = turno_por_horarios(inicio, fim)
+            if not turno or turno_ocupacao == turno:
+                yield data, sala, turno_ocupacao, quantidade
+        return
+
+    resumo = OcupacaoResumoDiario
+    consulta = (
+        db.session.query(
+            resumo.data,
+            resumo.sala_id,
+            resumo.turno,
+            func.sum(resumo.quantidade),
+        )
+        .filter(
+            resumo.data >= data_inicio,
+            resumo.data <= data_fim,
+            resumo.status.in_(STATUS_ATIVOS),
+        )
+        .group_by(resumo.data, resumo.sala_id, resumo.turno)
+    )
+    if sala_id:
+        consulta = consulta.filter(resumo.sala_id == sala_id)
+    if turno:
+        consulta = consulta.filter(resumo.turno == turno)
+    yield from consulta
+
+
+def montar_resumo_periodo(
+    data_inicio: date,
+    data_fim: date,
+    sala_id: int | None = None,
+    turno: str | None = None,
+    instrutor_id: int | None = None,
+) -> dict[str, Any]:
+    salas = dict(
+        db.session.query(Sala.id, Sala.nome).filter(Sala.status == "ativa").all()
+    )
+    total_salas = len(salas)
+
+    ocupadas: dict = defaultdict(lambda: defaultdict(dict))
+    for data, sala, turno_ocupacao, quantidade in _ocupadas_por_turno(
+        data_inicio, data_fim, sala_id, turno, instrutor_id
+    ):
+        if turno_ocupacao in TURNOS_PADRAO and quantidade:
+            por_sala = ocupadas[data.isoformat()][turno_ocupacao]
+            por_sala[sala] = por_sala.get(sala, 0) + int(quantidade)
+
+    resumo: dict[str, Any] = {}
+    for dia in _dias(data_inicio, data_fim):
+        chave_dia = dia.isoformat()
+        resumo[chave_dia] = {}
+        for nome_turno in TURNOS_PADRAO:
+            por_sala = ocupadas.get(chave_dia, {}).get(nome_turno, {})
+            total_ocupadas = sum(por_sala.values())
+            resumo[chave_dia][nome_turno] = {
+                "ocupadas": total_ocupadas,
+                "salas_ocupadas": [
+                    {"sala_id": sala, "sala_nome": salas.get(sala, str(sala))}
+                    for sala in sorted(por_sala, key=lambda s: salas.get(s, str(s)))
+                ],
+                "salas_livres": [
+                    nome for sala, nome in salas.items() if sala not in por_sala
+                ],
+                "total_salas": total_salas,
+                "livres": total_salas - total_ocupadas,
+            }
+    return resumo
+
+
+def montar_relatorio(data_inicio: date, data_fim: date) -> dict[str, Any]:
+    resumo = OcupacaoResumoDiario
+    grupos = (
+        db.session.query(
+            resumo.sala_id,
+            resumo.status,
+            resumo.tipo_ocupacao,
+            func.sum(resumo.quantidade),
+        )
+        .filter(resumo.data >= data_inicio, resumo.data <= data_fim)
+        .group_by(resumo.sala_id, resumo.status, resumo.tipo_ocupacao)
+        .all()
+    )
+
+    por_status: Counter = Counter()
+    por_sala: Counter = Counter()
+    por_tipo: Counter = Counter()
+    for sala_id, status, tipo, quantidade in grupos:
+        quantidade = int(quantidade or 0)
+        por_status[status] += quantidade
+        if status in STATUS_ATIVOS:
+            por_sala[sala_id] += quantidade
+            por_tipo[tipo or None] += quantidade
+
+    nomes = dict(
+        db.session.query(Sala.id, Sala.nome).filter(Sala.id.in_(list(por_sala))).all()
+    )
+    salas_mais_utilizadas = sorted(
+        (
+            (nomes[sala_id], total)
+            for sala_id, total in por_sala.items()
+            if sala_id in nomes
+        ),
+        key=lambda item: (-item[1], item[0]),
+    )[:10]
+
+    return {
+        "periodo": {
+            "data_inicio": data_inicio.isoformat(),
+            "data_fim": data_fim.isoformat(),
+        },
+        "estatisticas_gerais": {
+            "total_ocupacoes": sum(por_status.values()),
+            "ocupacoes_confirmadas": por_status["confirmado"],
+            "ocupacoes_pendentes": por_status["pendente"],
+            "ocupacoes_canceladas": por_status["cancelado"],
+        },
+        "salas_mais_utilizadas": [
+            {"sala": sala, "total_ocupacoes": total}
+            for sala, total in salas_mais_utilizadas
+        ],
+        "ocupacoes_por_tipo": [
+            {"tipo": tipo or "Não especificado", "total": total}
+            for tipo, total in sorted(
+                por_tipo.items(), key=lambda item: (-item[1], item[0] or "")
+            )
+        ],
+    }
+
+
+def montar_tendencia(ano: int) -> list[dict[str, Any]]:
+    resumo = OcupacaoResumoDiario
+    mes = extract("month", resumo.data)
+    resultados = (
+        db.session.query(mes, func.sum(resumo.quantidade))
+        .filter(resumo.data >= date(ano, 1, 1), resumo.data <= date(ano, 12, 31))
+        .group_by(mes)
+        .all()
+    )
+    totais = {int(numero): int(total or 0) for numero, total in resultados}
+    return [
+        {"mes": str(numero).zfill(2), "total": totais.get(numero, 0)}
+        for numero in range(1, 13)
+    ]
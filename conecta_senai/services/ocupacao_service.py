@@ -0,0 +1,157 @@
+import csv
+from collections import defaultdict
+from datetime import date, time
+from io import StringIO
+from typing import Iterator
+
+from openpyxl import Workbook
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+from sqlalchemy import String, cast, func
+
+from conecta_senai.models import db
+from conecta_senai.models.ocupacao import STATUS_ATIVOS, Ocupacao
+from conecta_senai.models.sala import Sala
+
+
+def buscar_conflitos_periodo(
+    sala_id: int,
+    data_inicio: date,
+    data_fim: date,
+    horario_inicio: time,
+    horario_fim: time,
+    ocupacao_id: int | None = None,
+    grupo_ocupacao_id: str | None = None,
+) -> dict[date, list[Ocupacao]]:
+    """Resolve os conflitos de todo o intervalo em uma única consulta.
+
+    Retorna um dicionário ``{dia: [ocupações conflitantes]}`` contendo apenas
+    os dias em que há conflito.
+    """
+    query = Ocupacao.query.filter(
+        Ocupacao.sala_id == sala_id,
+        Ocupacao.data >= data_inicio,
+        Ocupacao.data <= data_fim,
+        Ocupacao.status.in_(STATUS_ATIVOS),
+        Ocupacao.filtro_sobreposicao(horario_inicio, horario_fim),
+    )
+
+    if ocupacao_id:
+        query = query.filter(Ocupacao.id != ocupacao_id)
+
+    if grupo_ocupacao_id:
+        query = query.filter(Ocupacao.grupo_ocupacao_id != grupo_ocupacao_id)
+
+    conflitos_por_dia: dict[date, list[Ocupacao]] = defaultdict(list)
+    for ocupacao in query.order_by(Ocupacao.data, Ocupacao.horario_inicio).all():
+        conflitos_por_dia[ocupacao.data].append(ocupacao)
+    return dict(conflitos_por_dia)
+
+
+def verificar_disponibilidade_periodo(
+    sala,
+    data_inicio: date,
+    data_fim: date,
+    horario_inicio: time,
+    horario_fim: time,
+    ocupacao_id: int | None = None,
+    grupo_ocupacao_id: str | None = None,
+) -> tuple[bool, list[Ocupacao]]:
+    """Equivalente em lote a ``Sala.is_disponivel`` + ``Ocupacao.buscar_conflitos``.
+
+    Retorna ``(disponivel, conflitos)`` com os conflitos ordenados por dia.
+    """
+    conflitos_por_dia = buscar_conflitos_periodo(
+        sala.id,
+        data_inicio,
+        data_fim,
+        horario_inicio,
+        horario_fim,
+        ocupacao_id,
+        grupo_ocupacao_id,
+    )
+    conflitos = [
+        ocupacao
+        for dia in sorted(conflitos_por_dia)
+        for ocupacao in conflitos_por_dia[dia]
+    ]
+    disponivel = sala.status == "ativa" and not conflitos
+    return disponivel, conflitos
+
+
+CABECALHO_EXPORTACAO = ["ID", "Sala", "Data", "Início", "Fim", "Status"]
+TAMANHO_LOTE_EXPORTACAO = 1000
+
+
+def consultar_ocupacoes_exportacao(
+    data_inicio: date | None = None,
+    data_fim: date | None = None,
+    sala_id: int | None = None,
+):
+    """Itera as linhas da exportação em lotes via cursor do servidor.
+
+    Cada linha é uma tupla ``(id, sala, data, início, fim, status)`` com o nome
+    da sala já resolvido no ``JOIN``, sem carregar entidades no identity map.
+    """
+    query = (
+        db.session.query(
+            Ocupacao.id,
+            func.coalesce(Sala.nome, cast(Ocupacao.sala_id, String)),
+            Ocupacao.data,
+            Ocupacao.horario_inicio,
+            Ocupacao.horario_fim,
+            Ocupacao.status,
+        )
+        .outerjoin(Sala, Sala.id == Ocupacao.sala_id)
+        .order_by(Ocupacao.data, Ocupacao.id)
+    )
+
+    if data_inicio:
+        query = query.filter(Ocupacao.data >= data_inicio)
+
+    if data_fim:
+        query = query.filter(Ocupacao.data <= data_fim)
+
+    if sala_id:
+        query = query.filter(Ocupacao.sala_id == sala_id)
+
+    return query.execution_options(
+        stream_results=True, yield_per=TAMANHO_LOTE_EXPORTACAO
+    )
+
+
+def gerar_csv_ocupacoes(linhas) -> Iterator[str]:
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CABECALHO_EXPORTACAO)
+    for indice, linha in enumerate(linhas, start=1):
+        writer.writerow(linha)
+        if indice % TAMANHO_LOTE_EXPORTACAO == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+    yield buffer.getvalue()
+
+
+def escrever_xlsx_ocupacoes(linhas, destino) -> None:
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(CABECALHO_EXPORTACAO)
+    for linha in linhas:
+        ws.append(list(linha))
+    wb.save(destino)
+
+
+def escrever_pdf_ocupacoes(linhas, destino) -> None:
+    c = canvas.Canvas(destino, pagesize=letter)
+    c.drawString(50, 750, "Relatório de Ocupações")
+    y = 730
+    c.drawString(50, y, "ID  Sala  Data  Início  Fim  Status")
+    y -= 20
+    for oc_id, sala, data, inicio, fim, status in linhas:
+        c.drawString(50, y, f"{oc_id}  {sala}  {data}  {inicio}  {fim}  {status}")
+        y -= 20
+        if y < 50:
+            c.showPage()
+            y = 750
+    c.save()
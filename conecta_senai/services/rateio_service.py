@@ -11,28 +11,28 @@ from conecta_senai.models.instrutor import Instrutor
 from conecta_senai.models.log_rateio import LogLancamentoRateio
 from conecta_senai.repositories.log_rateio_repository import LogRateioRepository
 from conecta_senai.schemas import RateioConfigCreateSchema, LancamentoRateioSchema
+from conecta_senai.utils.audit import registrar_evento
 from conecta_senai.utils.error_handler import handle_internal_error
 
 
 def registrar_log_rateio(
     user, acao, instrutor_nome, config, percentual, observacao=None
 ):
-
-    try:
-        log = LogLancamentoRateio(
-            usuario=user.nome if user else "Sistema",
-            acao=acao,
-            instrutor=instrutor_nome,
-            filial=config.filial if config else None,
-            uo=config.uo if config else None,
-            cr=config.cr if config else None,
-            classe_valor=config.classe_valor if config else None,
-            percentual=percentual,
-            observacao=observacao,
-        )
-        LogRateioRepository.add(log)
-    except Exception:
-        LogRateioRepository.rollback()
+    registrar_evento(
+        LogLancamentoRateio.__table__,
+        {
+            "usuario": user.nome if user else "Sistema",
+            "acao": acao,
+            "instrutor": instrutor_nome,
+            "filial": config.filial if config else None,
+            "uo": config.uo if config else None,
+            "cr": config.cr if config else None,
+            "classe_valor": config.classe_valor if config else None,
+            "percentual": percentual,
+            "observacao": observacao,
+            "timestamp": datetime.utcnow(),
+        },
+    )
 
 
 def listar_configs():
@@ -242,10 +242,9 @@ def listar_logs_rateio(usuario, instrutor, tipo, data_acao, page, per_page):
     )
 
 
-def exportar_logs_rateio():
+def escrever_csv_logs_rateio(destino) -> None:
     logs = LogRateioRepository.all_ordered()
-    si = StringIO()
-    writer = csv.writer(si)
+    writer = csv.writer(destino)
     writer.writerow(
         [
             "Data/Hora",
@@ -275,6 +274,11 @@ def exportar_logs_rateio():
                 l.observacao or "",
             ]
         )
+
+
+def exportar_logs_rateio():
+    si = StringIO()
+    escrever_csv_logs_rateio(si)
     output = make_response(si.getvalue())
     output.headers["Content-Disposition"] = "attachment; filename=logs_rateio.csv"
     output.headers["Content-Type"] = "text/csv"
@@ -0,0 +1,125 @@
+"""Consulta única das listagens de turmas de treinamento.
+
+As listagens da página inicial (agendadas, ativas, histórico e todas) leem só
+as colunas que serializam, com ``treinamentos`` e ``instrutores`` no mesmo
+SELECT; as linhas voltam como tuplas, sem passar pelo identity map do ORM.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import or_, select
+
+from conecta_senai.models import db
+from conecta_senai.models.instrutor import Instrutor
+from conecta_senai.models.treinamento import Treinamento, TurmaTreinamento
+
+CAMPOS_TURMA = (
+    "id",
+    "data_inicio",
+    "data_fim",
+    "local_realizacao",
+    "horario",
+    "teoria_online",
+)
+CAMPOS_TREINAMENTO = (
+    "id",
+    "nome",
+    "codigo",
+    "capacidade_maxima",
+    "carga_horaria",
+    "tem_pratica",
+    "links_materiais",
+    "tipo",
+    "conteudo_programatico",
+    "data_criacao",
+    "data_atualizacao",
+)
+CAMPOS_INSTRUTOR = (
+    "id",
+    "nome",
+    "email",
+    "telefone",
+    "area_atuacao",
+    "observacoes",
+    "disponibilidade",
+    "status",
+    "data_criacao",
+    "data_atualizacao",
+)
+
+
+def _colunas(modelo, prefixo: str, campos):
+    return [getattr(modelo, campo).label(f"{prefixo}_{campo}") for campo in campos]
+
+
+def _iso(valor):
+    return valor.isoformat() if valor else None
+
+
+def consultar_turmas(
+    filtros=(),
+    ordem=(),
+    desde: datetime | None = None,
+    pagina: int | None = None,
+    por_pagina: int | None = None,
+):
+    """Linhas da listagem; com ``por_pagina`` retorna também se há próxima página."""
+    consulta = (
+        select(
+            *_colunas(TurmaTreinamento, "turma", CAMPOS_TURMA),
+            *_colunas(Treinamento, "treinamento", CAMPOS_TREINAMENTO),
+            *_colunas(Instrutor, "instrutor", CAMPOS_INSTRUTOR),
+        )
+        .select_from(TurmaTreinamento)
+        .join(Treinamento, Treinamento.id == TurmaTreinamento.treinamento_id)
+        .outerjoin(Instrutor, Instrutor.id == TurmaTreinamento.instrutor_id)
+        .where(*filtros)
+        .order_by(*ordem, TurmaTreinamento.id)
+    )
+    if desde is not None:
+        consulta = consulta.where(
+            or_(
+                TurmaTreinamento.data_atualizacao >= desde,
+                Treinamento.data_atualizacao >= desde,
+            )
+        )
+    if por_pagina is None:
+        return db.session.execute(consulta).all(), False
+
+    consulta = consulta.offset((pagina - 1) * por_pagina).limit(por_pagina + 1)
+    linhas = db.session.execute(consulta).all()
+    return linhas[:por_pagina], len(linhas) > por_pagina
+
+
+def serializar_turma(linha, instrutor_resumido: bool = False) -> dict:
+    valores = linha._mapping
+    treinamento = {
+        campo: valores[f"treinamento_{campo}"] for campo in CAMPOS_TREINAMENTO
+    }
+    treinamento["links_materiais"] = treinamento["links_materiais"] or []
+    treinamento["data_criacao"] = _iso(treinamento["data_criacao"])
+    treinamento["data_atualizacao"] = _iso(treinamento["data_atualizacao"])
+
+    dados = {
+        "turma_id": valores["turma_id"],
+        "treinamento": treinamento,
+        "data_inicio": _iso(valores["turma_data_inicio"]),
+        "data_fim": _iso(valores["turma_data_fim"]),
+        "local_realizacao": valores["turma_local_realizacao"],
+        "horario": valores["turma_horario"],
+    }
+    if instrutor_resumido:
+        dados["instrutor_nome"] = valores["instrutor_nome"] or "A definir"
+    elif valores["instrutor_id"] is None:
+        dados["instrutor"] = None
+    else:
+        instrutor = {campo: valores[f"instrutor_{campo}"] for campo in CAMPOS_INSTRUTOR}
+        instrutor["disponibilidade"] = instrutor["disponibilidade"] or []
+        instrutor["data_criacao"] = _iso(instrutor["data_criacao"])
+        instrutor["data_atualizacao"] = _iso(instrutor["data_atualizacao"])
+        dados["instrutor"] = instrutor
+    dados["teoria_online"] = valores["turma_teoria_online"]
+    dados["has_pratica"] = bool(treinamento["tem_pratica"])
+    return dados
@@ -1,3 +1,3 @@
-from .scheduler import start_scheduler
+from .scheduler import start_scheduler, stop_scheduler
 
-__all__ = ["start_scheduler"]
+__all__ = ["start_scheduler", "stop_scheduler"]
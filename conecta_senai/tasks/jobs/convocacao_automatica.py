@@ -1,72 +1,101 @@
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Iterable
+from datetime import date, datetime
 
 from flask import current_app
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import contains_eager, joinedload
 
 from conecta_senai.models import db, InscricaoTreinamento, TurmaTreinamento
+from conecta_senai.services.email_outbox_service import enfileirar_email
 from conecta_senai.services.email_service import enviar_convocacao
 
+TAMANHO_LOTE_PADRAO = 200
 
-def _carregar_inscricoes_pendentes() -> Iterable[InscricaoTreinamento]:
+
+def _carregar_lote_pendente(
+    apos_id: int, hoje: date, limite: int
+) -> list[InscricaoTreinamento]:
+    # Paginação por chave (id > marca d'água) sobre o índice parcial
+    # ``convocado_em IS NULL``; turmas já encerradas ficam de fora.
+    turma = contains_eager(InscricaoTreinamento.turma)
     return (
-        InscricaoTreinamento.query.options(
+        InscricaoTreinamento.query.join(
+            TurmaTreinamento, InscricaoTreinamento.turma_id == TurmaTreinamento.id
+        )
+        .options(
             joinedload(InscricaoTreinamento.usuario),
-            joinedload(InscricaoTreinamento.turma).joinedload(
-                TurmaTreinamento.treinamento
-            ),
-            joinedload(InscricaoTreinamento.turma).joinedload(
-                TurmaTreinamento.instrutor
-            ),
+            turma.joinedload(TurmaTreinamento.treinamento),
+            turma.joinedload(TurmaTreinamento.instrutor),
+        )
+        .filter(
+            InscricaoTreinamento.convocado_em.is_(None),
+            InscricaoTreinamento.id > apos_id,
+            TurmaTreinamento.data_fim >= hoje,
         )
-        .filter(InscricaoTreinamento.convocado_em.is_(None))
+        .order_by(InscricaoTreinamento.id)
+        .limit(limite)
         .all()
     )
 
 
-def convocacao_automatica_job() -> None:
+def _convocar_lote(lote: list[InscricaoTreinamento]) -> int:
     logger = current_app.logger
-
-    inscricoes_a_convocar = _carregar_inscricoes_pendentes()
-    if not inscricoes_a_convocar:
-        logger.debug("Nenhuma inscrição pendente de convocação encontrada.")
-        return
-
-    for inscricao in inscricoes_a_convocar:
-        turma = getattr(inscricao, "turma", None)
-        treinamento = getattr(turma, "treinamento", None) if turma else None
-        if turma is None or treinamento is None:
+    convocadas = 0
+    for inscricao in lote:
+        turma = inscricao.turma
+        if turma.treinamento is None:
             logger.warning(
-                "Inscrição %s sem turma ou treinamento associado; ignorando.",
-                getattr(inscricao, "id", "?"),
+                "Inscrição %s sem treinamento associado; ignorando.", inscricao.id
             )
             continue
 
         try:
-            enviar_convocacao(inscricao, turma)
+            enviar_convocacao(inscricao, turma, send_email_fn=enfileirar_email)
         except ValueError as exc:
             logger.warning(
-                "Convocação ignorada para inscrição %s: %s",
-                getattr(inscricao, "id", "?"),
-                exc,
+                "Convocação ignorada para inscrição %s: %s", inscricao.id, exc
             )
             continue
         except Exception:
             logger.exception(
                 "Falha ao enviar convocação automática para inscrição %s.",
-                getattr(inscricao, "id", "?"),
+                inscricao.id,
             )
             continue
 
         inscricao.convocado_em = datetime.utcnow()
+        convocadas += 1
+    return convocadas
 
-    try:
-        db.session.commit()
-    except Exception:
-        db.session.rollback()
-        logger.exception(
-            "Erro ao salvar o status das convocações automáticas no banco de dados.",
-        )
-        raise
+
+def convocacao_automatica_job() -> int:
+    logger = current_app.logger
+    tamanho_lote = int(current_app.config.get("CONVOCACAO_LOTE", TAMANHO_LOTE_PADRAO))
+    hoje = date.today()
+
+    marca_dagua = 0
+    convocadas = 0
+    while True:
+        lote = _carregar_lote_pendente(marca_dagua, hoje, tamanho_lote)
+        if not lote:
+            break
+        marca_dagua = lote[-1].id
+
+        convocadas_lote = _convocar_lote(lote)
+        try:
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            logger.exception(
+                "Erro ao salvar o lote de convocações automáticas até a inscrição %s.",
+                marca_dagua,
+            )
+            raise
+        convocadas += convocadas_lote
+
+        if len(lote) < tamanho_lote:
+            break
+
+    if not convocadas:
+        logger.debug("Nenhuma inscrição pendente de convocação encontrada.")
+    return convocadas
@@ -0,0 +1,14 @@
+import logging
+
+from conecta_senai.services.email_outbox_service import processar_outbox
+
+log = logging.getLogger(__name__)
+
+
+def despachar_emails() -> dict[str, int]:
+    resultado = processar_outbox()
+    if resultado.get("falhou"):
+        log.warning(
+            "%d e-mail(s) movidos para dead-letter neste lote.", resultado["falhou"]
+        )
+    return resultado
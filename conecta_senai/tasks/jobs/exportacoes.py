@@ -0,0 +1,22 @@
+import logging
+
+from conecta_senai.services.export_job_service import (
+    limpar_exportacoes_expiradas,
+    retomar_exportacoes_pendentes,
+)
+
+log = logging.getLogger(__name__)
+
+
+def manter_exportacoes() -> dict[str, int]:
+    resultado = {
+        "retomadas": retomar_exportacoes_pendentes(),
+        "removidas": limpar_exportacoes_expiradas(),
+    }
+    if resultado["retomadas"] or resultado["removidas"]:
+        log.info(
+            "Exportações: %d retomadas, %d expiradas removidas.",
+            resultado["retomadas"],
+            resultado["removidas"],
+        )
+    return resultado
@@ -7,4 +7,4 @@ from conecta_senai.services.notificacao_service import (
 def _executar_lembretes():
     app = current_app._get_current_object()
     with app.app_context():
-        criar_notificacoes_agendamentos_proximos()
+        return criar_notificacoes_agendamentos_proximos()
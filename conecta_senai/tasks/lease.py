@@ -0,0 +1,265 @@
+"""Execução única dos jobs agendados entre processos e containers.
+
+Cada processo da aplicação sobe o seu próprio ``BackgroundScheduler``. Antes
+de executar, o job entra numa seção crítica curta protegida por um lock
+distribuído (Redis, *advisory lock* do Postgres ou, na falta de ambos, um lock
+local) e consulta o histórico em ``job_execucoes``: se outra instância já
+iniciou o mesmo job dentro do intervalo mínimo, ou ainda o está executando, a
+execução é ignorada.
+
+Jobs de intervalo curto (abaixo de ``JANELA_MINIMA_HISTORICO``, ex.: o
+despacho de e-mails) rodam com o lock mantido e só gravam histórico quando
+fizeram algum trabalho ou falharam, para não inserir uma linha a cada tick.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import threading
+import time as time_module
+import uuid
+import zlib
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Callable, Iterator
+
+from flask import current_app
+from sqlalchemy import and_, or_, text
+
+from conecta_senai.config import redis as redis_config
+from conecta_senai.models import db
+from conecta_senai.models.job_execucao import JobExecucao
+
+log = logging.getLogger(__name__)
+
+PREFIXO_LOCK = "scheduler:lock:"
+
+_SCRIPT_LIBERAR = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+_locks_locais: dict[str, threading.Lock] = {}
+_locks_locais_guarda = threading.Lock()
+
+INSTANCIA = f"{socket.gethostname()}:{os.getpid()}"
+
+JANELA_MINIMA_HISTORICO = timedelta(minutes=1)
+
+
+def _redis_disponivel() -> Any:
+    cliente = redis_config.redis_conn
+    if isinstance(cliente, redis_config.DummyRedis):
+        return None
+    return cliente
+
+
+def _liberar_redis(cliente: Any, chave: str, token: str) -> None:
+    try:
+        cliente.eval(_SCRIPT_LIBERAR, 1, chave, token)
+    except Exception:
+        log.warning("Falha ao liberar lock %s no Redis", chave)
+
+
+@contextmanager
+def _lock_postgres(nome: str) -> Iterator[bool]:
+    chave = zlib.crc32(f"{PREFIXO_LOCK}{nome}".encode())
+    with db.engine.connect() as conexao:
+        obtido = bool(
+            conexao.execute(
+                text("SELECT pg_try_advisory_lock(:chave)"), {"chave": chave}
+            ).scalar()
+        )
+        try:
+            yield obtido
+        finally:
+            if obtido:
+                conexao.execute(
+                    text("SELECT pg_advisory_unlock(:chave)"), {"chave": chave}
+                )
+                conexao.commit()
+
+
+@contextmanager
+def _lock_local(nome: str) -> Iterator[bool]:
+    with _locks_locais_guarda:
+        lock = _locks_locais.setdefault(nome, threading.Lock())
+    obtido = lock.acquire(blocking=False)
+    try:
+        yield obtido
+    finally:
+        if obtido:
+            lock.release()
+
+
+@contextmanager
+def adquirir_lock(nome: str, ttl: int = 60) -> Iterator[tuple[bool, str]]:
+    """Tenta obter o lock ``nome`` sem bloquear; retorna ``(obtido, backend)``."""
+    cliente = _redis_disponivel()
+    if cliente is not None:
+        chave = f"{PREFIXO_LOCK}{nome}"
+        token = uuid.uuid4().hex
+        try:
+            obtido = bool(cliente.set(chave, token, nx=True, ex=ttl))
+        except Exception as exc:
+            log.warning("Lock no Redis indisponível, usando fallback: %s", exc)
+        else:
+            try:
+                yield obtido, "redis"
+            finally:
+                if obtido:
+                    _liberar_redis(cliente, chave, token)
+            return
+
+    if db.engine.dialect.name == "postgresql":
+        with _lock_postgres(nome) as obtido:
+            yield obtido, "postgres"
+        return
+
+    with _lock_local(nome) as obtido:
+        yield obtido, "local"
+
+
+def _contar_linhas(resultado: Any) -> int | None:
+    if isinstance(resultado, bool):
+        return None
+    if isinstance(resultado, int):
+        return resultado
+    if isinstance(resultado, dict):
+        valores = [v for v in resultado.values() if isinstance(v, int)]
+        return sum(valores) if valores else None
+    return None
+
+
+def _houve_trabalho(resultado: Any) -> bool:
+    linhas = _contar_linhas(resultado)
+    if linhas is not None:
+        return linhas > 0
+    return bool(resultado)
+
+
+def _reservar_execucao(
+    job_id: str, intervalo_minimo: timedelta, backend: str
+) -> JobExecucao | None:
+    agora = datetime.utcnow()
+    expirada = agora - timedelta(
+        minutes=int(current_app.config.get("SCHEDULER_EXECUCAO_EXPIRADA_MINUTOS", 60))
+    )
+    ocupado = (
+        db.session.query(JobExecucao.id)
+        .filter(
+            JobExecucao.job_id == job_id,
+            or_(
+                JobExecucao.iniciado_em > agora - intervalo_minimo,
+                and_(
+                    JobExecucao.status == "executando",
+                    JobExecucao.iniciado_em > expirada,
+                ),
+            ),
+        )
+        .first()
+    )
+    if ocupado:
+        return None
+    execucao = JobExecucao(
+        job_id=job_id,
+        instancia=INSTANCIA,
+        backend_lock=backend,
+        status="executando",
+        iniciado_em=agora,
+    )
+    db.session.add(execucao)
+    db.session.commit()
+    return execucao
+
+
+def _rodar(job_id: str, funcao: Callable[[], Any]) -> tuple[Any, Exception | None]:
+    try:
+        return funcao(), None
+    except Exception as exc:
+        db.session.rollback()
+        log.exception("Falha ao executar job %s", job_id)
+        return None, exc
+
+
+def _finalizar(
+    execucao: JobExecucao, resultado: Any, erro: Exception | None, inicio: float
+) -> JobExecucao:
+    if erro is not None:
+        execucao.status = "erro"
+        execucao.erro = str(erro) or erro.__class__.__name__
+    else:
+        execucao.status = "sucesso"
+        execucao.linhas_afetadas = _contar_linhas(resultado)
+        if isinstance(resultado, dict):
+            execucao.resultado = resultado
+    execucao.finalizado_em = datetime.utcnow()
+    execucao.duracao_ms = int((time_module.perf_counter() - inicio) * 1000)
+    db.session.commit()
+    return execucao
+
+
+def _executar_frequente(
+    job_id: str, funcao: Callable[[], Any], ttl: int
+) -> JobExecucao | None:
+    with adquirir_lock(job_id, ttl) as (obtido, backend):
+        if not obtido:
+            log.debug("Job %s em execução em outra instância.", job_id)
+            return None
+        iniciado_em = datetime.utcnow()
+        inicio = time_module.perf_counter()
+        resultado, erro = _rodar(job_id, funcao)
+        if erro is None and not _houve_trabalho(resultado):
+            return None
+        execucao = JobExecucao(
+            job_id=job_id,
+            instancia=INSTANCIA,
+            backend_lock=backend,
+            iniciado_em=iniciado_em,
+        )
+        db.session.add(execucao)
+        return _finalizar(execucao, resultado, erro, inicio)
+
+
+def executar_job(
+    job_id: str,
+    funcao: Callable[[], Any],
+    intervalo_minimo: timedelta,
+) -> JobExecucao | None:
+    """Executa ``funcao`` uma única vez por ``intervalo_minimo`` no cluster.
+
+    Retorna o registro de histórico, ou ``None`` quando outra instância já
+    executou o job no intervalo ou ainda o está executando. Em jobs de
+    intervalo curto, ``None`` também indica um tick sem trabalho.
+    """
+    ttl = int(current_app.config.get("SCHEDULER_LOCK_TTL_SEGUNDOS", 60))
+    if intervalo_minimo < JANELA_MINIMA_HISTORICO:
+        return _executar_frequente(job_id, funcao, ttl)
+
+    with adquirir_lock(job_id, ttl) as (obtido, backend):
+        if not obtido:
+            log.debug("Job %s em execução em outra instância.", job_id)
+            return None
+        execucao = _reservar_execucao(job_id, intervalo_minimo, backend)
+    if execucao is None:
+        log.debug("Job %s já executado ou em execução neste intervalo.", job_id)
+        return None
+
+    inicio = time_module.perf_counter()
+    resultado, erro = _rodar(job_id, funcao)
+    execucao = db.session.get(JobExecucao, execucao.id)
+    return _finalizar(execucao, resultado, erro, inicio)
+
+
+def limpar_historico_jobs(dias: int | None = None) -> int:
+    dias = dias or int(current_app.config.get("SCHEDULER_HISTORICO_DIAS", 14))
+    limite = datetime.utcnow() - timedelta(days=dias)
+    removidos = JobExecucao.query.filter(JobExecucao.iniciado_em < limite).delete(
+        synchronize_session=False
+    )
+    db.session.commit()
+    return removidos
@@ -1,29 +1,66 @@
 import os
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.schedulers.base import STATE_RUNNING
+from datetime import timedelta
 
+from apscheduler.executors.pool import ThreadPoolExecutor
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.schedulers.base import STATE_RUNNING, STATE_STOPPED
 
 scheduler = BackgroundScheduler()
 
+# Fração do intervalo usada como janela de deduplicação entre instâncias:
+# tolera a diferença de fase entre os schedulers de cada processo.
+FATOR_JANELA_INTERVALO = 0.8
 
-def start_scheduler(app):
-    intervalo = int(os.getenv("NOTIFICACAO_INTERVALO_MINUTOS", "60"))
 
-    def job():
-        from conecta_senai.tasks.jobs.notificacoes import _executar_lembretes
+def _janela_execucao(trigger, trigger_args):
+    if trigger == "interval":
+        intervalo = timedelta(
+            **{
+                unidade: trigger_args[unidade]
+                for unidade in ("weeks", "days", "hours", "minutes", "seconds")
+                if unidade in trigger_args
+            }
+        )
+        return intervalo * FATOR_JANELA_INTERVALO
+    return timedelta(hours=12)
+
+
+def _agendar(app, funcao, trigger, job_id, misfire_grace_time, **trigger_args):
+    from conecta_senai.tasks.lease import executar_job
 
+    janela = _janela_execucao(trigger, trigger_args)
+
+    def executar():
         with app.app_context():
-            _executar_lembretes()
+            executar_job(job_id, funcao, janela)
 
     scheduler.add_job(
-        job,
-        "interval",
-        minutes=intervalo,
-        id="lembretes_notificacoes",
+        executar,
+        trigger,
+        id=job_id,
         replace_existing=True,
         max_instances=1,
         coalesce=True,
+        misfire_grace_time=misfire_grace_time,
+        **trigger_args,
+    )
+
+
+def start_scheduler(app, max_workers=None):
+    intervalo = int(os.getenv("NOTIFICACAO_INTERVALO_MINUTOS", "60"))
+
+    def job():
+        from conecta_senai.tasks.jobs.notificacoes import _executar_lembretes
+
+        return _executar_lembretes()
+
+    _agendar(
+        app,
+        job,
+        "interval",
+        "lembretes_notificacoes",
         misfire_grace_time=300,
+        minutes=intervalo,
     )
 
     def convocacao_job():
@@ -31,56 +68,129 @@ def start_scheduler(app):
             convocacao_automatica_job,
         )
 
-        with app.app_context():
-            convocacao_automatica_job()
+        return convocacao_automatica_job()
 
-    scheduler.add_job(
+    _agendar(
+        app,
         convocacao_job,
         "interval",
-        hours=1,
-        id="convocacao_automatica",
-        replace_existing=True,
-        max_instances=1,
-        coalesce=True,
+        "convocacao_automatica",
         misfire_grace_time=300,
+        hours=1,
     )
 
     def publicacao_noticias_job():
         from conecta_senai.tasks.jobs.noticias import publicar_noticias_agendadas
 
-        with app.app_context():
-            publicar_noticias_agendadas()
+        return publicar_noticias_agendadas()
 
-    scheduler.add_job(
+    _agendar(
+        app,
         publicacao_noticias_job,
         "interval",
-        minutes=5,
-        id="publicar_noticias_agendadas",
-        replace_existing=True,
-        max_instances=1,
-        coalesce=True,
+        "publicar_noticias_agendadas",
         misfire_grace_time=60,
+        minutes=5,
     )
 
     def limpeza_destaques_job():
         from conecta_senai.tasks.jobs.noticias import remover_destaques_expirados
 
-        with app.app_context():
-            remover_destaques_expirados()
+        return remover_destaques_expirados()
 
-    scheduler.add_job(
+    _agendar(
+        app,
         limpeza_destaques_job,
         "cron",
+        "remover_destaques_expirados",
+        misfire_grace_time=3600,
         hour=3,
         minute=0,
-        id="remover_destaques_expirados",
-        replace_existing=True,
-        max_instances=1,
-        coalesce=True,
+    )
+
+    def exportacoes_job():
+        from conecta_senai.tasks.jobs.exportacoes import manter_exportacoes
+
+        return manter_exportacoes()
+
+    _agendar(
+        app,
+        exportacoes_job,
+        "interval",
+        "manter_exportacoes",
+        misfire_grace_time=300,
+        minutes=10,
+    )
+
+    def emails_job():
+        from conecta_senai.tasks.jobs.emails import despachar_emails
+
+        return despachar_emails()
+
+    _agendar(
+        app,
+        emails_job,
+        "interval",
+        "despachar_emails",
+        misfire_grace_time=60,
+        seconds=int(app.config.get("EMAIL_OUTBOX_INTERVALO_SEGUNDOS", 15)),
+    )
+
+    def historico_jobs_job():
+        from conecta_senai.tasks.lease import limpar_historico_jobs
+
+        return limpar_historico_jobs()
+
+    _agendar(
+        app,
+        historico_jobs_job,
+        "cron",
+        "limpar_historico_jobs",
         misfire_grace_time=3600,
+        hour=3,
+        minute=30,
     )
 
+    def particoes_auditoria_job():
+        from conecta_senai.services.auditoria_retencao_service import (
+            garantir_particoes,
+        )
+
+        return garantir_particoes()
+
+    _agendar(
+        app,
+        particoes_auditoria_job,
+        "cron",
+        "garantir_particoes_auditoria",
+        misfire_grace_time=3600,
+        hour=2,
+        minute=30,
+    )
+
+    if app.config.get("EXPORT_JOBS_VIA_WORKER"):
+
+        def consumir_exportacoes_job():
+            from conecta_senai.services.export_job_service import (
+                despachar_exportacoes_pendentes,
+            )
+
+            return despachar_exportacoes_pendentes()
+
+        _agendar(
+            app,
+            consumir_exportacoes_job,
+            "interval",
+            "consumir_exportacoes",
+            misfire_grace_time=30,
+            seconds=int(app.config.get("EXPORT_JOBS_INTERVALO_SEGUNDOS", 5)),
+        )
+
     if scheduler.state != STATE_RUNNING:
+        if max_workers:
+            scheduler.configure(
+                executors={"default": ThreadPoolExecutor(int(max_workers))}
+            )
         scheduler.start()
         app.logger.info(
             "Scheduler de tarefas iniciado com %d jobs agendados.",
@@ -91,3 +201,9 @@ def start_scheduler(app):
 
     app.extensions.setdefault("apscheduler", scheduler)
     return scheduler
+
+
+def stop_scheduler(wait=True):
+    """Para o scheduler aguardando (por padrão) os jobs em andamento."""
+    if scheduler.state != STATE_STOPPED:
+        scheduler.shutdown(wait=wait)
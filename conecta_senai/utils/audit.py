@@ -1,9 +1,152 @@
+"""Gravação em lote dos registros de auditoria.
+
+Dentro de uma requisição os eventos ficam em ``g`` e são gravados com um
+único INSERT no teardown, numa conexão própria; fora dela (CLI, jobs, testes)
+ou com ``AUDITORIA_EM_LOTE`` desligado, são gravados na hora. Lotes que falham
+por indisponibilidade do banco ficam pendentes e são reenviados no próximo
+descarregamento ou na saída do processo.
+
+Os eventos acompanham a transação de ``db.session``: o commit os confirma e o
+rollback os descarta. No teardown, eventos ainda não confirmados só são
+gravados se a sessão não tiver escritas pendentes (ex.: ``log_action`` chamado
+depois do commit); caso contrário a transação será desfeita e eles também.
+"""
+
 from __future__ import annotations
 
-from typing import Any
+import atexit
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+
+from flask import current_app, g, has_request_context, request_tearing_down
+from sqlalchemy import event, insert
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
 from conecta_senai.models import db
 from conecta_senai.models.audit_log import AuditLog
 
+log = logging.getLogger(__name__)
+
+MAX_PENDENTES = 10_000
+_ESCRITA_PENDENTE = "auditoria_escrita_pendente"
+
+_pendentes: deque = deque(maxlen=MAX_PENDENTES)
+_lock_pendentes = threading.Lock()
+
+
+def _em_lote() -> bool:
+    return has_request_context() and current_app.config.get("AUDITORIA_EM_LOTE", True)
+
+
+def _inserir(lotes: dict) -> None:
+    with db.engine.begin() as conn:
+        for tabela, linhas in lotes.items():
+            conn.execute(insert(tabela), linhas)
+
+
+def _gravar(app, lotes: dict) -> None:
+    try:
+        _inserir(lotes)
+    except OperationalError:
+        log.exception("Falha ao gravar auditoria; lote mantido para nova tentativa")
+        with _lock_pendentes:
+            _pendentes.append((app, lotes))
+    except Exception:
+        log.exception("Registros de auditoria descartados")
+
+
+def _retirar_pendentes(app) -> list[dict]:
+    with _lock_pendentes:
+        lotes = [lote for dono, lote in _pendentes if dono is app]
+        restantes = [item for item in _pendentes if item[0] is not app]
+        _pendentes.clear()
+        _pendentes.extend(restantes)
+    return lotes
+
+
+def _juntar(destino: dict, origem: dict) -> None:
+    for tabela, linhas in origem.items():
+        destino.setdefault(tabela, []).extend(linhas)
+
+
+def _sessao_da_requisicao(sessao) -> bool:
+    return has_request_context() and sessao is db.session()
+
+
+def _escrita_pendente(sessao) -> bool:
+    return bool(
+        sessao.new
+        or sessao.dirty
+        or sessao.deleted
+        or sessao.info.get(_ESCRITA_PENDENTE)
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def _marcar_escrita(sessao, _contexto) -> None:
+    sessao.info[_ESCRITA_PENDENTE] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _confirmar_eventos(sessao) -> None:
+    sessao.info.pop(_ESCRITA_PENDENTE, None)
+    if not _sessao_da_requisicao(sessao):
+        return
+    eventos = g.pop("_auditoria_transacao", None)
+    if eventos:
+        _juntar(g.setdefault("_auditoria", {}), eventos)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _descartar_eventos(sessao, transacao_anterior) -> None:
+    if transacao_anterior.nested:
+        return
+    sessao.info.pop(_ESCRITA_PENDENTE, None)
+    if _sessao_da_requisicao(sessao):
+        g.pop("_auditoria_transacao", None)
+
+
+def registrar_evento(tabela, linha: dict) -> None:
+    """Enfileira ``linha`` para ``tabela`` (ou grava na hora, fora de requisição)."""
+    if _em_lote():
+        buffer = g.setdefault("_auditoria_transacao", {})
+        buffer.setdefault(tabela, []).append(linha)
+        return
+    _gravar(current_app._get_current_object(), {tabela: [linha]})
+
+
+def descarregar_auditoria(sender, **_extra) -> None:
+    """Grava os eventos confirmados da requisição atual e os lotes pendentes."""
+    lotes = g.pop("_auditoria", None) or {}
+    nao_confirmados = g.pop("_auditoria_transacao", None)
+    if nao_confirmados:
+        if _escrita_pendente(db.session()):
+            log.debug("Eventos de auditoria descartados com a transação não confirmada")
+        else:
+            _juntar(lotes, nao_confirmados)
+    pendentes = _retirar_pendentes(sender) if _pendentes else []
+    if lotes:
+        pendentes.append(lotes)
+    for lote in pendentes:
+        _gravar(sender, lote)
+
+
+request_tearing_down.connect(descarregar_auditoria)
+
+
+@atexit.register
+def _descarregar_pendentes_na_saida() -> None:
+    for app in {dono for dono, _ in list(_pendentes)}:
+        with app.app_context():
+            for lote in _retirar_pendentes(app):
+                try:
+                    _inserir(lote)
+                except Exception:
+                    log.exception("Registros de auditoria pendentes perdidos na saída")
+
 
 def log_action(
     user_id: int | None,
@@ -12,16 +155,14 @@ def log_action(
     entity_id: int,
     details: dict | None = None,
 ) -> None:
-
-    try:
-        log = AuditLog(
-            user_id=user_id,
-            action=action,
-            entity=entity,
-            entity_id=entity_id,
-            details=details or {},
-        )
-        db.session.add(log)
-        db.session.commit()
-    except Exception:
-        db.session.rollback()
+    registrar_evento(
+        AuditLog.__table__,
+        {
+            "user_id": user_id,
+            "action": action,
+            "entity": entity,
+            "entity_id": entity_id,
+            "details": details or {},
+            "timestamp": datetime.utcnow(),
+        },
+    )
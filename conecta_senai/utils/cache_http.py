@@ -0,0 +1,227 @@
+"""Respostas com ETag fraco para endpoints de catálogo quase estáticos.
+
+``cache_http(Modelo, ...)`` deriva o ETag da rota, da query string e da versão
+de cada tabela envolvida. A versão é um contador no Redis incrementado a cada
+commit que altera a tabela, iniciado num valor aleatório para que um Redis
+zerado não repita versões já servidas. Sem Redis, vem do próprio banco
+(``count``/``max(data_atualizacao)`` ou, em tabelas sem essa coluna, um hash
+das linhas), para que alterações feitas por outros processos também mudem o
+ETag. ``If-None-Match`` correspondente recebe 304 sem executar a view, e os
+corpos serializados ficam num LRU por processo.
+
+Use apenas em respostas que não dependem do usuário autenticado, abaixo dos
+decoradores de autenticação.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import secrets
+import threading
+from collections import OrderedDict, defaultdict
+from functools import wraps
+from itertools import chain
+
+from flask import current_app, request
+from sqlalchemy import event, func, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from conecta_senai.config import redis as redis_config
+from conecta_senai.config.redis import DummyRedis
+from conecta_senai.models import db
+
+log = logging.getLogger(__name__)
+
+CHAVE_VERSAO = "cache_http:versao:{}"
+CHAVE_ALTERADAS = "cache_http_tabelas_alteradas"
+TAMANHO_PADRAO = 256
+CACHE_CONTROL = "private, no-cache"
+
+_tabelas_monitoradas: set[str] = set()
+_versoes_locais: dict[str, int] = defaultdict(int)
+_lock_versoes = threading.Lock()
+
+
+class CacheRespostas:
+    """LRU de corpos já serializados, indexado pela chave do ETag."""
+
+    def __init__(self, capacidade: int = TAMANHO_PADRAO) -> None:
+        self.capacidade = capacidade
+        self._itens: OrderedDict[str, tuple[bytes, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def obter(self, chave: str) -> tuple[bytes, str] | None:
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is not None:
+                self._itens.move_to_end(chave)
+            return item
+
+    def guardar(self, chave: str, corpo: bytes, mimetype: str) -> None:
+        if self.capacidade <= 0:
+            return
+        with self._lock:
+            self._itens[chave] = (corpo, mimetype)
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.capacidade:
+                self._itens.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._itens)
+
+
+def obter_cache_respostas() -> CacheRespostas:
+    cache = current_app.extensions.get("cache_http")
+    if cache is None:
+        cache = current_app.extensions.setdefault(
+            "cache_http",
+            CacheRespostas(
+                int(current_app.config.get("CACHE_HTTP_MAX_ENTRADAS", TAMANHO_PADRAO))
+            ),
+        )
+    return cache
+
+
+def _texto(valor) -> str:
+    if valor is None:
+        return "0"
+    return valor.decode() if isinstance(valor, bytes) else str(valor)
+
+
+def _hash_linhas(tabela) -> str:
+    linhas = db.session.execute(
+        select(tabela).order_by(*tabela.primary_key.columns)
+    ).all()
+    return hashlib.sha1(repr(linhas).encode()).hexdigest()
+
+
+def _versao_banco(tabela) -> str:
+    if "data_atualizacao" not in tabela.c:
+        return f"{_versoes_locais[tabela.name]}:h{_hash_linhas(tabela)}"
+    valores = db.session.execute(
+        select(func.count(), func.max(tabela.c.data_atualizacao)).select_from(tabela)
+    ).one()
+    return ":".join([str(_versoes_locais[tabela.name]), *map(str, valores)])
+
+
+def _semear_versoes(cliente, chaves) -> None:
+    for chave in chaves:
+        cliente.set(chave, secrets.randbits(48), nx=True)
+
+
+def versoes_tabelas(tabelas) -> list[str] | None:
+    """Versão atual de cada tabela, ou ``None`` se não for possível obtê-la."""
+    if not tabelas:
+        return []
+    cliente = redis_config.redis_conn
+    if not isinstance(cliente, DummyRedis):
+        chaves = [CHAVE_VERSAO.format(t.name) for t in tabelas]
+        try:
+            valores = cliente.mget(chaves)
+            ausentes = [c for c, valor in zip(chaves, valores) if valor is None]
+            if ausentes:
+                _semear_versoes(cliente, ausentes)
+                valores = cliente.mget(chaves)
+            return [f"r{_texto(valor)}" for valor in valores]
+        except Exception:
+            log.warning("Versões do cache HTTP indisponíveis no Redis")
+    try:
+        return [_versao_banco(tabela) for tabela in tabelas]
+    except SQLAlchemyError:
+        db.session.rollback()
+        return None
+
+
+def invalidar_tabelas(*tabelas: str) -> None:
+    """Avança a versão das tabelas, invalidando os ETags que dependem delas."""
+    if not tabelas:
+        return
+    with _lock_versoes:
+        for tabela in tabelas:
+            _versoes_locais[tabela] += 1
+    cliente = redis_config.redis_conn
+    if isinstance(cliente, DummyRedis):
+        return
+    try:
+        chaves = [CHAVE_VERSAO.format(tabela) for tabela in tabelas]
+        _semear_versoes(cliente, chaves)
+        for chave in chaves:
+            cliente.incr(chave)
+    except Exception:
+        log.warning("Não foi possível atualizar a versão de %s no Redis", tabelas)
+
+
+@event.listens_for(Session, "after_flush")
+def _registrar_alteracoes(session, flush_context):
+    alteradas = {
+        tabela.name
+        for obj in chain(session.new, session.dirty, session.deleted)
+        if (tabela := getattr(obj, "__table__", None)) is not None
+        and tabela.name in _tabelas_monitoradas
+    }
+    if alteradas:
+        session.info.setdefault(CHAVE_ALTERADAS, set()).update(alteradas)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _registrar_dml(estado):
+    if not (estado.is_update or estado.is_delete):
+        return
+    alteradas = {
+        mapper.local_table.name
+        for mapper in estado.all_mappers
+        if mapper.local_table.name in _tabelas_monitoradas
+    }
+    if alteradas:
+        estado.session.info.setdefault(CHAVE_ALTERADAS, set()).update(alteradas)
+
+
+@event.listens_for(Session, "after_commit")
+def _publicar_versoes(session):
+    alteradas = session.info.pop(CHAVE_ALTERADAS, None)
+    if alteradas:
+        invalidar_tabelas(*sorted(alteradas))
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _descartar_alteracoes(session, transacao_anterior):
+    if transacao_anterior.parent is None:
+        session.info.pop(CHAVE_ALTERADAS, None)
+
+
+def cache_http(*modelos):
+    """Responde com ETag fraco e 304 enquanto as tabelas de ``modelos`` não mudam."""
+    tabelas = [modelo.__table__ for modelo in modelos]
+    _tabelas_monitoradas.update(tabela.name for tabela in tabelas)
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            versoes = versoes_tabelas(tabelas)
+            if versoes is None:
+                return view(*args, **kwargs)
+            chave = "|".join([request.path, request.query_string.decode(), *versoes])
+            etag = hashlib.sha1(chave.encode()).hexdigest()
+
+            if request.if_none_match.contains_weak(etag):
+                resposta = current_app.response_class(status=304)
+            else:
+                cache = obter_cache_respostas()
+                item = cache.obter(chave)
+                if item is None:
+                    resposta = current_app.make_response(view(*args, **kwargs))
+                    if resposta.status_code != 200:
+                        return resposta
+                    item = (resposta.get_data(), resposta.mimetype)
+                    cache.guardar(chave, *item)
+                resposta = current_app.response_class(item[0], mimetype=item[1])
+
+            resposta.set_etag(etag, weak=True)
+            resposta.headers["Cache-Control"] = CACHE_CONTROL
+            return resposta
+
+        return wrapper
+
+    return decorator
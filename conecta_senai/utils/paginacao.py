@@ -0,0 +1,61 @@
+"""Paginação por chave (keyset) em ordem decrescente de ``(data, id)``.
+
+O cursor é opaco para o cliente: codifica a data e o id do último item da
+página, e a próxima página começa estritamente depois dele. O custo de cada
+página não depende de quantos registros existem antes dela.
+"""
+
+from __future__ import annotations
+
+import base64
+from datetime import datetime
+
+from sqlalchemy import func, tuple_
+
+
+def codificar_cursor(data: datetime, id_: int) -> str:
+    valor = f"{data.isoformat()}|{id_}"
+    return base64.urlsafe_b64encode(valor.encode()).decode().rstrip("=")
+
+
+def decodificar_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        preenchimento = "=" * (-len(cursor) % 4)
+        valor = base64.urlsafe_b64decode(cursor + preenchimento).decode()
+        data, id_ = valor.rsplit("|", 1)
+        return datetime.fromisoformat(data), int(id_)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Cursor inválido")
+
+
+def limitar_por_pagina(per_page: int | None, padrao: int, maximo: int) -> int:
+    return max(1, min(per_page or padrao, maximo))
+
+
+def paginar_por_chave(consulta, coluna_data, coluna_id, cursor=None, per_page=20):
+    """Retorna ``(itens, proximo_cursor)`` da página após ``cursor``.
+
+    Levanta ``ValueError`` se o cursor não puder ser decodificado.
+    """
+    if cursor:
+        data, id_ = decodificar_cursor(cursor)
+        consulta = consulta.filter(tuple_(coluna_data, coluna_id) < (data, id_))
+
+    itens = (
+        consulta.order_by(coluna_data.desc(), coluna_id.desc())
+        .limit(per_page + 1)
+        .all()
+    )
+    proximo = None
+    if len(itens) > per_page:
+        itens = itens[:per_page]
+        ultimo = itens[-1]
+        proximo = codificar_cursor(
+            getattr(ultimo, coluna_data.key), getattr(ultimo, coluna_id.key)
+        )
+    return itens, proximo
+
+
+def contar_total(consulta) -> int:
+    """Conta as linhas do filtro, ignorando a ordenação."""
+    return consulta.order_by(None).with_entities(func.count()).scalar()
@@ -0,0 +1,124 @@
+"""Processo dedicado aos jobs agendados e às filas em segundo plano.
+
+Executa o mesmo scheduler dos processos web (``start_scheduler``), mas sobre uma
+aplicação enxuta, sem blueprints nem Swagger. Uso::
+
+    python -m conecta_senai.worker --threads 4
+
+ou ``flask worker``. Com um worker dedicado, defina ``SCHEDULER_ENABLED=0`` nos
+processos web.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import signal
+import threading
+import traceback
+
+from flask import Flask
+
+from conecta_senai import (
+    STATIC_DIR,
+    TEMPLATES_DIR,
+    _configure_database,
+    _configure_database_url,
+    _load_config,
+    _setup_observability,
+)
+from conecta_senai.config.redis import init_redis
+from conecta_senai.services.email_template_service import precompilar_templates_email
+from conecta_senai.services.export_job_service import encerrar_executor
+from conecta_senai.tasks import start_scheduler, stop_scheduler
+
+log = logging.getLogger(__name__)
+
+
+def create_worker_app() -> Flask:
+    _setup_observability()
+
+    app = Flask(
+        __name__,
+        static_folder=str(STATIC_DIR),
+        template_folder=str(TEMPLATES_DIR),
+    )
+    _load_config(app)
+    app.config["WORKER_PROCESS"] = True
+    _configure_database_url(app)
+    _configure_database(app)
+    init_redis(app)
+
+    secret_key = (
+        os.getenv("SECRET_KEY") or os.getenv("FLASK_SECRET_KEY") or ""
+    ).strip()
+    if secret_key:
+        app.config["SECRET_KEY"] = secret_key
+    app.config["SCHEDULER_ENABLED"] = True
+
+    precompilar_templates_email(app)
+    return app
+
+
+def _instalar_sinais(parar: threading.Event) -> None:
+    if threading.current_thread() is not threading.main_thread():
+        return
+
+    def _encerrar(signum, _frame):
+        log.info("Sinal %s recebido; encerrando worker.", signal.Signals(signum).name)
+        parar.set()
+
+    signal.signal(signal.SIGTERM, _encerrar)
+    signal.signal(signal.SIGINT, _encerrar)
+
+
+def run_worker(
+    app: Flask,
+    threads: int | None = None,
+    parar: threading.Event | None = None,
+) -> None:
+    """Inicia o scheduler e bloqueia até ``parar`` ser sinalizado.
+
+    No encerramento aguarda os jobs em andamento e o pool de exportações.
+    """
+    threads = threads or int(app.config.get("WORKER_THREADS", 4))
+    parar = parar or threading.Event()
+    _instalar_sinais(parar)
+
+    app.config["WORKER_PROCESS"] = True
+    start_scheduler(app, max_workers=threads)
+    app.logger.info("Worker iniciado com %d threads.", threads)
+    try:
+        parar.wait()
+    finally:
+        stop_scheduler(wait=True)
+        encerrar_executor(wait=True)
+        app.logger.info("Worker encerrado.")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Executa os jobs agendados do Conecta SENAI."
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=None,
+        help="Quantidade de jobs executados em paralelo (WORKER_THREADS).",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        app = create_worker_app()
+    except Exception as exc:
+        logging.error("!!!!!! FALHA CRÍTICA AO INICIAR O WORKER !!!!!!")
+        logging.error("Erro: %s", exc)
+        logging.error("Traceback: %s", traceback.format_exc())
+        raise
+
+    run_worker(app, threads=args.threads)
+
+
+if __name__ == "__main__":
+    main()
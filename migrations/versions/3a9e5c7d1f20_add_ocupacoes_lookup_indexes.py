@@ -0,0 +1,44 @@
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "3a9e5c7d1f20"
+down_revision: Union[str, Sequence[str], None] = (
+    "1b24c8c3cd24",
+    "1c0b1c8e5c1a",
+    "8055be39141c",
+    "892341234567",
+    "9fd848c63563",
+    "c5c387dbd0a4",
+    "e7b8a3c932e3",
+)
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FILTRO_STATUS_ATIVOS = "status IN ('confirmado', 'pendente')"
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_ocupacoes_sala_data_horario_ativas",
+        "ocupacoes",
+        ["sala_id", "data", "horario_inicio", "horario_fim"],
+        postgresql_where=sa.text(FILTRO_STATUS_ATIVOS),
+        sqlite_where=sa.text(FILTRO_STATUS_ATIVOS),
+    )
+    op.create_index(
+        "ix_ocupacoes_instrutor_data_ativas",
+        "ocupacoes",
+        ["instrutor_id", "data"],
+        postgresql_where=sa.text(FILTRO_STATUS_ATIVOS),
+        sqlite_where=sa.text(FILTRO_STATUS_ATIVOS),
+    )
+    op.create_index("ix_ocupacoes_data_status", "ocupacoes", ["data", "status"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_ocupacoes_data_status", table_name="ocupacoes")
+    op.drop_index("ix_ocupacoes_instrutor_data_ativas", table_name="ocupacoes")
+    op.drop_index("ix_ocupacoes_sala_data_horario_ativas", table_name="ocupacoes")
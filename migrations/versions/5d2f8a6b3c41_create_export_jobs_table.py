@@ -0,0 +1,43 @@
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "5d2f8a6b3c41"
+down_revision: Union[str, Sequence[str], None] = "3a9e5c7d1f20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "export_jobs",
+        sa.Column("id", sa.String(length=32), primary_key=True),
+        sa.Column("tipo", sa.String(length=50), nullable=False),
+        sa.Column("formato", sa.String(length=10), nullable=False),
+        sa.Column("parametros", sa.JSON(), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column(
+            "usuario_id", sa.Integer(), sa.ForeignKey("usuarios.id"), nullable=True
+        ),
+        sa.Column("nome_arquivo", sa.String(length=255), nullable=True),
+        sa.Column("mimetype", sa.String(length=120), nullable=True),
+        sa.Column("caminho_arquivo", sa.String(length=500), nullable=True),
+        sa.Column("tamanho_bytes", sa.Integer(), nullable=True),
+        sa.Column("erro", sa.Text(), nullable=True),
+        sa.Column("tentativas", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("criado_em", sa.DateTime(), nullable=False),
+        sa.Column("iniciado_em", sa.DateTime(), nullable=True),
+        sa.Column("concluido_em", sa.DateTime(), nullable=True),
+        sa.Column("expira_em", sa.DateTime(), nullable=True),
+    )
+    op.create_index(
+        "ix_export_jobs_status_criado_em", "export_jobs", ["status", "criado_em"]
+    )
+    op.create_index("ix_export_jobs_expira_em", "export_jobs", ["expira_em"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_export_jobs_expira_em", table_name="export_jobs")
+    op.drop_index("ix_export_jobs_status_criado_em", table_name="export_jobs")
+    op.drop_table("export_jobs")
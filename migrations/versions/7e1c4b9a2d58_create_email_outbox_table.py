@@ -0,0 +1,49 @@
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "7e1c4b9a2d58"
+down_revision: Union[str, Sequence[str], None] = "5d2f8a6b3c41"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "email_outbox",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("destinatarios", sa.JSON(), nullable=False),
+        sa.Column("cc", sa.JSON(), nullable=True),
+        sa.Column("bcc", sa.JSON(), nullable=True),
+        sa.Column("assunto", sa.String(length=255), nullable=False),
+        sa.Column("html", sa.Text(), nullable=False),
+        sa.Column("texto", sa.Text(), nullable=True),
+        sa.Column("remetente", sa.String(length=255), nullable=True),
+        sa.Column("reply_to", sa.String(length=255), nullable=True),
+        sa.Column("headers", sa.JSON(), nullable=True),
+        sa.Column("tags", sa.JSON(), nullable=True),
+        sa.Column("anexos", sa.JSON(), nullable=True),
+        sa.Column("referencia", sa.String(length=100), nullable=True),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("tentativas", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("max_tentativas", sa.Integer(), nullable=False, server_default="5"),
+        sa.Column("proxima_tentativa_em", sa.DateTime(), nullable=False),
+        sa.Column("reservado_em", sa.DateTime(), nullable=True),
+        sa.Column("provider_id", sa.String(length=100), nullable=True),
+        sa.Column("ultimo_erro", sa.Text(), nullable=True),
+        sa.Column("criado_em", sa.DateTime(), nullable=False),
+        sa.Column("enviado_em", sa.DateTime(), nullable=True),
+    )
+    op.create_index(
+        "ix_email_outbox_status_proxima_tentativa",
+        "email_outbox",
+        ["status", "proxima_tentativa_em"],
+    )
+    op.create_index("ix_email_outbox_referencia", "email_outbox", ["referencia"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_email_outbox_referencia", table_name="email_outbox")
+    op.drop_index("ix_email_outbox_status_proxima_tentativa", table_name="email_outbox")
+    op.drop_table("email_outbox")
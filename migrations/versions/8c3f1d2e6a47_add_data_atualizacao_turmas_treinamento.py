@@ -0,0 +1,24 @@
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "8c3f1d2e6a47"
+down_revision: Union[str, Sequence[str], None] = "7e1c4b9a2d58"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "turmas_treinamento",
+        sa.Column("data_atualizacao", sa.DateTime(), nullable=True),
+    )
+    op.execute(
+        "UPDATE turmas_treinamento SET data_atualizacao = CURRENT_TIMESTAMP "
+        "WHERE data_atualizacao IS NULL"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("turmas_treinamento", "data_atualizacao")
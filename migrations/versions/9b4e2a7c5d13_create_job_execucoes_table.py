@@ -0,0 +1,36 @@
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "9b4e2a7c5d13"
+down_revision: Union[str, Sequence[str], None] = "8c3f1d2e6a47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "job_execucoes",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("job_id", sa.String(length=100), nullable=False),
+        sa.Column("instancia", sa.String(length=120), nullable=False),
+        sa.Column("backend_lock", sa.String(length=20), nullable=True),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("iniciado_em", sa.DateTime(), nullable=False),
+        sa.Column("finalizado_em", sa.DateTime(), nullable=True),
+        sa.Column("duracao_ms", sa.Integer(), nullable=True),
+        sa.Column("linhas_afetadas", sa.Integer(), nullable=True),
+        sa.Column("resultado", sa.JSON(), nullable=True),
+        sa.Column("erro", sa.Text(), nullable=True),
+    )
+    op.create_index(
+        "ix_job_execucoes_job_iniciado_em",
+        "job_execucoes",
+        ["job_id", "iniciado_em"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_job_execucoes_job_iniciado_em", table_name="job_execucoes")
+    op.drop_table("job_execucoes")
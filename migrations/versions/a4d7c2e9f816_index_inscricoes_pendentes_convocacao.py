@@ -0,0 +1,26 @@
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "a4d7c2e9f816"
+down_revision: Union[str, Sequence[str], None] = "9b4e2a7c5d13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_inscricoes_treinamento_pendentes_convocacao",
+        "inscricoes_treinamento",
+        ["id"],
+        postgresql_where=sa.text("convocado_em IS NULL"),
+        sqlite_where=sa.text("convocado_em IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_inscricoes_treinamento_pendentes_convocacao",
+        table_name="inscricoes_treinamento",
+    )
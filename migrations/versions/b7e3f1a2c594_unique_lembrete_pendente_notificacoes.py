@@ -0,0 +1,36 @@
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "b7e3f1a2c594"
+down_revision: Union[str, Sequence[str], None] = "a4d7c2e9f816"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LEMBRETE_PENDENTE = "lida = false AND agendamento_id IS NOT NULL"
+
+
+def upgrade() -> None:
+    # Remove lembretes não lidos duplicados antes de criar o índice único.
+    op.execute(sa.text(f"""
+            DELETE FROM notificacoes
+            WHERE {LEMBRETE_PENDENTE}
+              AND id NOT IN (
+                SELECT MIN(id) FROM notificacoes
+                WHERE {LEMBRETE_PENDENTE}
+                GROUP BY agendamento_id
+              )
+            """))
+    op.create_index(
+        "uq_notificacoes_lembrete_pendente",
+        "notificacoes",
+        ["agendamento_id"],
+        unique=True,
+        postgresql_where=sa.text(LEMBRETE_PENDENTE),
+        sqlite_where=sa.text(LEMBRETE_PENDENTE),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_notificacoes_lembrete_pendente", table_name="notificacoes")
@@ -0,0 +1,22 @@
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "c2a8e5d1f379"
+down_revision: Union[str, Sequence[str], None] = "b7e3f1a2c594"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_notificacoes_usuario_lida_data_criacao",
+        "notificacoes",
+        ["usuario_id", "lida", "data_criacao"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_notificacoes_usuario_lida_data_criacao", table_name="notificacoes"
+    )
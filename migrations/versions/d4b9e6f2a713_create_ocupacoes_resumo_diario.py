@@ -0,0 +1,90 @@
+from collections import Counter
+from datetime import time
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "d4b9e6f2a713"
+down_revision: Union[str, Sequence[str], None] = "c2a8e5d1f379"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TURNOS = {
+    (time(8, 0), time(12, 0)): "Manhã",
+    (time(13, 30), time(17, 30)): "Tarde",
+    (time(18, 30), time(22, 30)): "Noite",
+}
+
+
+def upgrade() -> None:
+    resumo = op.create_table(
+        "ocupacoes_resumo_diario",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("data", sa.Date(), nullable=False),
+        sa.Column("sala_id", sa.Integer(), nullable=False),
+        sa.Column("turno", sa.String(length=10), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("tipo_ocupacao", sa.String(length=50), nullable=False),
+        sa.Column("quantidade", sa.Integer(), nullable=False),
+        sa.UniqueConstraint(
+            "data",
+            "sala_id",
+            "turno",
+            "status",
+            "tipo_ocupacao",
+            name="uq_ocupacoes_resumo_diario_chave",
+        ),
+    )
+    op.create_index(
+        "ix_ocupacoes_resumo_diario_sala_id",
+        "ocupacoes_resumo_diario",
+        ["sala_id"],
+    )
+
+    ocupacoes = sa.table(
+        "ocupacoes",
+        sa.column("id", sa.Integer()),
+        sa.column("data", sa.Date()),
+        sa.column("sala_id", sa.Integer()),
+        sa.column("horario_inicio", sa.Time()),
+        sa.column("horario_fim", sa.Time()),
+        sa.column("status", sa.String()),
+        sa.column("tipo_ocupacao", sa.String()),
+    )
+    colunas = [
+        ocupacoes.c.data,
+        ocupacoes.c.sala_id,
+        ocupacoes.c.horario_inicio,
+        ocupacoes.c.horario_fim,
+        ocupacoes.c.status,
+        ocupacoes.c.tipo_ocupacao,
+    ]
+    grupos = op.get_bind().execute(
+        sa.select(*colunas, sa.func.count(ocupacoes.c.id)).group_by(*colunas)
+    )
+    contagens = Counter()
+    for data, sala_id, inicio, fim, status, tipo, quantidade in grupos:
+        turno = TURNOS.get((inicio, fim), "Outro")
+        contagens[(data, sala_id, turno, status or "", tipo or "")] += quantidade
+
+    linhas = [
+        {
+            "data": data,
+            "sala_id": sala_id,
+            "turno": turno,
+            "status": status,
+            "tipo_ocupacao": tipo,
+            "quantidade": quantidade,
+        }
+        for (data, sala_id, turno, status, tipo), quantidade in contagens.items()
+    ]
+    if linhas:
+        op.bulk_insert(resumo, linhas)
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_ocupacoes_resumo_diario_sala_id", table_name="ocupacoes_resumo_diario"
+    )
+    op.drop_table("ocupacoes_resumo_diario")
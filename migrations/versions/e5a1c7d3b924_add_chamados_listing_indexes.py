@@ -0,0 +1,29 @@
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "e5a1c7d3b924"
+down_revision: Union[str, Sequence[str], None] = "d4b9e6f2a713"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDICES = [
+    ("suporte_chamados", "status"),
+    ("suporte_chamados", "area"),
+    ("suporte_chamados", "tipo_equipamento_id"),
+    ("manutencao_chamados", "status"),
+    ("manutencao_chamados", "area"),
+    ("manutencao_chamados", "tipo_servico_id"),
+]
+
+
+def upgrade() -> None:
+    for tabela, coluna in INDICES:
+        op.create_index(
+            f"ix_{tabela}_{coluna}_created_at", tabela, [coluna, "created_at"]
+        )
+
+
+def downgrade() -> None:
+    for tabela, coluna in reversed(INDICES):
+        op.drop_index(f"ix_{tabela}_{coluna}_created_at", table_name=tabela)
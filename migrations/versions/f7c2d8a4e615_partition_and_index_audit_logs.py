@@ -0,0 +1,120 @@
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "f7c2d8a4e615"
+down_revision: Union[str, Sequence[str], None] = "e5a1c7d3b924"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# tabela -> chaves estrangeiras a recriar depois da conversão
+TABELAS = {
+    "audit_logs": ["FOREIGN KEY (user_id) REFERENCES usuarios (id)"],
+    "logs_agendamentos": [],
+    "log_lancamentos_rateio_instrutor": [],
+}
+
+INDICES = [
+    ("audit_logs", "timestamp_id", ["timestamp", "id"]),
+    ("audit_logs", "entity_timestamp", ["entity", "timestamp"]),
+    ("audit_logs", "user_id_timestamp", ["user_id", "timestamp"]),
+    ("logs_agendamentos", "timestamp_id", ["timestamp", "id"]),
+    ("logs_agendamentos", "tipo_acao_timestamp", ["tipo_acao", "timestamp"]),
+    ("log_lancamentos_rateio_instrutor", "timestamp_id", ["timestamp", "id"]),
+    ("log_lancamentos_rateio_instrutor", "acao_timestamp", ["acao", "timestamp"]),
+]
+
+MESES_A_FRENTE = 2
+
+
+def _mes(dia: date, deslocamento: int = 0) -> date:
+    indice = dia.year * 12 + dia.month - 1 + deslocamento
+    return date(indice // 12, indice % 12 + 1, 1)
+
+
+def _particionar(tabela: str, chaves: list[str]) -> None:
+    """Troca ``tabela`` por uma tabela particionada por mês de ``timestamp``."""
+    conn = op.get_bind()
+    legado = f"{tabela}_legado"
+    sequencia = f"{tabela}_id_seq"
+
+    op.execute(f'ALTER TABLE "{tabela}" RENAME TO "{legado}"')
+    op.execute(f'ALTER SEQUENCE "{sequencia}" OWNED BY NONE')
+    op.execute(
+        f'CREATE TABLE "{tabela}" (LIKE "{legado}" INCLUDING DEFAULTS) '
+        'PARTITION BY RANGE ("timestamp")'
+    )
+    op.execute(f'ALTER TABLE "{tabela}" ALTER COLUMN "timestamp" SET NOT NULL')
+
+    mais_antigo = conn.execute(
+        sa.text(f'SELECT min("timestamp") FROM "{legado}"')
+    ).scalar()
+    mes = _mes(mais_antigo.date() if mais_antigo else date.today())
+    ultimo = _mes(date.today(), MESES_A_FRENTE)
+    while mes <= ultimo:
+        op.execute(
+            f'CREATE TABLE "{tabela}_p{mes:%Y%m}" PARTITION OF "{tabela}" '
+            f"FOR VALUES FROM ('{mes}') TO ('{_mes(mes, 1)}')"
+        )
+        mes = _mes(mes, 1)
+    op.execute(f'CREATE TABLE "{tabela}_padrao" PARTITION OF "{tabela}" DEFAULT')
+
+    colunas = [
+        linha[0]
+        for linha in conn.execute(
+            sa.text(
+                "SELECT column_name FROM information_schema.columns "
+                "WHERE table_name = :tabela ORDER BY ordinal_position"
+            ),
+            {"tabela": legado},
+        )
+    ]
+    lista = ", ".join(f'"{coluna}"' for coluna in colunas)
+    selecao = ", ".join(
+        (
+            "COALESCE(\"timestamp\", now() AT TIME ZONE 'utc')"
+            if coluna == "timestamp"
+            else f'"{coluna}"'
+        )
+        for coluna in colunas
+    )
+    op.execute(f'INSERT INTO "{tabela}" ({lista}) SELECT {selecao} FROM "{legado}"')
+    op.execute(f'DROP TABLE "{legado}"')
+    # Restrições só depois do DROP: os nomes gerados colidiriam com os do legado.
+    op.execute(f'ALTER TABLE "{tabela}" ADD PRIMARY KEY (id, "timestamp")')
+    for chave in chaves:
+        op.execute(f'ALTER TABLE "{tabela}" ADD {chave}')
+    op.execute(f'ALTER SEQUENCE "{sequencia}" OWNED BY "{tabela}".id')
+
+
+def _desparticionar(tabela: str, chaves: list[str]) -> None:
+    particionada = f"{tabela}_particionada"
+    sequencia = f"{tabela}_id_seq"
+
+    op.execute(f'ALTER TABLE "{tabela}" RENAME TO "{particionada}"')
+    op.execute(f'ALTER SEQUENCE "{sequencia}" OWNED BY NONE')
+    op.execute(f'CREATE TABLE "{tabela}" (LIKE "{particionada}" INCLUDING DEFAULTS)')
+    op.execute(f'INSERT INTO "{tabela}" SELECT * FROM "{particionada}"')
+    op.execute(f'DROP TABLE "{particionada}" CASCADE')
+    op.execute(f'ALTER TABLE "{tabela}" ADD PRIMARY KEY (id)')
+    for chave in chaves:
+        op.execute(f'ALTER TABLE "{tabela}" ADD {chave}')
+    op.execute(f'ALTER SEQUENCE "{sequencia}" OWNED BY "{tabela}".id')
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        for tabela, chaves in TABELAS.items():
+            _particionar(tabela, chaves)
+    for tabela, nome, colunas in INDICES:
+        op.create_index(f"ix_{tabela}_{nome}", tabela, colunas)
+
+
+def downgrade() -> None:
+    for tabela, nome, _ in reversed(INDICES):
+        op.drop_index(f"ix_{tabela}_{nome}", table_name=tabela)
+    if op.get_bind().dialect.name == "postgresql":
+        for tabela, chaves in TABELAS.items():
+            _desparticionar(tabela, chaves)
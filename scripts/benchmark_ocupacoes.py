@@ -0,0 +1,192 @@
+"""Benchmark das consultas de ocupação sobre uma base volumosa.
+
+Popula a tabela ``ocupacoes`` com ``--linhas`` registros (500 mil por padrão),
+mede as consultas mais frequentes e falha caso algum plano de execução faça
+varredura completa da tabela em vez de usar os índices compostos.
+
+Uso::
+
+    python scripts/benchmark_ocupacoes.py --linhas 500000
+    DATABASE_URL=postgresql://... python scripts/benchmark_ocupacoes.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time as relogio
+from datetime import date, timedelta
+from pathlib import Path
+
+from flask import Flask
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from conecta_senai.models import db  # noqa: E402
+from conecta_senai.models.instrutor import Instrutor  # noqa: E402
+from conecta_senai.models.ocupacao import (  # noqa: E402
+    STATUS_ATIVOS,
+    TURNOS_PADRAO,
+    Ocupacao,
+)
+from conecta_senai.models.sala import Sala  # noqa: E402
+from conecta_senai.models.user import User  # noqa: E402
+
+TOTAL_SALAS = 200
+TOTAL_INSTRUTORES = 100
+LOTE = 10_000
+
+
+def criar_app(database_url: str) -> Flask:
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = database_url
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    db.init_app(app)
+    return app
+
+
+def popular(total: int) -> None:
+    usuario = User(nome="Benchmark", email="bench@example.com", senha="Password1!")
+    db.session.add(usuario)
+    db.session.add_all(
+        Sala(nome=f"Sala {i}", capacidade=30) for i in range(TOTAL_SALAS)
+    )
+    db.session.add_all(
+        Instrutor(nome=f"Instrutor {i}", email=f"instrutor{i}@example.com")
+        for i in range(TOTAL_INSTRUTORES)
+    )
+    db.session.commit()
+
+    sala_ids = [s.id for s in Sala.query.all()]
+    instrutor_ids = [i.id for i in Instrutor.query.all()]
+    turnos = list(TURNOS_PADRAO.values())
+    status = ["confirmado"] * 8 + ["pendente", "cancelado"]
+    inicio = date(2015, 1, 1)
+    aleatorio = random.Random(42)
+
+    linhas = []
+    for n in range(total):
+        horario_inicio, horario_fim = aleatorio.choice(turnos)
+        linhas.append(
+            {
+                "sala_id": aleatorio.choice(sala_ids),
+                "instrutor_id": aleatorio.choice(instrutor_ids),
+                "usuario_id": usuario.id,
+                "curso_evento": f"Curso {n % 500}",
+                "data": inicio + timedelta(days=aleatorio.randrange(3650)),
+                "horario_inicio": horario_inicio,
+                "horario_fim": horario_fim,
+                "tipo_ocupacao": "aula_regular",
+                "recorrencia": "unica",
+                "status": aleatorio.choice(status),
+            }
+        )
+        if len(linhas) == LOTE:
+            db.session.execute(Ocupacao.__table__.insert(), linhas)
+            linhas.clear()
+    if linhas:
+        db.session.execute(Ocupacao.__table__.insert(), linhas)
+    db.session.commit()
+
+    if db.engine.dialect.name == "postgresql":
+        db.session.execute(db.text("ANALYZE ocupacoes"))
+    else:
+        db.session.execute(db.text("ANALYZE"))
+    db.session.commit()
+
+
+def consultas_quentes() -> dict:
+    dia = date(2020, 6, 15)
+    manha_inicio, manha_fim = TURNOS_PADRAO["Manhã"]
+    return {
+        "buscar_conflitos": Ocupacao.query.filter(
+            Ocupacao.sala_id == 1,
+            Ocupacao.data == dia,
+            Ocupacao.status.in_(STATUS_ATIVOS),
+            Ocupacao.filtro_sobreposicao(manha_inicio, manha_fim),
+        ),
+        "conflitos_periodo": Ocupacao.query.filter(
+            Ocupacao.sala_id == 1,
+            Ocupacao.data >= dia,
+            Ocupacao.data <= dia + timedelta(days=180),
+            Ocupacao.status.in_(STATUS_ATIVOS),
+            Ocupacao.filtro_sobreposicao(manha_inicio, manha_fim),
+        ),
+        "periodo_instrutor": Ocupacao.query.filter(
+            Ocupacao.instrutor_id == 1,
+            Ocupacao.data >= dia,
+            Ocupacao.data <= dia + timedelta(days=30),
+            Ocupacao.status.in_(STATUS_ATIVOS),
+        ),
+        "calendario_mes": Ocupacao.query.filter(
+            Ocupacao.data >= dia,
+            Ocupacao.data <= dia + timedelta(days=30),
+            Ocupacao.status.in_(STATUS_ATIVOS),
+        ),
+    }
+
+
+def plano(query) -> str:
+    sql = str(
+        query.statement.compile(
+            dialect=db.engine.dialect, compile_kwargs={"literal_binds": True}
+        )
+    )
+    if db.engine.dialect.name == "postgresql":
+        linhas = db.session.execute(db.text(f"EXPLAIN {sql}")).all()
+        return "\n".join(linha[0] for linha in linhas)
+    linhas = db.session.execute(db.text(f"EXPLAIN QUERY PLAN {sql}")).all()
+    return "\n".join(linha[-1] for linha in linhas)
+
+
+def usa_varredura_completa(texto_plano: str) -> bool:
+    if db.engine.dialect.name == "postgresql":
+        return "Seq Scan on ocupacoes" in texto_plano
+    return any(
+        linha.strip().startswith("SCAN ocupacoes") and "INDEX" not in linha
+        for linha in texto_plano.splitlines()
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--linhas", type=int, default=500_000)
+    parser.add_argument("--repeticoes", type=int, default=20)
+    args = parser.parse_args()
+
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        arquivo = Path(tempfile.mkdtemp()) / "benchmark_ocupacoes.db"
+        database_url = f"sqlite:///{arquivo}"
+
+    app = criar_app(database_url)
+    falhas = 0
+    with app.app_context():
+        db.create_all()
+        inicio = relogio.perf_counter()
+        popular(args.linhas)
+        print(
+            f"{args.linhas} ocupações inseridas em "
+            f"{relogio.perf_counter() - inicio:.1f}s ({database_url})"
+        )
+
+        for nome, query in consultas_quentes().items():
+            texto_plano = plano(query)
+            inicio = relogio.perf_counter()
+            for _ in range(args.repeticoes):
+                query.all()
+            media_ms = (relogio.perf_counter() - inicio) * 1000 / args.repeticoes
+            varredura = usa_varredura_completa(texto_plano)
+            falhas += varredura
+            print(f"\n[{'FALHA' if varredura else 'OK'}] {nome}: {media_ms:.2f} ms")
+            print(texto_plano)
+
+        db.drop_all()
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
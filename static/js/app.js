@@ -603,8 +603,50 @@ function notify(tipo, mensagem) {
     showToast(mensagem, tipo);
 }
 
+const INTERVALO_CONSULTA_EVENTOS_MS = 60000;
+let fonteEventos = null;
+let consultaEventosAtiva = false;
+const assinantesEventos = [];
+
+// Sem o canal SSE (desabilitado no servidor ou sem suporte no navegador), os
+// assinantes são chamados periodicamente com dados vazios e recarregam a tela.
+function iniciarConsultaEventos() {
+    if (consultaEventosAtiva) return;
+    consultaEventosAtiva = true;
+    setInterval(() => {
+        assinantesEventos.forEach(({ callback }) => callback({}));
+    }, INTERVALO_CONSULTA_EVENTOS_MS);
+}
+
+// Canal SSE compartilhado pela página; o navegador reconecta automaticamente.
+function assinarEventos(tipo, callback) {
+    assinantesEventos.push({ tipo, callback });
+    if (typeof EventSource === 'undefined') {
+        iniciarConsultaEventos();
+        return;
+    }
+    if (!fonteEventos) {
+        fonteEventos = new EventSource(`${API_URL}/notificacoes/stream`, { withCredentials: true });
+        fonteEventos.addEventListener('error', () => {
+            // Resposta diferente de 200 (ex.: 404 com o SSE desabilitado)
+            // encerra a conexão sem nova tentativa.
+            if (fonteEventos.readyState === EventSource.CLOSED) iniciarConsultaEventos();
+        });
+    }
+    fonteEventos.addEventListener(tipo, (evento) => {
+        let dados = {};
+        try {
+            dados = JSON.parse(evento.data);
+        } catch (error) {
+            console.error('Evento inválido recebido:', error);
+        }
+        callback(dados);
+    });
+}
+
 window.showToast = showToast;
 window.notify = notify;
+window.assinarEventos = assinarEventos;
 window.setBusy = setBusy;
 window.normalizarUrlModulo = normalizarUrlModulo;
 document.addEventListener('DOMContentLoaded', criarToastContainer);
@@ -898,6 +940,7 @@ function atualizarInterfaceUsuario() {
     
     if (window.location.pathname === '/laboratorios/calendario.html') {
         carregarNotificacoes();
+        assinarEventos('notificacao', () => carregarNotificacoes());
     }
 }
 
@@ -906,7 +949,7 @@ async function carregarNotificacoes() {
     if (!notificacoesContainer) return;
     
     try {
-        const notificacoes = await chamarAPI('/notificacoes');
+        const { items: notificacoes } = await chamarAPI('/notificacoes');
         
         if (notificacoes.length === 0) {
             notificacoesContainer.innerHTML = '<p class="text-muted">Nenhuma notificação disponível.</p>';
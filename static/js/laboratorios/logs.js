@@ -10,8 +10,10 @@ document.addEventListener('DOMContentLoaded', () => {
     verificarPermissaoAdmin();
 
     const tabelaBody = document.querySelector('#tabelaLogs tbody');
+    let proximoCursor = null;
+    let btnCarregarMais = null;
 
-    async function carregarLogs() {
+    async function carregarLogs(continuar = false) {
         const params = new URLSearchParams();
         const usuario = document.getElementById('filtroUsuario').value.trim();
         const data = document.getElementById('filtroData').value;
@@ -19,13 +21,32 @@ document.addEventListener('DOMContentLoaded', () => {
         if (usuario) params.append('usuario', usuario);
         if (data) params.append('data', data);
         if (tipo) params.append('tipo', tipo);
-        const logs = await chamarAPI(`/logs-agenda?${params.toString()}`, 'GET');
-        atualizarTabela(logs);
+        if (continuar && proximoCursor) params.append('cursor', proximoCursor);
+        const pagina = await chamarAPI(`/logs-agenda?${params.toString()}`, 'GET');
+        proximoCursor = pagina?.next_cursor || null;
+        atualizarTabela(Array.isArray(pagina?.items) ? pagina.items : [], continuar);
+        atualizarBotaoCarregarMais();
     }
 
-    function atualizarTabela(logs) {
-        tabelaBody.innerHTML = '';
-        if (!logs || logs.length === 0) {
+    function atualizarBotaoCarregarMais() {
+        if (!btnCarregarMais) {
+            const container = tabelaBody.closest('table')?.parentElement;
+            if (!container) return;
+            btnCarregarMais = document.createElement('button');
+            btnCarregarMais.type = 'button';
+            btnCarregarMais.className = 'btn btn-outline-secondary btn-sm m-3';
+            btnCarregarMais.textContent = 'Carregar mais';
+            btnCarregarMais.addEventListener('click', () => carregarLogs(true));
+            container.appendChild(btnCarregarMais);
+        }
+        btnCarregarMais.classList.toggle('d-none', !proximoCursor);
+    }
+
+    function atualizarTabela(logs, continuar = false) {
+        if (!continuar) {
+            tabelaBody.innerHTML = '';
+        }
+        if (!continuar && (!logs || logs.length === 0)) {
             tabelaBody.innerHTML = '<tr><td colspan="7" class="text-center">Nenhum registro encontrado.</td></tr>';
             return;
         }
@@ -43,7 +64,7 @@ document.addEventListener('DOMContentLoaded', () => {
         });
     }
 
-    document.getElementById('btnAplicarFiltros').addEventListener('click', carregarLogs);
+    document.getElementById('btnAplicarFiltros').addEventListener('click', () => carregarLogs());
     document.getElementById('btnLimparFiltros').addEventListener('click', () => {
         document.getElementById('filtroUsuario').value = '';
         document.getElementById('filtroData').value = '';
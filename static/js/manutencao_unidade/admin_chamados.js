@@ -51,6 +51,9 @@
         atualizarNomeUsuario();
         await carregarBaseFiltros();
         await buscarChamados();
+        assinarEventos('chamado', (dados) => {
+            if (!dados.modulo || dados.modulo === 'manutencao_unidade') buscarChamados();
+        });
     }
 
     function atualizarNomeUsuario() {
@@ -148,8 +151,18 @@
             ? `/manutencao_unidade/admin/todos_chamados?${params.toString()}`
             : '/manutencao_unidade/admin/todos_chamados?status=Aberto,Em Atendimento';
         try {
-            const chamados = await chamarAPI(endpoint);
-            renderizarChamados(chamados || []);
+            // Chamados ativos são poucos: percorre todas as páginas do cursor.
+            const chamados = [];
+            let cursor = null;
+            do {
+                const url = cursor
+                    ? `${endpoint}&per_page=200&cursor=${encodeURIComponent(cursor)}`
+                    : `${endpoint}&per_page=200`;
+                const pagina = await chamarAPI(url);
+                chamados.push(...(Array.isArray(pagina?.items) ? pagina.items : []));
+                cursor = pagina?.next_cursor || null;
+            } while (cursor);
+            renderizarChamados(chamados);
         } catch (error) {
             console.error(error);
             renderizarChamados([]);
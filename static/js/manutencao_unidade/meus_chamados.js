@@ -13,6 +13,9 @@
         }
         atualizarNomeUsuario();
         await carregarChamados();
+        assinarEventos('chamado', (dados) => {
+            if (!dados.modulo || dados.modulo === 'manutencao_unidade') carregarChamados();
+        });
     }
 
     function atualizarNomeUsuario() {
@@ -113,6 +113,10 @@ function inicializarCalendario() {
     });
     
     calendar.render();
+    assinarEventos('ocupacao', () => {
+        calendar.refetchEvents();
+        carregarResumoPeriodo(calendar.view.activeStart.toISOString(), calendar.view.activeEnd.toISOString());
+    });
     
     document.getElementById('loadingCalendario').style.display = 'none';
     document.getElementById('calendario').style.display = 'block';
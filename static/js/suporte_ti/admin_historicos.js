@@ -22,6 +22,10 @@
     let chamadoEmEdicao = null;
     let textoOriginalSalvarEdicao = btnSalvarEdicaoHistorico?.innerHTML || '';
     let exibindoSomenteMesAtual = true;
+    let historicosCarregados = [];
+    let proximoCursorHistoricos = null;
+    let totalHistoricosServidor = 0;
+    let btnCarregarMaisHistoricos = null;
 
     async function inicializar() {
         const autenticado = await verificarAutenticacao();
@@ -79,10 +83,15 @@
         preencherSelectEdicao(editarTipoSelect, tiposEquipamentoBase, 'Selecione...');
     }
 
-    async function carregarHistoricos() {
+    async function carregarHistoricos(continuar = false) {
         try {
             const params = new URLSearchParams();
             params.set('status', 'Finalizado,Cancelado');
+            if (continuar && proximoCursorHistoricos) {
+                params.set('cursor', proximoCursorHistoricos);
+            } else {
+                params.set('incluir_total', '1');
+            }
 
             if (exibindoSomenteMesAtual) {
                 const agora = new Date();
@@ -107,10 +116,21 @@
 
             const endpoint = `/suporte_ti/admin/todos_chamados?${params.toString()}`;
             console.log('[Históricos] Buscando:', endpoint);
-            const chamados = await chamarAPI(endpoint);
-            renderizarChamados(chamados || []);
+            const pagina = await chamarAPI(endpoint);
+            const itens = Array.isArray(pagina?.items) ? pagina.items : [];
+            if (continuar) {
+                historicosCarregados = historicosCarregados.concat(itens);
+            } else {
+                historicosCarregados = itens;
+                totalHistoricosServidor = pagina?.total ?? itens.length;
+            }
+            proximoCursorHistoricos = pagina?.next_cursor || null;
+            renderizarChamados(historicosCarregados);
         } catch (error) {
             console.error(error);
+            historicosCarregados = [];
+            proximoCursorHistoricos = null;
+            totalHistoricosServidor = 0;
             renderizarChamados([]);
         }
     }
@@ -120,9 +140,11 @@
         tabela.innerHTML = '';
         const lista = Array.isArray(chamados) ? chamados : [];
         const total = lista.length;
+        const totalGeral = Math.max(totalHistoricosServidor, total);
         if (totalHistoricosEl) {
-            totalHistoricosEl.textContent = `${total} registro${total === 1 ? '' : 's'}`;
+            totalHistoricosEl.textContent = `${totalGeral} registro${totalGeral === 1 ? '' : 's'}`;
         }
+        atualizarBotaoCarregarMais();
         if (!total) {
             const linha = document.createElement('tr');
             linha.innerHTML = '<td colspan="8" class="text-center text-muted py-4">Nenhum histórico encontrado no momento.</td>';
@@ -171,6 +193,20 @@
         });
     }
 
+    function atualizarBotaoCarregarMais() {
+        if (!btnCarregarMaisHistoricos) {
+            const container = tabela?.closest('table')?.parentElement;
+            if (!container) return;
+            btnCarregarMaisHistoricos = document.createElement('button');
+            btnCarregarMaisHistoricos.type = 'button';
+            btnCarregarMaisHistoricos.className = 'btn btn-outline-secondary btn-sm m-3';
+            btnCarregarMaisHistoricos.textContent = 'Carregar mais';
+            btnCarregarMaisHistoricos.addEventListener('click', () => carregarHistoricos(true));
+            container.appendChild(btnCarregarMaisHistoricos);
+        }
+        btnCarregarMaisHistoricos.classList.toggle('d-none', !proximoCursorHistoricos);
+    }
+
     function classeUrgencia(urgencia) {
         switch ((urgencia || '').toLowerCase()) {
             case 'alto':
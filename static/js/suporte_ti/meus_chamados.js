@@ -13,6 +13,9 @@
         }
         atualizarNomeUsuario();
         await carregarChamados();
+        assinarEventos('chamado', (dados) => {
+            if (!dados.modulo || dados.modulo === 'suporte_ti') carregarChamados();
+        });
     }
 
     function atualizarNomeUsuario() {
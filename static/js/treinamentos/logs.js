@@ -4,19 +4,29 @@ document.addEventListener('DOMContentLoaded', () => {
     carregarLogs();
 });
 
-async function carregarLogs() {
+let proximoCursorLogs = null;
+
+async function carregarLogs(continuar = false) {
     const tbody = document.getElementById('logsTableBody');
-    tbody.innerHTML = '<tr><td colspan="4" class="text-center">Carregando...</td></tr>';
+    if (!continuar) {
+        tbody.innerHTML = '<tr><td colspan="4" class="text-center">Carregando...</td></tr>';
+    }
 
     try {
-        const logs = await chamarAPI('/treinamentos/logs');
-        
-        if (logs.length === 0) {
-            tbody.innerHTML = '<tr><td colspan="4" class="text-center">Nenhum log encontrado.</td></tr>';
-            return;
+        const url = continuar && proximoCursorLogs
+            ? `/treinamentos/logs?cursor=${encodeURIComponent(proximoCursorLogs)}`
+            : '/treinamentos/logs';
+        const pagina = await chamarAPI(url);
+        const logs = Array.isArray(pagina?.items) ? pagina.items : [];
+        proximoCursorLogs = pagina?.next_cursor || null;
+
+        if (!continuar) {
+            tbody.innerHTML = '';
+            if (logs.length === 0) {
+                tbody.innerHTML = '<tr><td colspan="4" class="text-center">Nenhum log encontrado.</td></tr>';
+            }
         }
 
-        tbody.innerHTML = ''; 
         logs.forEach(log => {
             const tr = document.createElement('tr');
             tr.innerHTML = `
@@ -27,7 +37,24 @@ async function carregarLogs() {
             `;
             tbody.appendChild(tr);
         });
+        atualizarBotaoCarregarMais(tbody);
     } catch (e) {
         tbody.innerHTML = `<tr><td colspan="4" class="text-center text-danger">Erro ao carregar logs: ${e.message}</td></tr>`;
     }
 }
+
+function atualizarBotaoCarregarMais(tbody) {
+    let botao = document.getElementById('btnCarregarMaisLogs');
+    if (!botao) {
+        const container = tbody.closest('table')?.parentElement;
+        if (!container) return;
+        botao = document.createElement('button');
+        botao.id = 'btnCarregarMaisLogs';
+        botao.type = 'button';
+        botao.className = 'btn btn-outline-secondary btn-sm m-3';
+        botao.textContent = 'Carregar mais';
+        botao.addEventListener('click', () => carregarLogs(true));
+        container.appendChild(botao);
+    }
+    botao.classList.toggle('d-none', !proximoCursorLogs);
+}
@@ -1,3 +1,4 @@
+import fnmatch
 import os
 import sys
 from datetime import datetime, timedelta
@@ -11,9 +12,11 @@ os.environ["REDIS_URL"] = "memory://"
 import pytest
 from flask import Flask
 from flask_wtf.csrf import CSRFProtect
+from sqlalchemy import event
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+from conecta_senai.config import redis as redis_config
 from conecta_senai.models import db
 from conecta_senai.models.user import User
 from conecta_senai.models.sala import Sala
@@ -106,12 +109,116 @@ def client(app):
     return app.test_client()
 
 
+@pytest.fixture
+def contar_consultas(app):
+    """Instruções SQL executadas no engine de ``app`` enquanto o teste roda."""
+    consultas = []
+
+    def registrar(conn, cursor, statement, *args):
+        consultas.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", registrar)
+    yield consultas
+    event.remove(engine, "before_cursor_execute", registrar)
+
+
+class RedisFalso:
+    """Subconjunto em memória dos comandos do Redis usados pela aplicação."""
+
+    def __init__(self):
+        self.valores = {}
+        self.ttls = {}
+        self.zsets = {}
+        self.consultas = []
+        self.publicados = []
+
+    def get(self, chave):
+        self.consultas.append(chave)
+        return self.valores.get(chave)
+
+    def mget(self, chaves):
+        return [self.valores.get(chave) for chave in chaves]
+
+    def set(self, chave, valor, nx=False, ex=None):
+        if nx and chave in self.valores:
+            return None
+        self.valores[chave] = valor
+        if ex is not None:
+            self.ttls[chave] = ex
+        return True
+
+    def setex(self, chave, ttl, valor):
+        self.set(chave, valor, ex=ttl)
+
+    def incr(self, chave):
+        self.valores[chave] = self.valores.get(chave, 0) + 1
+        return self.valores[chave]
+
+    def delete(self, *chaves):
+        for chave in chaves:
+            self.valores.pop(chave, None)
+            self.ttls.pop(chave, None)
+
+    def exists(self, chave):
+        return int(chave in self.valores)
+
+    def ttl(self, chave):
+        if chave not in self.valores:
+            return -2
+        return self.ttls.get(chave, -1)
+
+    def scan_iter(self, match=None, count=None):
+        return iter(
+            [c for c in self.valores if match is None or fnmatch.fnmatchcase(c, match)]
+        )
+
+    def zadd(self, chave, membros):
+        self.zsets.setdefault(chave, {}).update(membros)
+
+    def zremrangebyscore(self, chave, minimo, maximo):
+        zset = self.zsets.get(chave, {})
+        removidos = [m for m, s in zset.items() if float(minimo) <= s <= float(maximo)]
+        for membro in removidos:
+            del zset[membro]
+        return len(removidos)
+
+    def zrangebyscore(self, chave, minimo, maximo, withscores=False):
+        itens = sorted(
+            (s, m.encode())
+            for m, s in self.zsets.get(chave, {}).items()
+            if float(minimo) <= s <= float(maximo)
+        )
+        return [(m, s) if withscores else m for s, m in itens]
+
+    def publish(self, canal, mensagem):
+        self.publicados.append((canal, mensagem))
+
+    def pubsub(self, **_kwargs):
+        raise ConnectionError("sem pub/sub no teste")
+
+
+@pytest.fixture
+def redis_falso(monkeypatch):
+    cliente = RedisFalso()
+    monkeypatch.setattr(redis_config, "redis_conn", cliente)
+    return cliente
+
+
 @pytest.fixture
 def csrf_token(client):
     resp = client.get("/api/csrf-token")
     return resp.get_json()["csrf_token"]
 
 
+@pytest.fixture
+def admin_auth_headers(app):
+    with app.app_context():
+        user = User.query.filter_by(email="admin@example.com").first()
+        return {"Authorization": f"Bearer {gerar_token_acesso(user)}"}
+
+
 @pytest.fixture
 def non_admin_auth_headers(app):
     with app.app_context():
@@ -0,0 +1,112 @@
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from conecta_senai.models import db
+from conecta_senai.models.audit_log import AuditLog
+from conecta_senai.models.instrutor import Instrutor
+from conecta_senai.models.log_rateio import LogLancamentoRateio
+from conecta_senai.models.rateio import LancamentoRateio, RateioConfig
+from conecta_senai.utils import audit
+from conecta_senai.utils.audit import log_action
+
+
+@pytest.fixture
+def app_auditoria(app):
+    @app.route("/auditar/<int:quantidade>")
+    def auditar(quantidade):
+        for i in range(quantidade):
+            log_action(1, "create", "Teste", i, {"i": i})
+        with db.engine.connect() as conn:
+            gravados = conn.execute(
+                db.select(db.func.count()).select_from(AuditLog.__table__)
+            ).scalar()
+        return {"gravados_durante": gravados}
+
+    yield app
+    audit._pendentes.clear()
+
+
+def test_eventos_da_requisicao_gravados_num_unico_insert(
+    app_auditoria, contar_consultas
+):
+    resp = app_auditoria.test_client().get("/auditar/5")
+
+    assert resp.get_json()["gravados_durante"] == 0
+    inserts = [sql for sql in contar_consultas if sql.startswith("INSERT INTO audit")]
+    assert len(inserts) == 1
+    with app_auditoria.app_context():
+        assert AuditLog.query.filter_by(entity="Teste").count() == 5
+
+
+def test_modo_sincrono_grava_na_hora(app_auditoria):
+    app_auditoria.config["AUDITORIA_EM_LOTE"] = False
+    resp = app_auditoria.test_client().get("/auditar/2")
+    assert resp.get_json()["gravados_durante"] == 2
+
+
+def test_lote_com_falha_de_conexao_e_reenviado(app_auditoria, monkeypatch):
+    original = audit._inserir
+
+    def falhar(lotes):
+        raise OperationalError("INSERT", {}, Exception("banco fora"))
+
+    monkeypatch.setattr(audit, "_inserir", falhar)
+    app_auditoria.test_client().get("/auditar/3")
+    assert len(audit._pendentes) == 1
+
+    monkeypatch.setattr(audit, "_inserir", original)
+    app_auditoria.test_client().get("/auditar/1")
+    assert len(audit._pendentes) == 0
+    with app_auditoria.app_context():
+        assert AuditLog.query.filter_by(entity="Teste").count() == 4
+
+
+def _lancar_rateio(app, client, login_admin):
+    with app.app_context():
+        instrutor = Instrutor(nome="Instrutor Rateio")
+        config = RateioConfig(filial="F", uo="U", cr="CR", classe_valor="CL")
+        db.session.add_all([instrutor, config])
+        db.session.commit()
+        payload = {
+            "instrutor_id": instrutor.id,
+            "ano": 2024,
+            "mes": 5,
+            "lancamentos": [{"rateio_config_id": config.id, "percentual": 60}],
+        }
+    token, _ = login_admin(client)
+    return client.post(
+        "/api/rateio/lancamentos",
+        json=payload,
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+
+def _logs_do_instrutor(app):
+    with app.app_context():
+        return LogLancamentoRateio.query.filter_by(instrutor="Instrutor Rateio").count()
+
+
+def test_eventos_confirmados_com_o_commit(app, client, login_admin):
+    resp = _lancar_rateio(app, client, login_admin)
+
+    assert resp.status_code == 201
+    assert _logs_do_instrutor(app) == 1
+
+
+def test_eventos_descartados_quando_o_commit_falha(app, client, login_admin):
+    def falhar(sessao):
+        if any(isinstance(obj, LancamentoRateio) for obj in sessao.new):
+            raise OperationalError("COMMIT", {}, Exception("banco fora"))
+
+    event.listen(Session, "before_commit", falhar)
+    try:
+        resp = _lancar_rateio(app, client, login_admin)
+    finally:
+        event.remove(Session, "before_commit", falhar)
+
+    assert resp.status_code == 500
+    assert _logs_do_instrutor(app) == 0
+    with app.app_context():
+        assert LancamentoRateio.query.count() == 0
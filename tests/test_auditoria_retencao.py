@@ -0,0 +1,135 @@
+import gzip
+import json
+from datetime import date, datetime
+
+import pytest
+
+from conecta_senai.cli.auditoria import register_auditoria_cli
+from conecta_senai.models import db
+from conecta_senai.models.audit_log import AuditLog
+from conecta_senai.models.log_agendamento import LogAgendamento
+from conecta_senai.models.user import User
+from conecta_senai.services.auditoria_retencao_service import (
+    arquivar_logs,
+    garantir_particoes,
+)
+
+
+@pytest.fixture
+def logs_antigos(app):
+    with app.app_context():
+        admin = User.query.filter_by(email="admin@example.com").first()
+        for mes in (1, 2, 3, 5):
+            for dia in (1, 20):
+                db.session.add(
+                    AuditLog(
+                        user_id=admin.id,
+                        action="create",
+                        entity="Treinamento",
+                        entity_id=mes * 100 + dia,
+                        details={"nome": f"T{mes}"},
+                        timestamp=datetime(2024, mes, dia, 10, 0),
+                    )
+                )
+        db.session.commit()
+        return admin.id
+
+
+def test_arquivar_meses_fora_da_retencao(app, logs_antigos, tmp_path):
+    with app.app_context():
+        arquivados = arquivar_logs(3, tmp_path, referencia=date(2024, 6, 15))
+
+        assert [(a["tabela"], a["mes"], a["linhas"]) for a in arquivados] == [
+            ("audit_logs", "2024-01", 2),
+            ("audit_logs", "2024-02", 2),
+        ]
+        restantes = sorted(log.timestamp.month for log in AuditLog.query)
+        assert restantes == [3, 3, 5, 5]
+
+    with gzip.open(tmp_path / "audit_logs" / "2024-01.jsonl.gz", "rt") as arquivo:
+        linhas = [json.loads(linha) for linha in arquivo]
+    assert [linha["entity_id"] for linha in linhas] == [101, 120]
+    assert linhas[0]["timestamp"] == "2024-01-01T10:00:00"
+    assert linhas[0]["details"] == {"nome": "T1"}
+
+
+def test_arquivar_nao_sobrescreve_arquivo_existente(app, logs_antigos, tmp_path):
+    pasta = tmp_path / "audit_logs"
+    pasta.mkdir()
+    for nome in ("2024-01.jsonl.gz", "2024-04.jsonl.gz"):
+        with gzip.open(pasta / nome, "wt") as arquivo:
+            arquivo.write('{"entity_id": 1}\n')
+
+    with app.app_context():
+        arquivados = arquivar_logs(1, tmp_path, referencia=date(2024, 6, 15))
+
+    assert [a["arquivo"] for a in arquivados] == [
+        str(pasta / "2024-01.1.jsonl.gz"),
+        str(pasta / "2024-02.jsonl.gz"),
+        str(pasta / "2024-03.jsonl.gz"),
+    ]
+    for nome in ("2024-01.jsonl.gz", "2024-04.jsonl.gz"):
+        with gzip.open(pasta / nome, "rt") as arquivo:
+            assert arquivo.read() == '{"entity_id": 1}\n'
+    with gzip.open(pasta / "2024-01.1.jsonl.gz", "rt") as arquivo:
+        assert [json.loads(linha)["entity_id"] for linha in arquivo] == [101, 120]
+    assert not list(pasta.glob("*.tmp"))
+
+
+def test_particoes_so_no_postgres(app):
+    with app.app_context():
+        assert garantir_particoes() == []
+
+
+def test_cli_arquivar_logs(app, logs_antigos, tmp_path):
+    register_auditoria_cli(app)
+    resultado = app.test_cli_runner().invoke(
+        args=["arquivar_logs_auditoria", "--meses-retencao", "0", "--destino", tmp_path]
+    )
+    assert resultado.exit_code == 0
+    assert "4 mês(es) arquivado(s)." in resultado.output
+    with app.app_context():
+        assert AuditLog.query.count() == 0
+
+
+def test_logs_treinamentos_paginados_por_cursor(client, login_admin, logs_antigos):
+    token, _ = login_admin(client)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    vistos = []
+    url = "/api/treinamentos/logs?per_page=3"
+    while url:
+        pagina = client.get(url, headers=headers).get_json()
+        vistos.extend(item["timestamp"] for item in pagina["items"])
+        assert all(item["usuario"] == "Admin" for item in pagina["items"])
+        cursor = pagina["next_cursor"]
+        url = f"/api/treinamentos/logs?per_page=3&cursor={cursor}" if cursor else None
+
+    assert len(vistos) == 8
+    assert vistos == sorted(vistos, reverse=True)
+
+
+def test_logs_agenda_filtra_dia_por_intervalo(app, client, login_admin):
+    with app.app_context():
+        for dia, hora in ((10, 0), (10, 23), (11, 0)):
+            log = LogAgendamento("Admin", "create", "Lab", "Manhã", None, None, {})
+            log.timestamp = datetime(2024, 4, dia, hora, 30)
+            db.session.add(log)
+        db.session.commit()
+    token, _ = login_admin(client)
+
+    resp = client.get(
+        "/api/logs-agenda?data=2024-04-10&per_page=1",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    dados = resp.get_json()
+    assert len(dados["items"]) == 1
+    assert dados["next_cursor"]
+
+    resp = client.get(
+        f"/api/logs-agenda?data=2024-04-10&cursor={dados['next_cursor']}",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    dados = resp.get_json()
+    assert [item["timestamp"] for item in dados["items"]] == ["2024-04-10T00:30:00"]
+    assert dados["next_cursor"] is None
@@ -0,0 +1,133 @@
+import time
+import uuid
+
+from conecta_senai.auth.cache_usuarios import (
+    CHAVE_REVOGADOS,
+    CacheUsuarios,
+    FiltroBloom,
+    obter_cache_usuarios,
+)
+from conecta_senai.models import db
+from conecta_senai.models.user import User
+from conecta_senai.routes.user import gerar_token_acesso
+
+
+def fetch_csrf(client):
+    return client.get("/api/csrf-token").get_json()["csrf_token"]
+
+
+def _token(app, email):
+    with app.app_context():
+        usuario = User.query.filter_by(email=email).first()
+        return usuario.id, gerar_token_acesso(usuario)
+
+
+def test_filtro_bloom_sem_falsos_negativos():
+    filtro = FiltroBloom(capacidade=1000)
+    jtis = [str(uuid.uuid4()) for _ in range(1000)]
+    for jti in jtis:
+        filtro.adicionar(jti)
+
+    assert all(jti in filtro for jti in jtis)
+    falsos_positivos = sum(str(uuid.uuid4()) in filtro for _ in range(2000))
+    assert falsos_positivos < 100
+
+
+def test_identidade_em_cache_evita_consulta_ao_banco(app, contar_consultas):
+    with app.app_context():
+        usuario_id = User.query.filter_by(email="usuario@example.com").first().id
+        cache = CacheUsuarios(ttl=30)
+        contar_consultas.clear()
+        primeira = cache.obter(usuario_id, "jti-1")
+        db.session.expunge_all()
+        consultas_iniciais = len(contar_consultas)
+        segunda = cache.obter(usuario_id, "jti-1")
+
+    assert consultas_iniciais == 1
+    assert len(contar_consultas) == 1
+    assert segunda == primeira
+    assert primeira.tipo == "comum"
+
+
+def test_logout_revoga_token_no_proprio_processo(client, app):
+    usuario_id, token = _token(app, "usuario@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    assert client.get(f"/api/usuarios/{usuario_id}", headers=headers).status_code == 200
+
+    resp = client.post(
+        "/api/logout",
+        headers={**headers, "X-CSRFToken": fetch_csrf(client)},
+        json={},
+    )
+    assert resp.status_code == 200
+
+    resp = client.get(f"/api/usuarios/{usuario_id}", headers=headers)
+    assert resp.status_code == 401
+    assert resp.get_json()["erro"] == "Token has been revoked"
+
+
+def test_alteracao_de_tipo_invalida_identidade_em_cache(client, app):
+    usuario_id, token_usuario = _token(app, "usuario@example.com")
+    _, token_admin = _token(app, "admin@example.com")
+    headers_usuario = {"Authorization": f"Bearer {token_usuario}"}
+
+    assert client.get("/api/usuarios", headers=headers_usuario).status_code == 403
+
+    resp = client.put(
+        f"/api/usuarios/{usuario_id}",
+        json={"tipo": "secretaria"},
+        headers={
+            "Authorization": f"Bearer {token_admin}",
+            "X-CSRFToken": fetch_csrf(client),
+        },
+    )
+    assert resp.status_code == 200
+
+    assert client.get("/api/usuarios", headers=headers_usuario).status_code == 200
+
+
+def test_revogacao_consulta_redis_apenas_quando_filtro_acusa(app, redis_falso):
+    revogado = str(uuid.uuid4())
+    redis_falso.setex(revogado, 60, "revoked")
+    redis_falso.zadd(CHAVE_REVOGADOS, {revogado: time.time() + 60})
+
+    with app.app_context():
+        cache = CacheUsuarios(janela_revogacao_legada=0)
+        assert cache.token_revogado(str(uuid.uuid4())) is False
+        assert redis_falso.consultas == []
+
+        # Sincronizado do conjunto de revogados, o filtro resolve sem o GET.
+        assert cache.token_revogado(revogado) is True
+
+        # Revogação vinda de outro processo pelo pub/sub.
+        outro = str(uuid.uuid4())
+        cache.aplicar({"tipo": "revogado", "jti": outro, "expira_em": time.time() + 60})
+        assert cache.token_revogado(outro) is True
+        assert redis_falso.consultas == []
+
+
+def test_revogacao_legada_sem_conjunto_continua_valendo(app, redis_falso):
+    # Logout anterior ao conjunto de revogados: só a chave ``<jti>``.
+    legado = str(uuid.uuid4())
+    redis_falso.setex(legado, 600, "revoked")
+
+    with app.app_context():
+        assert obter_cache_usuarios().token_revogado(legado) is True
+        assert CacheUsuarios(janela_revogacao_legada=0).token_revogado(legado) is False
+
+
+def test_falha_na_sincronizacao_espera_o_intervalo(app, redis_falso, monkeypatch):
+    tentativas = []
+
+    def falhar(*_args):
+        tentativas.append(1)
+        raise ConnectionError("redis fora")
+
+    monkeypatch.setattr(redis_falso, "zremrangebyscore", falhar)
+    with app.app_context():
+        cache = CacheUsuarios(janela_revogacao_legada=0)
+        for _ in range(3):
+            assert cache.token_revogado(str(uuid.uuid4())) is False
+
+    assert len(tentativas) == 1
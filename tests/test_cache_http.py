@@ -0,0 +1,116 @@
+from sqlalchemy import text
+
+from conecta_senai.models import db
+from conecta_senai.models.instrutor import Instrutor
+from conecta_senai.models.recurso import Recurso
+from conecta_senai.models.sala import Sala
+from conecta_senai.utils.cache_http import CHAVE_VERSAO, CacheRespostas
+
+
+def test_etag_e_304_para_catalogo(client, non_admin_auth_headers):
+    primeira = client.get("/api/salas", headers=non_admin_auth_headers)
+    assert primeira.status_code == 200
+    etag = primeira.headers["ETag"]
+    assert etag.startswith('W/"')
+    assert primeira.headers["Cache-Control"] == "private, no-cache"
+
+    resp = client.get(
+        "/api/salas", headers={**non_admin_auth_headers, "If-None-Match": etag}
+    )
+    assert resp.status_code == 304
+    assert resp.data == b""
+
+    filtrada = client.get("/api/salas?status=ativa", headers=non_admin_auth_headers)
+    assert filtrada.headers["ETag"] != etag
+
+
+def test_corpo_servido_do_lru_ate_a_tabela_mudar(
+    app, client, non_admin_auth_headers, contar_consultas
+):
+    client.get("/api/instrutores", headers=non_admin_auth_headers)
+    contar_consultas.clear()
+    repetida = client.get("/api/instrutores", headers=non_admin_auth_headers)
+    assert repetida.get_json() == []
+    assert not any("instrutores.nome" in sql for sql in contar_consultas)
+
+    with app.app_context():
+        db.session.add(Instrutor(nome="Ana", email="ana@example.com"))
+        db.session.commit()
+
+    nova = client.get("/api/instrutores", headers=non_admin_auth_headers)
+    assert nova.headers["ETag"] != repetida.headers["ETag"]
+    assert [i["nome"] for i in nova.get_json()] == ["Ana"]
+
+
+def test_versoes_no_redis_dispensam_o_banco(
+    app, client, non_admin_auth_headers, redis_falso, contar_consultas
+):
+    etag = client.get("/api/salas", headers=non_admin_auth_headers).headers["ETag"]
+
+    contar_consultas.clear()
+    resp = client.get(
+        "/api/salas", headers={**non_admin_auth_headers, "If-None-Match": etag}
+    )
+    assert resp.status_code == 304
+    assert not any("salas" in sql for sql in contar_consultas)
+
+    semente = redis_falso.valores[CHAVE_VERSAO.format("salas")]
+    with app.app_context():
+        db.session.add(Sala(nome="Nova", capacidade=5))
+        db.session.commit()
+    assert redis_falso.valores[CHAVE_VERSAO.format("salas")] == semente + 1
+
+    resp = client.get(
+        "/api/salas", headers={**non_admin_auth_headers, "If-None-Match": etag}
+    )
+    assert resp.status_code == 200
+    assert "Nova" in [sala["nome"] for sala in resp.get_json()]
+
+
+def test_redis_zerado_nao_repete_versao(client, non_admin_auth_headers, redis_falso):
+    etag = client.get("/api/salas", headers=non_admin_auth_headers).headers["ETag"]
+
+    redis_falso.valores.clear()
+    resp = client.get(
+        "/api/salas", headers={**non_admin_auth_headers, "If-None-Match": etag}
+    )
+    assert resp.status_code == 200
+    assert resp.headers["ETag"] != etag
+
+
+def test_sem_redis_alteracao_em_outro_processo_muda_etag(
+    app, client, non_admin_auth_headers
+):
+    with app.app_context():
+        db.session.add(Recurso(nome="projetor"))
+        db.session.commit()
+    etag = client.get("/api/salas/recursos", headers=non_admin_auth_headers).headers[
+        "ETag"
+    ]
+
+    # Fora da Session, como um commit feito por outro worker do gunicorn.
+    with app.app_context(), db.engine.begin() as conn:
+        conn.execute(text("UPDATE recursos SET nome = 'tv' WHERE nome = 'projetor'"))
+
+    resp = client.get(
+        "/api/salas/recursos",
+        headers={**non_admin_auth_headers, "If-None-Match": etag},
+    )
+    assert resp.status_code == 200
+    assert [r["valor"] for r in resp.get_json()] == ["tv"]
+
+
+def test_sem_autenticacao_nao_usa_cache(client):
+    assert client.get("/api/ocupacoes/tipos").status_code == 401
+
+
+def test_lru_descarta_o_menos_usado():
+    cache = CacheRespostas(capacidade=2)
+    cache.guardar("a", b"1", "application/json")
+    cache.guardar("b", b"2", "application/json")
+    cache.obter("a")
+    cache.guardar("c", b"3", "application/json")
+
+    assert cache.obter("b") is None
+    assert cache.obter("a") == (b"1", "application/json")
+    assert len(cache) == 2
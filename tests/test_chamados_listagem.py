@@ -0,0 +1,105 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from conecta_senai.models import db
+from conecta_senai.models.suporte_anexo import SuporteAnexo
+from conecta_senai.models.suporte_basedados import SuporteTipoEquipamento
+from conecta_senai.models.suporte_chamado import SuporteChamado
+from conecta_senai.models.user import User
+from conecta_senai.routes.suporte_ti.admin import suporte_ti_admin_bp
+
+
+@pytest.fixture
+def listagem_app(app):
+    app.register_blueprint(suporte_ti_admin_bp)
+    base = datetime(2024, 5, 10, 8, 0)
+    with app.app_context():
+        admin = User.query.filter_by(email="admin@example.com").first()
+        tipos = [SuporteTipoEquipamento(nome=f"Tipo {i}") for i in range(3)]
+        db.session.add_all(tipos)
+        db.session.flush()
+        for i in range(7):
+            chamado = SuporteChamado(
+                user_id=admin.id,
+                email="x@example.com",
+                area="TI" if i % 2 else "Secretaria",
+                tipo_equipamento_id=tipos[i % 3].id,
+                descricao_problema=f"Chamado {i}",
+                status="Aberto",
+                # Dois chamados no mesmo instante exercitam o desempate por id.
+                created_at=base + timedelta(hours=min(i, 5)),
+            )
+            chamado.anexos.append(SuporteAnexo(file_path=f"/anexo/{i}.png"))
+            db.session.add(chamado)
+        db.session.commit()
+    return app
+
+
+def test_paginacao_por_cursor_percorre_todos(listagem_app, admin_auth_headers):
+    app = listagem_app
+    client = app.test_client()
+
+    vistos = []
+    cursor = None
+    while True:
+        url = "/api/suporte_ti/admin/todos_chamados?per_page=3"
+        if cursor:
+            url += f"&cursor={cursor}"
+        pagina = client.get(url, headers=admin_auth_headers).get_json()
+        assert "total" not in pagina
+        vistos.extend(chamado["id"] for chamado in pagina["items"])
+        cursor = pagina["next_cursor"]
+        if not cursor:
+            break
+
+    assert len(vistos) == len(set(vistos)) == 7
+    with app.app_context():
+        esperado = [
+            c.id
+            for c in SuporteChamado.query.order_by(
+                SuporteChamado.created_at.desc(), SuporteChamado.id.desc()
+            )
+        ]
+    assert vistos == esperado
+
+
+def test_total_apenas_quando_solicitado_e_com_filtros(listagem_app, admin_auth_headers):
+    app = listagem_app
+    resp = app.test_client().get(
+        "/api/suporte_ti/admin/todos_chamados?area=TI&per_page=2&incluir_total=1",
+        headers=admin_auth_headers,
+    )
+    dados = resp.get_json()
+    assert dados["total"] == 3
+    assert len(dados["items"]) == 2
+    assert all(chamado["area"] == "TI" for chamado in dados["items"])
+
+
+def test_relacionamentos_carregados_sem_n_mais_1(
+    listagem_app, admin_auth_headers, contar_consultas
+):
+    app = listagem_app
+    contar_consultas.clear()
+    resp = app.test_client().get(
+        "/api/suporte_ti/admin/todos_chamados?per_page=50", headers=admin_auth_headers
+    )
+    consultas = [sql for sql in contar_consultas if sql.lstrip().startswith("SELECT")]
+
+    dados = resp.get_json()
+    assert len(dados["items"]) == 7
+    assert all(chamado["anexos"] for chamado in dados["items"])
+    assert all(chamado["tipo_equipamento_nome"] for chamado in dados["items"])
+    chamados = [sql for sql in consultas if "FROM suporte_chamados" in sql]
+    anexos = [sql for sql in consultas if "FROM suporte_anexos" in sql]
+    assert len(chamados) == 1
+    assert len(anexos) == 1
+
+
+def test_cursor_invalido(listagem_app, admin_auth_headers):
+    app = listagem_app
+    resp = app.test_client().get(
+        "/api/suporte_ti/admin/todos_chamados?cursor=invalido",
+        headers=admin_auth_headers,
+    )
+    assert resp.status_code == 400
@@ -0,0 +1,117 @@
+from datetime import date, timedelta
+
+from sqlalchemy import event
+
+from conecta_senai.models import (
+    db,
+    EmailOutbox,
+    InscricaoTreinamento,
+    Treinamento,
+    TurmaTreinamento,
+)
+from conecta_senai.tasks.jobs.convocacao_automatica import convocacao_automatica_job
+
+
+def _criar_turma(treino, inicio, fim):
+    turma = TurmaTreinamento(
+        treinamento_id=treino.id,
+        data_inicio=inicio,
+        data_fim=fim,
+        local_realizacao="Local",
+        horario="08h",
+    )
+    db.session.add(turma)
+    db.session.commit()
+    return turma
+
+
+def _inscrever(turma, quantidade, prefixo):
+    inscricoes = [
+        InscricaoTreinamento(
+            turma_id=turma.id,
+            nome=f"{prefixo} {i}",
+            email=f"{prefixo}{i}@example.com",
+            cpf=str(i),
+        )
+        for i in range(quantidade)
+    ]
+    db.session.add_all(inscricoes)
+    db.session.commit()
+    return [inscricao.id for inscricao in inscricoes]
+
+
+def test_convocacao_automatica_pagina_por_id_e_ignora_turmas_encerradas(app):
+    app.config["CONVOCACAO_LOTE"] = 2
+    hoje = date.today()
+    with app.app_context():
+        treino = Treinamento(nome="Treino", codigo="TA1", carga_horaria=8)
+        db.session.add(treino)
+        db.session.commit()
+        futura = _criar_turma(
+            treino, hoje + timedelta(days=3), hoje + timedelta(days=4)
+        )
+        encerrada = _criar_turma(
+            treino, hoje - timedelta(days=10), hoje - timedelta(days=9)
+        )
+        pendentes = _inscrever(futura, 5, "futuro")
+        antigas = _inscrever(encerrada, 2, "antigo")
+
+        commits = []
+
+        def registrar_commit(sessao):
+            commits.append(sessao)
+
+        event.listen(db.session(), "after_commit", registrar_commit)
+        try:
+            assert convocacao_automatica_job() == 5
+        finally:
+            event.remove(db.session(), "after_commit", registrar_commit)
+
+        # 5 inscrições em lotes de 2: um commit por lote.
+        assert len(commits) == 3
+        for inscricao_id in pendentes:
+            assert db.session.get(InscricaoTreinamento, inscricao_id).convocado_em
+        for inscricao_id in antigas:
+            assert (
+                db.session.get(InscricaoTreinamento, inscricao_id).convocado_em is None
+            )
+        assert EmailOutbox.query.count() == 5
+
+        assert convocacao_automatica_job() == 0
+        assert EmailOutbox.query.count() == 5
+
+
+def test_convocacao_automatica_mantem_lotes_ja_gravados(app, monkeypatch):
+    app.config["CONVOCACAO_LOTE"] = 2
+    hoje = date.today()
+    with app.app_context():
+        treino = Treinamento(nome="Treino", codigo="TA2", carga_horaria=8)
+        db.session.add(treino)
+        db.session.commit()
+        turma = _criar_turma(treino, hoje + timedelta(days=1), hoje + timedelta(days=1))
+        ids = _inscrever(turma, 4, "aluno")
+
+        commit_original = db.session.commit
+        chamadas = []
+
+        def commit_com_falha():
+            chamadas.append(1)
+            if len(chamadas) == 2:
+                raise RuntimeError("queda do banco")
+            commit_original()
+
+        monkeypatch.setattr(db.session, "commit", commit_com_falha)
+        try:
+            convocacao_automatica_job()
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError("a falha deveria ser propagada")
+        monkeypatch.undo()
+
+        convocados = [
+            inscricao_id
+            for inscricao_id in ids
+            if db.session.get(InscricaoTreinamento, inscricao_id).convocado_em
+        ]
+        assert convocados == ids[:2]
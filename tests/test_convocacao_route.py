@@ -53,10 +53,11 @@ def test_convocar_inscrito(client, app, monkeypatch):
 
     called = {}
 
-    def fake_send_email(to, subject, html):
+    def fake_send_email(to, subject, html, attachments=None, referencia=None):
         called["to"] = to
         called["subject"] = subject
         called["html"] = html
+        called["referencia"] = referencia
 
     monkeypatch.setattr(
         "conecta_senai.routes.treinamentos.treinamento.send_email", fake_send_email
@@ -66,6 +67,7 @@ def test_convocar_inscrito(client, app, monkeypatch):
     assert resp.status_code == 200
     assert called["to"] == "joao@example.com"
     assert "Convocação" in called["subject"]
+    assert called["referencia"] == f"convocacao:{iid}"
     with app.app_context():
         insc = db.session.get(InscricaoTreinamento, iid)
         assert insc.convocado_em is not None
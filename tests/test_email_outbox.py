@@ -0,0 +1,211 @@
+import functools
+from datetime import date, datetime
+from unittest.mock import patch
+
+from resend.exceptions import ResendError
+
+from conecta_senai.models import (
+    db,
+    EmailOutbox,
+    InscricaoTreinamento,
+    Treinamento,
+    TurmaTreinamento,
+)
+from conecta_senai.services.email_service import FakeTransport, enviar_convocacao
+from conecta_senai.services.email_outbox_service import (
+    TokenBucket,
+    enfileirar_email,
+    processar_outbox,
+    reenfileirar_falhas,
+)
+
+
+def _erro_resend(code):
+    return ResendError(
+        code=code, error_type="erro", message="falha", suggested_action=""
+    )
+
+
+class TransporteComFalha(FakeTransport):
+    def __init__(self, erro):
+        super().__init__()
+        self.erro = erro
+        self.chamadas = 0
+
+    def send_batch(self, params_list):
+        self.chamadas += 1
+        raise self.erro
+
+
+def test_token_bucket_local_limita_rajadas():
+    bucket = TokenBucket(taxa=2, redis_client=object())
+    assert bucket.tentar_consumir() == 0
+    assert bucket.tentar_consumir() == 0
+    espera = bucket.tentar_consumir()
+    assert 0 < espera <= 0.5
+
+
+def test_outbox_envia_mensagens_sem_anexo_em_lote(app):
+    transport = app.extensions["email_transport"] = FakeTransport()
+    with app.app_context():
+        for i in range(3):
+            enfileirar_email(f"p{i}@example.com", "Oi", "<p>oi</p>")
+        enfileirar_email(
+            "anexo@example.com",
+            "Oi",
+            "<p>oi</p>",
+            attachments=[{"filename": "a.txt", "content": "YQ=="}],
+        )
+        db.session.commit()
+
+        assert processar_outbox() == {"enviado": 4}
+
+        assert len(transport.batches) == 1
+        assert [p["to"] for p in transport.batches[0]] == [
+            ["p0@example.com"],
+            ["p1@example.com"],
+            ["p2@example.com"],
+        ]
+        assert [p["to"] for p in transport.sent] == [["anexo@example.com"]]
+        mensagens = EmailOutbox.query.order_by(EmailOutbox.id).all()
+        assert all(m.status == "enviado" for m in mensagens)
+        assert [m.provider_id for m in mensagens[:3]] == ["fake-1", "fake-2", "fake-3"]
+        assert all(m.tentativas == 1 for m in mensagens)
+
+
+def test_outbox_reagenda_com_backoff_e_move_para_dead_letter(app):
+    app.config["EMAIL_OUTBOX_MAX_TENTATIVAS"] = 2
+    transport = TransporteComFalha(_erro_resend(429))
+    app.extensions["email_transport"] = transport
+    with app.app_context():
+        enfileirar_email("a@example.com", "Oi", "<p>oi</p>")
+        db.session.commit()
+
+        with patch("conecta_senai.services.email_service.time_module.sleep"):
+            assert processar_outbox() == {"pendente": 1}
+            mensagem = EmailOutbox.query.one()
+            assert mensagem.tentativas == 1
+            assert mensagem.proxima_tentativa_em > datetime.utcnow()
+            # Só o backoff da fila reage ao 429, sem a retentativa de send_email.
+            assert transport.chamadas == 1
+
+            assert processar_outbox() == {}
+
+            mensagem.proxima_tentativa_em = datetime.utcnow()
+            db.session.commit()
+            assert processar_outbox() == {"falhou": 1}
+
+        assert EmailOutbox.query.one().status == "falhou"
+        assert reenfileirar_falhas() == 1
+        assert EmailOutbox.query.one().status == "pendente"
+
+
+def test_outbox_erro_definitivo_vai_direto_para_dead_letter(app):
+    app.extensions["email_transport"] = TransporteComFalha(_erro_resend(422))
+    with app.app_context():
+        enfileirar_email("invalido", "Oi", "<p>oi</p>")
+        db.session.commit()
+
+        assert processar_outbox() == {"falhou": 1}
+        assert EmailOutbox.query.one().tentativas == 1
+
+
+class TransporteFalhaPrimeiroLote(FakeTransport):
+    def send_batch(self, params_list):
+        if not self.batches:
+            self.batches.append(params_list)
+            raise _erro_resend(500)
+        return super().send_batch(params_list)
+
+
+def test_outbox_falha_de_um_lote_nao_descarta_os_demais(app, monkeypatch):
+    monkeypatch.setattr("conecta_senai.services.email_service.MAX_BATCH_SIZE", 2)
+    transport = app.extensions["email_transport"] = TransporteFalhaPrimeiroLote()
+    with app.app_context():
+        for i in range(4):
+            enfileirar_email(f"p{i}@example.com", "Oi", "<p>oi</p>")
+        db.session.commit()
+
+        assert processar_outbox() == {"pendente": 2, "enviado": 2}
+
+        assert len(transport.batches) == 2
+        status = [m.status for m in EmailOutbox.query.order_by(EmailOutbox.id)]
+        assert status == ["pendente", "pendente", "enviado", "enviado"]
+
+
+def test_convocar_todos_apenas_enfileira(client, app, admin_auth_headers):
+    headers = admin_auth_headers
+    with app.app_context():
+        treino = Treinamento(nome="Treino", codigo="T1", carga_horaria=8)
+        db.session.add(treino)
+        db.session.commit()
+        turma = TurmaTreinamento(
+            treinamento_id=treino.id,
+            data_inicio=date.today(),
+            data_fim=date.today(),
+            local_realizacao="Local",
+            horario="08h",
+        )
+        db.session.add(turma)
+        db.session.commit()
+        for i in range(3):
+            db.session.add(
+                InscricaoTreinamento(
+                    turma_id=turma.id,
+                    nome=f"Participante {i}",
+                    email=f"p{i}@example.com",
+                    cpf=str(i),
+                )
+            )
+        db.session.commit()
+        turma_id = turma.id
+
+    with patch("conecta_senai.services.email_service.send_email") as mock_send:
+        resp = client.post(
+            f"/api/treinamentos/turmas/{turma_id}/convocar-todos", headers=headers
+        )
+        assert mock_send.call_count == 0
+
+    assert resp.status_code == 200
+    assert resp.get_json()["emails_enfileirados"] == 3
+    with app.app_context():
+        mensagens = EmailOutbox.query.order_by(EmailOutbox.id).all()
+        assert [m.destinatarios for m in mensagens] == [
+            ["p0@example.com"],
+            ["p1@example.com"],
+            ["p2@example.com"],
+        ]
+        assert all(m.status == "pendente" for m in mensagens)
+        assert (
+            InscricaoTreinamento.query.filter(
+                InscricaoTreinamento.convocado_em.is_(None)
+            ).count()
+            == 0
+        )
+
+
+def test_convocacao_aceita_qualquer_send_email_fn(app):
+    with app.app_context():
+        treino = Treinamento(nome="Treino", codigo="T1", carga_horaria=8)
+        turma = TurmaTreinamento(
+            treinamento=treino,
+            data_inicio=date.today(),
+            data_fim=date.today(),
+            local_realizacao="Local",
+            horario="08h",
+            teoria_online=False,
+        )
+        inscricao = InscricaoTreinamento(
+            turma=turma, nome="Participante", email="p@example.com", cpf="1"
+        )
+        db.session.add_all([treino, turma, inscricao])
+        db.session.commit()
+
+        enviar_convocacao(
+            inscricao, turma, send_email_fn=functools.partial(enfileirar_email)
+        )
+        db.session.commit()
+
+        mensagem = EmailOutbox.query.one()
+        assert mensagem.destinatarios == ["p@example.com"]
+        assert mensagem.referencia == f"convocacao:{inscricao.id}"
@@ -5,6 +5,7 @@ import pytest
 from resend.exceptions import ResendError
 
 import conecta_senai.services.email_service as email_service
+from conecta_senai.services.email_outbox_service import processar_outbox
 
 
 def reload_service(
@@ -92,3 +93,69 @@ def test_send_email_retries_on_rate_limit(monkeypatch, app):
             result = svc.send_email("a@example.com", "Oi", "<p>oi</p>")
         assert result["id"] == "123"
         assert mock_send.call_count == 2
+
+
+def test_send_batch_agrupa_em_lotes_e_substitui_logo(app):
+    transport = app.extensions["email_transport"] = email_service.FakeTransport()
+    app.config["APP_BASE_URL"] = "https://conecta.example.com"
+    mensagens = [
+        {
+            "to": f"p{i}@example.com",
+            "subject": "Oi",
+            "html": '<img src="cid:logo_assinatura">',
+        }
+        for i in range(email_service.MAX_BATCH_SIZE + 5)
+    ]
+    mensagens.append(
+        {
+            "to": "anexo@example.com",
+            "subject": "Oi",
+            "html": "<p>oi</p>",
+            "attachments": [{"filename": "a.txt", "content": "YQ=="}],
+        }
+    )
+
+    with app.app_context():
+        resultados = email_service.send_batch(mensagens)
+
+    assert [len(lote) for lote in transport.batches] == [
+        email_service.MAX_BATCH_SIZE,
+        5,
+    ]
+    assert len(transport.sent) == 1
+    assert transport.sent[0]["to"] == ["anexo@example.com"]
+    assert len(resultados) == len(mensagens)
+    assert all(r.get("id") for r in resultados)
+    html = transport.batches[0][0]["html"]
+    assert "cid:" not in html
+    assert "https://conecta.example.com/static/img/Logo-assinatura" in html
+
+
+def test_dedupe_recipients_ignora_caixa_e_vazios():
+    assert email_service.dedupe_recipients(
+        ["A@example.com", "a@example.com ", "", None, "b@example.com"]
+    ) == ["A@example.com", "b@example.com"]
+
+
+def test_treinamento_desmarcado_envia_um_email_por_destinatario(app):
+    from types import SimpleNamespace
+
+    transport = app.extensions["email_transport"] = email_service.FakeTransport()
+    turma = SimpleNamespace(
+        treinamento=SimpleNamespace(nome="NR-10", codigo="N10"),
+        data_inicio=None,
+        data_fim=None,
+        horario="08h",
+        instrutor=None,
+        local_realizacao="Sala 1",
+        teoria_online=False,
+    )
+    with app.app_context():
+        email_service.send_treinamento_desmarcado_email(
+            ["sec@example.com", "SEC@example.com", "inst@example.com"], turma
+        )
+        assert transport.batches == []
+        processar_outbox()
+
+    assert len(transport.batches) == 1
+    assert transport.recipients == ["sec@example.com", "inst@example.com"]
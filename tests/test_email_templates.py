@@ -0,0 +1,116 @@
+from datetime import date
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from flask import render_template
+
+from conecta_senai.models import (
+    db,
+    InscricaoTreinamento,
+    Treinamento,
+    TurmaTreinamento,
+)
+import conecta_senai.services.email_service as email_service
+from conecta_senai.services.email_service import FakeTransport, enviar_convocacao
+from conecta_senai.services.email_template_service import (
+    carregar_anexo_base64,
+    obter_cache,
+    precompilar_templates_email,
+)
+
+
+def _criar_turma():
+    treino = Treinamento(nome="NR-35", codigo="N35", carga_horaria=8)
+    db.session.add(treino)
+    db.session.commit()
+    turma = TurmaTreinamento(
+        treinamento_id=treino.id,
+        data_inicio=date(2030, 3, 1),
+        data_fim=date(2030, 3, 2),
+        local_realizacao="Galpão <A>",
+        horario="08h às 17h",
+    )
+    db.session.add(turma)
+    db.session.commit()
+    inscricoes = [
+        InscricaoTreinamento(
+            turma_id=turma.id, nome=nome, email=email, cpf=str(i), empresa="E"
+        )
+        for i, (nome, email) in enumerate(
+            [("Ana", "ana@example.com"), ("Bruno & Cia", "bruno@example.com")]
+        )
+    ]
+    db.session.add_all(inscricoes)
+    db.session.commit()
+    return turma, inscricoes
+
+
+def _html_esperado(turma, inscricao):
+    return render_template(
+        "email/convocacao.html.j2",
+        nome=inscricao.nome,
+        nome_do_treinamento=turma.treinamento.nome,
+        periodo="De 01/03/2030 a 02/03/2030",
+        horario=turma.horario,
+        carga_horaria=turma.treinamento.carga_horaria,
+        instrutor="A definir",
+        local_de_realizacao=turma.local_realizacao,
+        email_fornecido_na_inscricao=inscricao.email,
+        local_da_pratica=turma.local_realizacao,
+        teoria_online=False,
+        tem_pratica=False,
+    )
+
+
+def test_convocacao_renderiza_turma_uma_vez_por_versao(app):
+    transport = app.extensions["email_transport"] = FakeTransport()
+    with app.app_context():
+        turma, inscricoes = _criar_turma()
+
+        with patch.object(
+            email_service,
+            "_montar_contexto_convocacao",
+            wraps=email_service._montar_contexto_convocacao,
+        ) as contexto:
+            for inscricao in inscricoes:
+                enviar_convocacao(inscricao, turma)
+            assert contexto.call_count == 1
+
+        enviados = [params["html"] for params in transport.sent]
+        assert enviados == [_html_esperado(turma, i) for i in inscricoes]
+        cache = obter_cache()
+        assert (cache.falhas, cache.acertos) == (1, 1)
+
+        turma.horario = "13h às 17h"
+        db.session.commit()
+        enviar_convocacao(inscricoes[0], turma)
+        assert "13h às 17h" in transport.sent[-1]["html"]
+        assert cache.falhas == 2
+
+
+def test_convocacao_sem_id_nao_usa_cache(app):
+    transport = app.extensions["email_transport"] = FakeTransport()
+    turma = SimpleNamespace(
+        treinamento=SimpleNamespace(nome="T", carga_horaria=4, tem_pratica=True),
+        data_inicio=None,
+        data_fim=None,
+        horario="08h",
+        local_realizacao="Local",
+        teoria_online=False,
+    )
+    inscricao = SimpleNamespace(nome="Ana", email="ana@example.com")
+    with app.app_context():
+        enviar_convocacao(inscricao, turma)
+        assert "Olá Ana" in transport.sent[0]["html"]
+        assert obter_cache().falhas == 0
+
+
+def test_precompila_templates_e_reaproveita_anexo(app, tmp_path):
+    assert precompilar_templates_email(app) > 0
+
+    anexo = tmp_path / "tutorial.pdf"
+    anexo.write_bytes(b"pdf")
+    with patch("builtins.open", wraps=open) as abrir:
+        assert carregar_anexo_base64(str(anexo)) == "cGRm"
+        assert carregar_anexo_base64(str(anexo)) == "cGRm"
+        assert abrir.call_count == 1
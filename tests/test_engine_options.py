@@ -0,0 +1,88 @@
+import logging
+import threading
+import time
+
+from sqlalchemy import create_engine, text
+
+from conecta_senai.config.database import (
+    QueuePoolMedido,
+    metricas_pool,
+    montar_engine_options,
+)
+from conecta_senai.routes.diagnostico import diagnostico_bp
+
+PG = "postgresql://conecta:conecta@db:5432/conecta"
+
+
+def test_postgres_recebe_pool_application_name_e_statement_timeout():
+    opcoes = montar_engine_options(
+        PG,
+        {"DB_POOL_SIZE": 8, "DB_STATEMENT_TIMEOUT_MS": 30000},
+    )
+
+    assert opcoes["poolclass"] is QueuePoolMedido
+    assert opcoes["pool_size"] == 8
+    assert opcoes["pool_pre_ping"] is True
+    assert opcoes["connect_args"]["application_name"] == "conecta-senai"
+    assert opcoes["connect_args"]["options"] == "-c statement_timeout=30000"
+
+
+def test_worker_usa_timeout_e_nome_proprios():
+    opcoes = montar_engine_options(
+        PG,
+        {
+            "WORKER_PROCESS": True,
+            "DB_STATEMENT_TIMEOUT_MS": 30000,
+            "DB_WORKER_STATEMENT_TIMEOUT_MS": 0,
+        },
+    )
+
+    assert opcoes["connect_args"]["application_name"] == "conecta-senai-worker"
+    assert "options" not in opcoes["connect_args"]
+
+
+def test_sqlite_recebe_apenas_pre_ping_e_opcoes_explicitas_prevalecem():
+    assert montar_engine_options("sqlite:///:memory:", {}) == {"pool_pre_ping": True}
+
+    opcoes = montar_engine_options(
+        PG, {"SQLALCHEMY_ENGINE_OPTIONS": {"pool_size": 2, "echo": True}}
+    )
+    assert opcoes["pool_size"] == 2
+    assert opcoes["echo"] is True
+
+
+def test_pool_registra_espera_por_conexao(tmp_path, caplog):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=QueuePoolMedido,
+        pool_size=1,
+        max_overflow=0,
+        limiar_espera_ms=50,
+    )
+    ocupada = engine.connect()
+
+    def liberar():
+        time.sleep(0.1)
+        ocupada.close()
+
+    thread = threading.Thread(target=liberar)
+    thread.start()
+    with caplog.at_level(logging.WARNING, logger="conecta_senai.config.database"):
+        with engine.connect() as conexao:
+            conexao.execute(text("SELECT 1"))
+    thread.join()
+
+    metricas = metricas_pool(engine)
+    assert metricas["esperas_lentas"] == 1
+    assert metricas["espera_maxima_ms"] >= 50
+    assert "Espera de" in caplog.text
+    engine.dispose()
+    assert engine.pool.limiar_espera_ms == 50
+
+
+def test_diagnostico_banco(app, client, admin_auth_headers):
+    app.register_blueprint(diagnostico_bp, url_prefix="/api")
+
+    resp = client.get("/api/diagnostico/banco", headers=admin_auth_headers)
+    assert resp.status_code == 200
+    assert "classe" in resp.get_json()
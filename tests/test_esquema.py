@@ -0,0 +1,85 @@
+import pytest
+from sqlalchemy import inspect
+
+from conecta_senai.config import esquema
+from conecta_senai.config.esquema import (
+    OK,
+    garantir_esquema,
+    registrar_verificacao,
+    verificar_esquema,
+)
+from conecta_senai.models import db
+from conecta_senai.models.suporte_chamado import SuporteChamado
+from conecta_senai.routes.suporte_ti.utils import ensure_tables_exist
+
+
+@pytest.fixture
+def verificacao_temporaria(monkeypatch):
+    chamadas = []
+    monkeypatch.setattr(esquema, "_registro", dict(esquema._registro))
+
+    def registrar(resultado=True):
+        chamadas.clear()
+        registrar_verificacao("teste", ajuste=lambda: chamadas.append(1) or resultado)
+        return chamadas
+
+    return registrar
+
+
+def test_verificacao_roda_uma_vez_por_processo(app, contar_consultas):
+    with app.app_context():
+        resultados = verificar_esquema()
+        assert resultados["suporte_ti"] == OK
+        assert resultados["manutencao_unidade"] == OK
+
+        contar_consultas.clear()
+        ensure_tables_exist([SuporteChamado])
+        garantir_esquema()
+        assert contar_consultas == []
+
+
+def test_garantir_esquema_cria_tabela_ausente_uma_vez(app, contar_consultas):
+    with app.app_context():
+        verificar_esquema()
+        SuporteChamado.__table__.drop(db.engine)
+        verificar_esquema(forcar=True)
+        assert inspect(db.engine).has_table("suporte_chamados")
+
+        contar_consultas.clear()
+        ensure_tables_exist([SuporteChamado])
+        assert contar_consultas == []
+
+
+def test_forcar_reexecuta_ajustes(app, verificacao_temporaria):
+    chamadas = verificacao_temporaria()
+    with app.app_context():
+        garantir_esquema()
+        garantir_esquema()
+        assert len(chamadas) == 1
+
+        verificar_esquema(forcar=True)
+        assert len(chamadas) == 2
+
+
+def test_ajuste_indisponivel_e_refeito_apos_intervalo(
+    app, verificacao_temporaria, monkeypatch
+):
+    chamadas = verificacao_temporaria(resultado=False)
+    with app.app_context():
+        assert verificar_esquema()["teste"] == "indisponível"
+        garantir_esquema()
+        assert len(chamadas) == 1
+
+        monkeypatch.setattr(esquema, "INTERVALO_NOVA_TENTATIVA_SEGUNDOS", 0.0)
+        verificar_esquema()
+        garantir_esquema()
+        assert len(chamadas) == 3
+
+
+def test_cli_verificar_esquema(app):
+    from conecta_senai.cli.esquema import register_esquema_cli
+
+    register_esquema_cli(app)
+    resultado = app.test_cli_runner().invoke(args=["verificar_esquema"])
+    assert resultado.exit_code == 0
+    assert "suporte_ti: ok" in resultado.output
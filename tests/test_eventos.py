@@ -0,0 +1,153 @@
+import json
+from datetime import date, timedelta
+
+import pytest
+
+from conecta_senai.config import redis as redis_config
+from conecta_senai.models import db
+from conecta_senai.models.agendamento import Agendamento
+from conecta_senai.models.user import User
+from conecta_senai.routes.notificacao import notificacao_bp
+from conecta_senai.services.eventos_service import (
+    Assinatura,
+    barramento_local,
+    evento_visivel,
+    publicar_evento,
+)
+from conecta_senai.services.notificacao_service import (
+    criar_notificacoes_agendamentos_proximos,
+)
+
+
+@pytest.fixture
+def sse_client(app):
+    app.config["SSE_HABILITADO"] = True
+    app.config["SSE_HEARTBEAT_SEGUNDOS"] = 0.05
+    app.config["SSE_DURACAO_MAXIMA_SEGUNDOS"] = 5
+    app.register_blueprint(notificacao_bp, url_prefix="/api")
+    return app.test_client()
+
+
+def _proximo_evento(chunks):
+    for chunk in chunks:
+        texto = chunk.decode() if isinstance(chunk, bytes) else chunk
+        if texto.startswith("event:"):
+            return texto
+    return None
+
+
+def test_stream_entrega_eventos_visiveis(app, sse_client, non_admin_auth_headers):
+    with app.app_context():
+        usuario_id = User.query.filter_by(email="usuario@example.com").first().id
+
+    resp = sse_client.get(
+        "/api/notificacoes/stream", headers=non_admin_auth_headers, buffered=False
+    )
+    assert resp.status_code == 200
+    assert resp.mimetype == "text/event-stream"
+    chunks = iter(resp.response)
+    assert next(chunks).decode().startswith("retry:")
+
+    with app.app_context():
+        publicar_evento("chamado", {"id": 1}, usuario_ids=[usuario_id + 100])
+        publicar_evento("ocupacao", {"acao": "criada", "ids": [7]})
+
+    evento = _proximo_evento(chunks)
+    resp.close()
+
+    assert evento.startswith("event: ocupacao\n")
+    assert json.loads(evento.split("data: ", 1)[1]) == {"acao": "criada", "ids": [7]}
+    assert not barramento_local._filas
+
+
+def test_stream_exige_autenticacao(sse_client):
+    assert sse_client.get("/api/notificacoes/stream").status_code == 401
+
+
+def test_stream_desabilitado_por_padrao(app, non_admin_auth_headers):
+    app.register_blueprint(notificacao_bp, url_prefix="/api")
+    resp = app.test_client().get(
+        "/api/notificacoes/stream", headers=non_admin_auth_headers
+    )
+    assert resp.status_code == 404
+
+
+def test_visibilidade_por_destinatario():
+    evento = {"tipo": "chamado", "dados": {}, "usuario_ids": [3]}
+    assert evento_visivel(evento, 3, admin=False)
+    assert not evento_visivel(evento, 4, admin=False)
+    assert evento_visivel(evento, 4, admin=True)
+    assert evento_visivel({"tipo": "x", "usuario_ids": None}, 4, admin=False)
+
+
+def test_lembretes_publicam_evento(app):
+    with app.app_context():
+        usuario_id = User.query.filter_by(email="usuario@example.com").first().id
+        db.session.add(
+            Agendamento(
+                data=date.today() + timedelta(days=1),
+                laboratorio="Lab",
+                turma="T",
+                turno="Manhã",
+                horarios=["08:00"],
+                usuario_id=usuario_id,
+            )
+        )
+        db.session.commit()
+
+        assinatura = Assinatura(timeout=0.05)
+        try:
+            assert criar_notificacoes_agendamentos_proximos() == 1
+            evento = next(assinatura)
+        finally:
+            assinatura.close()
+
+    assert evento == {
+        "tipo": "notificacao",
+        "dados": {"novas": 1},
+        "usuario_ids": [usuario_id],
+    }
+
+
+def test_publicacao_via_redis_pubsub(app, monkeypatch):
+    class PubSubFalso:
+        def __init__(self, redis):
+            self.redis = redis
+            self.canais = []
+
+        def subscribe(self, canal):
+            self.canais.append(canal)
+
+        def get_message(self, timeout=None):
+            if self.redis.mensagens:
+                canal, dados = self.redis.mensagens.pop(0)
+                return {"type": "message", "channel": canal, "data": dados.encode()}
+            return None
+
+        def close(self):
+            self.redis.fechados += 1
+
+    class RedisFalso:
+        def __init__(self):
+            self.mensagens = []
+            self.fechados = 0
+
+        def publish(self, canal, mensagem):
+            self.mensagens.append((canal, mensagem))
+
+        def pubsub(self, ignore_subscribe_messages=False):
+            return PubSubFalso(self)
+
+    redis_falso = RedisFalso()
+    monkeypatch.setattr(redis_config, "redis_conn", redis_falso)
+    app.config["EVENTOS_CANAL"] = "canal-teste"
+
+    with app.app_context():
+        assinatura = Assinatura(timeout=0.01)
+        publicar_evento("ocupacao", {"acao": "removida"})
+        evento = next(assinatura)
+        assinatura.close()
+
+    assert redis_falso.fechados == 1
+    assert evento["dados"] == {"acao": "removida"}
+    assert not barramento_local._filas
@@ -1,6 +1,9 @@
+import csv
+import io
 import os
 import sys
-from datetime import date, datetime, timedelta
+import tracemalloc
+from datetime import date, datetime, time, timedelta
 import jwt
 
 import pytest
@@ -9,6 +12,7 @@ from flask import Flask
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from conecta_senai.models import db
+from conecta_senai.models.ocupacao import Ocupacao
 from conecta_senai.models.sala import Sala
 from conecta_senai.models.user import User
 from conecta_senai.routes.user import user_bp
@@ -157,3 +161,78 @@ def test_export_ocupacoes_xlsx(client_oc, app_ocupacoes):
         "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
         in resp.content_type
     )
+
+
+def _inserir_ocupacoes(app, total, data_base=date(2030, 1, 1)):
+    with app.app_context():
+        user = User.query.first()
+        sala = Sala.query.first()
+        db.session.execute(
+            Ocupacao.__table__.insert(),
+            [
+                {
+                    "sala_id": sala.id,
+                    "usuario_id": user.id,
+                    "curso_evento": f"Curso {i}",
+                    "data": data_base + timedelta(days=i % 365),
+                    "horario_inicio": time(8, 0),
+                    "horario_fim": time(12, 0),
+                    "status": "confirmado",
+                }
+                for i in range(total)
+            ],
+        )
+        db.session.commit()
+
+
+def test_export_ocupacoes_csv_filtra_periodo(client_oc, app_ocupacoes):
+    token = gerar_token(app_ocupacoes)
+    headers = {"Authorization": f"Bearer {token}"}
+    _inserir_ocupacoes(app_ocupacoes, 10)
+
+    resp = client_oc.get(
+        "/api/ocupacoes/export",
+        query_string={
+            "formato": "csv",
+            "data_inicio": "2030-01-03",
+            "data_fim": "2030-01-05",
+        },
+        headers=headers,
+    )
+    assert resp.status_code == 200
+    linhas = list(csv.reader(io.StringIO(resp.get_data(as_text=True))))
+    assert linhas[0] == ["ID", "Sala", "Data", "Início", "Fim", "Status"]
+    assert [linha[2] for linha in linhas[1:]] == [
+        "2030-01-03",
+        "2030-01-04",
+        "2030-01-05",
+    ]
+    assert all(linha[1] == "Sala" for linha in linhas[1:])
+
+    resp_invalida = client_oc.get(
+        "/api/ocupacoes/export?data_inicio=03/01/2030", headers=headers
+    )
+    assert resp_invalida.status_code == 400
+
+
+def test_export_ocupacoes_csv_memoria_limitada(client_oc, app_ocupacoes):
+    token = gerar_token(app_ocupacoes)
+    headers = {"Authorization": f"Bearer {token}"}
+    total = 50000
+    _inserir_ocupacoes(app_ocupacoes, total)
+
+    tracemalloc.start()
+    try:
+        resp = client_oc.get("/api/ocupacoes/export?formato=csv", headers=headers)
+        tamanho = 0
+        linhas = 0
+        for bloco in resp.iter_encoded():
+            tamanho += len(bloco)
+            linhas += bloco.count(b"\n")
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert linhas == total + 1
+    assert pico < tamanho
+    assert pico < 4 * 1024 * 1024
@@ -0,0 +1,288 @@
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from conecta_senai.models import db
+from conecta_senai.models.export_job import ExportJob
+from conecta_senai.models.ocupacao import Ocupacao
+from conecta_senai.models.sala import Sala
+from conecta_senai.models.user import User
+from conecta_senai.routes.exportacoes import exportacoes_bp
+from conecta_senai.services import export_job_service
+from conecta_senai.services.export_job_service import (
+    despachar_exportacoes_pendentes,
+    encerrar_executor,
+    limpar_exportacoes_expiradas,
+    retomar_exportacoes_pendentes,
+)
+
+
+@pytest.fixture
+def exportacoes_app(app, tmp_path):
+    app.config["EXPORT_JOBS_DIR"] = str(tmp_path / "exports")
+    app.config["EXPORT_JOBS_SINCRONO"] = True
+    app.register_blueprint(exportacoes_bp, url_prefix="/api")
+    with app.app_context():
+        admin = User.query.filter_by(email="admin@example.com").first()
+        sala = Sala.query.filter_by(nome="Sala Teste").first()
+        db.session.add(
+            Ocupacao(
+                sala_id=sala.id,
+                usuario_id=admin.id,
+                curso_evento="Curso",
+                data=date(2030, 5, 2),
+                horario_inicio="08:00",
+                horario_fim="12:00",
+            )
+        )
+        db.session.commit()
+    return app
+
+
+def test_exportacao_ocupacoes_enfileirada_e_baixada(
+    exportacoes_app, client, admin_auth_headers
+):
+    headers = admin_auth_headers
+    resp = client.post(
+        "/api/exportacoes",
+        json={"tipo": "ocupacoes", "formato": "csv", "parametros": {}},
+        headers=headers,
+    )
+    assert resp.status_code == 202
+    job = resp.get_json()
+    assert job["status"] == "concluido"
+
+    status = client.get(f"/api/exportacoes/{job['id']}", headers=headers)
+    assert status.get_json()["nome_arquivo"] == "ocupacoes.csv"
+
+    download = client.get(f"/api/exportacoes/{job['id']}/download", headers=headers)
+    assert download.status_code == 200
+    assert "text/csv" in download.content_type
+    conteudo = download.get_data(as_text=True)
+    assert "Sala Teste" in conteudo
+    assert "2030-05-02" in conteudo
+
+
+def test_exportacao_valida_tipo_formato_e_permissao(
+    exportacoes_app, client, admin_auth_headers, non_admin_auth_headers
+):
+    admin = admin_auth_headers
+    comum = non_admin_auth_headers
+
+    assert (
+        client.post("/api/exportacoes", json={"tipo": "x"}, headers=admin).status_code
+        == 400
+    )
+    assert (
+        client.post(
+            "/api/exportacoes",
+            json={"tipo": "ocupacoes", "formato": "docx"},
+            headers=admin,
+        ).status_code
+        == 400
+    )
+    assert (
+        client.post(
+            "/api/exportacoes", json={"tipo": "logs_rateio"}, headers=comum
+        ).status_code
+        == 403
+    )
+
+    job = client.post(
+        "/api/exportacoes", json={"tipo": "ocupacoes"}, headers=admin
+    ).get_json()
+    assert client.get(f"/api/exportacoes/{job['id']}", headers=comum).status_code == 403
+
+
+def test_exportacao_com_erro_registra_falha(
+    exportacoes_app, client, admin_auth_headers
+):
+    headers = admin_auth_headers
+    resp = client.post(
+        "/api/exportacoes",
+        json={"tipo": "inscricoes_turma", "formato": "xlsx", "parametros": {}},
+        headers=headers,
+    )
+    job = resp.get_json()
+    assert job["status"] == "erro"
+    assert "Turma não encontrada" in job["erro"]
+    assert job["expira_em"] is not None
+    download = client.get(f"/api/exportacoes/{job['id']}/download", headers=headers)
+    assert download.status_code == 409
+
+
+def test_falha_interna_nao_expoe_detalhes_e_expira(
+    exportacoes_app, client, admin_auth_headers, monkeypatch
+):
+    def falhar(parametros, formato, destino):
+        raise RuntimeError("SELECT * FROM segredo em /srv/app/db.sqlite")
+
+    original = export_job_service.EXPORTADORES["ocupacoes"]
+    monkeypatch.setitem(
+        export_job_service.EXPORTADORES, "ocupacoes", original._replace(funcao=falhar)
+    )
+    job = client.post(
+        "/api/exportacoes", json={"tipo": "ocupacoes"}, headers=admin_auth_headers
+    ).get_json()
+    assert job["status"] == "erro"
+    assert job["erro"] == "Falha ao gerar a exportação"
+
+    with exportacoes_app.app_context():
+        registro = db.session.get(ExportJob, job["id"])
+        registro.expira_em = datetime.utcnow() - timedelta(minutes=1)
+        db.session.commit()
+        assert limpar_exportacoes_expiradas() == 1
+
+
+def test_limpeza_remove_exportacoes_expiradas(
+    exportacoes_app, client, admin_auth_headers
+):
+    app = exportacoes_app
+    headers = admin_auth_headers
+    job = client.post(
+        "/api/exportacoes", json={"tipo": "ocupacoes"}, headers=headers
+    ).get_json()
+
+    with app.app_context():
+        registro = db.session.get(ExportJob, job["id"])
+        caminho = Path(registro.caminho_arquivo)
+        assert caminho.is_file()
+        registro.expira_em = datetime.utcnow() - timedelta(minutes=1)
+        db.session.commit()
+
+        assert limpar_exportacoes_expiradas() == 1
+        assert not caminho.exists()
+        assert db.session.get(ExportJob, job["id"]) is None
+
+
+def test_exportacao_processada_pelo_pool_de_threads(
+    exportacoes_app, client, admin_auth_headers
+):
+    exportacoes_app.config["EXPORT_JOBS_SINCRONO"] = False
+    headers = admin_auth_headers
+
+    job = client.post(
+        "/api/exportacoes",
+        json={"tipo": "ocupacoes", "formato": "xlsx"},
+        headers=headers,
+    ).get_json()
+    assert job["status"] in {"pendente", "processando", "concluido"}
+
+    encerrar_executor(wait=True)
+
+    resp = client.get(f"/api/exportacoes/{job['id']}", headers=headers)
+    assert resp.get_json()["status"] == "concluido"
+    download = client.get(f"/api/exportacoes/{job['id']}/download", headers=headers)
+    assert download.status_code == 200
+    assert download.data[:2] == b"PK"
+
+
+def test_exportacao_via_worker_fica_pendente_ate_o_worker(
+    exportacoes_app, client, admin_auth_headers
+):
+    app = exportacoes_app
+    app.config["EXPORT_JOBS_SINCRONO"] = False
+    app.config["EXPORT_JOBS_VIA_WORKER"] = True
+    headers = admin_auth_headers
+
+    job = client.post(
+        "/api/exportacoes", json={"tipo": "ocupacoes"}, headers=headers
+    ).get_json()
+    assert job["status"] == "pendente"
+
+    app.config["WORKER_PROCESS"] = True
+    with app.app_context():
+        assert despachar_exportacoes_pendentes() == 1
+    encerrar_executor(wait=True)
+
+    resp = client.get(f"/api/exportacoes/{job['id']}", headers=headers)
+    assert resp.get_json()["status"] == "concluido"
+
+
+def _job_processando(app, **campos):
+    agora = datetime.utcnow()
+    campos.setdefault("tentativas", 1)
+    with app.app_context():
+        job = ExportJob(
+            id="job1",
+            tipo="ocupacoes",
+            formato="csv",
+            parametros={},
+            status="processando",
+            criado_em=agora - timedelta(minutes=30),
+            iniciado_em=agora - timedelta(minutes=30),
+            **campos,
+        )
+        db.session.add(job)
+        db.session.commit()
+        return job.id
+
+
+def test_retomada_ignora_job_com_heartbeat_recente(exportacoes_app):
+    app = exportacoes_app
+    job_id = _job_processando(app, heartbeat_em=datetime.utcnow())
+
+    with app.app_context():
+        assert retomar_exportacoes_pendentes() == 0
+        job = db.session.get(ExportJob, job_id)
+        assert job.status == "processando"
+        assert job.tentativas == 1
+
+
+def test_retomada_reprocessa_job_com_heartbeat_vencido(exportacoes_app):
+    app = exportacoes_app
+    job_id = _job_processando(
+        app, heartbeat_em=datetime.utcnow() - timedelta(minutes=10)
+    )
+
+    with app.app_context():
+        assert retomar_exportacoes_pendentes() == 1
+        job = db.session.get(ExportJob, job_id)
+        assert job.status == "concluido"
+        assert job.tentativas == 2
+        assert Path(job.caminho_arquivo).name == f"{job_id}.2.csv"
+
+
+def test_retomada_limitada_por_tentativas(exportacoes_app):
+    app = exportacoes_app
+    app.config["EXPORT_JOBS_MAX_TENTATIVAS"] = 2
+    job_id = _job_processando(app, tentativas=2)
+
+    with app.app_context():
+        assert retomar_exportacoes_pendentes() == 0
+        job = db.session.get(ExportJob, job_id)
+        assert job.status == "erro"
+        assert job.tentativas == 2
+
+
+def test_tentativa_que_perdeu_a_reserva_nao_conclui_o_job(exportacoes_app, monkeypatch):
+    app = exportacoes_app
+    original = export_job_service.EXPORTADORES["ocupacoes"]
+
+    def exportar_e_perder_reserva(parametros, formato, destino):
+        # Simula a retomada por outro processo enquanto este ainda exporta.
+        ExportJob.query.filter_by(id=job_id).update(
+            {"tentativas": ExportJob.tentativas + 1}, synchronize_session=False
+        )
+        db.session.commit()
+        return original.funcao(parametros, formato, destino)
+
+    monkeypatch.setitem(
+        export_job_service.EXPORTADORES,
+        "ocupacoes",
+        original._replace(funcao=exportar_e_perder_reserva),
+    )
+    with app.app_context():
+        job = ExportJob(
+            id="job2", tipo="ocupacoes", formato="csv", parametros={}, status="pendente"
+        )
+        db.session.add(job)
+        db.session.commit()
+        job_id = job.id
+
+        assert export_job_service.processar_exportacao(job_id) is False
+        job = db.session.get(ExportJob, job_id)
+        assert job.status == "processando"
+        assert job.caminho_arquivo is None
+        assert list(export_job_service.diretorio_exportacoes().iterdir()) == []
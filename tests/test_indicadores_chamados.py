@@ -0,0 +1,125 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from conecta_senai.models import db
+from conecta_senai.models.suporte_basedados import SuporteTipoEquipamento
+from conecta_senai.models.suporte_chamado import SuporteChamado
+from conecta_senai.routes.suporte_ti.admin import suporte_ti_admin_bp
+
+
+@pytest.fixture
+def indicadores_app(app):
+    app.register_blueprint(suporte_ti_admin_bp)
+    base = datetime(2024, 5, 10, 8, 0)
+    with app.app_context():
+        notebook = SuporteTipoEquipamento(nome="Notebook")
+        impressora = SuporteTipoEquipamento(nome="Impressora")
+        db.session.add_all([notebook, impressora])
+        db.session.flush()
+
+        def chamado(tipo, nivel, status, atendimento_h=None, encerramento_h=None):
+            return SuporteChamado(
+                email="x@example.com",
+                area="TI",
+                tipo_equipamento_id=tipo.id,
+                descricao_problema="Teste",
+                nivel_urgencia=nivel,
+                status=status,
+                created_at=base,
+                inicio_atendimento_at=(
+                    base + timedelta(hours=atendimento_h) if atendimento_h else None
+                ),
+                encerrado_at=(
+                    base + timedelta(hours=encerramento_h) if encerramento_h else None
+                ),
+            )
+
+        db.session.add_all(
+            [
+                chamado(notebook, "Alto", "Concluido", 2, 10),
+                chamado(notebook, "Alto", "Em Atendimento", 30),
+                chamado(impressora, "Baixo", "Aberto"),
+                chamado(impressora, "Médio", "Concluido", 4, 20),
+            ]
+        )
+        db.session.commit()
+    return app
+
+
+def test_indicadores_calculados_em_uma_consulta(
+    indicadores_app, admin_auth_headers, contar_consultas
+):
+    app = indicadores_app
+    contar_consultas.clear()
+    resp = app.test_client().get(
+        "/api/suporte_ti/admin/indicadores", headers=admin_auth_headers
+    )
+    consultas = [
+        sql
+        for sql in contar_consultas
+        if "suporte_chamados" in sql and sql.startswith("SELECT")
+    ]
+
+    assert resp.status_code == 200
+    assert len(consultas) == 1
+    dados = resp.get_json()
+    assert dados["total_chamados"] == 4
+    assert dados["por_status"] == [
+        {"status": "Concluido", "quantidade": 2},
+        {"status": "Aberto", "quantidade": 1},
+        {"status": "Em Atendimento", "quantidade": 1},
+    ]
+    assert dados["por_tipo_equipamento"] == [
+        {"tipo": "Impressora", "quantidade": 2},
+        {"tipo": "Notebook", "quantidade": 2},
+    ]
+    assert dados["tempo_medio_abertura_para_atendimento_segundos"] == 12 * 3600
+    assert dados["tempo_medio_abertura_para_encerramento_segundos"] == 15 * 3600
+    assert dados["percentual_atendidos_em_24h"] == pytest.approx(66.67)
+    por_nivel = {item["nivel"]: item for item in dados["tempo_medio_por_urgencia"]}
+    assert por_nivel["Alto"]["tempo_atendimento"] == 16 * 3600
+    assert por_nivel["Alto"]["tempo_encerramento"] == 10 * 3600
+    assert por_nivel["Baixo"] == {
+        "nivel": "Baixo",
+        "tempo_atendimento": 0,
+        "tempo_encerramento": 0,
+    }
+
+
+def test_indicadores_respeitam_filtros(indicadores_app, admin_auth_headers):
+    app = indicadores_app
+
+    resp = app.test_client().get(
+        "/api/suporte_ti/admin/indicadores?nivel_urgencia=Alto&data_inicio=2024-05-10",
+        headers=admin_auth_headers,
+    )
+
+    dados = resp.get_json()
+    assert dados["total_chamados"] == 2
+    assert dados["por_nivel_urgencia"] == [{"nivel": "Alto", "quantidade": 2}]
+
+
+def test_indicadores_em_cache_por_filtro(
+    indicadores_app, admin_auth_headers, redis_falso
+):
+    app = indicadores_app
+    client = app.test_client()
+
+    primeira = client.get(
+        "/api/suporte_ti/admin/indicadores", headers=admin_auth_headers
+    )
+    filtrada = client.get(
+        "/api/suporte_ti/admin/indicadores?status=Aberto", headers=admin_auth_headers
+    )
+    assert len(redis_falso.valores) == 2
+
+    with app.app_context():
+        SuporteChamado.query.delete()
+        db.session.commit()
+
+    segunda = client.get(
+        "/api/suporte_ti/admin/indicadores", headers=admin_auth_headers
+    )
+    assert segunda.get_json() == primeira.get_json()
+    assert filtrada.get_json()["total_chamados"] == 1
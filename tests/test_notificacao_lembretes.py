@@ -0,0 +1,90 @@
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+
+from conecta_senai.models import db
+from conecta_senai.models.agendamento import Agendamento, Notificacao
+from conecta_senai.models.user import User
+from conecta_senai.services import notificacao_service
+from conecta_senai.services.notificacao_service import (
+    criar_notificacoes_agendamentos_proximos,
+)
+
+
+def _agendamento(usuario_id, data, laboratorio="Lab 1"):
+    agendamento = Agendamento(
+        data=data,
+        laboratorio=laboratorio,
+        turma="T1",
+        turno="Manhã",
+        horarios=["08:00"],
+        usuario_id=usuario_id,
+    )
+    db.session.add(agendamento)
+    return agendamento
+
+
+def test_lembretes_criados_em_lote_sem_duplicar(app):
+    with app.app_context():
+        usuario = User.query.filter_by(email="admin@example.com").first()
+        amanha = date.today() + timedelta(days=1)
+        proximo = _agendamento(usuario.id, amanha, "Lab Química")
+        _agendamento(usuario.id, date.today() + timedelta(days=10))
+        lido = _agendamento(usuario.id, date.today())
+        db.session.commit()
+        notificacao_lida = Notificacao(usuario.id, "antigo", agendamento_id=lido.id)
+        notificacao_lida.lida = True
+        db.session.add(notificacao_lida)
+        db.session.commit()
+
+        assert criar_notificacoes_agendamentos_proximos() == 2
+        assert criar_notificacoes_agendamentos_proximos() == 0
+
+        lembrete = Notificacao.query.filter_by(
+            agendamento_id=proximo.id, lida=False
+        ).one()
+        assert lembrete.usuario_id == usuario.id
+        assert lembrete.mensagem == (
+            "Lembrete: Você tem um agendamento para Lab Química em "
+            f"{amanha.strftime('%d/%m/%Y')}"
+        )
+        assert lembrete.data_criacao is not None
+        assert Notificacao.query.filter_by(lida=False).count() == 2
+
+
+def test_indice_unico_impede_lembrete_pendente_duplicado(app):
+    with app.app_context():
+        usuario = User.query.filter_by(email="admin@example.com").first()
+        agendamento = _agendamento(usuario.id, date.today())
+        db.session.commit()
+        db.session.add(Notificacao(usuario.id, "a", agendamento_id=agendamento.id))
+        db.session.commit()
+
+        db.session.add(Notificacao(usuario.id, "b", agendamento_id=agendamento.id))
+        with pytest.raises(IntegrityError):
+            db.session.commit()
+        db.session.rollback()
+
+
+def test_lembretes_sem_returning_em_outros_bancos(app, monkeypatch, contar_consultas):
+    monkeypatch.setattr(
+        notificacao_service,
+        "_insert_ignorando_duplicados",
+        lambda dialeto: (insert(Notificacao.__table__), False),
+    )
+    invalidados = []
+    monkeypatch.setattr(notificacao_service, "invalidar_contadores", invalidados.extend)
+    with app.app_context():
+        usuario = User.query.filter_by(email="admin@example.com").first()
+        _agendamento(usuario.id, date.today() + timedelta(days=1))
+        _agendamento(usuario.id, date.today() + timedelta(days=10))
+        db.session.commit()
+
+        assert criar_notificacoes_agendamentos_proximos() == 1
+        assert criar_notificacoes_agendamentos_proximos() == 0
+        assert invalidados == [usuario.id]
+        assert Notificacao.query.filter_by(lida=False).count() == 1
+    inserts = [sql for sql in contar_consultas if sql.startswith("INSERT INTO notif")]
+    assert inserts and not [sql for sql in inserts if "RETURNING" in sql]
@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from conecta_senai.models import db
+from conecta_senai.models.agendamento import Notificacao
+from conecta_senai.models.user import User
+from conecta_senai.routes.notificacao import notificacao_bp
+from conecta_senai.services import notificacao_service
+
+
+@pytest.fixture
+def notificacoes_client(app):
+    app.register_blueprint(notificacao_bp, url_prefix="/api")
+    with app.app_context():
+        usuario = User.query.filter_by(email="usuario@example.com").first()
+        admin = User.query.filter_by(email="admin@example.com").first()
+        base = datetime(2030, 1, 1, 8, 0)
+        for i in range(5):
+            notificacao = Notificacao(usuario.id, f"Aviso {i}")
+            # Dois avisos com o mesmo instante testam o desempate por id.
+            notificacao.data_criacao = base + timedelta(minutes=min(i, 3))
+            db.session.add(notificacao)
+        db.session.add(Notificacao(admin.id, "Aviso do admin"))
+        db.session.commit()
+    return app.test_client()
+
+
+def test_feed_paginado_por_cursor(notificacoes_client, non_admin_auth_headers):
+    mensagens = []
+    cursor = None
+    while True:
+        params = {"per_page": 2}
+        if cursor:
+            params["cursor"] = cursor
+        resp = notificacoes_client.get(
+            "/api/notificacoes", query_string=params, headers=non_admin_auth_headers
+        )
+        assert resp.status_code == 200
+        dados = resp.get_json()
+        assert len(dados["items"]) <= 2
+        mensagens.extend(item["mensagem"] for item in dados["items"])
+        cursor = dados["next_cursor"]
+        if not cursor:
+            break
+
+    assert mensagens == [f"Aviso {i}" for i in (4, 3, 2, 1, 0)]
+
+    resp = notificacoes_client.get(
+        "/api/notificacoes?cursor=invalido", headers=non_admin_auth_headers
+    )
+    assert resp.status_code == 400
+
+
+def test_contador_e_marcar_todas_lidas(
+    notificacoes_client, non_admin_auth_headers, redis_falso
+):
+    resp = notificacoes_client.get(
+        "/api/notificacoes/nao-lidas", headers=non_admin_auth_headers
+    )
+    assert resp.get_json() == {"nao_lidas": 5}
+    assert list(redis_falso.valores.values()) == [5]
+
+    resp = notificacoes_client.put(
+        "/api/notificacoes/marcar-todas-lidas", headers=non_admin_auth_headers
+    )
+    assert resp.get_json() == {"atualizadas": 5, "nao_lidas": 0}
+    assert redis_falso.valores == {}
+
+    resp = notificacoes_client.get(
+        "/api/notificacoes/nao-lidas", headers=non_admin_auth_headers
+    )
+    assert resp.get_json() == {"nao_lidas": 0}
+    resp = notificacoes_client.get(
+        "/api/notificacoes?lida=false", headers=non_admin_auth_headers
+    )
+    assert resp.get_json()["items"] == []
+    with notificacoes_client.application.app_context():
+        assert Notificacao.query.filter_by(lida=False).count() == 1
+
+
+def test_admin_marca_todas_lidas_invalida_cada_usuario_uma_vez(
+    notificacoes_client, admin_auth_headers, monkeypatch
+):
+    invalidados = []
+    monkeypatch.setattr(notificacao_service, "invalidar_contadores", invalidados.append)
+
+    resp = notificacoes_client.put(
+        "/api/notificacoes/marcar-todas-lidas", headers=admin_auth_headers
+    )
+
+    assert resp.get_json() == {"atualizadas": 6, "nao_lidas": 0}
+    assert len(invalidados) == 1
+    assert len(invalidados[0]) == len(set(invalidados[0])) == 2
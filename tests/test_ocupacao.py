@@ -434,3 +434,122 @@ def test_atualizar_ocupacao_turno_invalido(client, app):
         headers={"Authorization": f"Bearer {token}"},
     )
     assert resp.status_code == 400
+
+
+def test_criar_ocupacao_conflito_periodo_lista_todos_os_dias(client, app):
+    with app.app_context():
+        user = User.query.first()
+        sala = Sala.query.first()
+    token = jwt.encode(
+        {
+            "user_id": user.id,
+            "nome": user.nome,
+            "perfil": user.tipo,
+            "exp": datetime.utcnow() + timedelta(hours=1),
+        },
+        app.config["SECRET_KEY"],
+        algorithm="HS256",
+    )
+    headers = {"Authorization": f"Bearer {token}"}
+    inicio = date(2031, 3, 3)
+    client.post(
+        "/api/ocupacoes",
+        json={
+            "sala_id": sala.id,
+            "curso_evento": "Existente",
+            "data_inicio": inicio.isoformat(),
+            "data_fim": (inicio + timedelta(days=2)).isoformat(),
+            "turno": "Tarde",
+        },
+        headers=headers,
+    )
+
+    resp = client.post(
+        "/api/ocupacoes",
+        json={
+            "sala_id": sala.id,
+            "curso_evento": "Novo",
+            "data_inicio": (inicio - timedelta(days=10)).isoformat(),
+            "data_fim": (inicio + timedelta(days=30)).isoformat(),
+            "turno": "Tarde",
+        },
+        headers=headers,
+    )
+    assert resp.status_code == 409
+    conflitos = resp.get_json()["conflitos"]
+    assert [c["data"] for c in conflitos] == [
+        (inicio + timedelta(days=i)).isoformat() for i in range(3)
+    ]
+
+    resp_check = client.get(
+        "/api/ocupacoes/verificar-disponibilidade",
+        query_string={
+            "sala_id": sala.id,
+            "data_inicio": inicio.isoformat(),
+            "data_fim": (inicio + timedelta(days=5)).isoformat(),
+            "turno": "Tarde",
+        },
+        headers=headers,
+    )
+    dados = resp_check.get_json()
+    assert dados["disponivel"] is False
+    assert len(dados["conflitos"]) == 3
+    assert all(isinstance(c, dict) for c in dados["conflitos"])
+
+
+def test_buscar_conflitos_periodo_usa_uma_consulta(app, contar_consultas):
+    from conecta_senai.services.ocupacao_service import buscar_conflitos_periodo
+
+    with app.app_context():
+        user = User.query.first()
+        sala = Sala.query.first()
+        inicio = date(2031, 1, 1)
+        for i in range(0, 180, 7):
+            db.session.add(
+                Ocupacao(
+                    sala_id=sala.id,
+                    usuario_id=user.id,
+                    curso_evento="Semanal",
+                    data=inicio + timedelta(days=i),
+                    horario_inicio="08:00",
+                    horario_fim="12:00",
+                )
+            )
+        db.session.commit()
+        sala_id = sala.id
+
+        contar_consultas.clear()
+        conflitos = buscar_conflitos_periodo(
+            sala_id,
+            inicio,
+            inicio + timedelta(days=180),
+            datetime.strptime("09:00", "%H:%M").time(),
+            datetime.strptime("10:00", "%H:%M").time(),
+        )
+
+        assert len(contar_consultas) == 1
+        assert len(conflitos) == 26
+        assert all(len(ocs) == 1 for ocs in conflitos.values())
+
+
+def test_consulta_de_conflitos_usa_indice_composto(app):
+    from conecta_senai.models.ocupacao import STATUS_ATIVOS
+
+    with app.app_context():
+        inicio = datetime.strptime("08:00", "%H:%M").time()
+        fim = datetime.strptime("12:00", "%H:%M").time()
+        query = Ocupacao.query.filter(
+            Ocupacao.sala_id == 1,
+            Ocupacao.data == date(2031, 1, 1),
+            Ocupacao.status.in_(STATUS_ATIVOS),
+            Ocupacao.filtro_sobreposicao(inicio, fim),
+        )
+        sql = str(
+            query.statement.compile(
+                dialect=db.engine.dialect, compile_kwargs={"literal_binds": True}
+            )
+        )
+        plano = db.session.execute(db.text(f"EXPLAIN QUERY PLAN {sql}")).all()
+        assert "ix_ocupacoes_sala_data_horario_ativas" in " ".join(
+            linha[-1] for linha in plano
+        )
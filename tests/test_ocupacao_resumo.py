@@ -0,0 +1,281 @@
+from datetime import date, timedelta
+
+import pytest
+from flask import Flask
+
+from conecta_senai.cli.ocupacao import register_ocupacao_cli
+from conecta_senai.models import db
+from conecta_senai.models.ocupacao import Ocupacao
+from conecta_senai.models.ocupacao_resumo import OcupacaoResumoDiario
+from conecta_senai.models.sala import Sala
+from conecta_senai.models.user import User
+from conecta_senai.routes.ocupacao import ocupacao_bp, sala_bp
+from conecta_senai.routes.user import user_bp
+
+SEGUNDA = date(2024, 6, 3)
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config["TESTING"] = True
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    app.config["SECRET_KEY"] = "test"
+    db.init_app(app)
+    app.register_blueprint(ocupacao_bp, url_prefix="/api")
+    app.register_blueprint(sala_bp, url_prefix="/api")
+    app.register_blueprint(user_bp, url_prefix="/api")
+    register_ocupacao_cli(app)
+
+    with app.app_context():
+        db.create_all()
+        db.session.add(
+            User(
+                nome="Admin",
+                email="admin@example.com",
+                senha="Password1!",
+                tipo="admin",
+            )
+        )
+        db.session.add_all(
+            [Sala(nome="Sala A", capacidade=10), Sala(nome="Sala B", capacidade=10)]
+        )
+        db.session.commit()
+    return app
+
+
+def _ids_salas(app):
+    with app.app_context():
+        return [s.id for s in Sala.query.order_by(Sala.nome).all()]
+
+
+def _criar(client, headers, sala_id, inicio, fim, turno="Manhã", **extra):
+    resp = client.post(
+        "/api/ocupacoes",
+        json={
+            "sala_id": sala_id,
+            "curso_evento": "Curso",
+            "data_inicio": inicio.isoformat(),
+            "data_fim": fim.isoformat(),
+            "turno": turno,
+            **extra,
+        },
+        headers=headers,
+    )
+    assert resp.status_code == 201
+    return resp.get_json()
+
+
+def _resumo(app):
+    with app.app_context():
+        return sorted(
+            (r.data, r.sala_id, r.turno, r.status, r.tipo_ocupacao, r.quantidade)
+            for r in OcupacaoResumoDiario.query.all()
+        )
+
+
+def test_resumo_acompanha_criacao_edicao_e_remocao(app, client, admin_auth_headers):
+    headers = admin_auth_headers
+    sala_a, sala_b = _ids_salas(app)
+    criadas = _criar(client, headers, sala_a, SEGUNDA, SEGUNDA + timedelta(days=2))
+    _criar(client, headers, sala_b, SEGUNDA, SEGUNDA, turno="Noite", status="pendente")
+
+    assert len(_resumo(app)) == 4
+
+    resp = client.put(
+        f"/api/ocupacoes/{criadas[0]['grupo_ocupacao_id']}",
+        json={"turno": "Tarde", "data_fim": (SEGUNDA + timedelta(days=1)).isoformat()},
+        headers=headers,
+    )
+    assert resp.status_code == 200
+    assert (
+        client.delete(
+            f"/api/ocupacoes/{resp.get_json()['ocupacoes'][0]['id']}?somente_dia=true",
+            headers=headers,
+        ).status_code
+        == 200
+    )
+
+    esperado = [
+        (SEGUNDA, sala_b, "Noite", "pendente", "aula_regular", 1),
+        (SEGUNDA + timedelta(days=1), sala_a, "Tarde", "confirmado", "aula_regular", 1),
+    ]
+    assert _resumo(app) == sorted(esperado)
+
+    resultado = app.test_cli_runner().invoke(args=["reconstruir_resumo_ocupacoes"])
+    assert "2 linha(s)" in resultado.output
+    assert _resumo(app) == sorted(esperado)
+
+
+def test_reconstrucao_por_intervalo(app, client, admin_auth_headers):
+    headers = admin_auth_headers
+    sala_a, _ = _ids_salas(app)
+    _criar(client, headers, sala_a, SEGUNDA, SEGUNDA + timedelta(days=1))
+    with app.app_context():
+        db.session.execute(db.delete(OcupacaoResumoDiario))
+        db.session.add(
+            Ocupacao(
+                sala_id=sala_a,
+                usuario_id=1,
+                curso_evento="Fora do turno",
+                data=SEGUNDA,
+                horario_inicio="10:00",
+                horario_fim="11:00",
+            )
+        )
+        db.session.commit()
+
+    resultado = app.test_cli_runner().invoke(
+        args=[
+            "reconstruir_resumo_ocupacoes",
+            "--data-inicio",
+            SEGUNDA.isoformat(),
+            "--data-fim",
+            SEGUNDA.isoformat(),
+        ]
+    )
+
+    assert resultado.exit_code == 0
+    assert [(r[0], r[2], r[5]) for r in _resumo(app)] == [
+        (SEGUNDA, "Manhã", 1),
+        (SEGUNDA, "Outro", 1),
+    ]
+
+
+def test_endpoints_leem_apenas_o_resumo(
+    app, client, admin_auth_headers, contar_consultas
+):
+    headers = admin_auth_headers
+    sala_a, sala_b = _ids_salas(app)
+    _criar(client, headers, sala_a, SEGUNDA, SEGUNDA + timedelta(days=4))
+    _criar(client, headers, sala_b, SEGUNDA, SEGUNDA, status="pendente")
+    _criar(
+        client,
+        headers,
+        sala_b,
+        SEGUNDA + timedelta(days=1),
+        SEGUNDA + timedelta(days=1),
+        turno="Tarde",
+        tipo_ocupacao="reuniao",
+        status="cancelado",
+    )
+
+    contar_consultas.clear()
+    resumo = client.get(
+        "/api/ocupacoes/resumo-periodo",
+        query_string={
+            "data_inicio": SEGUNDA.isoformat(),
+            "data_fim": (SEGUNDA + timedelta(days=1)).isoformat(),
+        },
+        headers=headers,
+    ).get_json()
+    relatorio = client.get(
+        "/api/ocupacoes/relatorio",
+        query_string={
+            "data_inicio": SEGUNDA.isoformat(),
+            "data_fim": (SEGUNDA + timedelta(days=6)).isoformat(),
+        },
+        headers=headers,
+    ).get_json()
+    tendencia = client.get(
+        "/api/ocupacoes/tendencia?ano=2024", headers=headers
+    ).get_json()
+
+    assert not any("FROM ocupacoes " in sql for sql in contar_consultas)
+
+    manha = resumo[SEGUNDA.isoformat()]["Manhã"]
+    assert manha["ocupadas"] == 2
+    assert [s["sala_nome"] for s in manha["salas_ocupadas"]] == ["Sala A", "Sala B"]
+    assert manha["salas_livres"] == []
+    assert manha["livres"] == 0
+    tarde = resumo[(SEGUNDA + timedelta(days=1)).isoformat()]["Tarde"]
+    assert tarde["ocupadas"] == 0
+    assert sorted(tarde["salas_livres"]) == ["Sala A", "Sala B"]
+
+    assert relatorio["estatisticas_gerais"] == {
+        "total_ocupacoes": 7,
+        "ocupacoes_confirmadas": 5,
+        "ocupacoes_pendentes": 1,
+        "ocupacoes_canceladas": 1,
+    }
+    assert relatorio["salas_mais_utilizadas"] == [
+        {"sala": "Sala A", "total_ocupacoes": 5},
+        {"sala": "Sala B", "total_ocupacoes": 1},
+    ]
+    assert relatorio["ocupacoes_por_tipo"] == [{"tipo": "aula_regular", "total": 6}]
+
+    assert tendencia[5] == {"mes": "06", "total": 7}
+    assert sum(item["total"] for item in tendencia) == 7
+
+
+def test_resumo_periodo_filtra_por_instrutor(app, client, admin_auth_headers):
+    headers = admin_auth_headers
+    sala_a, sala_b = _ids_salas(app)
+    _criar(client, headers, sala_a, SEGUNDA, SEGUNDA)
+    criada = _criar(client, headers, sala_b, SEGUNDA, SEGUNDA)[0]
+    with app.app_context():
+        db.session.get(Ocupacao, criada["id"]).instrutor_id = 7
+        db.session.commit()
+
+    resumo = client.get(
+        "/api/ocupacoes/resumo-periodo",
+        query_string={
+            "data_inicio": SEGUNDA.isoformat(),
+            "data_fim": SEGUNDA.isoformat(),
+            "instrutor_id": 7,
+        },
+        headers=headers,
+    ).get_json()
+
+    manha = resumo[SEGUNDA.isoformat()]["Manhã"]
+    assert manha["ocupadas"] == 1
+    assert manha["salas_ocupadas"] == [{"sala_id": sala_b, "sala_nome": "Sala B"}]
+    assert manha["salas_livres"] == ["Sala A"]
+
+
+def test_remover_usuario_desconta_ocupacoes_do_resumo(app, client, admin_auth_headers):
+    headers = admin_auth_headers
+    sala_a, sala_b = _ids_salas(app)
+    removidas = _criar(client, headers, sala_a, SEGUNDA, SEGUNDA + timedelta(days=1))
+    _criar(client, headers, sala_b, SEGUNDA, SEGUNDA)
+    with app.app_context():
+        dono = User(nome="Dono", email="d@example.com", senha="Password1!")
+        db.session.add(dono)
+        db.session.flush()
+        Ocupacao.query.filter(Ocupacao.id.in_([oc["id"] for oc in removidas])).update(
+            {"usuario_id": dono.id}, synchronize_session=False
+        )
+        db.session.commit()
+        dono_id = dono.id
+
+    client.set_cookie("csrf_token", "csrf")
+    resp = client.delete(
+        f"/api/usuarios/{dono_id}", headers={**headers, "X-CSRF-Token": "csrf"}
+    )
+
+    assert resp.status_code == 200
+    assert _resumo(app) == [(SEGUNDA, sala_b, "Manhã", "confirmado", "aula_regular", 1)]
+    relatorio = client.get(
+        "/api/ocupacoes/relatorio",
+        query_string={
+            "data_inicio": SEGUNDA.isoformat(),
+            "data_fim": (SEGUNDA + timedelta(days=6)).isoformat(),
+        },
+        headers=headers,
+    ).get_json()
+    assert relatorio["estatisticas_gerais"]["total_ocupacoes"] == 1
+
+
+def test_remover_sala_desconta_ocupacoes_do_resumo(app, client, admin_auth_headers):
+    headers = admin_auth_headers
+    sala_a, sala_b = _ids_salas(app)
+    _criar(client, headers, sala_a, SEGUNDA, SEGUNDA + timedelta(days=2))
+    _criar(client, headers, sala_b, SEGUNDA, SEGUNDA, turno="Tarde")
+
+    resp = client.delete(f"/api/salas/{sala_a}", headers=headers)
+
+    assert resp.status_code == 200
+    assert _resumo(app) == [(SEGUNDA, sala_b, "Tarde", "confirmado", "aula_regular", 1)]
+    tendencia = client.get("/api/ocupacoes/tendencia?ano=2024", headers=headers)
+    assert tendencia.get_json()[5] == {"mes": "06", "total": 1}
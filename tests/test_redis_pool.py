@@ -0,0 +1,120 @@
+import time
+
+import pytest
+from flask import Flask
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from conecta_senai.config import redis as redis_config
+from conecta_senai.config.redis import DummyRedis, GerenciadorRedis
+from conecta_senai.routes.diagnostico import diagnostico_bp
+
+URL_FECHADA = "redis://127.0.0.1:1/0"
+
+
+@pytest.fixture
+def gerenciador(monkeypatch):
+    gerenciador = GerenciadorRedis(
+        URL_FECHADA,
+        max_conexoes=5,
+        connect_timeout=0.2,
+        limite_falhas=2,
+        intervalo_reconexao=0.05,
+    )
+    monkeypatch.setattr(redis_config, "gerenciador", gerenciador)
+    monkeypatch.setattr(redis_config, "redis_conn", gerenciador.cliente)
+    yield gerenciador
+    gerenciador.encerrar()
+
+
+def _aguardar(condicao, limite=2.0):
+    fim = time.monotonic() + limite
+    while time.monotonic() < fim:
+        if condicao():
+            return True
+        time.sleep(0.01)
+    return condicao()
+
+
+def test_disjuntor_abre_apos_falhas_e_reconecta(gerenciador, monkeypatch):
+    for _ in range(2):
+        with pytest.raises(RedisConnectionError):
+            gerenciador.cliente.get("chave")
+
+    assert gerenciador.aberto
+    assert isinstance(redis_config.redis_conn, DummyRedis)
+    assert redis_config.metricas_redis()["estado"] == "aberto"
+
+    monkeypatch.setattr(gerenciador.cliente, "ping", lambda: True)
+    assert _aguardar(lambda: redis_config.redis_conn is gerenciador.cliente)
+    metricas = redis_config.metricas_redis()
+    assert metricas["estado"] == "fechado"
+    assert metricas["aberturas"] == 1
+    assert metricas["pool"]["max_conexoes"] == 5
+
+
+def test_falha_no_primeiro_ping_nao_desabilita_redis_para_sempre(
+    gerenciador, monkeypatch
+):
+    monkeypatch.setattr(redis_config, "redis_conn", DummyRedis())
+
+    assert isinstance(gerenciador.conectar(), DummyRedis)
+    assert gerenciador.aberto
+
+    monkeypatch.setattr(gerenciador.cliente, "ping", lambda: True)
+    assert _aguardar(lambda: redis_config.redis_conn is gerenciador.cliente)
+
+
+def test_limiter_compartilha_o_pool_quando_aponta_para_o_mesmo_servidor():
+    gerenciador = GerenciadorRedis("redis://redis:6379/0")
+    app = Flask(__name__)
+    app.config["RATELIMIT_STORAGE_URI"] = "redis://redis:6379"
+    redis_config._compartilhar_pool_com_limiter(app, gerenciador)
+    assert app.config["RATELIMIT_STORAGE_OPTIONS"]["connection_pool"] is (
+        gerenciador.pool
+    )
+
+    outro = Flask(__name__)
+    outro.config["RATELIMIT_STORAGE_URI"] = "redis://outro-host:6379"
+    redis_config._compartilhar_pool_com_limiter(outro, gerenciador)
+    assert "RATELIMIT_STORAGE_OPTIONS" not in outro.config
+
+    outro_db = Flask(__name__)
+    outro_db.config["RATELIMIT_STORAGE_URI"] = "redis://redis:6379/1"
+    redis_config._compartilhar_pool_com_limiter(outro_db, gerenciador)
+    assert "RATELIMIT_STORAGE_OPTIONS" not in outro_db.config
+
+    com_senha = Flask(__name__)
+    com_senha.config["RATELIMIT_STORAGE_URI"] = "redis://:segredo@redis:6379/0"
+    redis_config._compartilhar_pool_com_limiter(com_senha, gerenciador)
+    assert "RATELIMIT_STORAGE_OPTIONS" not in com_senha.config
+
+
+def test_app_redis_conn_acompanha_o_disjuntor(gerenciador, monkeypatch):
+    app = Flask(__name__)
+    monkeypatch.setattr(gerenciador, "conectar", lambda: gerenciador.cliente)
+    monkeypatch.setattr(redis_config, "gerenciador", None)
+    monkeypatch.setattr(
+        redis_config.GerenciadorRedis, "from_app", lambda app=None: gerenciador
+    )
+    monkeypatch.delenv("DISABLE_REDIS", raising=False)
+    redis_config.init_redis(app)
+
+    assert app.redis_conn.connection_pool is gerenciador.pool
+    for _ in range(2):
+        with pytest.raises(RedisConnectionError):
+            app.redis_conn.get("chave")
+    assert gerenciador.aberto
+    assert app.redis_conn.get("chave") is None
+
+
+def test_diagnostico_redis_exige_admin(
+    app, client, non_admin_auth_headers, admin_auth_headers
+):
+    app.register_blueprint(diagnostico_bp, url_prefix="/api")
+
+    resp = client.get("/api/diagnostico/redis", headers=non_admin_auth_headers)
+    assert resp.status_code == 403
+
+    resp = client.get("/api/diagnostico/redis", headers=admin_auth_headers)
+    assert resp.status_code == 200
+    assert resp.get_json() == {"estado": "desabilitado"}
@@ -0,0 +1,93 @@
+import pytest
+from flask import Flask, jsonify
+
+from conecta_senai.config.database import (
+    CHAVE_PAUSA_REPLICA,
+    engine_replica,
+    usar_replica,
+)
+from conecta_senai.models import db
+from conecta_senai.models.sala import Sala
+
+
+def _criar_app(tmp_path, replica_url):
+    app = Flask(__name__)
+    app.config["TESTING"] = True
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / 'principal.db'}"
+    app.config["SQLALCHEMY_REPLICA_URI"] = replica_url
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    db.init_app(app)
+
+    @app.route("/salas")
+    @usar_replica
+    def listar_salas():
+        return jsonify(sorted(sala.nome for sala in Sala.query.all()))
+
+    @app.route("/salas/principal")
+    def listar_salas_principal():
+        return jsonify(sorted(sala.nome for sala in Sala.query.all()))
+
+    @app.route("/salas/nova", methods=["POST"])
+    @usar_replica
+    def criar_sala():
+        db.session.add(Sala(nome="Criada", capacidade=5))
+        db.session.commit()
+        return jsonify(sorted(sala.nome for sala in Sala.query.all()))
+
+    return app
+
+
+@pytest.fixture
+def app_replica(tmp_path):
+    app = _criar_app(tmp_path, f"sqlite:///{tmp_path / 'replica.db'}")
+    with app.app_context():
+        db.create_all()
+        db.metadata.create_all(engine_replica())
+        db.session.add(Sala(nome="Principal", capacidade=10))
+        db.session.commit()
+        with engine_replica().begin() as conexao:
+            conexao.execute(
+                Sala.__table__.insert(), {"nome": "Replica", "capacidade": 10}
+            )
+    yield app
+    with app.app_context():
+        db.session.remove()
+        engine_replica().dispose()
+
+
+def test_view_marcada_le_da_replica(app_replica):
+    client = app_replica.test_client()
+
+    assert client.get("/salas").get_json() == ["Replica"]
+    assert client.get("/salas/principal").get_json() == ["Principal"]
+
+
+def test_escritas_vao_para_o_principal(app_replica):
+    client = app_replica.test_client()
+
+    resp = client.post("/salas/nova")
+
+    assert resp.get_json() == ["Replica"]
+    assert client.get("/salas/principal").get_json() == ["Criada", "Principal"]
+
+
+def test_sem_replica_configurada_usa_o_principal(tmp_path):
+    app = _criar_app(tmp_path, None)
+    with app.app_context():
+        db.create_all()
+        db.session.add(Sala(nome="Principal", capacidade=10))
+        db.session.commit()
+
+    assert app.test_client().get("/salas").get_json() == ["Principal"]
+
+
+def test_falha_na_replica_volta_ao_principal(tmp_path):
+    app = _criar_app(tmp_path, f"sqlite:///{tmp_path / 'inexistente' / 'r.db'}")
+    with app.app_context():
+        db.create_all()
+        db.session.add(Sala(nome="Principal", capacidade=10))
+        db.session.commit()
+
+    client = app.test_client()
+    assert client.get("/salas").get_json() == ["Principal"]
+    assert CHAVE_PAUSA_REPLICA in app.extensions
@@ -0,0 +1,221 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from conecta_senai.models import db
+from conecta_senai.models.job_execucao import JobExecucao
+from conecta_senai.routes.scheduler import scheduler_bp
+from conecta_senai.tasks import lease
+from conecta_senai.tasks.lease import (
+    _lock_local,
+    adquirir_lock,
+    executar_job,
+    limpar_historico_jobs,
+)
+
+
+@pytest.fixture
+def scheduler_app(app):
+    app.register_blueprint(scheduler_bp, url_prefix="/api")
+    return app
+
+
+def test_job_executa_uma_vez_por_intervalo(app):
+    chamadas = []
+
+    def job():
+        chamadas.append(1)
+        return 3
+
+    with app.app_context():
+        primeira = executar_job("teste", job, timedelta(minutes=5))
+        segunda = executar_job("teste", job, timedelta(minutes=5))
+
+        assert primeira is not None
+        assert primeira.status == "sucesso"
+        assert primeira.linhas_afetadas == 3
+        assert primeira.backend_lock == "local"
+        assert primeira.duracao_ms is not None
+        assert segunda is None
+        assert len(chamadas) == 1
+        assert JobExecucao.query.count() == 1
+
+
+def test_job_executa_novamente_apos_intervalo(app):
+    with app.app_context():
+        db.session.add(
+            JobExecucao(
+                job_id="teste",
+                instancia="outra:1",
+                status="sucesso",
+                iniciado_em=datetime.utcnow() - timedelta(minutes=10),
+            )
+        )
+        db.session.commit()
+
+        execucao = executar_job("teste", lambda: None, timedelta(minutes=5))
+
+        assert execucao is not None
+        assert execucao.linhas_afetadas is None
+        assert JobExecucao.query.count() == 2
+
+
+def test_execucao_em_andamento_bloqueia_nova_execucao(app):
+    chamadas = []
+    with app.app_context():
+        db.session.add(
+            JobExecucao(
+                job_id="longo",
+                instancia="outra:1",
+                status="executando",
+                iniciado_em=datetime.utcnow() - timedelta(minutes=10),
+            )
+        )
+        db.session.commit()
+
+        resultado = executar_job(
+            "longo", lambda: chamadas.append(1), timedelta(minutes=5)
+        )
+
+        assert resultado is None
+        assert chamadas == []
+
+
+def test_execucao_presa_expirada_nao_bloqueia(app):
+    app.config["SCHEDULER_EXECUCAO_EXPIRADA_MINUTOS"] = 30
+    with app.app_context():
+        db.session.add(
+            JobExecucao(
+                job_id="longo",
+                instancia="morta:1",
+                status="executando",
+                iniciado_em=datetime.utcnow() - timedelta(hours=1),
+            )
+        )
+        db.session.commit()
+
+        execucao = executar_job("longo", lambda: 1, timedelta(minutes=5))
+
+        assert execucao is not None
+        assert execucao.status == "sucesso"
+
+
+def test_job_frequente_so_registra_quando_trabalha(app):
+    janela = timedelta(seconds=12)
+    with app.app_context():
+        assert executar_job("despachar_emails", lambda: {}, janela) is None
+        assert executar_job("despachar_emails", lambda: 0, janela) is None
+        assert JobExecucao.query.count() == 0
+
+        execucao = executar_job("despachar_emails", lambda: {"enviado": 3}, janela)
+        assert execucao.status == "sucesso"
+        assert execucao.linhas_afetadas == 3
+        assert execucao.backend_lock == "local"
+
+        segunda = executar_job("despachar_emails", lambda: 1 / 0, janela)
+        assert segunda.status == "erro"
+        assert JobExecucao.query.count() == 2
+
+
+def test_job_registra_erro(app):
+    def job():
+        raise RuntimeError("falhou")
+
+    with app.app_context():
+        execucao = executar_job("quebrado", job, timedelta(minutes=5))
+
+        assert execucao.status == "erro"
+        assert execucao.erro == "falhou"
+        assert execucao.finalizado_em is not None
+
+
+def test_job_soma_linhas_de_resultado_dict(app):
+    with app.app_context():
+        execucao = executar_job(
+            "exportacoes",
+            lambda: {"retomadas": 2, "removidas": 5},
+            timedelta(minutes=5),
+        )
+
+        assert execucao.linhas_afetadas == 7
+        assert execucao.resultado == {"retomadas": 2, "removidas": 5}
+
+
+def test_lock_ocupado_ignora_execucao(app):
+    chamadas = []
+    with app.app_context():
+        with _lock_local("concorrente") as obtido:
+            assert obtido
+            resultado = executar_job(
+                "concorrente", lambda: chamadas.append(1), timedelta(minutes=5)
+            )
+
+        assert resultado is None
+        assert chamadas == []
+        assert JobExecucao.query.count() == 0
+
+
+def test_lock_redis_exclusivo(app, monkeypatch):
+    class RedisFalso:
+        def __init__(self):
+            self.dados = {}
+
+        def set(self, chave, valor, nx=False, ex=None):
+            if nx and chave in self.dados:
+                return None
+            self.dados[chave] = valor
+            return True
+
+        def eval(self, script, numkeys, chave, token):
+            if self.dados.get(chave) == token:
+                del self.dados[chave]
+                return 1
+            return 0
+
+    cliente = RedisFalso()
+    monkeypatch.setattr(lease.redis_config, "redis_conn", cliente)
+    with app.app_context():
+        with adquirir_lock("job") as (obtido, backend):
+            assert (obtido, backend) == (True, "redis")
+            with adquirir_lock("job") as (obtido_outro, _):
+                assert obtido_outro is False
+        assert cliente.dados == {}
+
+
+def test_limpar_historico_jobs(app):
+    with app.app_context():
+        db.session.add_all(
+            [
+                JobExecucao(
+                    job_id="antigo",
+                    instancia="a:1",
+                    status="sucesso",
+                    iniciado_em=datetime.utcnow() - timedelta(days=30),
+                ),
+                JobExecucao(job_id="recente", instancia="a:1", status="sucesso"),
+            ]
+        )
+        db.session.commit()
+
+        assert limpar_historico_jobs(14) == 1
+        assert [e.job_id for e in JobExecucao.query.all()] == ["recente"]
+
+
+def test_endpoints_historico(scheduler_app, client, admin_auth_headers):
+    app = scheduler_app
+    with app.app_context():
+        executar_job("a", lambda: 4, timedelta(minutes=5))
+        executar_job("b", lambda: 1 / 0, timedelta(minutes=5))
+
+    resp = client.get("/api/scheduler/execucoes?job_id=a", headers=admin_auth_headers)
+    assert resp.status_code == 200
+    dados = resp.get_json()
+    assert [e["job_id"] for e in dados] == ["a"]
+    assert dados[0]["linhas_afetadas"] == 4
+
+    resp = client.get("/api/scheduler/execucoes/resumo", headers=admin_auth_headers)
+    resumo = {item["job_id"]: item for item in resp.get_json()}
+    assert resumo["a"]["execucoes"] == 1
+    assert resumo["b"]["erros"] == 1
+
+    assert client.get("/api/scheduler/execucoes").status_code == 401
@@ -1,10 +1,10 @@
 import pytest
 from sqlalchemy import inspect, text
 
+from conecta_senai.config.esquema import verificar_esquema
 from conecta_senai.models import db
 from conecta_senai.models.suporte_basedados import SuporteArea, SuporteTipoEquipamento
 from conecta_senai.models.suporte_chamado import SuporteChamado
-from conecta_senai.routes.suporte_ti.utils import ensure_tables_exist
 
 
 @pytest.fixture
@@ -66,15 +66,11 @@ def test_abertura_chamado_token_invalido(client, suporte_base):
     assert resposta.get_json()["erro"] == "Token CSRF inválido."
 
 
-def test_ensure_tables_exist_repairs_legacy_schema(
-    client, app, csrf_token, suporte_base
-):
+def test_verificar_esquema_repairs_legacy_schema(client, app, csrf_token, suporte_base):
     with app.app_context():
         with db.engine.begin() as connection:
             connection.execute(text("DROP TABLE IF EXISTS suporte_chamados"))
-            connection.execute(
-                text(
-                    """
+            connection.execute(text("""
                     CREATE TABLE suporte_chamados (
                         id INTEGER PRIMARY KEY,
                         user_id INTEGER NOT NULL,
@@ -89,11 +85,9 @@ def test_ensure_tables_exist_repairs_legacy_schema(
                         created_at DATETIME NOT NULL,
                         updated_at DATETIME NOT NULL
                     )
-                    """
-                )
-            )
+                    """))
 
-        ensure_tables_exist([SuporteChamado])
+        assert verificar_esquema(forcar=True)["suporte_ti"] == "ok"
         inspector = inspect(db.engine)
         columns = inspector.get_columns("suporte_chamados")
         names = {column["name"] for column in columns}
@@ -2,11 +2,15 @@ import jwt
 from datetime import datetime, timedelta, date
 from unittest.mock import patch
 
-from conecta_senai.models import db
+from conecta_senai.models import db, EmailOutbox
 from conecta_senai.models.instrutor import Instrutor
 from conecta_senai.models.secretaria_treinamentos import SecretariaTreinamentos
 from conecta_senai.models.treinamento import Treinamento, TurmaTreinamento
-from conecta_senai.services.email_service import notificar_atualizacao_turma
+from conecta_senai.services.email_outbox_service import processar_outbox
+from conecta_senai.services.email_service import (
+    FakeTransport,
+    notificar_atualizacao_turma,
+)
 
 
 def coletar_destinatarios(mock_send):
@@ -137,14 +141,18 @@ def test_notificar_atualizacao_envia_emails_instrutores(app):
         db.session.add_all([treino, inst_old, inst_new, turma, sec])
         db.session.commit()
         diff = {"instrutor": (inst_old.nome, inst_new.nome)}
-        with patch("conecta_senai.services.email_service.send_email") as mock_send:
-            notificar_atualizacao_turma(turma, diff, inst_old)
-            destinatarios = set(coletar_destinatarios(mock_send))
-            assert destinatarios == {
-                "sec2@example.com",
-                "old@example.com",
-                "new@example.com",
-            }
+        transport = app.extensions["email_transport"] = FakeTransport()
+        notificar_atualizacao_turma(turma, diff, inst_old)
+        assert transport.batches == []
+        assert EmailOutbox.query.filter_by(status="pendente").count() == 3
+        processar_outbox()
+        assert set(transport.recipients) == {
+            "sec2@example.com",
+            "old@example.com",
+            "new@example.com",
+        }
+        assert len(transport.batches) == 1
+        assert transport.sent == []
 
 
 def test_notificar_atualizacao_instrutor_id(app):
@@ -162,14 +170,14 @@ def test_notificar_atualizacao_instrutor_id(app):
         db.session.add_all([treino, inst_old, inst_new, turma, sec])
         db.session.commit()
         diff = {"instrutor": (inst_old.nome, inst_new.nome)}
-        with patch("conecta_senai.services.email_service.send_email") as mock_send:
-            notificar_atualizacao_turma(turma, diff, inst_old.id)
-            destinatarios = set(coletar_destinatarios(mock_send))
-            assert destinatarios == {
-                "sec3@example.com",
-                "old2@example.com",
-                "new2@example.com",
-            }
+        transport = app.extensions["email_transport"] = FakeTransport()
+        notificar_atualizacao_turma(turma, diff, inst_old.id)
+        processar_outbox()
+        assert set(transport.recipients) == {
+            "sec3@example.com",
+            "old2@example.com",
+            "new2@example.com",
+        }
 
 
 def test_notificar_atualizacao_instrutor_inalterado_recebe_email(app):
@@ -189,10 +197,11 @@ def test_notificar_atualizacao_instrutor_inalterado_recebe_email(app):
 
         diff = {"local_realizacao": ("Local Antigo", "Local Atual")}
 
-        with patch("conecta_senai.services.email_service.send_email") as mock_send:
-            notificar_atualizacao_turma(turma, diff, instrutor)
+        transport = app.extensions["email_transport"] = FakeTransport()
+        notificar_atualizacao_turma(turma, diff, instrutor)
+        processar_outbox()
 
-        destinatarios = coletar_destinatarios(mock_send)
+        destinatarios = transport.recipients
         assert "inst@example.com" in destinatarios
         assert destinatarios.count("inst@example.com") == 1
 
@@ -224,13 +233,9 @@ def test_atualizar_turma_notifica_instrutor_uma_vez(client, app):
         headers=headers,
     )
     turma_id = resp.get_json()["id"]
-    patch_path = "conecta_senai.services.email_service.send_nova_turma_instrutor_email"
-    with (
-        patch(patch_path) as mock_send,
-        patch(
-            "conecta_senai.routes.treinamentos.treinamento.send_turma_alterada_email"
-        ),
-        patch("conecta_senai.services.email_service.send_email"),
+    transport = app.extensions["email_transport"] = FakeTransport()
+    with patch(
+        "conecta_senai.routes.treinamentos.treinamento.send_turma_alterada_email"
     ):
         r_up = client.put(
             f"/api/treinamentos/turmas/{turma_id}",
@@ -238,7 +243,11 @@ def test_atualizar_turma_notifica_instrutor_uma_vez(client, app):
             headers=headers,
         )
         assert r_up.status_code == 200
-        assert mock_send.call_count == 1
+    assert transport.recipients == []
+    with app.app_context():
+        processar_outbox()
+    assert transport.recipients.count("new@example.com") == 1
+    assert transport.recipients.count("old@example.com") == 1
 
 
 def test_remover_turma_envia_email_desmarcado(client, app):
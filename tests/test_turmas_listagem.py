@@ -0,0 +1,150 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from conecta_senai.models import db
+from conecta_senai.models.instrutor import Instrutor
+from conecta_senai.models.treinamento import Treinamento, TurmaTreinamento
+
+
+@pytest.fixture
+def turmas(app):
+    hoje = date.today()
+    with app.app_context():
+        instrutor = Instrutor(
+            nome="Maria", email="maria@example.com", disponibilidade=["manha"]
+        )
+        treinamentos = [
+            Treinamento(nome=f"Curso {i}", codigo=f"C{i}", tem_pratica=i % 2 == 0)
+            for i in range(3)
+        ]
+        db.session.add(instrutor)
+        db.session.add_all(treinamentos)
+        db.session.flush()
+        periodos = [
+            (hoje + timedelta(days=10), hoje + timedelta(days=12)),
+            (hoje + timedelta(days=5), hoje + timedelta(days=6)),
+            (hoje - timedelta(days=1), hoje + timedelta(days=1)),
+            (hoje - timedelta(days=20), hoje - timedelta(days=18)),
+        ]
+        for i, (inicio, fim) in enumerate(periodos):
+            db.session.add(
+                TurmaTreinamento(
+                    treinamento_id=treinamentos[i % 3].id,
+                    data_inicio=inicio,
+                    data_fim=fim,
+                    local_realizacao="Sala 1",
+                    horario="08:00",
+                    instrutor_id=instrutor.id if i % 2 else None,
+                    teoria_online=bool(i % 2),
+                )
+            )
+        db.session.commit()
+    return app
+
+
+def test_payload_igual_ao_dos_modelos(turmas, client, login_admin):
+    token, _ = login_admin(client)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    ativas = client.get("/api/treinamentos/turmas-ativas", headers=headers)
+    agendadas = client.get("/api/treinamentos/agendadas", headers=headers)
+    assert ativas.status_code == agendadas.status_code == 200
+
+    with turmas.app_context():
+        turma = TurmaTreinamento.query.filter(
+            TurmaTreinamento.data_inicio <= date.today(),
+            TurmaTreinamento.data_fim >= date.today(),
+        ).one()
+        assert ativas.get_json() == [
+            {
+                "turma_id": turma.id,
+                "treinamento": turma.treinamento.to_dict(),
+                "data_inicio": turma.data_inicio.isoformat(),
+                "data_fim": turma.data_fim.isoformat(),
+                "local_realizacao": "Sala 1",
+                "horario": "08:00",
+                "instrutor": None,
+                "teoria_online": False,
+                "has_pratica": turma.treinamento.tem_pratica,
+            }
+        ]
+
+        esperado = [
+            (t.id, t.instrutor.nome if t.instrutor else "A definir")
+            for t in TurmaTreinamento.query.filter(
+                TurmaTreinamento.data_inicio > date.today()
+            ).order_by(TurmaTreinamento.data_inicio)
+        ]
+    assert [
+        (item["turma_id"], item["instrutor_nome"]) for item in agendadas.get_json()
+    ] == esperado
+    assert esperado[0][1] == "Maria"
+
+
+def test_historico_traz_instrutor_completo_em_um_select(
+    turmas, client, login_admin, contar_consultas
+):
+    token, _ = login_admin(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    contar_consultas.clear()
+
+    resposta = client.get("/api/treinamentos/historico", headers=headers)
+
+    assert resposta.status_code == 200
+    selects = [
+        sql
+        for sql in contar_consultas
+        if "turmas_treinamento" in sql or "instrutores" in sql
+    ]
+    assert len(selects) == 1
+    (item,) = resposta.get_json()
+    with turmas.app_context():
+        assert (
+            item["instrutor"]
+            == db.session.get(Instrutor, item["instrutor"]["id"]).to_dict()
+        )
+
+
+def test_paginacao_por_pagina(turmas, client, login_admin):
+    token, _ = login_admin(client)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    vistos = []
+    pagina = 1
+    while True:
+        dados = client.get(
+            f"/api/treinamentos/todas?per_page=3&page={pagina}", headers=headers
+        ).get_json()
+        assert dados["page"] == pagina and dados["per_page"] == 3
+        vistos.extend(item["turma_id"] for item in dados["items"])
+        if not dados["has_next"]:
+            break
+        pagina += 1
+
+    completa = client.get("/api/treinamentos/todas", headers=headers).get_json()
+    assert pagina == 2
+    assert vistos == [item["turma_id"] for item in completa]
+
+
+def test_filtro_atualizado_desde(turmas, client, login_admin):
+    token, _ = login_admin(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    antigo = datetime(2020, 1, 1)
+    with turmas.app_context():
+        TurmaTreinamento.query.update({"data_atualizacao": antigo})
+        Treinamento.query.update({"data_atualizacao": antigo})
+        turma = TurmaTreinamento.query.order_by(TurmaTreinamento.id).first()
+        turma.local_realizacao = "Sala 2"
+        turma.data_atualizacao = datetime(2024, 6, 1)
+        db.session.commit()
+        turma_id = turma.id
+
+    resposta = client.get(
+        "/api/treinamentos/todas?atualizado_desde=2024-01-01T00:00:00",
+        headers=headers,
+    )
+    assert [item["turma_id"] for item in resposta.get_json()] == [turma_id]
+
+    invalido = client.get("/api/treinamentos/todas?since=ontem", headers=headers)
+    assert invalido.status_code == 400
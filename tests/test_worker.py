@@ -0,0 +1,101 @@
+import threading
+
+import pytest
+from apscheduler.schedulers.base import STATE_STOPPED
+
+from conecta_senai import worker as worker_module
+from conecta_senai.cli import register_cli
+from conecta_senai.tasks import start_scheduler
+from conecta_senai.tasks.scheduler import scheduler
+from conecta_senai.worker import create_worker_app, run_worker
+
+
+@pytest.fixture
+def worker_app(tmp_path, monkeypatch):
+    monkeypatch.setenv("FLASK_ENV", "testing")
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'worker.db'}")
+    monkeypatch.setenv("SECRET_KEY", "test")
+    return create_worker_app()
+
+
+def test_worker_app_sem_blueprints_nem_swagger(worker_app):
+    assert worker_app.blueprints == {}
+    assert "flasgger" not in worker_app.extensions
+    assert worker_app.config["WORKER_PROCESS"] is True
+    assert worker_app.config["SECRET_KEY"] == "test"
+    assert "sqlalchemy" in worker_app.extensions
+
+
+def test_run_worker_encerra_de_forma_graciosa(app, monkeypatch):
+    chamadas = []
+    monkeypatch.setattr(
+        worker_module,
+        "start_scheduler",
+        lambda app, max_workers=None: chamadas.append(("start", max_workers)),
+    )
+    monkeypatch.setattr(
+        worker_module,
+        "stop_scheduler",
+        lambda wait=True: chamadas.append(("stop", wait)),
+    )
+    monkeypatch.setattr(
+        worker_module,
+        "encerrar_executor",
+        lambda wait=True: chamadas.append(("exportacoes", wait)),
+    )
+    app.config["WORKER_THREADS"] = 3
+
+    parar = threading.Event()
+    thread = threading.Thread(target=run_worker, args=(app,), kwargs={"parar": parar})
+    thread.start()
+    parar.set()
+    thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert chamadas == [("start", 3), ("stop", True), ("exportacoes", True)]
+
+
+def test_comando_cli_worker(app, monkeypatch):
+    recebido = {}
+
+    def falso_run_worker(app, threads=None):
+        recebido["app"] = app
+        recebido["threads"] = threads
+
+    monkeypatch.setattr(worker_module, "run_worker", falso_run_worker)
+    monkeypatch.setattr(worker_module, "create_worker_app", lambda: app)
+    register_cli(app)
+
+    resultado = app.test_cli_runner().invoke(args=["worker", "--threads", "2"])
+
+    assert resultado.exit_code == 0, resultado.output
+    assert recebido == {"app": app, "threads": 2}
+
+
+def test_comando_cli_worker_repassa_threads_ao_executor(app, monkeypatch):
+    # Simula o scheduler já iniciado pelo create_app carregado pela CLI.
+    start_scheduler(app)
+    run_original = worker_module.run_worker
+    stop_original = worker_module.stop_scheduler
+    executores = []
+
+    def run_sem_bloquear(app, threads=None):
+        parar = threading.Event()
+        parar.set()
+        run_original(app, threads=threads, parar=parar)
+
+    def registrar_e_parar(wait=True):
+        executores.append(scheduler._lookup_executor("default")._pool._max_workers)
+        stop_original(wait=wait)
+
+    monkeypatch.setattr(worker_module, "run_worker", run_sem_bloquear)
+    monkeypatch.setattr(worker_module, "stop_scheduler", registrar_e_parar)
+    monkeypatch.setattr(worker_module, "_instalar_sinais", lambda parar: None)
+    monkeypatch.setattr(worker_module, "create_worker_app", lambda: app)
+    register_cli(app)
+
+    resultado = app.test_cli_runner().invoke(args=["worker", "--threads", "2"])
+
+    assert resultado.exit_code == 0, resultado.output
+    assert executores == [2]
+    assert scheduler.state == STATE_STOPPED